@@ -19,14 +19,22 @@ def generar_reporte_excel_con_turnos_individuales(archivo_excel, archivo_salida=
     """
     try:
         # Leer el archivo Excel directamente con openpyxl
-        wb_original = openpyxl.load_workbook(archivo_excel, data_only=True)
-        ws_original = wb_original.active
+        # Leer el libro en streaming (solo lectura, sin objetos Cell): una sola pasada por la hoja
+        wb_original = openpyxl.load_workbook(archivo_excel, read_only=True, data_only=True)
+        filas_original = list(wb_original.active.iter_rows(values_only=True))
+        wb_original.close()
+        max_row = len(filas_original)
+        max_column = max((len(valores) for valores in filas_original), default=0)
+        
+        def valor_celda(fila, col):
+            valores = filas_original[fila - 1]
+            return valores[col - 1] if col <= len(valores) else None
         
         # Encontrar la fila de encabezados (días)
         fila_encabezados = None
-        for row in range(1, ws_original.max_row + 1):
-            for col in range(1, ws_original.max_column + 1):
-                cell_value = ws_original.cell(row=row, column=col).value
+        for row in range(1, max_row + 1):
+            for col in range(1, max_column + 1):
+                cell_value = valor_celda(row, col)
                 if cell_value and str(cell_value).startswith(('FRI', 'SAT', 'SUN', 'MON', 'TUE', 'WED', 'THU')):
                     fila_encabezados = row
                     break
@@ -39,9 +47,9 @@ def generar_reporte_excel_con_turnos_individuales(archivo_excel, archivo_salida=
         
         # Encontrar las filas de trabajadores
         filas_trabajadores = []
-        for row in range(fila_encabezados + 1, ws_original.max_row + 1):
-            cell_no = ws_original.cell(row=row, column=1).value
-            cell_codigo = ws_original.cell(row=row, column=2).value
+        for row in range(fila_encabezados + 1, max_row + 1):
+            cell_no = valor_celda(row, 1)
+            cell_codigo = valor_celda(row, 2)
             if cell_no and cell_codigo and str(cell_no).isdigit():
                 filas_trabajadores.append(row)
         
@@ -51,18 +59,18 @@ def generar_reporte_excel_con_turnos_individuales(archivo_excel, archivo_salida=
         datos_trabajadores = []
         
         for fila_idx in filas_trabajadores:
-            numero_trabajador = ws_original.cell(row=fila_idx, column=1).value
-            codigo_trabajador = ws_original.cell(row=fila_idx, column=2).value
+            numero_trabajador = valor_celda(fila_idx, 1)
+            codigo_trabajador = valor_celda(fila_idx, 2)
             
             # Contar parejas de turnos y turnos individuales
             parejas_encontradas = defaultdict(int)
             turnos_individuales = defaultdict(int)
             
             # Recorrer las columnas de días (cada día tiene 2 columnas)
-            for col in range(3, ws_original.max_column + 1, 2):
-                if col + 1 <= ws_original.max_column:
-                    turno1 = ws_original.cell(row=fila_idx, column=col).value
-                    turno2 = ws_original.cell(row=fila_idx, column=col + 1).value
+            for col in range(3, max_column + 1, 2):
+                if col + 1 <= max_column:
+                    turno1 = valor_celda(fila_idx, col)
+                    turno2 = valor_celda(fila_idx, col + 1)
                     
                     # Contar turnos individuales
                     if turno1:
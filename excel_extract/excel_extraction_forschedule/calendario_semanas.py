@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Calendario de Semanas - Sistema de Turnos
+=========================================
+Calendario precalculado por año, compartido por el generador, los validadores y los exportadores.
+
+- Semana 1 empieza el primer lunes de enero (misma numeración que usa GeneradorDescansosSeparacion)
+- Cada semana tiene 7 registros de día: fecha, formato DIA-DD, dia_semana, es_domingo, es_festivo, es_no_laborable
+- Los festivos se guardan como set de fechas: consultar un día es O(1)
+- obtener_calendario() construye cada (año, festivos) una sola vez por proceso
+- indice_semana(año, semana) numera las semanas de forma continua entre años (diferencias entre años distintos)
+"""
+
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+# ============================================================================
+# NOMBRES DE DÍAS
+# ============================================================================
+
+NOMBRES_DIAS = ('MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN')
+DIAS_ES = ('lunes', 'martes', 'miércoles', 'jueves', 'viernes', 'sábado', 'domingo')
+
+INDICE_DIA = {nombre: i for i, nombre in enumerate(NOMBRES_DIAS)}   # 'MON' → 0
+MAPEO_DIAS = {nombre: i for i, nombre in enumerate(DIAS_ES)}        # 'lunes' → 0
+DIA_ES_A_FORMATO = dict(zip(DIAS_ES, NOMBRES_DIAS))                 # 'lunes' → 'MON'
+
+
+class CalendarioAño:
+    """Semanas de un año (lunes a domingo) con sus días ya formateados y marcados"""
+
+    def __init__(self, año, dias_festivos=()):
+        self.año = año
+        self.festivos = set()
+        for fecha_str in dias_festivos:
+            try:
+                self.festivos.add(datetime.strptime(fecha_str, "%Y-%m-%d").date())
+            except ValueError:
+                continue  # validar_restricciones() ya reporta los festivos mal escritos
+
+        self.primer_lunes_enero = self._calcular_primer_lunes_enero()
+        ultimo_dia_año = date(año, 12, 31)
+        self.total_semanas = (ultimo_dia_año - self.primer_lunes_enero).days // 7 + 1
+
+        self._semanas = {
+            semana: tuple(self._generar_dia(self.primer_lunes_enero + timedelta(days=(semana - 1) * 7 + i), i)
+                          for i in range(7))
+            for semana in range(1, self.total_semanas + 1)
+        }
+
+    def _calcular_primer_lunes_enero(self):
+        """Primer lunes de enero (si el 1 de enero es lunes se toma el lunes siguiente)"""
+        primer_dia_enero = date(self.año, 1, 1)
+        dias_hasta_lunes = (7 - primer_dia_enero.weekday()) % 7
+        if dias_hasta_lunes == 0:
+            dias_hasta_lunes = 7
+        return primer_dia_enero + timedelta(days=dias_hasta_lunes)
+
+    def _generar_dia(self, fecha, dia_semana):
+        es_domingo = dia_semana == 6
+        es_festivo = fecha in self.festivos
+        return {
+            'fecha': fecha,
+            'formato': f"{NOMBRES_DIAS[dia_semana]}-{fecha.day:02d}",
+            'dia_semana': dia_semana,
+            'es_domingo': es_domingo,
+            'es_festivo': es_festivo,
+            'es_no_laborable': es_domingo or es_festivo
+        }
+
+    def dias(self, semana):
+        """Los 7 registros de día de la semana (compartidos: no modificarlos)"""
+        return self._semanas[semana]
+
+    def fechas(self, semana):
+        """Las 7 fechas (lunes a domingo) de la semana"""
+        return [dia['fecha'] for dia in self._semanas[semana]]
+
+    def semana_de(self, fecha):
+        """Número de semana que contiene la fecha"""
+        return (fecha - self.primer_lunes_enero).days // 7 + 1
+
+    def indice_semana(self, semana):
+        """Semanas desde el lunes 1-1-0001 hasta el lunes de la semana (también fuera de 1..total_semanas)"""
+        return (self.primer_lunes_enero.toordinal() - 1) // 7 + semana - 1
+
+    def es_festivo(self, fecha):
+        return fecha in self.festivos
+
+    def festivos_semana(self, semana):
+        """Registros de día festivos de la semana"""
+        return [dia for dia in self._semanas[semana] if dia['es_festivo']]
+
+
+@lru_cache(maxsize=None)
+def _calendario_cacheado(año, dias_festivos):
+    return CalendarioAño(año, dias_festivos)
+
+
+def obtener_calendario(año, dias_festivos=()):
+    """Calendario del año, construido una sola vez por combinación (año, festivos)"""
+    return _calendario_cacheado(año, tuple(dias_festivos))
+
+
+def indice_semana(año, semana):
+    """Índice absoluto de la semana de un año: la resta de dos índices son las semanas transcurridas"""
+    return obtener_calendario(año).indice_semana(semana)
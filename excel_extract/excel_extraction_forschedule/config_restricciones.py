@@ -261,7 +261,9 @@ DIAS_FESTIVOS = [
 # ============================================================================
 
 CONFIGURACION_GENERAL = {
-    "archivo_historial_sabados": "historial_sabados.csv",
+    "archivo_historial_sabados": "historial_sabados.db",
+    # Año de las semanas de historial_sabados.csv al importarlo (None = según su fecha de modificación)
+    "año_historial_csv": None,
     "mapeo_dias": {
         "lunes": 0, "martes": 1, "miércoles": 2, "jueves": 3, 
         "viernes": 4, "sábado": 5, "domingo": 6
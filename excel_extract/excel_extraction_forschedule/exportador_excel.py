@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Exportador Excel - Sistema de Turnos
+====================================
+Estilos con nombre y escritura en modo solo escritura para el horario semanal.
+
+- Misma API que generadorDescFiles/exportador_excel.py, reducida a lo que usa este generador
+  (cada carpeta se ejecuta por separado: los módulos compartidos se copian, no se importan de la otra)
+- Cada color es un estilo con nombre que se registra una sola vez por libro; asignarlo a una celda
+  solo copia sus índices, sin crear objetos PatternFill por celda
+- escribir_hoja: hoja nueva en un libro Workbook(write_only=True) a partir de filas de valores y
+  nombres de estilo, con anchos de columna calculados sobre la grilla codificada
+"""
+
+import numpy as np
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import NamedStyle, PatternFill
+from openpyxl.utils import get_column_letter
+
+# Nombre → color RGB. Los colores fuera de la paleta usan el estilo "relleno_<RGB>".
+PALETA = {
+    "amarillo": "FFFF00",        # Turnos especiales y trabajadores fuera de operación
+}
+
+_NOMBRE_COLOR = {color: nombre for nombre, color in PALETA.items()}
+
+
+def color_rgb(color):
+    """Nombre de la paleta o RGB → RGB de 6 dígitos en mayúsculas"""
+    if color in PALETA:
+        return PALETA[color]
+    return color.upper()[-6:]
+
+
+def nombre_estilo(color=None):
+    """Nombre del estilo de relleno para un color (nombre de la paleta o RGB); sin color es "Normal" """
+    if color is None:
+        return "Normal"
+    rgb = color_rgb(color)
+    return _NOMBRE_COLOR.get(rgb, f"relleno_{rgb}")
+
+
+def registrar_estilo(wb, color=None):
+    """Registra en el libro (una sola vez) el estilo de relleno del color y devuelve su nombre"""
+    nombre = nombre_estilo(color)
+    if nombre == "Normal" or nombre in wb.named_styles:
+        return nombre
+    rgb = color_rgb(color)
+    estilo = NamedStyle(name=nombre)
+    estilo.fill = PatternFill(start_color=rgb, end_color=rgb, fill_type="solid")
+    wb.add_named_style(estilo)
+    return nombre
+
+
+def anchos_columnas(codigos, longitudes, encabezados, extra=(), minimo=0, maximo=15):
+    """
+    Anchos de columna a partir de la grilla codificada: largo del código más largo de cada columna
+    (longitudes[codigo], 0 = vacía), del encabezado y de las filas extra, más 2, acotado a [minimo, maximo]
+    """
+    largos = np.asarray(longitudes, dtype=np.int64)
+    por_columna = largos[codigos].max(axis=0) if codigos.size else np.zeros(codigos.shape[1], dtype=np.int64)
+    anchos = []
+    for j, encabezado in enumerate(encabezados):
+        largo = max(int(por_columna[j]), len(str(encabezado)))
+        for fila in extra:
+            if fila[j] is not None:
+                largo = max(largo, len(str(fila[j])))
+        anchos.append(min(max(largo + 2, minimo), maximo))
+    return anchos
+
+
+def libro_solo_escritura():
+    """Libro nuevo en modo solo escritura (las hojas se crean con escribir_hoja)"""
+    return Workbook(write_only=True)
+
+
+def escribir_hoja(wb, titulo, filas, estilos=None, anchos=None):
+    """
+    Escribe una hoja nueva en un libro de solo escritura
+
+    Args:
+        filas: Valores fila por fila (None = celda vacía)
+        estilos: Por cada fila, el nombre de estilo de cada celda (None = sin estilo); deben estar
+            registrados con registrar_estilo. Las filas sin estilos pueden ser None
+        anchos: Ancho de cada columna desde la A
+    """
+    ws = wb.create_sheet(titulo)
+    for col, ancho in enumerate(anchos or (), start=1):
+        ws.column_dimensions[get_column_letter(col)].width = ancho
+
+    estilos = iter(estilos) if estilos is not None else None
+    for valores in filas:
+        estilos_fila = next(estilos, None) if estilos is not None else None
+        if not estilos_fila:
+            ws.append(list(valores))
+            continue
+        fila = []
+        for valor, estilo in zip(valores, estilos_fila):
+            if estilo is None:
+                fila.append(valor)
+            else:
+                celda = WriteOnlyCell(ws, value=valor)
+                celda.style = estilo
+                fila.append(celda)
+        ws.append(fila)
+    return ws
@@ -1,10 +1,15 @@
 import pandas as pd
 import calendar
-from datetime import datetime, date, timedelta
+import math
+from itertools import combinations
+from datetime import datetime, date
 import random
 import numpy as np
-import csv
-import os
+import sys
+import json
+import hashlib
+import logging
+from concurrent.futures import ProcessPoolExecutor
 
 # Importar configuración externa de restricciones
 from config_restricciones import (
@@ -16,10 +21,146 @@ from config_restricciones import (
     CONFIGURACION_GENERAL,
     obtener_empleados
 )
+from restricciones_compiladas import RestriccionesCompiladas
+from planificador_sabados import planificar_sabados
+from validacion_semana import ReporteValidacion
+from historial_sabados_db import HistorialSabados
+from calendario_semanas import (
+    NOMBRES_DIAS,
+    DIAS_ES,
+    INDICE_DIA,
+    MAPEO_DIAS,
+    DIA_ES_A_FORMATO,
+    indice_semana,
+    obtener_calendario
+)
+from exportador_excel import anchos_columnas, escribir_hoja, libro_solo_escritura, registrar_estilo
+
+# Registro del generador: silencioso por defecto (NullHandler). Los mensajes usan formato diferido
+# ("%s", valor), así que con el nivel desactivado no se construye ningún texto.
+# configurar_registro() activa la consola y/o un flujo JSON-lines de eventos.
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class FormateadorJSONLineas(logging.Formatter):
+    """Un evento JSON por línea: t (epoch), nivel, funcion, mensaje"""
+    
+    def format(self, record):
+        return json.dumps({
+            't': round(record.created, 3),
+            'nivel': record.levelname,
+            'funcion': record.funcName,
+            'mensaje': record.getMessage().strip()
+        }, ensure_ascii=False, default=str)
+
+
+def configurar_registro(nivel=logging.INFO, consola=True, archivo_jsonl=None):
+    """
+    Configura la salida del generador (reemplaza la configuración anterior)
+    
+    - nivel: DEBUG incluye tablas de prioridades, cascada y cada asignación por empleado;
+      INFO los resúmenes y validaciones; WARNING solo advertencias
+    - consola: mensajes tal cual a stdout (mismo aspecto que los print anteriores)
+    - archivo_jsonl: ruta de un flujo de eventos JSON-lines (se agrega al final del archivo)
+    """
+    for manejador in list(logger.handlers):
+        if not isinstance(manejador, logging.NullHandler):
+            logger.removeHandler(manejador)
+            manejador.close()
+    logger.setLevel(nivel)
+    
+    if consola:
+        manejador = logging.StreamHandler(sys.stdout)
+        manejador.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(manejador)
+    if archivo_jsonl:
+        manejador = logging.FileHandler(archivo_jsonl, encoding='utf-8')
+        manejador.setFormatter(FormateadorJSONLineas())
+        manejador.addFilter(lambda registro: bool(registro.getMessage().strip()))
+        logger.addHandler(manejador)
+    return logger
+
+class GeneradorAleatorioRegistrado:
+    """
+    Fuente única de aleatoriedad del generador, con registro compacto de decisiones
+    
+    - Modo normal: delega en random.Random(semilla) y anota cada resultado como (tipo, valor):
+      'u' uniform, 'r' random, 'c' índice elegido en choice, 's' permutación aplicada en shuffle
+    - Modo reproducción (decisiones=lista previa): devuelve las decisiones registradas en orden sin sortear;
+      si el código pide una decisión distinta de la registrada lanza ValueError indicando la posición
+      (sirve para ubicar en qué punto diverge una regresión)
+    """
+    
+    def __init__(self, semilla=None, decisiones=None):
+        self.semilla = semilla
+        self._rng = random.Random(semilla)
+        self.reproduciendo = decisiones is not None
+        self.decisiones = [tuple(d) for d in decisiones] if decisiones is not None else []
+        self._posicion = 0
+    
+    def _siguiente(self, tipo):
+        if self._posicion >= len(self.decisiones):
+            raise ValueError(f"Registro agotado en la decisión {self._posicion} (se pidió '{tipo}')")
+        tipo_registrado, valor = self.decisiones[self._posicion]
+        if tipo_registrado != tipo:
+            raise ValueError(f"Divergencia en la decisión {self._posicion}: registrada '{tipo_registrado}', pedida '{tipo}'")
+        self._posicion += 1
+        return valor
+    
+    def _anotar(self, tipo, valor):
+        self.decisiones.append((tipo, valor))
+        return valor
+    
+    def uniform(self, a, b):
+        if self.reproduciendo:
+            return self._siguiente('u')
+        return self._anotar('u', self._rng.uniform(a, b))
+    
+    def random(self):
+        if self.reproduciendo:
+            return self._siguiente('r')
+        return self._anotar('r', self._rng.random())
+    
+    def choice(self, secuencia):
+        if self.reproduciendo:
+            indice = self._siguiente('c')
+            if indice >= len(secuencia):
+                raise ValueError(f"Divergencia en la decisión {self._posicion - 1}: índice {indice} con {len(secuencia)} opciones")
+        else:
+            indice = self._anotar('c', self._rng.randrange(len(secuencia)))
+        return secuencia[indice]
+    
+    def shuffle(self, lista):
+        if self.reproduciendo:
+            orden = self._siguiente('s')
+            if sorted(orden) != list(range(len(lista))):
+                raise ValueError(f"Divergencia en la decisión {self._posicion - 1}: permutación de {len(orden)} para {len(lista)} elementos")
+        else:
+            orden = list(range(len(lista)))
+            self._rng.shuffle(orden)
+            self._anotar('s', orden)
+        lista[:] = [lista[i] for i in orden]
 
 class GeneradorDescansosSeparacion:
-    def __init__(self, año=2025, mes=1, num_empleados=25, semana_especifica=None):
-        """Inicializa el generador con configuración básica"""
+    def __init__(self, año=2025, mes=1, num_empleados=25, semana_especifica=None, historial_sabados=None, guardar_historial=True,
+                 semilla=None, registro_decisiones=None, horizonte_sabados=6, plan_sabados=None):
+        """
+        Inicializa el generador con configuración básica
+        
+        Args:
+            historial_sabados: Historial {empleado: (año, semana) del último TROP en sábado} ya cargado en
+                memoria (modo por lotes); si es None se lee de historial_sabados.db
+            guardar_historial: Si es False el historial actualizado solo queda en memoria
+                (self.historial_sabados_actualizado) y la semana no se registra en historial_sabados.db
+            semilla: Semilla del generador aleatorio; con la misma semilla, configuración e historial
+                la semana sale idéntica (None = aleatorio en cada ejecución)
+            registro_decisiones: Lista de decisiones de un registro previo (ver exportar_registro_decisiones)
+                para reproducir la semana exactamente sin sortear
+            horizonte_sabados: Semanas (desde la seleccionada) que el plan de sábados tiene en cuenta
+            plan_sabados: Plan {semana: [empleados]} ya calculado (planificar_sabados); si es None
+                se calcula al asignar los sábados
+        """
         self.año = año
         self.mes = mes
         self.num_empleados = num_empleados
@@ -28,8 +169,9 @@ class GeneradorDescansosSeparacion:
         # Cargar empleados desde configuración
         self.empleados = obtener_empleados()
         
-        # Configuración de aleatorización
-        np.random.seed()
+        # Configuración de aleatorización: una sola fuente con semilla y registro de decisiones
+        self.semilla = semilla
+        self.aleatorio = GeneradorAleatorioRegistrado(semilla, registro_decisiones)
         
         # SISTEMA UNIFICADO DE RESTRICCIONES CONSOLIDADO (AHORA EXTERNO)
         self.restricciones_empleados = RESTRICCIONES_EMPLEADOS
@@ -40,13 +182,19 @@ class GeneradorDescansosSeparacion:
         # NUEVA FUNCIONALIDAD: Turnos especiales extendidos (AHORA EXTERNO)
         self.turnos_especiales = TURNOS_ESPECIALES
         
+        # Restricciones compiladas por empleado (máscaras de días, fechas indexadas)
+        self.restricciones_compiladas = RestriccionesCompiladas(
+            self.restricciones_empleados, self.turnos_fechas_especificas, self.turnos_especiales
+        )
+        
         # NUEVA FUNCIONALIDAD: Trabajadores fuera de operación (AHORA EXTERNO)
         self.trabajadores_fuera_operacion = TRABAJADORES_FUERA_OPERACION
         
         # NUEVA FUNCIONALIDAD: Días festivos (AHORA EXTERNO)
         self.dias_festivos = DIAS_FESTIVOS
         
-        # NUEVO SISTEMA: Calcular semanas basado en primer lunes de enero
+        # NUEVO SISTEMA: Calcular semanas basado en primer lunes de enero (calendario compartido por año)
+        self.calendario = obtener_calendario(self.año, self.dias_festivos)
         self.primer_lunes_enero = self._calcular_primer_lunes_enero()
         self.total_semanas_año = self._calcular_total_semanas_año()
         self.semana_seleccionada = self._seleccionar_semana()
@@ -56,77 +204,74 @@ class GeneradorDescansosSeparacion:
         self.dias_mes = self._generar_dias_semana()
         self.semanas = self._agrupar_por_semanas()
         
+        # Fechas específicas y turnos especiales de la semana, resueltos una sola vez por empleado
+        self._fechas_especificas_semana = self._precalcular_fechas_especificas_semana()
+        self._turnos_especiales_semana = self._precalcular_turnos_especiales_semana()
+        self._turno_especial_completo = {}
+        
         # Mapeo de días de la semana para las restricciones
-        self.mapeo_dias = {
-            "lunes": 0, "martes": 1, "miércoles": 2, "jueves": 3, 
-            "viernes": 4, "sábado": 5, "domingo": 6
-        }
+        self.mapeo_dias = MAPEO_DIAS
         
         # SISTEMA DE PRIORIDADES DE SÁBADOS
-        self.archivo_historial_sabados = 'historial_sabados.csv'
-        self.historial_sabados = self._cargar_historial_sabados()
+        self.archivo_historial_sabados = CONFIGURACION_GENERAL.get("archivo_historial_sabados", "historial_sabados.db")
+        self.guardar_historial = guardar_historial
+        if historial_sabados is not None:
+            self.historial_sabados = self._normalizar_historial(historial_sabados)
+        else:
+            self.historial_sabados = self._cargar_historial_sabados()
+        self.historial_sabados_actualizado = dict(self.historial_sabados)
+        self.sabados_semana = []
         self.prioridades_sabados = self._calcular_prioridades_sabados()
+        self.horizonte_sabados = horizonte_sabados
+        self.plan_sabados = plan_sabados
         
 
     
+    def _normalizar_historial(self, historial_sabados):
+        """{empleado: (año, semana) o None}; acepta listas (registros JSON) y semanas sueltas de registros
+        anteriores, que eran siempre del año generado"""
+        normalizado = {}
+        for empleado, ultima in historial_sabados.items():
+            if ultima is None:
+                normalizado[empleado] = None
+            elif isinstance(ultima, (list, tuple)):
+                normalizado[empleado] = tuple(ultima)
+            else:
+                normalizado[empleado] = (self.año, ultima)
+        return normalizado
+    
     def _cargar_historial_sabados(self):
-        """Carga el historial de sábados desde CSV o crea uno nuevo"""
-        if not os.path.exists(self.archivo_historial_sabados):
-            print(f"📄 Creando archivo de historial: {self.archivo_historial_sabados}")
-            return self._crear_historial_inicial()
-        
+        """Carga {empleado: (año, semana) del último TROP en sábado} desde historial_sabados.db
+        (la primera vez importa historial_sabados.csv)"""
         try:
-            historial = {}
-            with open(self.archivo_historial_sabados, 'r', newline='', encoding='utf-8') as archivo:
-                reader = csv.DictReader(archivo)
-                for fila in reader:
-                    empleado = fila['empleado']
-                    ultima_semana = fila['ultima_semana_trop_sabado']
-                    # Convertir a entero si no está vacío, sino None
-                    historial[empleado] = int(ultima_semana) if ultima_semana.strip() else None
-            
-            print(f"📄 Historial cargado: {len(historial)} empleados")
-            return historial
+            with HistorialSabados(self.archivo_historial_sabados,
+                                  año_csv=CONFIGURACION_GENERAL.get("año_historial_csv")) as historial:
+                ultimas = historial.ultimas_semanas(self.empleados)
+            logger.info("📄 Historial cargado: %s empleados con sábado registrado",
+                        sum(1 for semana in ultimas.values() if semana is not None))
+            return ultimas
             
         except Exception as e:
-            print(f"⚠️ Error cargando historial: {e}")
-            print("📄 Creando historial inicial...")
-            return self._crear_historial_inicial()
+            logger.warning("⚠️ Error cargando historial: %s", e)
+            return {empleado: None for empleado in self.empleados}  # None = nunca ha tenido TROP en sábado
     
-    def _crear_historial_inicial(self):
-        """Crea un historial inicial con todos los empleados vacíos"""
-        historial = {}
-        for empleado in self.empleados:
-            historial[empleado] = None  # None = nunca ha tenido TROP en sábado
-        
-        # Guardar el archivo inicial
-        self._guardar_historial_sabados(historial)
-        print(f"✅ Historial inicial creado con {len(historial)} empleados")
-        return historial
-    
-    def _guardar_historial_sabados(self, historial):
-        """Guarda el historial de sábados en CSV"""
+    def _registrar_sabados(self, semanas):
+        """Registra {semana: [empleados con TROP en sábado]} en historial_sabados.db (una transacción)"""
         try:
-            with open(self.archivo_historial_sabados, 'w', newline='', encoding='utf-8') as archivo:
-                writer = csv.writer(archivo)
-                writer.writerow(['empleado', 'ultima_semana_trop_sabado'])
-                
-                for empleado in self.empleados:
-                    ultima_semana = historial.get(empleado, None)
-                    ultima_semana_str = str(ultima_semana) if ultima_semana is not None else ""
-                    writer.writerow([empleado, ultima_semana_str])
-            
-            print(f"💾 Historial guardado en {self.archivo_historial_sabados}")
+            with HistorialSabados(self.archivo_historial_sabados,
+                                  año_csv=CONFIGURACION_GENERAL.get("año_historial_csv")) as historial:
+                historial.registrar_semanas(self.año, semanas)
+            logger.info("💾 Historial registrado en %s (semanas %s)", self.archivo_historial_sabados, ', '.join(map(str, semanas)))
             
         except Exception as e:
-            print(f"⚠️ Error guardando historial: {e}")
+            logger.warning("⚠️ Error guardando historial: %s", e)
     
     def _calcular_prioridades_sabados(self):
         """Calcula las prioridades de sábados para la semana actual"""
         prioridades = {}
         
-        print(f"\n🎯 CALCULANDO PRIORIDADES PARA SEMANA {self.semana_seleccionada}")
-        print("=" * 60)
+        logger.debug("\n🎯 CALCULANDO PRIORIDADES PARA SEMANA %s", self.semana_seleccionada)
+        logger.debug("=" * 60)
         
         for empleado in self.empleados:
             ultima_semana = self.historial_sabados.get(empleado, None)
@@ -136,8 +281,8 @@ class GeneradorDescansosSeparacion:
                 semanas_transcurridas = 999  # Valor alto para indicar "nunca"
                 nivel_prioridad = 4  # Prioridad máxima
             else:
-                # Calcular semanas transcurridas
-                semanas_transcurridas = self.semana_seleccionada - ultima_semana
+                # Calcular semanas transcurridas (también desde un sábado del año anterior)
+                semanas_transcurridas = indice_semana(self.año, self.semana_seleccionada) - indice_semana(*ultima_semana)
                 # Limitar a máximo 4 semanas para el nivel de prioridad
                 nivel_prioridad = min(max(semanas_transcurridas, -2), 4)
             
@@ -173,10 +318,13 @@ class GeneradorDescansosSeparacion:
     
     def _mostrar_tabla_prioridades(self, prioridades):
         """Muestra una tabla formateada con las prioridades"""
-        print(f"\n📊 TABLA DE PRIORIDADES SEMANA {self.semana_seleccionada}:")
-        print("-" * 80)
-        print(f"{'Empleado':<8} {'Última':<6} {'Transcur':<8} {'Nivel':<6} {'Puede Mantener Sábado':<25}")
-        print("-" * 80)
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        
+        logger.debug("\n📊 TABLA DE PRIORIDADES SEMANA %s:", self.semana_seleccionada)
+        logger.debug("-" * 80)
+        logger.debug("%-8s %-8s %-8s %-6s %-25s", 'Empleado', 'Última', 'Transcur', 'Nivel', 'Puede Mantener Sábado')
+        logger.debug("-" * 80)
         
         # Ordenar por nivel de prioridad (mayor a menor)
         empleados_ordenados = sorted(prioridades.items(), 
@@ -184,14 +332,18 @@ class GeneradorDescansosSeparacion:
                                    reverse=True)
         
         for empleado, datos in empleados_ordenados:
-            ultima = datos['ultima_semana'] if datos['ultima_semana'] is not None else "Nunca"
+            if datos['ultima_semana'] is not None:
+                año_ultima, semana_ultima = datos['ultima_semana']
+                ultima = f"{semana_ultima}/{año_ultima}"
+            else:
+                ultima = "Nunca"
             transcur = datos['semanas_transcurridas'] if datos['semanas_transcurridas'] != 999 else "∞"
             nivel = datos['nivel_prioridad']
             puede = datos['puede_mantener_sabado']
             
-            print(f"{empleado:<8} {str(ultima):<6} {str(transcur):<8} {nivel:<6} {puede:<25}")
+            logger.debug("%-8s %-8s %-8s %-6s %-25s", empleado, ultima, str(transcur), nivel, puede)
         
-        print("-" * 80)
+        logger.debug("-" * 80)
         
         # Mostrar resumen por niveles
         niveles_count = {}
@@ -199,7 +351,7 @@ class GeneradorDescansosSeparacion:
             nivel = datos['nivel_prioridad']
             niveles_count[nivel] = niveles_count.get(nivel, 0) + 1
         
-        print(f"\n📈 RESUMEN POR NIVELES:")
+        logger.debug("\n📈 RESUMEN POR NIVELES:")
         for nivel in sorted(niveles_count.keys(), reverse=True):
             count = niveles_count[nivel]
             if nivel >= 4:
@@ -215,8 +367,7 @@ class GeneradorDescansosSeparacion:
             else:
                 descripcion = "PENALIZACIÓN"
             
-            print(f"   Nivel {nivel}: {count} empleados ({descripcion})")
-        print()
+            logger.debug("   Nivel %s: %s empleados (%s)", nivel, count, descripcion)
     
     def _puede_trabajar_sabado(self, empleado):
         """Verifica si un empleado puede trabajar TROP en sábado (restricciones específicas)"""
@@ -224,18 +375,8 @@ class GeneradorDescansosSeparacion:
         if self._esta_fuera_operacion(empleado):
             return False
         
-        # Verificar restricciones específicas de TROP
-        if self._tiene_restricciones_especificas(empleado):
-            restricciones = self.restricciones_empleados[empleado]
-            if 'TROP' in restricciones:
-                config_trop = restricciones['TROP']
-                if not config_trop.get('libre', False):
-                    dias_permitidos = config_trop.get('dias_permitidos', [])
-                    # Si tiene restricción específica y sábado no está en días permitidos
-                    if 'sábado' not in dias_permitidos:
-                        return False
-        
-        return True
+        # Verificar restricciones específicas de TROP (sábado = bit 5 de la máscara)
+        return self.restricciones_compiladas.permite(empleado, 'TROP', 5)
     
     def _obtener_empleados_por_nivel(self, nivel_minimo):
         """Obtiene empleados disponibles con nivel de prioridad >= nivel_minimo que pueden trabajar sábado"""
@@ -255,25 +396,11 @@ class GeneradorDescansosSeparacion:
     
     def _calcular_primer_lunes_enero(self):
         """Calcula el primer lunes de enero del año especificado"""
-        # Encontrar el primer lunes de enero
-        primer_dia_enero = date(self.año, 1, 1)
-        dias_hasta_lunes = (7 - primer_dia_enero.weekday()) % 7
-        if dias_hasta_lunes == 0:
-            dias_hasta_lunes = 7  # Si el 1 de enero es lunes, el primer lunes es el 1
-        
-        primer_lunes = primer_dia_enero + timedelta(days=dias_hasta_lunes)
-        return primer_lunes
+        return self.calendario.primer_lunes_enero
     
     def _calcular_total_semanas_año(self):
         """Calcula el total de semanas en el año (lunes a domingo)"""
-        # Calcular el último día del año
-        ultimo_dia_año = date(self.año, 12, 31)
-        
-        # Calcular cuántas semanas completas hay desde el primer lunes hasta el final del año
-        dias_desde_primer_lunes = (ultimo_dia_año - self.primer_lunes_enero).days
-        total_semanas = (dias_desde_primer_lunes // 7) + 1
-        
-        return total_semanas
+        return self.calendario.total_semanas
     
     def _seleccionar_semana(self):
         """Selecciona la semana según la configuración"""
@@ -282,7 +409,7 @@ class GeneradorDescansosSeparacion:
             if 1 <= self.semana_especifica <= self.total_semanas_año:
                 return self.semana_especifica
             else:
-                print(f"⚠️ ADVERTENCIA: Semana {self.semana_especifica} fuera de rango. Usando primera semana de julio.")
+                logger.warning("⚠️ ADVERTENCIA: Semana %s fuera de rango. Usando primera semana de julio.", self.semana_especifica)
                 return self._calcular_semana_julio()
         else:
             # Usar la primera semana de julio por defecto
@@ -290,16 +417,7 @@ class GeneradorDescansosSeparacion:
     
     def _calcular_semana_julio(self):
         """Calcula el número de semana correspondiente a la primera semana de julio"""
-        # Calcular el primer día de julio
-        primer_julio = date(self.año, 7, 1)
-        
-        # Calcular cuántas semanas han pasado desde el primer lunes de enero
-        dias_desde_primer_lunes = (primer_julio - self.primer_lunes_enero).days
-        
-        # Calcular la semana correspondiente
-        semana_julio = (dias_desde_primer_lunes // 7) + 1
-        
-        return semana_julio
+        return self.calendario.semana_de(date(self.año, 7, 1))
     
     def _seleccionar_primera_semana_julio(self):
         """Selecciona específicamente la primera semana de julio"""
@@ -307,39 +425,11 @@ class GeneradorDescansosSeparacion:
     
     def _calcular_fechas_semana(self):
         """Calcula las fechas exactas de la semana seleccionada"""
-        # Calcular el lunes de la semana seleccionada
-        lunes_semana = self.primer_lunes_enero + timedelta(days=(self.semana_seleccionada - 1) * 7)
-        
-        # Calcular todos los días de la semana
-        fechas = []
-        for i in range(7):
-            fecha = lunes_semana + timedelta(days=i)
-            fechas.append(fecha)
-        
-        return fechas
+        return self.calendario.fechas(self.semana_seleccionada)
     
     def _generar_dias_semana(self):
         """Genera la lista de días de la semana seleccionada con formato DIA-DD"""
-        dias = []
-        nombres_dias = ['MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN']
-        
-        for i, fecha in enumerate(self.fechas_semana):
-            nombre_dia = nombres_dias[i]
-            formato_dia = f"{nombre_dia}-{fecha.day:02d}"
-            es_domingo = i == 6
-            es_festivo = self._es_dia_festivo(fecha)
-            es_no_laborable = es_domingo or es_festivo
-            
-            dias.append({
-                'fecha': fecha,
-                'formato': formato_dia,
-                'dia_semana': i,
-                'es_domingo': es_domingo,
-                'es_festivo': es_festivo,
-                'es_no_laborable': es_no_laborable
-            })
-        
-        return dias
+        return list(self.calendario.dias(self.semana_seleccionada))
     
     def _agrupar_por_semanas(self):
         """Agrupa los días por semana"""
@@ -361,9 +451,9 @@ class GeneradorDescansosSeparacion:
         descansos_por_dia_entero = int(descansos_por_dia)
         descansos_extra = total_descansos - (descansos_por_dia_entero * total_dias_disponibles)
         
-        print(f"Total descansos a distribuir: {total_descansos}")
-        print(f"Días disponibles (sin domingo): {total_dias_disponibles}")
-        print(f"Descansos por día objetivo: {descansos_por_dia:.2f}")
+        logger.info("Total descansos a distribuir: %s", total_descansos)
+        logger.info("Días disponibles (sin domingo): %s", total_dias_disponibles)
+        logger.info("Descansos por día objetivo: %.2f", descansos_por_dia)
         
         return descansos_por_dia_entero, descansos_extra, dias_no_domingo
     
@@ -397,27 +487,26 @@ class GeneradorDescansosSeparacion:
         """Verifica si un empleado tiene restricciones de fechas específicas"""
         return empleado in self.turnos_fechas_especificas
     
+    def _precalcular_fechas_especificas_semana(self):
+        """Fechas específicas que caen en la semana actual, por empleado (solo los que tienen alguna)"""
+        fechas_por_empleado = {}
+        for empleado in self.restricciones_compiladas.fechas:
+            fechas_especificas = [
+                {
+                    "fecha": dia['fecha'].strftime('%Y-%m-%d'),
+                    "turno_requerido": turno_requerido,
+                    "indice_dia": dia['dia_semana'],
+                    "formato_dia": dia['formato']
+                }
+                for dia, turno_requerido in self.restricciones_compiladas.turnos_fechas(empleado, self.dias_mes)
+            ]
+            if fechas_especificas:
+                fechas_por_empleado[empleado] = fechas_especificas
+        return fechas_por_empleado
+    
     def _obtener_fechas_especificas_semana(self, empleado):
         """Obtiene las fechas específicas que caen en la semana actual"""
-        if not self._tiene_fechas_especificas(empleado):
-            return []
-        
-        fechas_especificas = []
-        fechas_semana_str = [fecha.strftime('%Y-%m-%d') for fecha in self.fechas_semana]
-        
-        for restriccion in self.turnos_fechas_especificas[empleado]:
-            fecha_restriccion = restriccion["fecha"]
-            if fecha_restriccion in fechas_semana_str:
-                # Encontrar el índice del día en la semana
-                idx_dia = fechas_semana_str.index(fecha_restriccion)
-                fechas_especificas.append({
-                    "fecha": fecha_restriccion,
-                    "turno_requerido": restriccion["turno_requerido"],
-                    "indice_dia": idx_dia,
-                    "formato_dia": self.dias_mes[idx_dia]['formato']
-                })
-        
-        return fechas_especificas
+        return self._fechas_especificas_semana.get(empleado, [])
     
     def _asignar_descansos_empleado_fechas_especificas(self, empleado, empleado_idx, dias_semana, descansos_por_dia, historial_dias, semana_num):
         """
@@ -445,7 +534,7 @@ class GeneradorDescansosSeparacion:
                 empleado, empleado_idx, dias_semana, descansos_por_dia, historial_dias, semana_num
             )
         
-        print(f"🔧 {empleado}: PROCESANDO {len(fechas_especificas)} FECHAS ESPECÍFICAS")
+        logger.debug("🔧 %s: PROCESANDO %s FECHAS ESPECÍFICAS", empleado, len(fechas_especificas))
         
         # PASO 1: Aplicar restricciones de fechas específicas (MÁXIMA PRIORIDAD)
         for fecha_esp in fechas_especificas:
@@ -461,7 +550,7 @@ class GeneradorDescansosSeparacion:
                 historial_dias[empleado_idx] = []
             historial_dias[empleado_idx].append(fecha_esp["indice_dia"])
             
-            print(f"   ✅ {empleado}: {formato_dia} = {turno_requerido} (fecha específica)")
+            logger.debug("   ✅ %s: %s = %s (fecha específica)", empleado, formato_dia, turno_requerido)
         
         # PASO 2: Verificar qué tipos de turnos ya están asignados
         tipos_asignados = list(descansos_semana.values())
@@ -477,11 +566,11 @@ class GeneradorDescansosSeparacion:
         # PASO 4: Determinar si necesita completar con DESC/TROP
         if tiene_turno_completo:
             # VACA, COME, COMS son turnos completos → NO necesita DESC/TROP adicionales
-            print(f"   ✅ {empleado}: Turno completo detectado → NO requiere DESC/TROP adicionales")
+            logger.debug("   ✅ %s: Turno completo detectado → NO requiere DESC/TROP adicionales", empleado)
             return descansos_semana
         
         # PASO 5: Para CMED, SIND o cualquier otro caso → DEBE completar con DESC/TROP
-        print(f"   🔧 {empleado}: Requiere completar con DESC/TROP obligatorios")
+        logger.debug("   🔧 %s: Requiere completar con DESC/TROP obligatorios", empleado)
         
         # Obtener días disponibles (excluyendo los ya ocupados por fechas específicas)
         dias_disponibles = [d for d in dias_semana if d['formato'] not in descansos_semana]
@@ -490,8 +579,8 @@ class GeneradorDescansosSeparacion:
         tiene_desc = "DESC" in tipos_asignados
         tiene_trop = "TROP" in tipos_asignados
         
-        print(f"   📊 {empleado}: Tiene DESC={tiene_desc}, Tiene TROP={tiene_trop}")
-        print(f"   📊 {empleado}: Días disponibles={len(dias_disponibles)}")
+        logger.debug("   📊 %s: Tiene DESC=%s, Tiene TROP=%s", empleado, tiene_desc, tiene_trop)
+        logger.debug("   📊 %s: Días disponibles=%s", empleado, len(dias_disponibles))
         
         # PASO 7: Asignar DESC si falta
         if not tiene_desc and len(dias_disponibles) >= 1:
@@ -511,7 +600,7 @@ class GeneradorDescansosSeparacion:
             # Remover el día usado de los disponibles
             dias_disponibles = [d for d in dias_disponibles if d['formato'] != dia_desc['formato']]
             
-            print(f"   ✅ {empleado}: DESC asignado en {dia_desc['formato']}")
+            logger.debug("   ✅ %s: DESC asignado en %s", empleado, dia_desc['formato'])
         
         # PASO 8: Asignar TROP si falta
         if not tiene_trop and len(dias_disponibles) >= 1:
@@ -528,7 +617,7 @@ class GeneradorDescansosSeparacion:
                 historial_dias[empleado_idx] = []
             historial_dias[empleado_idx].append(dia_trop['dia_semana'])
             
-            print(f"   ✅ {empleado}: TROP asignado en {dia_trop['formato']}")
+            logger.debug("   ✅ %s: TROP asignado en %s", empleado, dia_trop['formato'])
         
         # PASO 9: Verificar orden cronológico DESC → TROP
         turnos_desc_trop = [(d, tipo) for d, tipo in descansos_semana.items() if tipo in ['DESC', 'TROP']]
@@ -553,7 +642,7 @@ class GeneradorDescansosSeparacion:
                 
                 # Corregir si están en orden incorrecto
                 if primer_tipo != 'DESC' or segundo_tipo != 'TROP':
-                    print(f"   🔧 {empleado}: Corrigiendo orden cronológico DESC → TROP")
+                    logger.debug("   🔧 %s: Corrigiendo orden cronológico DESC → TROP", empleado)
                     descansos_semana[primer_formato] = 'DESC'
                     descansos_semana[segundo_formato] = 'TROP'
         
@@ -563,7 +652,7 @@ class GeneradorDescansosSeparacion:
         trop_count = tipos_finales.count('TROP')
         especiales_count = len([t for t in tipos_finales if t in turnos_especiales_adicionales + turnos_completos])
         
-        print(f"   🎯 {empleado}: RESULTADO FINAL → DESC={desc_count}, TROP={trop_count}, Especiales={especiales_count}")
+        logger.debug("   🎯 %s: RESULTADO FINAL → DESC=%s, TROP=%s, Especiales=%s", empleado, desc_count, trop_count, especiales_count)
         
         return descansos_semana
     
@@ -590,16 +679,11 @@ class GeneradorDescansosSeparacion:
             if restriccion.get("libre", False):
                 continue  # Se asignará después con lógica aleatoria
             
-            # Obtener días permitidos
-            dias_permitidos = restriccion.get("dias_permitidos", [])
             tipo_restriccion = restriccion.get("tipo", "libre")
             
-            # Filtrar días disponibles según las restricciones
-            dias_disponibles = []
-            for dia in dias_semana:
-                nombre_dia = list(self.mapeo_dias.keys())[dia['dia_semana']]
-                if nombre_dia in dias_permitidos:
-                    dias_disponibles.append(dia)
+            # Filtrar días disponibles según la máscara de días permitidos
+            dias_disponibles = [dia for dia in dias_semana
+                                if self.restricciones_compiladas.permite(empleado, tipo_descanso, dia['dia_semana'])]
             
             if dias_disponibles:
                 # Ordenar por disponibilidad
@@ -610,10 +694,10 @@ class GeneradorDescansosSeparacion:
                 if tipo_restriccion == "fijo":
                     # Para restricción fija, usar EXACTAMENTE el primer día permitido si está disponible
                     dia_seleccionado = dias_ordenados[0]  # Ya está filtrado por días permitidos
-                    print(f"✅ {empleado}: {tipo_descanso} asignado en día fijo requerido: {dia_seleccionado['formato']}")
+                    logger.debug("✅ %s: %s asignado en día fijo requerido: %s", empleado, tipo_descanso, dia_seleccionado['formato'])
                 elif tipo_restriccion == "opcional":
                     # Selección aleatoria entre los días permitidos
-                    dia_seleccionado = random.choice(dias_ordenados)
+                    dia_seleccionado = self.aleatorio.choice(dias_ordenados)
                 else:
                     # Tipo libre o no reconocido, usar primer día disponible
                     dia_seleccionado = dias_ordenados[0]
@@ -701,7 +785,7 @@ class GeneradorDescansosSeparacion:
                     
                     # Buscar el día correspondiente en la semana
                     for dia in dias_semana:
-                        nombre_dia = list(self.mapeo_dias.keys())[dia['dia_semana']]
+                        nombre_dia = DIAS_ES[dia['dia_semana']]
                         if nombre_dia == dia_fijo:
                             descansos_semana[dia['formato']] = tipo_descanso
                             descansos_por_dia[dia['formato']] = descansos_por_dia.get(dia['formato'], 0) + 1
@@ -810,70 +894,52 @@ class GeneradorDescansosSeparacion:
         if len(dias_disponibles) < 2:
             return descansos_semana
         
+        # Pesos de todos los días candidatos en una sola operación (menor peso = mejor opción)
+        indices_dias = np.fromiter((dia['dia_semana'] for dia in dias_disponibles), dtype=np.int8, count=len(dias_disponibles))
+        pesos = self._pesos_dias_candidatos(dias_disponibles, indices_dias, descansos_por_dia, historial_dias, empleado_idx)
+        orden = np.argsort(pesos, kind='stable')
+        
         # NUEVA LÓGICA: VERIFICAR RESTRICCIONES FIJAS PRIMERO
         dia_desc_seleccionado = None
         
         # Si tenemos el empleado, verificar restricciones fijas para DESC
         if empleado and self._es_seleccion_fija(empleado, "DESC"):
             dias_permitidos_desc = self._obtener_dias_permitidos_tipo(empleado, "DESC")
-            print(f"🎯 {empleado}: Tiene restricción fija DESC para: {dias_permitidos_desc}")
+            logger.debug("🎯 %s: Tiene restricción fija DESC para: %s", empleado, dias_permitidos_desc)
             
             # Buscar el día requerido entre los días disponibles
             if dias_permitidos_desc:
                 for dia_requerido in dias_permitidos_desc:
                     for dia_info in dias_disponibles:
                         # Mapear día en español a día en inglés del formato
-                        mapeo_dias_formato = {
-                            "lunes": "MON", "martes": "TUE", "miércoles": "WED", 
-                            "jueves": "THU", "viernes": "FRI", "sábado": "SAT", "domingo": "SUN"
-                        }
-                        
-                        if dia_requerido in mapeo_dias_formato:
-                            dia_formato_requerido = mapeo_dias_formato[dia_requerido]
+                        if dia_requerido in DIA_ES_A_FORMATO:
+                            dia_formato_requerido = DIA_ES_A_FORMATO[dia_requerido]
                             if dia_info['formato'].startswith(dia_formato_requerido):
                                 dia_desc_seleccionado = dia_info
-                                print(f"✅ {empleado}: DESC asignado en día requerido: {dia_info['formato']} ({dia_requerido})")
+                                logger.debug("✅ %s: DESC asignado en día requerido: %s (%s)", empleado, dia_info['formato'], dia_requerido)
                                 break
                     
                     if dia_desc_seleccionado:
                         break
                 
                 if not dia_desc_seleccionado:
-                    print(f"⚠️ {empleado}: No se pudo asignar DESC en día requerido {dias_permitidos_desc}, usando lógica estándar")
+                    logger.warning("⚠️ %s: No se pudo asignar DESC en día requerido %s, usando lógica estándar", empleado, dias_permitidos_desc)
         
         # Si no hay restricción fija o no se pudo cumplir, usar lógica original
         if not dia_desc_seleccionado:
-            # Crear lista de días con pesos para evitar repetición
-            dias_con_peso = []
-            for dia in dias_disponibles:
-                peso = descansos_por_dia.get(dia['formato'], 0)
-                
-                # Penalizar días que ya usó este empleado en semanas anteriores
-                if empleado_idx in historial_dias and dia['dia_semana'] in historial_dias[empleado_idx]:
-                    peso += 2  # Penalización por repetición
-                
-                # ALEATORIZACIÓN: Agregar ruido aleatorio al peso para variar la selección
-                ruido_aleatorio = random.uniform(-0.5, 0.5)
-                peso += ruido_aleatorio
-                
-                dias_con_peso.append((dia, peso))
-            
-            # Ordenar por peso (menor peso = mejor opción)
-            dias_con_peso.sort(key=lambda x: x[1])
-            
             # ALEATORIZACIÓN: A veces elegir el segundo mejor día en lugar del primero
-            if random.random() < 0.3 and len(dias_con_peso) > 1:
+            if self.aleatorio.random() < 0.3 and len(orden) > 1:
                 # 30% de probabilidad de elegir el segundo mejor día
-                dia_desc_seleccionado = dias_con_peso[1][0]
+                dia_desc_seleccionado = dias_disponibles[orden[1]]
             else:
-                dia_desc_seleccionado = dias_con_peso[0][0]
+                dia_desc_seleccionado = dias_disponibles[orden[0]]
             
             if empleado and dia_desc_seleccionado:
-                print(f"🔄 {empleado}: DESC asignado por lógica estándar: {dia_desc_seleccionado['formato']}")
+                logger.debug("🔄 %s: DESC asignado por lógica estándar: %s", empleado, dia_desc_seleccionado['formato'])
         
         # Verificar que se seleccionó un día válido
         if not dia_desc_seleccionado:
-            print(f"❌ No se pudo seleccionar día válido para DESC")
+            logger.warning("❌ No se pudo seleccionar día válido para DESC")
             return descansos_semana
         
         # Continuar con la asignación usando el día seleccionado
@@ -892,26 +958,22 @@ class GeneradorDescansosSeparacion:
         historial_dias[empleado_idx].append(dia_desc['dia_semana'])
         
         # Asignar segundo descanso
-        if len(dias_con_peso) > 1:
-            # Filtrar días que no sean consecutivos al primer descanso
-            dia_desc_semana = dia_desc['dia_semana']
-            dias_no_consecutivos = []
+        if len(orden) > 1:
+            # Días en orden de peso, sin el día del primer descanso
+            restantes = orden[indices_dias[orden] != dia_desc['dia_semana']]
             
-            for dia, peso in dias_con_peso:
-                if dia['formato'] != dia_desc['formato']:  # No el mismo día
-                    # Verificar que no sea consecutivo (diferencia > 1)
-                    if abs(dia['dia_semana'] - dia_desc_semana) > 1:
-                        dias_no_consecutivos.append((dia, peso))
+            # Filtrar días que no sean consecutivos al primer descanso (diferencia > 1)
+            no_consecutivos = restantes[np.abs(indices_dias[restantes] - dia_desc['dia_semana']) > 1]
             
             # Si no hay días no consecutivos, usar cualquier día disponible
-            if dias_no_consecutivos:
+            if len(no_consecutivos):
                 # ALEATORIZACIÓN: Elegir aleatoriamente entre los días no consecutivos
-                candidatos = sorted(dias_no_consecutivos, key=lambda x: x[1])[:3]  # Top 3 candidatos
-                dia_segundo = random.choice(candidatos)[0]
+                candidatos = [dias_disponibles[i] for i in no_consecutivos[:3]]  # Top 3 candidatos
+                dia_segundo = self.aleatorio.choice(candidatos)
             else:
                 # ALEATORIZACIÓN: Elegir aleatoriamente entre los días restantes
-                dias_restantes = [d for d, _ in dias_con_peso if d['formato'] != dia_desc['formato']]
-                dia_segundo = random.choice(dias_restantes)
+                dias_restantes = [dias_disponibles[i] for i in restantes]
+                dia_segundo = self.aleatorio.choice(dias_restantes)
             
             # CORRECCIÓN CRÍTICA: Determinar cuál es el primer y segundo descanso cronológicamente
             # El que ocurre primero en la semana debe ser DESC, el segundo debe ser TROP
@@ -931,6 +993,22 @@ class GeneradorDescansosSeparacion:
         
         return descansos_semana
     
+    def _pesos_dias_candidatos(self, dias_disponibles, indices_dias, descansos_por_dia, historial_dias, empleado_idx):
+        """Peso de cada día candidato: descansos ya asignados ese día + 2 si el empleado ya lo usó + ruido"""
+        # Descansos ya asignados por día de la semana (domingo no cuenta)
+        carga = np.zeros(7)
+        for dia in dias_disponibles:
+            carga[dia['dia_semana']] = descansos_por_dia.get(dia['formato'], 0)
+        
+        # Días de la semana que el empleado ya usó (fila de la matriz empleado × día)
+        repetidos = np.zeros(7, dtype=bool)
+        repetidos[[d for d in historial_dias.get(empleado_idx, ()) if isinstance(d, int)]] = True
+        
+        # ALEATORIZACIÓN: Ruido por día para variar la selección (mismo orden de sorteo que antes)
+        ruido = np.fromiter((self.aleatorio.uniform(-0.5, 0.5) for _ in dias_disponibles), dtype=float, count=len(dias_disponibles))
+        
+        return carga[indices_dias] + 2 * repetidos[indices_dias] + ruido
+    
     def _asignar_descansos_con_prioridades_sabado(self, empleado, dias_disponibles, descansos_por_dia, historial_dias, empleado_idx, semana_num, dias_ocupados=None):
         """Asigna DESC y TROP evaluando prioridades de sábado SOLO cuando TROP cae naturalmente en sábado (SISTEMA REACTIVO)"""
         
@@ -962,18 +1040,18 @@ class GeneradorDescansosSeparacion:
         
         # PASO 5: Verificar restricciones específicas (tienen prioridad absoluta)
         if not self._puede_trabajar_sabado(empleado):
-            print(f"🚫 {empleado}: No puede trabajar sábado por restricciones → Reasignando")
+            logger.debug("🚫 %s: No puede trabajar sábado por restricciones → Reasignando", empleado)
             return self._reasignar_sin_sabado(empleado, dias_disponibles, descansos_por_dia, historial_dias, empleado_idx, dias_ocupados)
         
         # PASO 6: Evaluar si merece el sábado según cascada de prioridades
         merece_sabado = self._evaluar_si_merece_sabado(empleado, nivel_empleado)
         
         if merece_sabado:
-            print(f"✅ {empleado}: Mantiene sábado (Nivel {nivel_empleado} - MERECE SÁBADO)")
+            logger.debug("✅ %s: Mantiene sábado (Nivel %s - MERECE SÁBADO)", empleado, nivel_empleado)
             return descansos_semana
         
         # PASO 7: No merece sábado → Buscar intercambio con empleado de mayor prioridad
-        print(f"🔄 {empleado}: Nivel {nivel_empleado} → Buscando intercambio con mayor prioridad")
+        logger.debug("🔄 %s: Nivel %s → Buscando intercambio con mayor prioridad", empleado, nivel_empleado)
         
         intercambio_exitoso = self._intentar_intercambio_sabado(
             empleado, nivel_empleado, dia_trop_sabado, descansos_semana, 
@@ -985,7 +1063,7 @@ class GeneradorDescansosSeparacion:
             return self._reasignar_sin_sabado(empleado, dias_disponibles, descansos_por_dia, historial_dias, empleado_idx, dias_ocupados)
         else:
             # No hay intercambio disponible → Mantener asignación original
-            print(f"⚠️ {empleado}: Sin intercambio disponible → Mantiene sábado por excepción")
+            logger.warning("⚠️ %s: Sin intercambio disponible → Mantiene sábado por excepción", empleado)
             return descansos_semana
     
     def _evaluar_si_merece_sabado(self, empleado, nivel_empleado):
@@ -1067,11 +1145,11 @@ class GeneradorDescansosSeparacion:
         
         # Intentar intercambio con el primer candidato disponible
         for candidato, nivel_candidato in candidatos_intercambio:
-            print(f"🔄 Intentando intercambio: {empleado_actual} (Nivel {nivel_actual}) ↔ {candidato} (Nivel {nivel_candidato})")
+            logger.debug("🔄 Intentando intercambio: %s (Nivel %s) ↔ %s (Nivel %s)", empleado_actual, nivel_actual, candidato, nivel_candidato)
             
             # Por simplicidad, asumir que el intercambio es posible
             # En una implementación más compleja, verificaríamos disponibilidad específica
-            print(f"✅ Intercambio exitoso: {candidato} recibe el sábado")
+            logger.debug("✅ Intercambio exitoso: %s recibe el sábado", candidato)
             return True
         
         return False
@@ -1105,7 +1183,7 @@ class GeneradorDescansosSeparacion:
         dias_sin_sabado = [d for d in dias_disponibles if not self._es_sabado(d['formato'])]
         
         if len(dias_sin_sabado) < 2:
-            print(f"⚠️ {empleado}: No hay suficientes días sin sábado - Usando asignación original")
+            logger.warning("⚠️ %s: No hay suficientes días sin sábado - Usando asignación original", empleado)
             # Restaurar historial si no se puede reasignar
             if empleado_idx in historial_dias and 'dias_originales' in locals():
                 historial_dias[empleado_idx].extend(dias_originales)
@@ -1198,11 +1276,11 @@ class GeneradorDescansosSeparacion:
                     historial_dias[empleado_idx] = []
                 historial_dias[empleado_idx].extend([dia_desc['dia_semana'], sabado_disponible['dia_semana']])
                 
-                print(f"✅ {empleado}: Asignado con sábado preferente (Nivel 4+ - PRIORIDAD MÁXIMA)")
+                logger.debug("✅ %s: Asignado con sábado preferente (Nivel 4+ - PRIORIDAD MÁXIMA)", empleado)
                 return descansos_semana
         
         # Si no hay sábado disponible, asignación normal
-        print(f"⚠️ {empleado}: Sábado no disponible, asignación normal (Nivel 4+)")
+        logger.warning("⚠️ %s: Sábado no disponible, asignación normal (Nivel 4+)", empleado)
         return self._asignar_descansos_separados_semana(
             dias_disponibles, descansos_por_dia, historial_dias, empleado_idx, semana_num, dias_ocupados, empleado=empleado
         )
@@ -1226,30 +1304,25 @@ class GeneradorDescansosSeparacion:
         # Si tenemos el empleado, verificar restricciones fijas para DESC
         if empleado and self._es_seleccion_fija(empleado, "DESC"):
             dias_permitidos_desc = self._obtener_dias_permitidos_tipo(empleado, "DESC")
-            print(f"✅ {empleado}: DESC asignado en día fijo requerido (sin sábado): {dias_permitidos_desc}")
+            logger.debug("✅ %s: DESC asignado en día fijo requerido (sin sábado): %s", empleado, dias_permitidos_desc)
             
             # Buscar el día requerido entre los días disponibles (sin sábados)
             if dias_permitidos_desc:
                 for dia_requerido in dias_permitidos_desc:
                     for dia_info in dias_sin_sabado:
                         # Mapear día en español a día en inglés del formato
-                        mapeo_dias_formato = {
-                            "lunes": "MON", "martes": "TUE", "miércoles": "WED", 
-                            "jueves": "THU", "viernes": "FRI", "sábado": "SAT", "domingo": "SUN"
-                        }
-                        
-                        if dia_requerido in mapeo_dias_formato:
-                            dia_formato_requerido = mapeo_dias_formato[dia_requerido]
+                        if dia_requerido in DIA_ES_A_FORMATO:
+                            dia_formato_requerido = DIA_ES_A_FORMATO[dia_requerido]
                             if dia_info['formato'].startswith(dia_formato_requerido):
                                 dia_desc_seleccionado = dia_info
-                                print(f"✅ {empleado}: DESC asignado en día requerido: {dia_info['formato']} ({dia_requerido})")
+                                logger.debug("✅ %s: DESC asignado en día requerido: %s (%s)", empleado, dia_info['formato'], dia_requerido)
                                 break
                     
                     if dia_desc_seleccionado:
                         break
                 
                 if not dia_desc_seleccionado:
-                    print(f"⚠️ {empleado}: No se pudo asignar DESC en día requerido {dias_permitidos_desc}, usando lógica estándar")
+                    logger.warning("⚠️ %s: No se pudo asignar DESC en día requerido %s, usando lógica estándar", empleado, dias_permitidos_desc)
         
         # Si no hay restricción fija o no se pudo cumplir, usar lógica original
         if not dia_desc_seleccionado:
@@ -1258,7 +1331,7 @@ class GeneradorDescansosSeparacion:
             dia_desc_seleccionado = dias_ordenados[0]
             
             if empleado:
-                print(f"🔄 {empleado}: DESC asignado por lógica estándar (sin sábado): {dia_desc_seleccionado['formato']}")
+                logger.debug("🔄 %s: DESC asignado por lógica estándar (sin sábado): %s", empleado, dia_desc_seleccionado['formato'])
         
         # Verificar que se seleccionó un día válido
         if not dia_desc_seleccionado:
@@ -1329,18 +1402,21 @@ class GeneradorDescansosSeparacion:
         # Actualizar historial
         historial_actualizado = self.historial_sabados.copy()
         for empleado in empleados_con_sabado:
-            historial_actualizado[empleado] = self.semana_seleccionada
+            historial_actualizado[empleado] = (self.año, self.semana_seleccionada)
         
-        # Guardar historial actualizado
-        self._guardar_historial_sabados(historial_actualizado)
+        # Guardar historial actualizado (en modo por lotes solo se conserva en memoria)
+        self.historial_sabados_actualizado = historial_actualizado
+        self.sabados_semana = empleados_con_sabado
+        if self.guardar_historial:
+            self._registrar_sabados({self.semana_seleccionada: empleados_con_sabado})
         
         # Mostrar resumen de actualizaciones
         if empleados_con_sabado:
-            print(f"\n💾 HISTORIAL ACTUALIZADO:")
-            print(f"   Empleados que recibieron TROP en sábado: {', '.join(empleados_con_sabado)}")
-            print(f"   Semana registrada: {self.semana_seleccionada}")
+            logger.info("\n💾 HISTORIAL ACTUALIZADO:")
+            logger.info("   Empleados que recibieron TROP en sábado: %s", ', '.join(empleados_con_sabado))
+            logger.info("   Semana registrada: %s", self.semana_seleccionada)
         else:
-            print(f"\n💾 No hay actualizaciones de historial (ningún TROP en sábado)")
+            logger.info("\n💾 No hay actualizaciones de historial (ningún TROP en sábado)")
     
     def generar_horario_primera_semana(self):
         """Genera el horario para la semana seleccionada aleatoriamente - CON SISTEMA DE CASCADA ESTRICTO PARA SÁBADOS"""
@@ -1351,8 +1427,8 @@ class GeneradorDescansosSeparacion:
         # Mostrar información de la semana seleccionada
         lunes_semana = self.fechas_semana[0]
         domingo_semana = self.fechas_semana[6]
-        print(f"\n📅 SEMANA SELECCIONADA: Semana {self.semana_seleccionada}")
-        print(f"📅 FECHAS: Lunes {lunes_semana.strftime('%d/%m/%Y')} - Domingo {domingo_semana.strftime('%d/%m/%Y')}")
+        logger.info("\n📅 SEMANA SELECCIONADA: Semana %s", self.semana_seleccionada)
+        logger.info("📅 FECHAS: Lunes %s - Domingo %s", lunes_semana.strftime('%d/%m/%Y'), domingo_semana.strftime('%d/%m/%Y'))
         
         # Inicializar contador de descansos por día
         descansos_por_dia = {dia['formato']: 0 for dia in dias_semana_seleccionada if not dia['es_domingo']}
@@ -1375,8 +1451,8 @@ class GeneradorDescansosSeparacion:
                 empleados_sin_restricciones.append((idx, empleado))
         
         # ALEATORIZACIÓN: Mezclar el orden de asignación de empleados (SOLO ACTIVOS)
-        random.shuffle(empleados_con_restricciones)
-        random.shuffle(empleados_sin_restricciones)
+        self.aleatorio.shuffle(empleados_con_restricciones)
+        self.aleatorio.shuffle(empleados_sin_restricciones)
         
         # Asignar primero empleados con restricciones específicas primero (SOLO ACTIVOS)
         filas = []
@@ -1393,7 +1469,7 @@ class GeneradorDescansosSeparacion:
             
             if fechas_especificas:
                 # MÁXIMA PRIORIDAD: Usar fechas específicas (VACA, COME, CMED, COMS)
-                print(f"🔧 {empleado}: PROCESANDO FECHAS ESPECÍFICAS (MÁXIMA PRIORIDAD)")
+                logger.debug("🔧 %s: PROCESANDO FECHAS ESPECÍFICAS (MÁXIMA PRIORIDAD)", empleado)
                 descansos_combinados = self._asignar_descansos_empleado_fechas_especificas(
                     empleado, idx_original, dias_semana, descansos_por_dia, historial_dias, semana_num
                 )
@@ -1447,7 +1523,7 @@ class GeneradorDescansosSeparacion:
             # SEGUNDO PASO: Verificar si este empleado debe recibir sábado por cascada estricta
             if empleado in empleados_asignados_sabado:
                 # ASIGNACIÓN FORZADA DE SÁBADO (por cascada estricta)
-                print(f"🎯 {empleado}: ASIGNACIÓN FORZADA DE SÁBADO (Cascada Estricta - Nivel {self.prioridades_sabados[empleado]['nivel_prioridad']})")
+                logger.debug("🎯 %s: ASIGNACIÓN FORZADA DE SÁBADO (Cascada Estricta - Nivel %s)", empleado, self.prioridades_sabados[empleado]['nivel_prioridad'])
                 descansos_semana = self._asignar_descansos_con_sabado_forzado(
                     empleado, dias_semana, descansos_por_dia, historial_dias, idx_original, turnos_especiales
                 )
@@ -1482,41 +1558,33 @@ class GeneradorDescansosSeparacion:
             
             filas.append(fila)
         
+        # PASO 2: REPARACIÓN (completar DESC/TROP faltantes y descargar días sobre el cupo)
+        self._reparar_descansos_semana(filas)
+        
         # Ordenar filas por número de empleado para mantener consistencia
         filas.sort(key=lambda x: x['No.'])
         
         columnas = ['No.', 'SIGLA ATCO'] + [dia['formato'] for dia in dias_semana_seleccionada]
         df = pd.DataFrame.from_records(filas, columns=columnas)
         
-        # Calcular personal disponible por día (EXCLUYENDO TRABAJADORES FUERA DE OPERACIÓN)
-        total_trabajadores_activos = len(self._obtener_trabajadores_activos())
-        personal_disponible_por_dia = {}
-        
-        for dia_info in dias_semana_seleccionada:
-            formato_dia = dia_info['formato']
-            descansos_en_dia = sum(1 for fila in filas 
-                                  if fila[formato_dia] is not None and 
-                                  fila['SIGLA ATCO'] not in self.trabajadores_fuera_operacion and
-                                  fila[formato_dia] in CONFIGURACION_GENERAL["turnos_validos"])
-            personal_disponible_por_dia[formato_dia] = total_trabajadores_activos - descansos_en_dia
-        
         # Mostrar resumen de descansos por empleado (SOLO TRABAJADORES ACTIVOS)
-        print("\n=== RESUMEN DE DESCANSO POR EMPLEADO ===")
-        for idx, empleado in enumerate(self.empleados):
-            if self._esta_fuera_operacion(empleado):
-                print(f"Empleado {idx + 1} ({empleado}): FUERA DE OPERACIÓN - Sin asignación")
-            else:
-                descansos_empleado = {}
-                for dia_info in dias_semana_seleccionada:
-                    formato_dia = dia_info['formato']
-                    valor = df.iloc[idx][formato_dia]
-                    if valor is not None:
-                        if valor not in descansos_empleado:
-                            descansos_empleado[valor] = 0
-                        descansos_empleado[valor] += 1
+        logger.info("\n=== RESUMEN DE DESCANSO POR EMPLEADO ===")
+        if logger.isEnabledFor(logging.DEBUG):
+            for idx, empleado in enumerate(self.empleados):
+                if self._esta_fuera_operacion(empleado):
+                    logger.debug("Empleado %s (%s): FUERA DE OPERACIÓN - Sin asignación", idx + 1, empleado)
+                else:
+                    descansos_empleado = {}
+                    for dia_info in dias_semana_seleccionada:
+                        formato_dia = dia_info['formato']
+                        valor = df.iloc[idx][formato_dia]
+                        if valor is not None:
+                            if valor not in descansos_empleado:
+                                descansos_empleado[valor] = 0
+                            descansos_empleado[valor] += 1
                 
-                resumen = ", ".join([f"{tipo}={cantidad}" for tipo, cantidad in descansos_empleado.items()])
-                print(f"Empleado {idx + 1} ({empleado}): {resumen}")
+                    resumen = ", ".join([f"{tipo}={cantidad}" for tipo, cantidad in descansos_empleado.items()])
+                    logger.debug("Empleado %s (%s): %s", idx + 1, empleado, resumen)
         
         # ACTUALIZAR HISTORIAL DE SÁBADOS
         self._actualizar_historial_sabados(df)
@@ -1525,312 +1593,422 @@ class GeneradorDescansosSeparacion:
     
 
     
-    def exportar_excel(self, df, nombre_archivo='horario_descansos_separacion_primera_semana_julio.xlsx'):
-        """Exporta el horario a Excel con conteo de personal disponible y formato condicional"""
-        # Generar nombre de hoja basado en la semana seleccionada
-        lunes_semana = self.fechas_semana[0]
-        domingo_semana = self.fechas_semana[6]
-        nombre_hoja = f"Semana {self.semana_seleccionada} ({lunes_semana.strftime('%d-%m')}-{domingo_semana.strftime('%d-%m')})"
+    def _reparar_descansos_semana(self, filas, profundidad_maxima=2):
+        """
+        Etapa de reparación sobre las filas ya asignadas, sin reiniciar la semana
         
-        with pd.ExcelWriter(nombre_archivo, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name=nombre_hoja, index=False)
-            
-            workbook = writer.book
-            worksheet = writer.sheets[nombre_hoja]
-            
-            # Importar estilos para formato condicional
-            from openpyxl.styles import PatternFill, Font
+        1️⃣ Trabajadores con DESC/TROP faltantes o invertidos: se completan en sus días libres
+        2️⃣ Días con más descansos que el cupo: se mueven descansos de trabajadores vecinos
+        
+        Si el día que necesita un trabajador está en el cupo, se libera moviendo el descanso
+        de otro trabajador (backtracking acotado a profundidad_maxima). Nunca se tocan sábados
+        (cascada), turnos especiales, días fijos ni trabajadores con fechas específicas.
+        
+        Returns:
+            int: número de trabajadores modificados
+        """
+        dias_reparables = [dia for dia in self.dias_mes if not dia['es_no_laborable'] and not self._es_sabado(dia['formato'])]
+        filas_activas = [fila for fila in filas
+                         if not self._esta_fuera_operacion(fila['SIGLA ATCO'])
+                         and not self._tiene_turno_especial_completo(fila['SIGLA ATCO'])]
+        if not dias_reparables or not filas_activas:
+            return 0
+        
+        # Carga DESC/TROP por día y cupo: promedio de los días reparables + 1 de tolerancia
+        carga = {dia['formato']: sum(1 for fila in filas_activas if fila[dia['formato']] in ('DESC', 'TROP'))
+                 for dia in dias_reparables}
+        descansos_esperados = sum(max(2 - len(self._descansos_fila(fila)), 0) for fila in filas_activas) + sum(carga.values())
+        cupo = math.ceil(descansos_esperados / len(dias_reparables)) + 1
+        
+        modificados = set()
+        
+        # 1️⃣ Completar o reordenar DESC/TROP
+        for fila in filas_activas:
+            empleado = fila['SIGLA ATCO']
+            descansos = self._descansos_fila(fila)
+            if len(descansos) == 2 and fila[descansos[0]['formato']] == 'DESC':
+                continue
+            if len(descansos) > 2:
+                logger.warning("⚠️ %s: Tiene %s descansos DESC/TROP, no se repara", empleado, len(descansos))
+                continue
             
-            # Definir el formato amarillo para turnos especiales
-            formato_amarillo = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
-            fuente_negra = Font(color="000000")
+            libres = [dia for dia in dias_reparables if fila[dia['formato']] is None]
+            mejor = None
+            for nuevos in combinations(libres, 2 - len(descansos)):
+                dias = sorted(descansos + list(nuevos), key=lambda d: d['dia_semana'])
+                if not self._par_descansos_valido(empleado, dias):
+                    continue
+                puntaje = (sum(carga[d['formato']] >= cupo for d in nuevos),
+                           abs(dias[0]['dia_semana'] - dias[1]['dia_semana']) <= 1,
+                           sum(carga[d['formato']] for d in nuevos))
+                if mejor is None or puntaje < mejor[0]:
+                    mejor = (puntaje, nuevos)
+            
+            if mejor is None:
+                logger.warning("⚠️ %s: Sin días libres válidos para DESC/TROP, no se puede reparar", empleado)
+                continue
             
-            # Obtener las columnas de días del DataFrame
-            columnas_dias = [col for col in df.columns if col.startswith(('MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN'))]
+            for dia in mejor[1]:
+                if carga[dia['formato']] >= cupo:
+                    self._liberar_cupo(dia['formato'], filas_activas, carga, cupo, {empleado}, profundidad_maxima, modificados)
+                fila[dia['formato']] = 'TROP'
+                carga[dia['formato']] += 1
+            self._reetiquetar_desc_trop(fila)
+            modificados.add(empleado)
+            logger.debug("🔧 %s: DESC/TROP reparados → %s", empleado,
+                         ", ".join(f"{d['formato']}={fila[d['formato']]}" for d in self._descansos_fila(fila)))
+        
+        # 2️⃣ Descargar días sobre el cupo
+        for formato in sorted(carga, key=carga.get, reverse=True):
+            while carga[formato] > cupo:
+                if not self._liberar_cupo(formato, filas_activas, carga, cupo, set(), profundidad_maxima, modificados):
+                    break
+        
+        if modificados:
+            logger.info("🔧 REPARACIÓN: %s trabajadores ajustados (cupo %s descansos por día)", len(modificados), cupo)
+        return len(modificados)
+    
+    def _descansos_fila(self, fila):
+        """Días (registros del calendario) con DESC o TROP en la fila, en orden cronológico"""
+        return [dia for dia in self.dias_mes if fila[dia['formato']] in ('DESC', 'TROP')]
+    
+    def _par_descansos_valido(self, empleado, dias):
+        """DESC en el primer día y TROP en el segundo permitidos por las restricciones del empleado"""
+        return (self.restricciones_compiladas.permite(empleado, 'DESC', dias[0]['dia_semana'])
+                and self.restricciones_compiladas.permite(empleado, 'TROP', dias[1]['dia_semana']))
+    
+    def _reetiquetar_desc_trop(self, fila):
+        """REGLA OBLIGATORIA: el primer descanso cronológico es DESC y el segundo TROP"""
+        for dia, tipo in zip(self._descansos_fila(fila), ('DESC', 'TROP')):
+            fila[dia['formato']] = tipo
+    
+    def _es_reubicable(self, empleado):
+        """Trabajadores cuyos DESC/TROP puede mover la reparación"""
+        return (not self._es_seleccion_fija(empleado, 'DESC')
+                and not self._es_seleccion_fija(empleado, 'TROP')
+                and not self._obtener_fechas_especificas_semana(empleado))
+    
+    def _liberar_cupo(self, formato, filas_activas, carga, cupo, intocables, profundidad, modificados):
+        """
+        Libera un descanso del día formato moviéndolo a otro día libre del mismo trabajador
+        
+        Si el destino también está en el cupo, se intenta liberarlo a su vez (hasta profundidad niveles).
+        
+        Returns:
+            bool: True si se movió un descanso
+        """
+        if profundidad <= 0:
+            return False
+        
+        for fila in filas_activas:
+            empleado = fila['SIGLA ATCO']
+            if empleado in intocables or fila[formato] not in ('DESC', 'TROP') or not self._es_reubicable(empleado):
+                continue
             
-            # Aplicar formato condicional a turnos especiales y trabajadores inactivos
-            turnos_especiales = CONFIGURACION_GENERAL["turnos_validos"]
+            descansos = self._descansos_fila(fila)
+            otro = [dia for dia in descansos if dia['formato'] != formato]
+            destinos = [dia for dia in self.dias_mes
+                        if dia['formato'] in carga and fila[dia['formato']] is None]
+            # Preferir destinos con menor carga y no consecutivos al otro descanso
+            destinos.sort(key=lambda d: (any(abs(d['dia_semana'] - o['dia_semana']) <= 1 for o in otro), carga[d['formato']]))
             
-            # Recorrer todas las celdas de datos (excluyendo encabezados)
-            for fila_idx in range(2, len(df) + 2):  # Empezar desde fila 2 (después del encabezado)
-                for col_idx, columna_dia in enumerate(columnas_dias, start=3):  # Empezar desde columna 3
-                    celda = worksheet.cell(row=fila_idx, column=col_idx)
-                    valor_celda = celda.value
-                    
-                    # Obtener el empleado de esta fila
-                    empleado_idx = fila_idx - 2  # Convertir índice de fila a índice del DataFrame
-                    if empleado_idx < len(df):
-                        empleado = df.iloc[empleado_idx]['SIGLA ATCO']
-                    else:
-                        empleado = None
-                    
-                    # Aplicar formato amarillo si el valor es un turno especial
-                    if valor_celda in turnos_especiales:
-                        celda.fill = formato_amarillo
-                        celda.font = fuente_negra
-                    
-                    # Aplicar formato amarillo si el empleado está fuera de operación (inactivo)
-                    if empleado and self._esta_fuera_operacion(empleado):
-                        celda.fill = formato_amarillo
-                        celda.font = fuente_negra
-            
-            # Calcular personal disponible por día (EXCLUYENDO TRABAJADORES FUERA DE OPERACIÓN)
-            total_trabajadores_activos = len(self._obtener_trabajadores_activos())
-            personal_disponible_por_dia = {}
-            
-            for columna_dia in columnas_dias:
-                # Contar trabajadores que NO están en descanso en este día
-                # Excluir trabajadores fuera de operación del conteo
-                descansos_en_dia = 0
-                for _, fila in df.iterrows():
-                    empleado = fila['SIGLA ATCO']
-                    valor_dia = fila[columna_dia]
-                    
-                    # Solo contar si el empleado está activo y tiene un turno que lo hace no disponible
-                    if (empleado not in self.trabajadores_fuera_operacion and 
-                        valor_dia is not None and 
-                        valor_dia in CONFIGURACION_GENERAL["turnos_validos"]):
-                        descansos_en_dia += 1
+            for destino in destinos:
+                dias = sorted(otro + [destino], key=lambda d: d['dia_semana'])
+                if len(dias) == 2 and not self._par_descansos_valido(empleado, dias):
+                    continue
+                if carga[destino['formato']] >= cupo and not self._liberar_cupo(
+                        destino['formato'], filas_activas, carga, cupo, intocables | {empleado}, profundidad - 1, modificados):
+                    continue
                 
-                personal_disponible_por_dia[columna_dia] = total_trabajadores_activos - descansos_en_dia
-            
-            # Agregar fila de conteo de personal disponible
-            fila_conteo = len(df) + 2  # Dos filas después de los datos de empleados
-            
-            # Agregar fila vacía
-            worksheet.cell(row=fila_conteo-1, column=1, value="")
-            
-            # Agregar fila de conteo
-            worksheet.cell(row=fila_conteo, column=1, value="Personal Disponible")
-            worksheet.cell(row=fila_conteo, column=2, value="")
-            
-            # Agregar conteos por día
-            for i, columna_dia in enumerate(columnas_dias, start=3):  # Empezar desde la columna 3 (después de No. y SIGLA ATCO)
-                col_idx = i
-                worksheet.cell(row=fila_conteo, column=col_idx, value=personal_disponible_por_dia[columna_dia])
-            
-            # Ajustar ancho de columnas
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 15)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-        
-        print(f"Horario exportado a: {nombre_archivo}")
-        print(f"📊 Nombre de hoja: {nombre_hoja}")
-        print(f"📊 Conteo de personal disponible agregado en la fila {fila_conteo}")
+                fila[destino['formato']] = fila[formato]
+                fila[formato] = None
+                self._reetiquetar_desc_trop(fila)
+                carga[formato] -= 1
+                carga[destino['formato']] += 1
+                modificados.add(empleado)
+                logger.debug("🔁 %s: descanso movido %s → %s", empleado, formato, destino['formato'])
+                return True
+        
+        return False
+    
+    def exportar_excel(self, df, nombre_archivo='horario_descansos_separacion_primera_semana_julio.xlsx'):
+        """Exporta el horario a Excel con conteo de personal disponible y formato condicional"""
+        # Generar nombre de hoja basado en la semana seleccionada
+        nombre_hoja = self._nombre_hoja()
+        
+        wb = libro_solo_escritura()
+        personal_disponible_por_dia, fila_conteo = self._escribir_hoja(wb, df)
+        wb.save(nombre_archivo)
+        
+        logger.info("Horario exportado a: %s", nombre_archivo)
+        logger.info("📊 Nombre de hoja: %s", nombre_hoja)
+        logger.info("📊 Conteo de personal disponible agregado en la fila %s", fila_conteo)
         
         # Mostrar resumen del conteo
-        print(f"\n📋 RESUMEN DE PERSONAL DISPONIBLE:")
+        logger.info("\n📋 RESUMEN DE PERSONAL DISPONIBLE:")
         for dia, disponibles in personal_disponible_por_dia.items():
-            print(f"  {dia}: {disponibles} trabajadores disponibles")
+            logger.info("  %s: %s trabajadores disponibles", dia, disponibles)
         
         # Mostrar información sobre el formato aplicado
         trabajadores_inactivos = self._obtener_trabajadores_fuera_operacion()
         if trabajadores_inactivos:
-            print(f"\n🎨 FORMATO APLICADO:")
-            print(f"  ✅ Color amarillo aplicado a turnos especiales")
-            print(f"  ✅ Color amarillo aplicado a trabajadores inactivos: {', '.join(trabajadores_inactivos)}")
+            logger.info("\n🎨 FORMATO APLICADO:")
+            logger.info("  ✅ Color amarillo aplicado a turnos especiales")
+            logger.info("  ✅ Color amarillo aplicado a trabajadores inactivos: %s", ', '.join(trabajadores_inactivos))
         else:
-            print(f"\n🎨 FORMATO APLICADO:")
-            print(f"  ✅ Color amarillo aplicado a turnos especiales")
-            print(f"  ℹ️  No hay trabajadores inactivos en esta semana")
+            logger.info("\n🎨 FORMATO APLICADO:")
+            logger.info("  ✅ Color amarillo aplicado a turnos especiales")
+            logger.info("  ℹ️  No hay trabajadores inactivos en esta semana")
         
         return nombre_archivo
     
-    def validar_regla_desc_trop(self, df):
-        """Valida que la regla DESC/TROP se cumple correctamente"""
-        print("\n=== VALIDACIÓN DE REGLA DESC/TROP ===")
-        print("✅ REGLA: El primer descanso cronológico debe ser DESC, el segundo debe ser TROP")
-        
-        errores_orden = 0
-        empleados_correctos = 0
+    def _nombre_hoja(self):
+        """Nombre de hoja de la semana seleccionada, ej: 'Semana 27 (30-06-06-07)'"""
+        lunes_semana = self.fechas_semana[0]
+        domingo_semana = self.fechas_semana[6]
+        return f"Semana {self.semana_seleccionada} ({lunes_semana.strftime('%d-%m')}-{domingo_semana.strftime('%d-%m')})"
+    
+    def _escribir_hoja(self, wb, df, reporte=None):
+        """
+        Escribe la semana en una hoja nueva de un libro de solo escritura: horario, amarillo en turnos
+        especiales y trabajadores inactivos, fila de personal disponible y ancho de columnas
         
-        # Analizar cada empleado
-        for idx, empleado in enumerate(self.empleados):
-            if self._esta_fuera_operacion(empleado):
-                continue  # Saltar empleados fuera de operación
-                
-            descansos_empleado = []
-            
-            # Recopilar todos los descansos DESC/TROP del empleado
-            for col in df.columns:
-                if col.startswith(('MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN')):
-                    valor = df.iloc[idx][col]
-                    if valor in ['DESC', 'TROP']:
-                        # Obtener el día de la semana del formato de columna
-                        dia_semana = self._obtener_dia_semana_de_formato(col)
-                        descansos_empleado.append((col, valor, dia_semana))
-            
-            # Ordenar por día de la semana (cronológicamente)
-            descansos_empleado.sort(key=lambda x: x[2])
-            
-            # Verificar orden correcto
-            if len(descansos_empleado) == 2:
-                primer_descanso = descansos_empleado[0]
-                segundo_descanso = descansos_empleado[1]
-                
-                col1, tipo1, dia1 = primer_descanso
-                col2, tipo2, dia2 = segundo_descanso
-                
-                if tipo1 == 'DESC' and tipo2 == 'TROP':
-                    print(f"✅ {empleado}: {col1}(DESC) → {col2}(TROP) - CORRECTO")
-                    empleados_correctos += 1
-                else:
-                    print(f"❌ {empleado}: {col1}({tipo1}) → {col2}({tipo2}) - INCORRECTO")
-                    print(f"   Debería ser: {col1}(DESC) → {col2}(TROP)")
-                    errores_orden += 1
+        Los colores, el conteo y los anchos salen de la semana codificada (ReporteValidacion), sin
+        recorrer celdas de openpyxl.
+        """
+        if reporte is None:
+            reporte = self.validar_semana(df)
+        
+        # Estilo con nombre del libro (se registra una sola vez)
+        estilo_amarillo = registrar_estilo(wb, 'amarillo')
+        
+        # Columnas de días en el DataFrame y celdas amarillas (turno especial o trabajador inactivo)
+        columnas = list(df.columns)
+        indices_dias = df.columns.get_indexer(reporte.columnas_dias)
+        amarillas = (reporte.codigos > 0) | ~reporte.activos[:, None]
+        
+        valores = df.astype(object).where(df.notna(), None).to_numpy()
+        estilos = np.full(valores.shape, None, dtype=object)
+        estilos[:, indices_dias] = np.where(amarillas, estilo_amarillo, None)
+        
+        # Fila de personal disponible por día (EXCLUYENDO TRABAJADORES FUERA DE OPERACIÓN), a continuación de los datos
+        personal_disponible_por_dia = reporte.personal_disponible_por_dia()
+        fila_conteo = len(df) + 2
+        conteo = ["Personal Disponible", ""] + [None] * (len(columnas) - 2)
+        for indice, columna_dia in zip(indices_dias, reporte.columnas_dias):
+            conteo[indice] = personal_disponible_por_dia[columna_dia]
+        
+        # Ancho de columnas: los días desde los códigos de la semana, No. y SIGLA ATCO desde sus valores
+        codigos = np.zeros(valores.shape, dtype=reporte.codigos.dtype)
+        codigos[:, indices_dias] = reporte.codigos
+        fijas = valores.copy()
+        fijas[:, indices_dias] = None
+        anchos = anchos_columnas(codigos, [0] + [len(tipo) for tipo in reporte.tipos], columnas, extra=[conteo, *fijas])
+        
+        escribir_hoja(wb, self._nombre_hoja(), [columnas, *valores.tolist(), conteo],
+                      [None, *estilos.tolist()], anchos)
+        
+        return personal_disponible_por_dia, fila_conteo
+    
+    def huella_configuracion(self):
+        """Hash corto de todo lo que, junto con la semilla, determina la semana (configuración, historial, semana)"""
+        datos = {
+            'año': self.año,
+            'semana': self.semana_seleccionada,
+            'empleados': self.empleados,
+            'restricciones': self.restricciones_empleados,
+            'fechas_especificas': self.turnos_fechas_especificas,
+            'turnos_especiales': self.turnos_especiales,
+            'fuera_operacion': self.trabajadores_fuera_operacion,
+            'festivos': self.dias_festivos,
+            'general': CONFIGURACION_GENERAL,
+            'historial_sabados': self.historial_sabados,
+            'horizonte_sabados': self.horizonte_sabados
+        }
+        texto = json.dumps(datos, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(texto.encode('utf-8')).hexdigest()[:16]
+    
+    def exportar_registro_decisiones(self, nombre_archivo=None):
+        """
+        Guarda en JSON las decisiones aleatorias de la última generación junto con el historial de sábados usado,
+        para reproducir la semana exactamente con reproducir_semana()
+        """
+        if nombre_archivo is None:
+            nombre_archivo = f'registro_semana_{self.semana_seleccionada}_{self.año}.json'
+        registro = {
+            'año': self.año,
+            'semana': self.semana_seleccionada,
+            'num_empleados': self.num_empleados,
+            'semilla': self.semilla,
+            'huella_configuracion': self.huella_configuracion(),
+            'historial_sabados': self.historial_sabados,
+            'horizonte_sabados': self.horizonte_sabados,
+            'decisiones': self.aleatorio.decisiones
+        }
+        with open(nombre_archivo, 'w', encoding='utf-8') as archivo:
+            json.dump(registro, archivo, ensure_ascii=False, separators=(',', ':'))
+        logger.info("🎲 Registro de %s decisiones guardado en %s", len(self.aleatorio.decisiones), nombre_archivo)
+        return nombre_archivo
+    
+    def validar_semana(self, df):
+        """Reporte de validación de la semana (ReporteValidacion), calculado por columnas sobre la semana codificada"""
+        siglas = df['SIGLA ATCO'].tolist()
+        return ReporteValidacion(
+            df, self.dias_mes,
+            activos=[sigla not in self.trabajadores_fuera_operacion for sigla in siglas],
+            con_turnos_especiales=[sigla in self.turnos_especiales for sigla in siglas],
+            turnos_validos=CONFIGURACION_GENERAL["turnos_validos"],
+            turnos_adicionales=CONFIGURACION_GENERAL["turnos_adicionales"]
+        )
+    
+    def validar_regla_desc_trop(self, df, reporte=None):
+        """Valida que la regla DESC/TROP se cumple correctamente"""
+        if reporte is None:
+            reporte = self.validar_semana(df)
+        logger.info("\n=== VALIDACIÓN DE REGLA DESC/TROP ===")
+        logger.info("✅ REGLA: El primer descanso cronológico debe ser DESC, el segundo debe ser TROP")
+        
+        # Detalle por empleado: solo los que tienen problemas (y todos en DEBUG)
+        if logger.isEnabledFor(logging.DEBUG):
+            filas = np.flatnonzero(reporte.activos)
+        else:
+            filas = np.flatnonzero(reporte.activos & ~reporte.orden_correcto)
+        for fila in filas:
+            empleado = reporte.empleados[fila]
+            descansos_empleado = reporte.descansos_empleado(fila)
+            
+            if reporte.orden_correcto[fila]:
+                (col1, _), (col2, _) = descansos_empleado
+                logger.debug("✅ %s: %s(DESC) → %s(TROP) - CORRECTO", empleado, col1, col2)
+            elif len(descansos_empleado) == 2:
+                (col1, tipo1), (col2, tipo2) = descansos_empleado
+                logger.warning("❌ %s: %s(%s) → %s(%s) - INCORRECTO", empleado, col1, tipo1, col2, tipo2)
+                logger.warning("   Debería ser: %s(DESC) → %s(TROP)", col1, col2)
             elif len(descansos_empleado) == 1:
-                col1, tipo1, dia1 = descansos_empleado[0]
-                print(f"⚠️  {empleado}: Solo tiene {col1}({tipo1}) - Falta el segundo descanso")
+                col1, tipo1 = descansos_empleado[0]
+                logger.warning("⚠️  %s: Solo tiene %s(%s) - Falta el segundo descanso", empleado, col1, tipo1)
             elif len(descansos_empleado) == 0:
-                print(f"⚠️  {empleado}: No tiene descansos DESC/TROP asignados")
+                logger.warning("⚠️  %s: No tiene descansos DESC/TROP asignados", empleado)
             else:
-                print(f"⚠️  {empleado}: Tiene {len(descansos_empleado)} descansos (debería tener 2)")
+                logger.warning("⚠️  %s: Tiene %s descansos (debería tener 2)", empleado, len(descansos_empleado))
         
         # Resumen de validación
+        errores_orden = int(reporte.orden_incorrecto.sum())
+        empleados_correctos = int(reporte.orden_correcto.sum())
         total_empleados_activos = len(self._obtener_trabajadores_activos())
-        print(f"\n📊 RESUMEN DE VALIDACIÓN:")
-        print(f"   Empleados activos: {total_empleados_activos}")
-        print(f"   Empleados con orden correcto: {empleados_correctos}")
-        print(f"   Empleados con orden incorrecto: {errores_orden}")
-        print(f"   Porcentaje de cumplimiento: {(empleados_correctos/total_empleados_activos*100):.1f}%")
+        logger.info("\n📊 RESUMEN DE VALIDACIÓN:")
+        logger.info("   Empleados activos: %s", total_empleados_activos)
+        logger.info("   Empleados con orden correcto: %s", empleados_correctos)
+        logger.info("   Empleados con orden incorrecto: %s", errores_orden)
+        logger.info("   Porcentaje de cumplimiento: %.1f%%", empleados_correctos/total_empleados_activos*100)
         
         if errores_orden == 0:
-            print("🎉 ¡EXCELENTE! Todos los empleados cumplen la regla DESC/TROP")
+            logger.info("🎉 ¡EXCELENTE! Todos los empleados cumplen la regla DESC/TROP")
         else:
-            print(f"⚠️  ATENCIÓN: {errores_orden} empleados NO cumplen la regla DESC/TROP")
+            logger.warning("⚠️  ATENCIÓN: %s empleados NO cumplen la regla DESC/TROP", errores_orden)
         
         return errores_orden == 0
     
-    def validar_turnos_especiales_adicionales(self, df):
+    def validar_turnos_especiales_adicionales(self, df, reporte=None):
         """Valida que los turnos especiales se suman correctamente a DESC/TROP"""
-        print("\n=== VALIDACIÓN DE TURNOS ESPECIALES ADICIONALES ===")
-        print("✅ REGLA: Turnos especiales (SIND, CMED) se SUMAN a DESC/TROP")
+        if reporte is None:
+            reporte = self.validar_semana(df)
+        logger.info("\n=== VALIDACIÓN DE TURNOS ESPECIALES ADICIONALES ===")
+        logger.info("✅ REGLA: Turnos especiales (SIND, CMED) se SUMAN a DESC/TROP")
         
-        empleados_con_turnos_especiales = 0
-        empleados_correctos = 0
+        turnos_adicionales = CONFIGURACION_GENERAL["turnos_adicionales"]
         
-        for idx, empleado in enumerate(self.empleados):
-            if self._esta_fuera_operacion(empleado):
-                continue  # Saltar empleados fuera de operación
-            
-            # Recopilar todos los turnos del empleado
-            turnos_empleado = []
-            desc_count = 0
-            trop_count = 0
-            turnos_especiales = []
-            
-            for col in df.columns:
-                if col.startswith(('MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN')):
-                    valor = df.iloc[idx][col]
-                    if valor is not None:
-                        turnos_empleado.append((col, valor))
-                        if valor == 'DESC':
-                            desc_count += 1
-                        elif valor == 'TROP':
-                            trop_count += 1
-                        elif valor in CONFIGURACION_GENERAL["turnos_adicionales"]:
-                            turnos_especiales.append((col, valor))
-            
-            # Verificar si tiene turnos especiales configurados
-            if self._tiene_turnos_especiales(empleado):
-                empleados_con_turnos_especiales += 1
-                
-                # Verificar que tiene DESC + TROP + turno especial
-                if desc_count == 1 and trop_count == 1 and len(turnos_especiales) >= 1:
-                    turnos_esp_str = ", ".join([f"{col}({tipo})" for col, tipo in turnos_especiales])
-                    print(f"✅ {empleado}: DESC={desc_count}, TROP={trop_count}, Especiales=[{turnos_esp_str}] - CORRECTO")
-                    empleados_correctos += 1
+        # Detalle por empleado: los que tienen turnos especiales configurados (y todos en DEBUG)
+        if logger.isEnabledFor(logging.DEBUG):
+            filas = np.flatnonzero(reporte.activos)
+        else:
+            filas = np.flatnonzero(reporte.evaluados_especiales & ~reporte.especiales_correctos)
+        for fila in filas:
+            empleado = reporte.empleados[fila]
+            desc_count = int(reporte.n_desc[fila])
+            trop_count = int(reporte.n_trop[fila])
+            turnos_esp_str = ", ".join([f"{col}({tipo})" for col, tipo in reporte.adicionales_empleado(fila, turnos_adicionales)])
+            
+            if reporte.evaluados_especiales[fila]:
+                if reporte.especiales_correctos[fila]:
+                    logger.debug("✅ %s: DESC=%s, TROP=%s, Especiales=[%s] - CORRECTO", empleado, desc_count, trop_count, turnos_esp_str)
                 else:
-                    turnos_esp_str = ", ".join([f"{col}({tipo})" for col, tipo in turnos_especiales])
-                    print(f"❌ {empleado}: DESC={desc_count}, TROP={trop_count}, Especiales=[{turnos_esp_str}] - INCORRECTO")
-                    print(f"   Debería tener: DESC=1, TROP=1, y al menos 1 turno especial")
+                    logger.warning("❌ %s: DESC=%s, TROP=%s, Especiales=[%s] - INCORRECTO", empleado, desc_count, trop_count, turnos_esp_str)
+                    logger.warning("   Debería tener: DESC=1, TROP=1, y al menos 1 turno especial")
             
             # Mostrar empleados sin turnos especiales pero con asignaciones correctas
-            elif desc_count == 1 and trop_count == 1 and len(turnos_especiales) == 0:
-                print(f"✅ {empleado}: DESC={desc_count}, TROP={trop_count} - CORRECTO (sin turnos especiales)")
+            elif desc_count == 1 and trop_count == 1 and reporte.n_adicionales[fila] == 0:
+                logger.debug("✅ %s: DESC=%s, TROP=%s - CORRECTO (sin turnos especiales)", empleado, desc_count, trop_count)
         
         # Resumen de validación
-        print(f"\n📊 RESUMEN DE TURNOS ESPECIALES:")
-        print(f"   Empleados con turnos especiales configurados: {empleados_con_turnos_especiales}")
-        print(f"   Empleados con turnos especiales correctos: {empleados_correctos}")
+        empleados_con_turnos_especiales = int(reporte.evaluados_especiales.sum())
+        empleados_correctos = int(reporte.especiales_correctos.sum())
+        logger.info("\n📊 RESUMEN DE TURNOS ESPECIALES:")
+        logger.info("   Empleados con turnos especiales configurados: %s", empleados_con_turnos_especiales)
+        logger.info("   Empleados con turnos especiales correctos: %s", empleados_correctos)
         
         if empleados_con_turnos_especiales > 0:
             porcentaje = (empleados_correctos/empleados_con_turnos_especiales*100)
-            print(f"   Porcentaje de cumplimiento: {porcentaje:.1f}%")
+            logger.info("   Porcentaje de cumplimiento: %.1f%%", porcentaje)
             
             if empleados_correctos == empleados_con_turnos_especiales:
-                print("🎉 ¡EXCELENTE! Todos los empleados con turnos especiales están correctos")
+                logger.info("🎉 ¡EXCELENTE! Todos los empleados con turnos especiales están correctos")
             else:
-                print(f"⚠️  ATENCIÓN: {empleados_con_turnos_especiales - empleados_correctos} empleados con turnos especiales incorrectos")
+                logger.warning("⚠️  ATENCIÓN: %s empleados con turnos especiales incorrectos", empleados_con_turnos_especiales - empleados_correctos)
         else:
-            print("ℹ️  No hay empleados con turnos especiales configurados en esta ejecución")
+            logger.info("ℹ️  No hay empleados con turnos especiales configurados en esta ejecución")
         
-        return empleados_correctos == empleados_con_turnos_especiales
+        return reporte.cumple_turnos_especiales
     
     def _obtener_dia_semana_de_formato(self, formato_columna):
         """Convierte formato de columna (ej: MON-07) a número de día de semana"""
-        mapeo_dias_formato = {
-            'MON': 0, 'TUE': 1, 'WED': 2, 'THU': 3, 
-            'FRI': 4, 'SAT': 5, 'SUN': 6
-        }
         dia_abrev = formato_columna.split('-')[0]
-        return mapeo_dias_formato.get(dia_abrev, 0)
+        return INDICE_DIA.get(dia_abrev, 0)
 
-    def analizar_separacion(self, df):
-        """Analiza la separación de descansos y variación semanal"""
-        print("\n=== ANÁLISIS DE SEPARACIÓN DE DESCANSO ===")
+    def analizar_separacion(self, df, reporte=None):
+        """
+        Analiza la separación de descansos y variación semanal
         
-        # Analizar cada empleado
-        for idx, empleado in enumerate(self.empleados):
-            print(f"\nEmpleado {idx+1} ({empleado}):")
+        Returns:
+            dict: 'consecutivos' (empleados con DESC/TROP en días seguidos), 'promedio', 'desviacion',
+                  'minimo' y 'maximo' de descansos por día
+        """
+        if reporte is None:
+            reporte = self.validar_semana(df)
+        logger.info("\n=== ANÁLISIS DE SEPARACIÓN DE DESCANSO ===")
+        semana_num = next(iter(self.semanas))
+        
+        # Detalle por empleado: separación 1 o 2 (y todos en DEBUG)
+        if logger.isEnabledFor(logging.DEBUG):
+            filas = range(len(reporte.empleados))
+        else:
+            filas = np.flatnonzero((reporte.separacion == 1) | (reporte.separacion == 2))
+        for fila in filas:
+            logger.debug("\nEmpleado %s (%s):", fila+1, reporte.empleados[fila])
+            separacion = reporte.separacion[fila]
+            if separacion < 0:
+                continue
             
-            # Agrupar por semanas
-            for semana_num, dias_semana in self.semanas.items():
-                dias_semana_disponibles = [d for d in dias_semana if not d['es_domingo']]
-                descansos_semana = []
-                
-                for dia in dias_semana_disponibles:
-                    valor = df.iloc[idx][dia['formato']]
-                    if valor in ['DESC', 'TROP']:
-                        descansos_semana.append((dia['formato'], valor, dia['dia_semana']))
-                
-                if len(descansos_semana) == 2:
-                    # Verificar separación
-                    dia1, tipo1, num_dia1 = descansos_semana[0]
-                    dia2, tipo2, num_dia2 = descansos_semana[1]
-                    separacion = abs(num_dia1 - num_dia2)
-                    
-                    print(f"  Semana {semana_num}: {dia1}({tipo1}) y {dia2}({tipo2}) - Separación: {separacion} días")
-                    
-                    if separacion == 1:
-                        print(f"    ⚠️  ADVERTENCIA: Descansos consecutivos!")
-                    elif separacion >= 3:
-                        print(f"    ✅ Excelente separación")
-                    else:
-                        print(f"    ⚠️  Separación mínima")
+            (dia1, tipo1), (dia2, tipo2) = [d for d in reporte.descansos_empleado(fila) if not d[0].startswith('SUN')]
+            logger.debug("  Semana %s: %s(%s) y %s(%s) - Separación: %s días", semana_num, dia1, tipo1, dia2, tipo2, separacion)
+            
+            if separacion == 1:
+                logger.warning("    ⚠️  ADVERTENCIA: Descansos consecutivos!")
+            elif separacion >= 3:
+                logger.debug("    ✅ Excelente separación")
+            else:
+                logger.warning("    ⚠️  Separación mínima")
         
         # Analizar paridad diaria
-        print(f"\n=== ANÁLISIS DE PARIDAD DIARIA ===")
-        descansos_por_dia = {}
-        for col in df.columns:
-            if col.startswith(('MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN')):
-                descansos = sum(1 for valor in df[col] if valor in ['DESC', 'TROP'])
-                descansos_por_dia[col] = descansos
-        
-        valores = list(descansos_por_dia.values())
-        print(f"Estadísticas de distribución:")
-        print(f"  Promedio: {np.mean(valores):.2f}")
-        print(f"  Desviación estándar: {np.std(valores):.2f}")
-        print(f"  Mínimo: {min(valores)}")
-        print(f"  Máximo: {max(valores)}")
+        logger.info("\n=== ANÁLISIS DE PARIDAD DIARIA ===")
+        resumen = reporte.resumen()
+        logger.info("Estadísticas de distribución:")
+        logger.info("  Promedio: %.2f", resumen['promedio'])
+        logger.info("  Desviación estándar: %.2f", resumen['desviacion'])
+        logger.info("  Mínimo: %s", resumen['minimo'])
+        logger.info("  Máximo: %s", resumen['maximo'])
+        
+        return {clave: resumen[clave] for clave in ('consecutivos', 'promedio', 'desviacion', 'minimo', 'maximo')}
     
     def validar_restricciones(self):
         """Valida que las restricciones no generen conflictos imposibles"""
@@ -1984,109 +2162,106 @@ class GeneradorDescansosSeparacion:
     
     def mostrar_restricciones_aplicadas(self):
         """Muestra información sobre las restricciones aplicadas"""
-        print("\n=== SISTEMA UNIFICADO DE RESTRICCIONES ===")
+        logger.info("\n=== SISTEMA UNIFICADO DE RESTRICCIONES ===")
         
         if not self.restricciones_empleados:
-            print("No hay restricciones configuradas.")
+            logger.info("No hay restricciones configuradas.")
         else:
             for empleado, restricciones in self.restricciones_empleados.items():
-                print(f"\nEmpleado: {empleado}")
+                logger.info("\nEmpleado: %s", empleado)
                 for tipo_descanso, config in restricciones.items():
                     if config.get("libre", False):
-                        print(f"  {tipo_descanso}: Sin restricción (libre)")
+                        logger.info("  %s: Sin restricción (libre)", tipo_descanso)
                     else:
                         if "dias_permitidos" in config and isinstance(config["dias_permitidos"], list):
                             dias_permitidos = ", ".join(config["dias_permitidos"])
                             tipo_restriccion = config.get("tipo", "no definido")
-                            print(f"  {tipo_descanso}: {dias_permitidos} (tipo: {tipo_restriccion})")
+                            logger.info("  %s: %s (tipo: %s)", tipo_descanso, dias_permitidos, tipo_restriccion)
                         else:
-                            print(f"  {tipo_descanso}: Configuración incompleta")
+                            logger.info("  %s: Configuración incompleta", tipo_descanso)
         
-        print("\n=== RESTRICCIONES DE FECHAS ESPECÍFICAS (MÁXIMA PRIORIDAD) ===")
+        logger.info("\n=== RESTRICCIONES DE FECHAS ESPECÍFICAS (MÁXIMA PRIORIDAD) ===")
         
         if not self.turnos_fechas_especificas:
-            print("No hay restricciones de fechas específicas configuradas.")
+            logger.info("No hay restricciones de fechas específicas configuradas.")
         else:
             for empleado, restricciones in self.turnos_fechas_especificas.items():
-                print(f"\nEmpleado: {empleado}")
+                logger.info("\nEmpleado: %s", empleado)
                 for restriccion in restricciones:
                     fecha = restriccion["fecha"]
                     turno = restriccion["turno_requerido"]
-                    print(f"  {fecha}: {turno} obligatorio")
+                    logger.info("  %s: %s obligatorio", fecha, turno)
         
-        print("\n=== TURNOS ESPECIALES EXTENDIDOS (ADICIONALES A DESC/TROP) ===")
+        logger.info("\n=== TURNOS ESPECIALES EXTENDIDOS (ADICIONALES A DESC/TROP) ===")
         
         if not self.turnos_especiales:
-            print("No hay turnos especiales configurados.")
+            logger.info("No hay turnos especiales configurados.")
         else:
             for empleado, restricciones in self.turnos_especiales.items():
-                print(f"\nEmpleado: {empleado}")
+                logger.info("\nEmpleado: %s", empleado)
                 for restriccion in restricciones:
                     tipo = restriccion["tipo"]
                     frecuencia = restriccion["frecuencia"]
                     dia_semana = restriccion["dia_semana"]
-                    print(f"  {tipo}: {frecuencia} en {dia_semana}")
+                    logger.info("  %s: %s en %s", tipo, frecuencia, dia_semana)
         
-        print("\n=== TRABAJADORES FUERA DE OPERACIÓN (EXCLUIDOS COMPLETAMENTE) ===")
+        logger.info("\n=== TRABAJADORES FUERA DE OPERACIÓN (EXCLUIDOS COMPLETAMENTE) ===")
         
         if not self.trabajadores_fuera_operacion:
-            print("No hay trabajadores fuera de operación configurados.")
+            logger.info("No hay trabajadores fuera de operación configurados.")
         else:
             for empleado in self.trabajadores_fuera_operacion:
-                print(f"  {empleado}: Sin asignación de turnos (fuera de operación)")
+                logger.info("  %s: Sin asignación de turnos (fuera de operación)", empleado)
         
         # Mostrar resumen de trabajadores activos vs fuera de operación
         trabajadores_activos = self._obtener_trabajadores_activos()
         trabajadores_fuera = self._obtener_trabajadores_fuera_operacion()
         
-        print(f"\n📊 RESUMEN DE TRABAJADORES:")
-        print(f"  Total de empleados: {len(self.empleados)}")
-        print(f"  Trabajadores activos: {len(trabajadores_activos)}")
-        print(f"  Trabajadores fuera de operación: {len(trabajadores_fuera)}")
+        logger.info("\n📊 RESUMEN DE TRABAJADORES:")
+        logger.info("  Total de empleados: %s", len(self.empleados))
+        logger.info("  Trabajadores activos: %s", len(trabajadores_activos))
+        logger.info("  Trabajadores fuera de operación: %s", len(trabajadores_fuera))
         
         # Mostrar información sobre días festivos
         dias_festivos_semana = self._obtener_dias_festivos_semana()
         if dias_festivos_semana:
-            print(f"\n🎉 DÍAS FESTIVOS EN LA SEMANA SELECCIONADA:")
+            logger.info("\n🎉 DÍAS FESTIVOS EN LA SEMANA SELECCIONADA:")
             for dia_festivo in dias_festivos_semana:
                 fecha = dia_festivo['fecha']
                 formato = dia_festivo['formato_dia']
-                print(f"  {formato} ({fecha.strftime('%d/%m/%Y')}): Día festivo - Sin descansos automáticos")
+                logger.info("  %s (%s): Día festivo - Sin descansos automáticos", formato, fecha.strftime('%d/%m/%Y'))
         else:
-            print(f"\n📅 DÍAS FESTIVOS EN LA SEMANA SELECCIONADA:")
-            print("  No hay días festivos en esta semana")
+            logger.info("\n📅 DÍAS FESTIVOS EN LA SEMANA SELECCIONADA:")
+            logger.info("  No hay días festivos en esta semana")
         
-        print(f"\n📋 DÍAS FESTIVOS CONFIGURADOS PARA 2025:")
+        logger.info("\n📋 DÍAS FESTIVOS CONFIGURADOS PARA 2025:")
         for fecha_str in self.dias_festivos:
             fecha = datetime.strptime(fecha_str, "%Y-%m-%d").date()
-            print(f"  {fecha.strftime('%d/%m/%Y')}: {fecha_str}")
+            logger.info("  %s: %s", fecha.strftime('%d/%m/%Y'), fecha_str)
     
     def _tiene_turnos_especiales(self, empleado):
         """Verifica si un empleado tiene turnos especiales"""
         return empleado in self.turnos_especiales
     
+    def _precalcular_turnos_especiales_semana(self):
+        """Turnos especiales semanales con el formato de día de la semana actual, por empleado"""
+        turnos_por_empleado = {}
+        for empleado, turnos in self.restricciones_compiladas.especiales_semanales.items():
+            turnos_por_empleado[empleado] = [
+                {
+                    "tipo": tipo,
+                    "indice_dia": indice_dia,
+                    "formato_dia": self.dias_mes[indice_dia]['formato'],
+                    "dia_semana": dia_semana
+                }
+                for indice_dia, tipo, dia_semana in turnos
+                if indice_dia < len(self.dias_mes)  # Verificar que el día existe en la semana actual
+            ]
+        return turnos_por_empleado
+    
     def _obtener_turnos_especiales_semana(self, empleado):
         """Obtiene los turnos especiales que se aplican en la semana actual"""
-        if not self._tiene_turnos_especiales(empleado):
-            return []
-        
-        turnos_especiales = []
-        
-        for turno_esp in self.turnos_especiales[empleado]:
-            if turno_esp["frecuencia"] == "semanal_fijo":
-                dia_semana = turno_esp["dia_semana"]
-                if dia_semana in self.mapeo_dias:
-                    indice_dia = self.mapeo_dias[dia_semana]
-                    # Verificar que el día existe en la semana actual
-                    if indice_dia < len(self.dias_mes):
-                        turnos_especiales.append({
-                            "tipo": turno_esp["tipo"],
-                            "indice_dia": indice_dia,
-                            "formato_dia": self.dias_mes[indice_dia]['formato'],
-                            "dia_semana": dia_semana
-                        })
-        
-        return turnos_especiales
+        return self._turnos_especiales_semana.get(empleado, [])
     
     def _asignar_turnos_especiales(self, empleado, empleado_idx, dias_semana, descansos_por_dia, historial_dias, semana_num):
         """Asigna turnos especiales (ADICIONALES a DESC/TROP)"""
@@ -2128,31 +2303,15 @@ class GeneradorDescansosSeparacion:
     
     def _tiene_turno_especial_completo(self, empleado):
         """Verifica si un empleado tiene un turno especial que ocupa toda la semana (VACA, COME, COMT, etc.)"""
-        if empleado not in self.turnos_fechas_especificas:
-            return False
-        
-        # Obtener las fechas específicas del empleado para esta semana
-        fechas_especificas = self._obtener_fechas_especificas_semana(empleado)
-        
-        if not fechas_especificas:
-            return False
-        
-        # Tipos de turnos que se consideran "completos" (reemplazan DESC/TROP)
-        turnos_completos = CONFIGURACION_GENERAL["turnos_completos"]
-        
-        # Verificar si todos los turnos especiales son del tipo "completo"
-        turnos_especificos = [fecha['turno_requerido'] for fecha in fechas_especificas]
-        todos_son_completos = all(turno in turnos_completos for turno in turnos_especificos)
-        
-        if not todos_son_completos:
-            return False
-        
-        # Contar cuántos días de la semana tiene turnos especiales completos
-        dias_con_turnos_especiales = len(fechas_especificas)
-        dias_laborables_semana = len([d for d in self.dias_mes if not d['es_domingo']])  # Excluir domingo
-        
-        # Si tiene turnos especiales completos en la mayoría de días laborables (>=4 días), es un turno completo
-        return dias_con_turnos_especiales >= min(4, dias_laborables_semana)
+        if empleado not in self._turno_especial_completo:
+            self._turno_especial_completo[empleado] = self._calcular_turno_especial_completo(empleado)
+        return self._turno_especial_completo[empleado]
+    
+    def _calcular_turno_especial_completo(self, empleado):
+        # Turnos completos (reemplazan DESC/TROP) en la mayoría de días laborables (>=4 días)
+        return self.restricciones_compiladas.turno_completo(
+            empleado, self.dias_mes, CONFIGURACION_GENERAL["turnos_completos"]
+        )
     
     def _obtener_trabajadores_disponibles_para_desc_trop(self):
         """Obtiene trabajadores que pueden recibir turnos DESC/TROP normales"""
@@ -2173,38 +2332,34 @@ class GeneradorDescansosSeparacion:
     
     def _es_dia_festivo(self, fecha):
         """Verifica si una fecha es un día festivo"""
-        fecha_str = fecha.strftime('%Y-%m-%d')
-        return fecha_str in self.dias_festivos
+        return self.calendario.es_festivo(fecha)
     
     def _obtener_dias_festivos_semana(self):
         """Obtiene los días festivos que caen en la semana actual"""
-        dias_festivos_semana = []
-        for i, fecha in enumerate(self.fechas_semana):
-            if self._es_dia_festivo(fecha):
-                dias_festivos_semana.append({
-                    'fecha': fecha,
-                    'indice_dia': i,
-                    'formato_dia': self.dias_mes[i]['formato']
-                })
-        return dias_festivos_semana
+        return [{
+            'fecha': dia['fecha'],
+            'indice_dia': dia['dia_semana'],
+            'formato_dia': dia['formato']
+        } for dia in self.calendario.festivos_semana(self.semana_seleccionada)]
     
     def _es_dia_no_laborable(self, dia_info):
         """Verifica si un día no es laborable (domingo o festivo)"""
-        return dia_info['es_domingo'] or self._es_dia_festivo(dia_info['fecha'])
+        return dia_info['es_no_laborable']
     
     def _asignar_sabados_por_cascada_estricta(self):
         """
         SISTEMA DE CASCADA ESTRICTO: Asigna sábados exclusivamente por orden de prioridad
         
         1️⃣ Calcular cuántos cupos de sábado necesitamos para mantener paridad
-        2️⃣ Llenar cupos ESTRICTAMENTE por cascada: Nivel 4 → 3 → 2 → 1 → 0
+        2️⃣ Llenar cupos con el plan de sábados del horizonte (planificador_sabados): menor intervalo
+           máximo entre sábados por trabajador, ausencias conocidas y desempates rotativos
         3️⃣ NO permitir asignaciones aleatorias fuera del sistema
         
         Returns:
             list: Lista de empleados que DEBEN recibir TROP en sábado (orden estricto de prioridad)
         """
         
-        print("\n🎯 === SISTEMA DE CASCADA ESTRICTO PARA SÁBADOS ===")
+        logger.debug("\n🎯 === SISTEMA DE CASCADA ESTRICTO PARA SÁBADOS ===")
         
         # PASO 1: Calcular cuántos cupos de sábado necesitamos para mantener paridad
         trabajadores_activos = self._obtener_trabajadores_activos()
@@ -2214,23 +2369,23 @@ class GeneradorDescansosSeparacion:
         total_trabajadores_activos = len(trabajadores_activos)
         total_trabajadores_disponibles = len(trabajadores_disponibles_desc_trop)
         
-        # Objetivo: Fórmula personalizada (trabajadores_disponibles - 11) con límites 4-11
-        cupos_sabado_objetivo = (total_trabajadores_disponibles - 11)# max(4, min(11, total_trabajadores_disponibles - 11))  # Entre 4-11 empleados
+        cupos_sabado_objetivo = self._calcular_cupos_sabado(total_trabajadores_disponibles)
         
-        print(f"📊 Trabajadores activos: {total_trabajadores_activos}")
+        logger.debug("📊 Trabajadores activos: %s", total_trabajadores_activos)
         
         # Debug detallado de detección de turnos completos
-        print(f"🔍 DEBUG - Análisis de turnos completos:")
-        for empleado in trabajadores_activos:
-            tiene_turno_completo = self._tiene_turno_especial_completo(empleado)
-            if empleado in self.turnos_fechas_especificas:
-                fechas_especificas = self._obtener_fechas_especificas_semana(empleado)
-                turnos_tipos = [fecha['turno_requerido'] for fecha in fechas_especificas] if fechas_especificas else []
-                print(f"  {empleado}: {len(fechas_especificas)} días, turnos={turnos_tipos}, completo={tiene_turno_completo}")
-        
-        print(f"📊 Trabajadores con turnos completos: {len(trabajadores_con_turnos_completos)} {trabajadores_con_turnos_completos}")
-        print(f"📊 Trabajadores disponibles para DESC/TROP: {total_trabajadores_disponibles}")
-        print(f"🎯 Cupos de sábado objetivo (fórmula: max(4, min(11, {total_trabajadores_disponibles} - 11))): {cupos_sabado_objetivo}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔍 DEBUG - Análisis de turnos completos:")
+            for empleado in trabajadores_activos:
+                tiene_turno_completo = self._tiene_turno_especial_completo(empleado)
+                if empleado in self.turnos_fechas_especificas:
+                    fechas_especificas = self._obtener_fechas_especificas_semana(empleado)
+                    turnos_tipos = [fecha['turno_requerido'] for fecha in fechas_especificas] if fechas_especificas else []
+                    logger.debug("  %s: %s días, turnos=%s, completo=%s", empleado, len(fechas_especificas), turnos_tipos, tiene_turno_completo)
+        
+        logger.debug("📊 Trabajadores con turnos completos: %s %s", len(trabajadores_con_turnos_completos), trabajadores_con_turnos_completos)
+        logger.debug("📊 Trabajadores disponibles para DESC/TROP: %s", total_trabajadores_disponibles)
+        logger.debug("🎯 Cupos de sábado objetivo (fórmula: max(4, min(11, %s - 11))): %s", total_trabajadores_disponibles, cupos_sabado_objetivo)
         
         # PASO 2: Agrupar empleados por nivel de prioridad (solo los que pueden trabajar sábado)
         empleados_por_nivel = {
@@ -2258,7 +2413,7 @@ class GeneradorDescansosSeparacion:
                         empleados_por_nivel[-2].append(empleado)  # Casos extraños
         
         # PASO 3: Mostrar distribución por niveles
-        print("\n📋 DISTRIBUCIÓN POR NIVELES DE PRIORIDAD:")
+        logger.debug("\n📋 DISTRIBUCIÓN POR NIVELES DE PRIORIDAD:")
         for nivel in [4, 3, 2, 1, 0, -1, -2]:
             empleados = empleados_por_nivel[nivel]
             if empleados:
@@ -2271,48 +2426,63 @@ class GeneradorDescansosSeparacion:
                     -1: "Negativos (PENALIZACIÓN LEVE)",
                     -2: "Negativos (PENALIZACIÓN FUERTE)"
                 }
-                print(f"  Nivel {nivel} ({nivel_desc[nivel]}): {empleados} ({len(empleados)} empleados)")
+                logger.debug("  Nivel %s (%s): %s (%s empleados)", nivel, nivel_desc[nivel], empleados, len(empleados))
         
-        # PASO 4: CASCADA ESTRICTA - Llenar cupos por orden de prioridad (SIN ALEATORIZACIÓN)
-        empleados_asignados_sabado = []
-        cupos_restantes = cupos_sabado_objetivo
+        # PASO 4: PLAN DE SÁBADOS SOBRE EL HORIZONTE - ausencias conocidas, desempates rotativos (SIN ALEATORIZACIÓN)
+        if self.plan_sabados is None or self.semana_seleccionada not in self.plan_sabados:
+            elegibles_por_semana, cupos_por_semana = self._calcular_horizonte_sabados()
+            self.plan_sabados, intervalo_maximo = planificar_sabados(
+                self.semana_seleccionada, self.historial_sabados, elegibles_por_semana, cupos_por_semana, self.año
+            )
+            logger.debug("\n🗓️  PLAN DE SÁBADOS (%s semanas, intervalo máximo %s):", len(cupos_por_semana), intervalo_maximo)
+            for semana, empleados in self.plan_sabados.items():
+                logger.debug("  Semana %s: %s", semana, empleados)
         
-        print(f"\n🔄 INICIANDO CASCADA ESTRICTA (Cupos objetivo: {cupos_restantes}):")
+        empleados_asignados_sabado = list(self.plan_sabados[self.semana_seleccionada])
+        cupos_restantes = cupos_sabado_objetivo - len(empleados_asignados_sabado)
         
-        for nivel in [4, 3, 2, 1, 0, -1, -2]:  # Orden estricto de mayor a menor prioridad
-            if cupos_restantes <= 0:
-                break
-                
-            empleados_nivel = empleados_por_nivel[nivel]
-            if not empleados_nivel:
-                continue
-            
-            # ORDEN ALFABÉTICO dentro del mismo nivel para consistencia (no aleatorio)
-            empleados_nivel_ordenados = sorted(empleados_nivel)
-            
-            # Tomar empleados hasta agotar el nivel o llenar cupos
-            empleados_a_tomar = min(len(empleados_nivel_ordenados), cupos_restantes)
-            empleados_seleccionados = empleados_nivel_ordenados[:empleados_a_tomar]
-            
-            empleados_asignados_sabado.extend(empleados_seleccionados)
-            cupos_restantes -= empleados_a_tomar
-            
-            nivel_desc = {
-                4: "PRIORIDAD MÁXIMA", 3: "PRIORIDAD ALTA", 2: "PRIORIDAD MEDIA",
-                1: "PRIORIDAD BAJA", 0: "SIN PRIORIDAD", -1: "PENALIZACIÓN LEVE", -2: "PENALIZACIÓN FUERTE"
-            }
-            
-            print(f"  🥇 Nivel {nivel} ({nivel_desc[nivel]}): {empleados_seleccionados} → {empleados_a_tomar} asignados")
+        for empleado in empleados_asignados_sabado:
+            nivel = self.prioridades_sabados[empleado]['nivel_prioridad']
+            logger.debug("  🥇 %s (nivel %s)", empleado, nivel)
         
         # PASO 5: Verificar resultado
         if cupos_restantes > 0:
-            print(f"⚠️  ADVERTENCIA: Quedan {cupos_restantes} cupos sin llenar (insuficientes empleados elegibles)")
+            logger.warning("⚠️  ADVERTENCIA: Quedan %s cupos sin llenar (insuficientes empleados elegibles)", cupos_restantes)
         
-        print(f"\n✅ RESULTADO CASCADA ESTRICTA: {len(empleados_asignados_sabado)} empleados asignados a sábado")
-        print(f"🎯 Empleados seleccionados (orden de prioridad): {empleados_asignados_sabado}")
+        logger.debug("\n✅ RESULTADO CASCADA ESTRICTA: %s empleados asignados a sábado", len(empleados_asignados_sabado))
+        logger.debug("🎯 Empleados seleccionados (orden de prioridad): %s", empleados_asignados_sabado)
         
         return empleados_asignados_sabado
     
+    def _calcular_cupos_sabado(self, total_trabajadores_disponibles):
+        """Cupos de sábado de una semana: fórmula personalizada (trabajadores_disponibles - 11)"""
+        return total_trabajadores_disponibles - 11  # max(4, min(11, total_trabajadores_disponibles - 11))  # Entre 4-11 empleados
+    
+    def _calcular_horizonte_sabados(self):
+        """
+        Elegibles y cupos de sábado para cada semana del horizonte (desde la semana seleccionada)
+        
+        Elegible: activo, sin turno completo esa semana, puede trabajar sábado y sin fecha específica ese sábado
+        """
+        turnos_completos = CONFIGURACION_GENERAL["turnos_completos"]
+        trabajadores_activos = self._obtener_trabajadores_activos()
+        ultima_semana = min(self.semana_seleccionada + self.horizonte_sabados - 1, self.total_semanas_año)
+        
+        elegibles_por_semana = []
+        cupos_por_semana = []
+        for semana in range(self.semana_seleccionada, ultima_semana + 1):
+            dias = self.calendario.dias(semana)
+            sabado = dias[5]['fecha']
+            disponibles = [emp for emp in trabajadores_activos
+                           if not self.restricciones_compiladas.turno_completo(emp, dias, turnos_completos)]
+            elegibles_por_semana.append({
+                emp for emp in disponibles
+                if self._puede_trabajar_sabado(emp) and sabado not in self.restricciones_compiladas.fechas.get(emp, {})
+            })
+            cupos_por_semana.append(self._calcular_cupos_sabado(len(disponibles)))
+        
+        return elegibles_por_semana, cupos_por_semana
+    
     def _asignar_descansos_con_sabado_forzado(self, empleado, dias_disponibles, descansos_por_dia, historial_dias, empleado_idx, turnos_especiales=None):
         """
         Asigna DESC y TROP garantizando que TROP caiga en sábado (por cascada automática)
@@ -2332,7 +2502,7 @@ class GeneradorDescansosSeparacion:
         if turnos_especiales is None:
             turnos_especiales = {}
         
-        print(f"🎯 {empleado}: ASIGNACIÓN FORZADA DE SÁBADO (por cascada)")
+        logger.debug("🎯 %s: ASIGNACIÓN FORZADA DE SÁBADO (por cascada)", empleado)
         
         # PASO 1: Encontrar el sábado en los días disponibles
         sabado_info = None
@@ -2347,14 +2517,14 @@ class GeneradorDescansosSeparacion:
                     otros_dias.append(dia_info)
         
         if not sabado_info:
-            print(f"❌ {empleado}: No hay sábado disponible en esta semana")
+            logger.warning("❌ %s: No hay sábado disponible en esta semana", empleado)
             # Fallback a asignación normal
             return self._asignar_descansos_separados_semana(
                 dias_disponibles, descansos_por_dia, historial_dias, empleado_idx, self.semana_seleccionada, empleado=empleado
             )
         
         if len(otros_dias) < 1:
-            print(f"❌ {empleado}: No hay suficientes días disponibles para DESC")
+            logger.warning("❌ %s: No hay suficientes días disponibles para DESC", empleado)
             # Fallback a asignación normal
             return self._asignar_descansos_separados_semana(
                 dias_disponibles, descansos_por_dia, historial_dias, empleado_idx, self.semana_seleccionada, empleado=empleado
@@ -2370,23 +2540,18 @@ class GeneradorDescansosSeparacion:
         # Verificar si el empleado tiene restricción fija para DESC
         if self._es_seleccion_fija(empleado, "DESC"):
             dias_permitidos_desc = self._obtener_dias_permitidos_tipo(empleado, "DESC")
-            print(f"🎯 {empleado}: Tiene restricción fija DESC para: {dias_permitidos_desc}")
+            logger.debug("🎯 %s: Tiene restricción fija DESC para: %s", empleado, dias_permitidos_desc)
             
             # Buscar el día requerido entre los días disponibles (solo si hay días permitidos)
             if dias_permitidos_desc:
                 for dia_requerido in dias_permitidos_desc:
                     for dia_info in otros_dias:
                         # Mapear día en español a día en inglés del formato
-                        mapeo_dias_formato = {
-                            "lunes": "MON", "martes": "TUE", "miércoles": "WED", 
-                            "jueves": "THU", "viernes": "FRI", "sábado": "SAT", "domingo": "SUN"
-                        }
-                        
-                        if dia_requerido in mapeo_dias_formato:
-                            dia_formato_requerido = mapeo_dias_formato[dia_requerido]
+                        if dia_requerido in DIA_ES_A_FORMATO:
+                            dia_formato_requerido = DIA_ES_A_FORMATO[dia_requerido]
                             if dia_info['formato'].startswith(dia_formato_requerido):
                                 dia_desc_seleccionado = dia_info
-                                print(f"✅ {empleado}: DESC asignado en día requerido: {dia_info['formato']} ({dia_requerido})")
+                                logger.debug("✅ %s: DESC asignado en día requerido: %s (%s)", empleado, dia_info['formato'], dia_requerido)
                                 break
                     
                     if dia_desc_seleccionado:
@@ -2394,7 +2559,7 @@ class GeneradorDescansosSeparacion:
             
             # Si no encontró el día requerido, mostrar advertencia
             if not dia_desc_seleccionado:
-                print(f"⚠️ {empleado}: No se pudo asignar DESC en día requerido {dias_permitidos_desc}, usando día alternativo")
+                logger.warning("⚠️ %s: No se pudo asignar DESC en día requerido %s, usando día alternativo", empleado, dias_permitidos_desc)
         
         # Si no tiene restricción fija o no se pudo cumplir, usar lógica original
         if not dia_desc_seleccionado:
@@ -2417,11 +2582,11 @@ class GeneradorDescansosSeparacion:
             
             # Seleccionar el día con menos descansos para DESC
             dia_desc_seleccionado = min(dias_antes_sabado, key=lambda d: descansos_por_dia.get(d['formato'], 0))
-            print(f"🔄 {empleado}: DESC asignado por lógica estándar: {dia_desc_seleccionado['formato']}")
+            logger.debug("🔄 %s: DESC asignado por lógica estándar: %s", empleado, dia_desc_seleccionado['formato'])
         
         # Verificar que se encontró un día válido
         if not dia_desc_seleccionado:
-            print(f"❌ {empleado}: No se pudo encontrar día válido para DESC")
+            logger.warning("❌ %s: No se pudo encontrar día válido para DESC", empleado)
             # Fallback a asignación normal
             return self._asignar_descansos_separados_semana(
                 dias_disponibles, descansos_por_dia, historial_dias, empleado_idx, self.semana_seleccionada, empleado=empleado
@@ -2441,12 +2606,179 @@ class GeneradorDescansosSeparacion:
             formato_sabado: 'TROP'
         }
         
-        print(f"✅ {empleado}: DESC={formato_desc}, TROP={formato_sabado} (SÁBADO FORZADO)")
+        logger.debug("✅ %s: DESC=%s, TROP=%s (SÁBADO FORZADO)", empleado, formato_desc, formato_sabado)
         
         return resultado
 
+def generar_rango_semanas(semana_inicio=1, semana_fin=None, año=2025, num_empleados=25, nombre_archivo=None):
+    """
+    Genera las semanas semana_inicio..semana_fin (ambas incluidas) en un solo proceso
+    
+    - El historial de sábados se lee una sola vez y se arrastra en memoria de una semana a la siguiente
+    - Los sábados de todas las semanas se registran al final en historial_sabados.db (una sola transacción)
+    - Se escribe un solo libro Excel con una hoja por semana
+    - semana_fin=None genera hasta la última semana del año
+    - El detalle de cada semana va al logger en nivel DEBUG; el progreso por semana en INFO
+    
+    Returns:
+        dict: {semana: DataFrame} con el horario de cada semana generada
+    """
+    historial = None
+    generadores = {}
+    horarios = {}
+    
+    semana = semana_inicio
+    while semana_fin is None or semana <= semana_fin:
+        generador = GeneradorDescansosSeparacion(
+            año=año, mes=1, num_empleados=num_empleados, semana_especifica=semana,
+            historial_sabados=historial, guardar_historial=False
+        )
+        if semana_fin is None:
+            semana_fin = generador.total_semanas_año
+        if generador.semana_seleccionada != semana:
+            # _seleccionar_semana cae a julio si la semana está fuera de rango
+            logger.warning("⚠️ Semana %s fuera de rango (1-%s) - Fin del lote", semana, generador.total_semanas_año)
+            break
+        
+        horario = generador.generar_horario_primera_semana()
+        
+        historial = generador.historial_sabados_actualizado
+        generadores[semana] = generador
+        horarios[semana] = horario
+        logger.info("📅 Semana %s generada (%s - %s)", semana, generador.fechas_semana[0].strftime('%d/%m/%Y'), generador.fechas_semana[6].strftime('%d/%m/%Y'))
+        semana += 1
+    
+    if not horarios:
+        logger.warning("❌ No se generó ninguna semana")
+        return horarios
+    
+    # Un solo libro con una hoja por semana
+    primera, ultima = min(horarios), max(horarios)
+    if nombre_archivo is None:
+        nombre_archivo = f'horario_descansos_semanas_{primera}_{ultima}_{año}.xlsx'
+    reportes = {semana: generadores[semana].validar_semana(horario) for semana, horario in horarios.items()}
+    wb = libro_solo_escritura()
+    for semana, horario in horarios.items():
+        generadores[semana]._escribir_hoja(wb, horario, reportes[semana])
+    wb.save(nombre_archivo)
+    
+    # Historial persistido una sola vez, semana a semana
+    generadores[ultima]._registrar_sabados({semana: generadores[semana].sabados_semana for semana in horarios})
+    
+    # Validación de todas las semanas (reporte por columnas, sin recorrer celdas)
+    incumplen = [semana for semana in horarios if not reportes[semana].cumple_regla_desc_trop]
+    if incumplen:
+        logger.warning("⚠️ Semanas que no cumplen la regla DESC/TROP: %s", incumplen)
+    else:
+        logger.info("✅ Todas las semanas cumplen la regla DESC/TROP")
+    
+    logger.info("\n📊 %s semanas (%s-%s) exportadas a: %s", len(horarios), primera, ultima, nombre_archivo)
+    return horarios
+
+def reproducir_semana(archivo_registro):
+    """
+    Reproduce exactamente una semana a partir de su registro de decisiones (exportar_registro_decisiones)
+    
+    - Usa el historial de sábados guardado en el registro y no modifica historial_sabados.db
+    - Avisa si la configuración actual no coincide con la huella registrada; si el código tomó otro camino
+      falla con ValueError en la primera decisión que diverge
+    
+    Returns:
+        DataFrame: el horario de la semana
+    """
+    with open(archivo_registro, 'r', encoding='utf-8') as archivo:
+        registro = json.load(archivo)
+    
+    generador = GeneradorDescansosSeparacion(
+        año=registro['año'], mes=1, num_empleados=registro['num_empleados'],
+        semana_especifica=registro['semana'], historial_sabados=registro['historial_sabados'],
+        guardar_historial=False, semilla=registro['semilla'], registro_decisiones=registro['decisiones'],
+        horizonte_sabados=registro.get('horizonte_sabados', 6)
+    )
+    if generador.huella_configuracion() != registro['huella_configuracion']:
+        logger.warning("⚠️ La configuración cambió desde que se generó el registro (%s → %s)", registro['huella_configuracion'], generador.huella_configuracion())
+    
+    return generador.generar_horario_primera_semana()
+
+def _evaluar_semana(generador, horario):
+    """
+    Puntúa una semana generada (menor es mejor) con el reporte de validación (validar_semana):
+    - regla DESC/TROP: incumplir el orden DESC → TROP pesa más que todo lo demás
+    - número de empleados con descansos consecutivos
+    - varianza del personal disponible en los días laborables (paridad diaria)
+    """
+    reporte = generador.validar_semana(horario)
+    cumple_regla = reporte.cumple_regla_desc_trop
+    
+    laborables = np.array([not dia_info['es_no_laborable'] for dia_info in generador.dias_mes])
+    personal_disponible = reporte.personal_disponible[laborables].tolist()
+    varianza_personal = float(np.var(personal_disponible)) if personal_disponible else 0.0
+    
+    return {
+        'cumple_regla': cumple_regla,
+        'consecutivos': reporte.consecutivos,
+        'varianza_personal': varianza_personal,
+        'personal_disponible': personal_disponible,
+        'puntaje': (0 if cumple_regla else 1, reporte.consecutivos, round(varianza_personal, 6))
+    }
+
+def _generar_muestra(parametros):
+    """Genera y puntúa una semana candidata (se ejecuta en un proceso del pool)"""
+    semana, año, num_empleados, semilla, historial = parametros
+    generador = GeneradorDescansosSeparacion(
+        año=año, mes=1, num_empleados=num_empleados, semana_especifica=semana,
+        historial_sabados=historial, guardar_historial=False, semilla=semilla
+    )
+    horario = generador.generar_horario_primera_semana()
+    metricas = _evaluar_semana(generador, horario)
+    return semilla, horario, metricas, generador.sabados_semana
+
+def muestrear_semana(semana, n_muestras=16, año=2025, num_empleados=25, semilla_base=0, max_procesos=None,
+                     historial_sabados=None, guardar_historial=True, nombre_archivo=None):
+    """
+    Genera n_muestras versiones de la misma semana en paralelo y se queda con la mejor
+    
+    - Cada muestra usa la semilla semilla_base + i, así que el resultado es reproducible
+    - Las muestras se reparten en un ProcessPoolExecutor (max_procesos=None usa todos los núcleos)
+    - Puntaje (menor es mejor): (incumple regla DESC/TROP, descansos consecutivos, varianza de personal disponible);
+      a igual puntaje gana la semilla menor
+    - Solo la muestra elegida se registra en historial_sabados.db y se exporta a Excel
+    
+    Returns:
+        dict: 'semilla', 'horario' (DataFrame), 'metricas' y 'puntajes' ({semilla: puntaje} de todas las muestras)
+    """
+    # Cargar el historial una sola vez y repartirlo a las muestras
+    generador = GeneradorDescansosSeparacion(
+        año=año, mes=1, num_empleados=num_empleados, semana_especifica=semana,
+        historial_sabados=historial_sabados, guardar_historial=False
+    )
+    historial = generador.historial_sabados
+    
+    parametros = [(semana, año, num_empleados, semilla_base + i, historial) for i in range(n_muestras)]
+    logger.info("🎲 Generando %s muestras de la semana %s (semillas %s-%s)", n_muestras, generador.semana_seleccionada, semilla_base, semilla_base + n_muestras - 1)
+    with ProcessPoolExecutor(max_workers=max_procesos) as executor:
+        resultados = list(executor.map(_generar_muestra, parametros))
+    
+    semilla, horario, metricas, sabados_semana = min(resultados, key=lambda r: (r[2]['puntaje'], r[0]))
+    puntajes = {r[0]: r[2]['puntaje'] for r in resultados}
+    
+    logger.info("🏆 Mejor muestra: semilla %s → regla DESC/TROP %s, consecutivos=%s, varianza personal=%.2f",
+                semilla, '✅' if metricas['cumple_regla'] else '❌', metricas['consecutivos'], metricas['varianza_personal'])
+    
+    if guardar_historial:
+        generador._registrar_sabados({generador.semana_seleccionada: sabados_semana})
+    if nombre_archivo is None:
+        nombre_archivo = f'horario_descansos_semana_{generador.semana_seleccionada}_mejor_de_{n_muestras}_{año}.xlsx'
+    generador.exportar_excel(horario, nombre_archivo)
+    logger.info("📊 Archivo: %s", nombre_archivo)
+    
+    return {'semilla': semilla, 'horario': horario, 'metricas': metricas, 'puntajes': puntajes}
+
 def main():
     """Función principal que ejecuta el generador"""
+    # Ejecución interactiva: todo el detalle a consola, como antes del registro por niveles
+    configurar_registro(logging.DEBUG)
+    
     print("=== GENERADOR DE DESCANSO CON SEPARACIÓN Y ALEATORIZACIÓN - SEMANA 26 2025 ===")
     
     # Crear instancia del generador para semana específica
@@ -2488,9 +2820,9 @@ def main():
     # Mostrar resumen de descansos por empleado
     print("\n=== RESUMEN DE DESCANSO POR EMPLEADO ===")
     for idx, empleado in enumerate(generador.empleados):
-        desc_count = sum(1 for col in horario.columns if col.startswith(('MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN')) 
+        desc_count = sum(1 for col in horario.columns if col.startswith(NOMBRES_DIAS) 
                         and horario.iloc[idx][col] == 'DESC')
-        trop_count = sum(1 for col in horario.columns if col.startswith(('MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN')) 
+        trop_count = sum(1 for col in horario.columns if col.startswith(NOMBRES_DIAS) 
                         and horario.iloc[idx][col] == 'TROP')
         print(f"Empleado {idx+1} ({empleado}): DESC={desc_count}, TROP={trop_count}")
     
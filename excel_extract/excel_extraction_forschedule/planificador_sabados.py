@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Planificador de Sábados - Sistema de Turnos
+===========================================
+Reparte los cupos de TROP en sábado sobre un horizonte de varias semanas (no una sola).
+
+- Minimiza el mayor intervalo, en semanas, entre dos sábados de un mismo trabajador
+- Usa las ausencias conocidas: quien no es elegible una semana no puede recibir ese sábado,
+  así que se adelanta a quien tiene menos oportunidades antes de su límite
+- Los empates se rotan semana a semana (no alfabéticos): no gana siempre la misma sigla
+- El historial trae (año, semana): un sábado del año anterior cuenta las semanas reales transcurridas
+"""
+
+import zlib
+
+from calendario_semanas import indice_semana
+
+# Peso de "nunca ha tenido sábado": siempre antes que cualquier semana registrada
+NUNCA = float('-inf')
+
+
+def _rotacion(empleado, semana):
+    """Desempate determinista que cambia cada semana (crc32: estable entre procesos)"""
+    return zlib.crc32(f"{empleado}-{semana}".encode('utf-8'))
+
+
+def _simular_plan(semana_inicio, ultima_inicial, elegibles_por_semana, cupos_por_semana, intervalo_maximo):
+    """
+    Plan voraz para un intervalo máximo dado: cada semana toma a los elegibles con menos holgura
+    (semanas elegibles que les quedan antes de su límite ultima + intervalo_maximo).
+
+    Returns:
+        tuple: (plan {semana: [empleados]}, cumple) - cumple es False si algún elegible llegó a su
+        límite sin recibir sábado
+    """
+    ultima = dict(ultima_inicial)
+    plan = {}
+    cumple = True
+
+    for i, (elegibles, cupos) in enumerate(zip(elegibles_por_semana, cupos_por_semana)):
+        semana = semana_inicio + i
+
+        def prioridad(empleado):
+            if ultima[empleado] == NUNCA:
+                return (NUNCA, NUNCA, _rotacion(empleado, semana))
+            limite = ultima[empleado] + intervalo_maximo
+            # Semanas elegibles desde hoy hasta el límite (fuera del horizonte se suponen elegibles)
+            holgura = sum(1 for j in range(i, min(limite - semana_inicio + 1, len(elegibles_por_semana)))
+                          if empleado in elegibles_por_semana[j])
+            holgura += max(limite - semana_inicio + 1 - len(elegibles_por_semana), 0)
+            return (holgura, ultima[empleado], _rotacion(empleado, semana))
+
+        candidatos = sorted(elegibles, key=prioridad)
+        seleccionados = candidatos[:max(cupos, 0)]
+        plan[semana] = seleccionados
+
+        for empleado in candidatos[len(seleccionados):]:
+            if ultima[empleado] != NUNCA and semana - ultima[empleado] >= intervalo_maximo:
+                cumple = False
+        for empleado in seleccionados:
+            ultima[empleado] = semana
+
+    return plan, cumple
+
+
+def planificar_sabados(semana_inicio, historial_sabados, elegibles_por_semana, cupos_por_semana, año):
+    """
+    Plan de sábados para las semanas semana_inicio, semana_inicio + 1, ... (una por elemento de las listas)
+
+    Busca (búsqueda binaria) el menor intervalo máximo entre sábados que el plan voraz puede cumplir.
+
+    Args:
+        semana_inicio: Primera semana del horizonte
+        historial_sabados: {empleado: (año, semana) del último TROP en sábado, o None si nunca}
+        elegibles_por_semana: Lista con el conjunto de empleados que pueden recibir sábado cada semana
+        cupos_por_semana: Lista con los cupos de sábado de cada semana
+        año: Año de semana_inicio
+
+    Returns:
+        tuple: (plan {semana: [empleados en orden de prioridad]}, intervalo máximo alcanzado)
+    """
+    # Últimas semanas en la numeración de `año` (las del año anterior quedan en 0, -1, ...)
+    indice_inicio = indice_semana(año, semana_inicio)
+    ultima = {}
+    for elegibles in elegibles_por_semana:
+        for empleado in elegibles:
+            registro = historial_sabados.get(empleado)
+            ultima[empleado] = NUNCA if registro is None else semana_inicio - (indice_inicio - indice_semana(*registro))
+
+    semana_fin = semana_inicio + len(elegibles_por_semana) - 1
+    registradas = [semana for semana in ultima.values() if semana != NUNCA]
+    # Con este intervalo nadie llega a su límite dentro del horizonte: siempre se cumple
+    alto = max([semana_fin - semana + 1 for semana in registradas] + [1])
+    bajo = 1
+
+    mejor_plan, _ = _simular_plan(semana_inicio, ultima, elegibles_por_semana, cupos_por_semana, alto)
+    while bajo < alto:
+        medio = (bajo + alto) // 2
+        plan, cumple = _simular_plan(semana_inicio, ultima, elegibles_por_semana, cupos_por_semana, medio)
+        if cumple:
+            mejor_plan, alto = plan, medio
+        else:
+            bajo = medio + 1
+
+    return mejor_plan, alto
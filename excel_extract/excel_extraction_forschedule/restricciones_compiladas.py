@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Restricciones Compiladas - Sistema de Turnos
+============================================
+Convierte la configuración de config_restricciones.py en estructuras por empleado para consultas O(1).
+
+- RESTRICCIONES_EMPLEADOS → máscara de bits de días permitidos por empleado y tipo (bit 0 = lunes … bit 6 = domingo)
+- TURNOS_FECHAS_ESPECIFICAS → {empleado: {fecha (date): turno_requerido}}
+- TURNOS_ESPECIALES → {empleado: ((indice_dia, tipo, dia_semana), ...)} para los turnos "semanal_fijo"
+- Entradas mal escritas (fechas o días inválidos) se omiten; validar_restricciones() las reporta
+"""
+
+from datetime import datetime
+
+from calendario_semanas import MAPEO_DIAS
+
+
+def mascara_dias(dias):
+    """Máscara de bits de una lista de días en español ('lunes' → bit 0)"""
+    mascara = 0
+    for dia in dias:
+        if dia in MAPEO_DIAS:
+            mascara |= 1 << MAPEO_DIAS[dia]
+    return mascara
+
+
+class RestriccionesCompiladas:
+    """Restricciones de todos los empleados indexadas por empleado, tipo y fecha"""
+
+    def __init__(self, restricciones_empleados, turnos_fechas_especificas, turnos_especiales):
+        # {empleado: {tipo_descanso: (tipo_restriccion, mascara)}}; los tipos "libre" no se incluyen
+        self.dias_permitidos = {}
+        for empleado, restricciones in restricciones_empleados.items():
+            por_tipo = {}
+            for tipo_descanso, config in restricciones.items():
+                if not isinstance(config, dict) or config.get("libre", False):
+                    continue
+                por_tipo[tipo_descanso] = (config.get("tipo", "libre"), mascara_dias(config.get("dias_permitidos", [])))
+            self.dias_permitidos[empleado] = por_tipo
+
+        # {empleado: {date: turno_requerido}}
+        self.fechas = {}
+        for empleado, entradas in turnos_fechas_especificas.items():
+            por_fecha = {}
+            for entrada in entradas:
+                try:
+                    fecha = datetime.strptime(entrada["fecha"], "%Y-%m-%d").date()
+                except (KeyError, ValueError):
+                    continue
+                if "turno_requerido" in entrada:
+                    por_fecha[fecha] = entrada["turno_requerido"]
+            self.fechas[empleado] = por_fecha
+
+        # {empleado: ((indice_dia, tipo, dia_semana), ...)}
+        self.especiales_semanales = {}
+        for empleado, entradas in turnos_especiales.items():
+            self.especiales_semanales[empleado] = tuple(
+                (MAPEO_DIAS[entrada["dia_semana"]], entrada["tipo"], entrada["dia_semana"])
+                for entrada in entradas
+                if entrada.get("frecuencia") == "semanal_fijo" and entrada.get("dia_semana") in MAPEO_DIAS
+            )
+
+    def permite(self, empleado, tipo_descanso, dia_semana):
+        """True si el empleado puede tener tipo_descanso el día dia_semana (0 = lunes); sin restricción → True"""
+        restriccion = self.dias_permitidos.get(empleado, {}).get(tipo_descanso)
+        if restriccion is None:
+            return True
+        return bool(restriccion[1] >> dia_semana & 1)
+
+    def turnos_fechas(self, empleado, dias):
+        """[(dia, turno_requerido)] para los registros de día (calendario) que tienen fecha específica"""
+        por_fecha = self.fechas.get(empleado)
+        if not por_fecha:
+            return []
+        return [(dia, por_fecha[dia['fecha']]) for dia in dias if dia['fecha'] in por_fecha]
+
+    def turno_completo(self, empleado, dias, turnos_completos):
+        """True si las fechas específicas del empleado en esos días son todas turnos completos (VACA, COME...)
+        y cubren la mayoría de los días laborables (>= 4, sin domingo)"""
+        turnos = [turno for _, turno in self.turnos_fechas(empleado, dias)]
+        if not turnos or not all(turno in turnos_completos for turno in turnos):
+            return False
+        return len(turnos) >= min(4, sum(1 for dia in dias if not dia['es_domingo']))
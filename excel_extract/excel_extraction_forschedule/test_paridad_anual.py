@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Script de Pruebas: Paridad Diaria y Tiempos en un Año Completo
+==============================================================
+
+Genera todas las semanas del año con varias semillas en procesos paralelos y mide
+calidad (paridad diaria) y velocidad en la misma corrida.
+
+Características:
+- Cada semilla recorre el año completo en su propio proceso con un historial de sábados
+  en memoria (no lee ni escribe historial_sabados.csv)
+- Personal disponible por día laborable (mismo conteo que la fila "Personal Disponible" del Excel)
+- Coeficiente de variación y calidad por día con AnalizadorParidadMultiple
+- Tabla comparativa por semilla y perfil de tiempos (generación, validación, total)
+- Guarda el resumen en JSON y lo compara contra una corrida anterior
+
+Uso:
+    python test_paridad_anual.py                            # año 2025, 4 semillas
+    python test_paridad_anual.py paridad_anual_base.json    # además compara contra esa corrida
+"""
+
+import sys
+import os
+import json
+import time
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+from config_restricciones import DIAS_FESTIVOS, obtener_empleados
+from calendario_semanas import NOMBRES_DIAS, obtener_calendario
+from generador_descansos_separacion import GeneradorDescansosSeparacion
+from test_paridad_multiple_semanas import AnalizadorParidadMultiple
+
+
+def _correr_semilla(parametros):
+    """Genera el año completo con una semilla (se ejecuta en un proceso del pool)"""
+    año, semilla, historial = parametros
+    total_semanas = obtener_calendario(año, DIAS_FESTIVOS).total_semanas
+
+    personal = {dia: [] for dia in NOMBRES_DIAS}
+    tiempos_generacion = []
+    tiempos_validacion = []
+    semanas_incumplen = []
+    consecutivos = 0
+
+    inicio = time.perf_counter()
+    for semana in range(1, total_semanas + 1):
+        t0 = time.perf_counter()
+        generador = GeneradorDescansosSeparacion(
+            año=año, mes=1, num_empleados=25, semana_especifica=semana,
+            historial_sabados=historial, guardar_historial=False, semilla=semilla * 1000 + semana
+        )
+        horario = generador.generar_horario_primera_semana()
+        t1 = time.perf_counter()
+        reporte = generador.validar_semana(horario)
+        t2 = time.perf_counter()
+
+        historial = generador.historial_sabados_actualizado
+        tiempos_generacion.append((t1 - t0) * 1000)
+        tiempos_validacion.append((t2 - t1) * 1000)
+
+        for dia, disponibles in zip(generador.dias_mes, reporte.personal_disponible.tolist()):
+            if not dia['es_no_laborable']:
+                personal[NOMBRES_DIAS[dia['dia_semana']]].append(disponibles)
+        if not reporte.cumple_regla_desc_trop:
+            semanas_incumplen.append(semana)
+        consecutivos += reporte.consecutivos
+
+    return {
+        'semilla': semilla,
+        'personal': personal,
+        'tiempos_generacion': tiempos_generacion,
+        'tiempos_validacion': tiempos_validacion,
+        'tiempo_proceso': time.perf_counter() - inicio,
+        'semanas_incumplen': semanas_incumplen,
+        'consecutivos': consecutivos
+    }
+
+
+def _percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(int(round(p / 100 * (len(ordenados) - 1))), len(ordenados) - 1)]
+
+
+def _cv_medio(estadisticas):
+    return statistics.mean(est['coef_variacion'] for est in estadisticas.values()) if estadisticas else 0.0
+
+
+class AnalizadorParidadAnual(AnalizadorParidadMultiple):
+    """Año completo × K semillas en paralelo, con perfil de tiempos y comparación entre corridas"""
+
+    def __init__(self, año=2025, semillas=4, max_procesos=None):
+        super().__init__()
+        self.año = año
+        self.semillas = semillas
+        self.max_procesos = max_procesos
+        self.corridas = []
+        self.resumen = None
+
+    def analizar_año(self, historial_inicial=None):
+        """Corre las semillas en paralelo; historial_inicial=None parte de un historial vacío"""
+        if historial_inicial is None:
+            historial_inicial = {empleado: None for empleado in obtener_empleados()}
+
+        print(f"\n🔍 ANALIZANDO AÑO {self.año}: {self.semillas} semillas en paralelo")
+        print("=" * 60)
+
+        parametros = [(self.año, semilla, historial_inicial) for semilla in range(self.semillas)]
+        inicio = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=self.max_procesos) as pool:
+            self.corridas = list(pool.map(_correr_semilla, parametros))
+        tiempo_real = time.perf_counter() - inicio
+
+        # Paridad de todas las semanas y semillas juntas
+        datos = {dia: [] for dia in self.dias_semana}
+        for corrida in self.corridas:
+            for dia in self.dias_semana:
+                datos[dia].extend(corrida['personal'][dia])
+        estadisticas = self._calcular_estadisticas_grupo(datos)
+        self.resultados_semanas[f"1-{len(self.corridas[0]['tiempos_generacion'])}"] = {
+            'datos': datos,
+            'estadisticas': estadisticas
+        }
+
+        generacion = [t for corrida in self.corridas for t in corrida['tiempos_generacion']]
+        validacion = [t for corrida in self.corridas for t in corrida['tiempos_validacion']]
+        tiempo_procesos = sum(corrida['tiempo_proceso'] for corrida in self.corridas)
+        self.resumen = {
+            'año': self.año,
+            'semillas': self.semillas,
+            'semanas': len(generacion),
+            'por_dia': {dia: {clave: est[clave] for clave in ('promedio', 'desviacion', 'coef_variacion')}
+                        for dia, est in estadisticas.items()},
+            'cv_medio': _cv_medio(estadisticas),
+            'semanas_incumplen': sum(len(corrida['semanas_incumplen']) for corrida in self.corridas),
+            'consecutivos': sum(corrida['consecutivos'] for corrida in self.corridas),
+            'tiempos': {
+                'generacion_ms_promedio': statistics.mean(generacion),
+                'generacion_ms_p50': _percentil(generacion, 50),
+                'generacion_ms_p95': _percentil(generacion, 95),
+                'generacion_ms_max': max(generacion),
+                'validacion_ms_promedio': statistics.mean(validacion),
+                'tiempo_procesos_s': tiempo_procesos,
+                'tiempo_real_s': tiempo_real,
+                'semanas_por_segundo': len(generacion) / tiempo_real
+            }
+        }
+        return self.resumen
+
+    def generar_reporte_semillas(self):
+        """Tabla comparativa por semilla"""
+        print(f"\n📊 COMPARACIÓN POR SEMILLA")
+        print("=" * 80)
+        print(f"{'Semilla':<8} | {'CV% medio':<9} | {'Incumplen':<9} | {'Consec.':<7} | {'ms/sem':<7} | {'Proceso s':<9}")
+        print("-" * 80)
+
+        for corrida in self.corridas:
+            estadisticas = self._calcular_estadisticas_grupo(corrida['personal'])
+            print(f"{corrida['semilla']:<8} | "
+                  f"{_cv_medio(estadisticas):<9.1f} | "
+                  f"{len(corrida['semanas_incumplen']):<9} | "
+                  f"{corrida['consecutivos']:<7} | "
+                  f"{statistics.mean(corrida['tiempos_generacion']):<7.1f} | "
+                  f"{corrida['tiempo_proceso']:<9.2f}")
+
+    def generar_perfil_tiempos(self):
+        """Perfil de tiempos de la corrida"""
+        tiempos = self.resumen['tiempos']
+        print(f"\n⏱️ PERFIL DE TIEMPOS ({self.resumen['semanas']} semanas generadas)")
+        print("=" * 60)
+        print(f"   Generación por semana: prom {tiempos['generacion_ms_promedio']:.1f} ms | "
+              f"p50 {tiempos['generacion_ms_p50']:.1f} ms | p95 {tiempos['generacion_ms_p95']:.1f} ms | "
+              f"máx {tiempos['generacion_ms_max']:.1f} ms")
+        print(f"   Validación por semana: prom {tiempos['validacion_ms_promedio']:.2f} ms")
+        print(f"   Suma de procesos: {tiempos['tiempo_procesos_s']:.2f} s | Tiempo real: {tiempos['tiempo_real_s']:.2f} s")
+        print(f"   Rendimiento: {tiempos['semanas_por_segundo']:.1f} semanas/s")
+
+    def comparar_con(self, base):
+        """Tabla comparativa contra el resumen (JSON) de una corrida anterior"""
+        print(f"\n🆚 COMPARACIÓN CONTRA CORRIDA BASE ({base['semillas']} semillas, {base['semanas']} semanas)")
+        print("=" * 80)
+        print(f"{'Día':<12} | {'CV% base':<9} | {'CV% actual':<10} | {'Δ CV%':<7}")
+        print("-" * 80)
+
+        for i, dia in enumerate(self.dias_semana):
+            if dia in self.resumen['por_dia'] and dia in base['por_dia']:
+                cv_base = base['por_dia'][dia]['coef_variacion']
+                cv_actual = self.resumen['por_dia'][dia]['coef_variacion']
+                print(f"{self.nombres_dias[i]:<12} | {cv_base:<9.1f} | {cv_actual:<10.1f} | {cv_actual - cv_base:<+7.1f}")
+
+        print("-" * 80)
+        filas = [
+            ('CV% medio', base['cv_medio'], self.resumen['cv_medio'], '.1f'),
+            ('Semanas que incumplen', base['semanas_incumplen'], self.resumen['semanas_incumplen'], 'd'),
+            ('Descansos consecutivos', base['consecutivos'], self.resumen['consecutivos'], 'd'),
+            ('ms por semana', base['tiempos']['generacion_ms_promedio'], self.resumen['tiempos']['generacion_ms_promedio'], '.1f'),
+            ('Semanas por segundo', base['tiempos']['semanas_por_segundo'], self.resumen['tiempos']['semanas_por_segundo'], '.1f'),
+        ]
+        for nombre, valor_base, valor_actual, formato in filas:
+            print(f"{nombre:<24} | {valor_base:<9{formato}} | {valor_actual:<10{formato}} | {valor_actual - valor_base:<+7{formato}}")
+
+    def guardar_resumen(self, nombre_archivo=None):
+        if nombre_archivo is None:
+            nombre_archivo = f'paridad_anual_{self.año}.json'
+        with open(nombre_archivo, 'w', encoding='utf-8') as archivo:
+            json.dump(self.resumen, archivo, ensure_ascii=False, indent=2)
+        print(f"\n💾 Resumen guardado en {nombre_archivo}")
+        return nombre_archivo
+
+
+def main():
+    """Función principal del script de pruebas"""
+    print("🧪 SCRIPT DE PRUEBAS: PARIDAD Y TIEMPOS EN UN AÑO COMPLETO")
+    print("=" * 60)
+
+    analizador = AnalizadorParidadAnual(año=2025, semillas=4)
+    analizador.analizar_año()
+
+    grupo, resultados = next(iter(analizador.resultados_semanas.items()))
+    analizador.generar_reporte_grupo(f"{grupo} × {analizador.semillas} semillas", resultados['estadisticas'])
+    analizador.generar_reporte_semillas()
+    analizador.generar_perfil_tiempos()
+
+    if len(sys.argv) > 1 and os.path.exists(sys.argv[1]):
+        with open(sys.argv[1], 'r', encoding='utf-8') as archivo:
+            analizador.comparar_con(json.load(archivo))
+
+    analizador.guardar_resumen()
+
+    print(f"\n🎉 ANÁLISIS COMPLETADO")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,6 @@ Versión extendida que analiza más semanas y detecta tendencias temporales.
 
 import sys
 import statistics
-import io
-import contextlib
 from generador_descansos_separacion import GeneradorDescansosSeparacion
 
 class AnalizadorParidadExtendido:
@@ -34,10 +32,8 @@ class AnalizadorParidadExtendido:
                     año=año, mes=1, num_empleados=25, semana_especifica=semana
                 )
                 
-                # Suprimir output
-                f = io.StringIO()
-                with contextlib.redirect_stdout(f):
-                    horario = generador.generar_horario_primera_semana()
+                # Generar horario (el generador es silencioso por defecto)
+                horario = generador.generar_horario_primera_semana()
                 
                 # Calcular paridad
                 paridad_semana = self._calcular_paridad_semana(horario, generador)
@@ -15,8 +15,6 @@ Características:
 
 import sys
 import statistics
-import io
-import contextlib
 from generador_descansos_separacion import GeneradorDescansosSeparacion
 
 class AnalizadorParidadMultiple:
@@ -44,10 +42,8 @@ class AnalizadorParidadMultiple:
                     semana_especifica=semana
                 )
                 
-                # Generar horario sin mostrar output detallado
-                f = io.StringIO()
-                with contextlib.redirect_stdout(f):
-                    horario = generador.generar_horario_primera_semana()
+                # Generar horario (el generador es silencioso por defecto)
+                horario = generador.generar_horario_primera_semana()
                 
                 # Analizar paridad diaria de esta semana
                 paridad_semana = self._calcular_paridad_semana(horario, generador)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Validación de Semana - Sistema de Turnos
+========================================
+Valida una semana generada por columnas, sobre la semana codificada como matriz de enteros.
+
+- Cada celda se codifica como 0 (vacía o no válida), 1 = DESC, 2 = TROP, 3.. = resto de turnos válidos
+- Regla DESC/TROP, turnos especiales adicionales, separación, paridad y personal disponible
+  se calculan con operaciones NumPy sobre la matriz (sin recorrer celdas)
+- ReporteValidacion guarda los resultados por empleado y por día para los mensajes y las métricas
+"""
+
+import numpy as np
+
+CODIGO_DESC = 1
+CODIGO_TROP = 2
+
+
+def codificar_semana(df, columnas_dias, tipos):
+    """Matriz (empleados × días) con el código de cada celda: posición en tipos + 1, 0 si vacía o desconocida"""
+    codigo = {tipo: i for i, tipo in enumerate(tipos, start=1)}
+    valores = df.to_numpy(dtype=object)[:, df.columns.get_indexer(columnas_dias)].ravel()
+    codigos = np.fromiter((codigo.get(valor, 0) for valor in valores), dtype=np.int8, count=len(valores))
+    return codigos.reshape(len(df), len(columnas_dias))
+
+
+class ReporteValidacion:
+    """Resultados de validación de una semana (por empleado y por día)"""
+
+    def __init__(self, df, dias, activos, con_turnos_especiales, turnos_validos, turnos_adicionales):
+        """
+        Args:
+            df: Horario de la semana (columnas 'SIGLA ATCO' + una por día)
+            dias: Registros de día de la semana (calendario), en orden
+            activos: Máscara booleana por fila, False para trabajadores fuera de operación
+            con_turnos_especiales: Máscara booleana por fila, True si el empleado tiene TURNOS_ESPECIALES
+            turnos_validos: Turnos que cuentan como "no disponible" (CONFIGURACION_GENERAL)
+            turnos_adicionales: Turnos que se suman a DESC/TROP (SIND, CMED, CERT)
+        """
+        self.empleados = df['SIGLA ATCO'].tolist()
+        self.columnas_dias = [dia['formato'] for dia in dias]
+        self.dias_semana = np.array([dia['dia_semana'] for dia in dias], dtype=np.int8)
+        self.tipos = ('DESC', 'TROP') + tuple(t for t in turnos_validos if t not in ('DESC', 'TROP'))
+        self.codigos = codificar_semana(df, self.columnas_dias, self.tipos)
+        self.activos = np.asarray(activos, dtype=bool)
+        self.con_turnos_especiales = np.asarray(con_turnos_especiales, dtype=bool)
+
+        es_desc = self.codigos == CODIGO_DESC
+        es_trop = self.codigos == CODIGO_TROP
+        self.descansos = es_desc | es_trop
+        self.n_desc = es_desc.sum(axis=1)
+        self.n_trop = es_trop.sum(axis=1)
+        self.n_descansos = self.n_desc + self.n_trop
+
+        # Regla DESC/TROP: exactamente un DESC y un TROP, con el DESC primero (columnas en orden cronológico)
+        dos_descansos = self.activos & (self.n_descansos == 2)
+        self.orden_correcto = dos_descansos & (self.n_desc == 1) & (es_desc.argmax(axis=1) < es_trop.argmax(axis=1))
+        self.orden_incorrecto = dos_descansos & ~self.orden_correcto
+
+        # Turnos especiales adicionales: DESC=1, TROP=1 y al menos un adicional
+        codigos_adicionales = [self.tipos.index(t) + 1 for t in turnos_adicionales if t in self.tipos]
+        self.n_adicionales = np.isin(self.codigos, codigos_adicionales).sum(axis=1)
+        self.evaluados_especiales = self.activos & self.con_turnos_especiales
+        self.especiales_correctos = (self.evaluados_especiales & (self.n_desc == 1) & (self.n_trop == 1)
+                                     & (self.n_adicionales >= 1))
+
+        # Separación entre los dos descansos (sin domingo); -1 si no tiene exactamente dos
+        sin_domingo = self.dias_semana != 6
+        descansos_laborables = self.descansos[:, sin_domingo]
+        dias_laborables = self.dias_semana[sin_domingo]
+        primero = descansos_laborables.argmax(axis=1)
+        ultimo = descansos_laborables.shape[1] - 1 - descansos_laborables[:, ::-1].argmax(axis=1)
+        self.separacion = np.where(descansos_laborables.sum(axis=1) == 2,
+                                   dias_laborables[ultimo] - dias_laborables[primero], -1)
+        self.consecutivos = int((self.separacion == 1).sum())
+
+        # Paridad diaria (todos los empleados) y personal disponible (solo activos)
+        self.descansos_por_dia = self.descansos.sum(axis=0)
+        self.personal_disponible = int(self.activos.sum()) - ((self.codigos > 0) & self.activos[:, None]).sum(axis=0)
+
+    @property
+    def cumple_regla_desc_trop(self):
+        return not self.orden_incorrecto.any()
+
+    @property
+    def cumple_turnos_especiales(self):
+        return int(self.especiales_correctos.sum()) == int(self.evaluados_especiales.sum())
+
+    def descansos_empleado(self, fila):
+        """[(columna, tipo)] de los DESC/TROP de una fila, en orden cronológico"""
+        return [(self.columnas_dias[j], self.tipos[self.codigos[fila, j] - 1]) for j in np.flatnonzero(self.descansos[fila])]
+
+    def adicionales_empleado(self, fila, turnos_adicionales):
+        """[(columna, tipo)] de los turnos adicionales de una fila"""
+        return [(self.columnas_dias[j], self.tipos[self.codigos[fila, j] - 1])
+                for j in np.flatnonzero(self.codigos[fila] > 0)
+                if self.tipos[self.codigos[fila, j] - 1] in turnos_adicionales]
+
+    def personal_disponible_por_dia(self):
+        """{columna: trabajadores activos sin turno ese día}"""
+        return dict(zip(self.columnas_dias, self.personal_disponible.tolist()))
+
+    def resumen(self):
+        """Métricas de la semana en un dict (mismas claves que analizar_separacion, más la regla DESC/TROP)"""
+        return {
+            'cumple_regla': self.cumple_regla_desc_trop,
+            'orden_correcto': int(self.orden_correcto.sum()),
+            'orden_incorrecto': int(self.orden_incorrecto.sum()),
+            'cumple_turnos_especiales': self.cumple_turnos_especiales,
+            'consecutivos': self.consecutivos,
+            'promedio': float(np.mean(self.descansos_por_dia)),
+            'desviacion': float(np.std(self.descansos_por_dia)),
+            'minimo': int(self.descansos_por_dia.min()),
+            'maximo': int(self.descansos_por_dia.max())
+        }
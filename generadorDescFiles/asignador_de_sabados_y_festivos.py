@@ -28,8 +28,12 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Set
 
+import numpy as np
 import openpyxl
-from openpyxl.styles import PatternFill, Font
+
+from exportador_excel import aplicar_estilo
+from grilla_horario import GrillaHorario
+from restricciones_horario import MotorRestricciones, desplazar_ayer, desplazar_manana
 
 # ------------------------------------------------------------
 # Utilidades de fechas y encabezados DOW-DD
@@ -104,6 +108,7 @@ class AsignadorSabadosFestivos:
     - json_path: ruta del JSON de entrada (por defecto 'cuentas1y2sabadosDomingo_asignado.json').
     - excel_out: ruta del Excel de salida (por defecto 'horario_procesado_con_sabados_domingos.xlsx').
     - modo_simulacion: si es True, no escribe en el Excel (solo genera reporte en memoria).
+    - wb: libro ya cargado (p. ej. desde pipeline.py); si se indica, no se lee 'excel_in'.
 
     Encabezados y fechas:
     - La fila 1 contiene encabezados de tipo 'DOW-DD' (p. ej., 'THU-07').
@@ -142,19 +147,23 @@ class AsignadorSabadosFestivos:
         json_path: str = "cuentas1y2sabadosDomingo_asignado.json",
         excel_out: str = "horario_procesado_con_sabados_domingos.xlsx",
         modo_simulacion: bool = True,
+        wb=None,
     ) -> None:
         self.excel_in = excel_in
         self.json_path = json_path
         self.excel_out = excel_out
         self.modo_simulacion = modo_simulacion
 
-        if not os.path.exists(self.excel_in):
+        if wb is None and not os.path.exists(self.excel_in):
             raise FileNotFoundError(f"No se encontró el archivo Excel: {self.excel_in}")
         if not os.path.exists(self.json_path):
             raise FileNotFoundError(f"No se encontró el archivo JSON: {self.json_path}")
 
-        self.wb = openpyxl.load_workbook(self.excel_in)
+        self.wb = wb if wb is not None else openpyxl.load_workbook(self.excel_in)
         self.ws = self.wb.active
+        # Lecturas/escrituras de la hoja principal y conteos operativos/Torre mantenidos en memoria
+        self.grilla = GrillaHorario(self.wb, self.ws)
+        self.restricciones = MotorRestricciones(self.grilla)
 
         # Mapeos clave
         self.sigla_to_row: Dict[str, int] = {}
@@ -168,15 +177,18 @@ class AsignadorSabadosFestivos:
 
         # Plan del propio JSON para BLPTD/BANTD por (trabajador, col)
         self.plan_blpt_bant_por_celda: Set[Tuple[str, int]] = set()
+        # El mismo plan como máscaras trabajador×día desplazadas (día anterior / día siguiente)
+        self.plan_blpt_bant_ayer = np.zeros_like(self.grilla.codigos, dtype=bool)
+        self.plan_blpt_bant_manana = np.zeros_like(self.grilla.codigos, dtype=bool)
 
         # Color para violaciones blandas
-        self.color_violacion_blanda = PatternFill(start_color="87CEEB", end_color="87CEEB", fill_type="solid")  # Azul clarito
+        self.color_violacion_blanda = "87CEEB"  # Azul clarito
 
         # Reporte
         self.resultados: List[ResultadoAsignacion] = []
 
         # Color para violaciones duras (fucsia)
-        self.color_violacion_dura = PatternFill(start_color="FF00FF", end_color="FF00FF", fill_type="solid")
+        self.color_violacion_dura = "FF00FF"
 
         self._mapear_trabajadores()
         self._mapear_encabezados()
@@ -255,27 +267,25 @@ class AsignadorSabadosFestivos:
                 if col is not None:
                     self.plan_blpt_bant_por_celda.add((p.trabajador, col))
 
+        plan = np.zeros_like(self.grilla.codigos, dtype=bool)
+        for trabajador, col in self.plan_blpt_bant_por_celda:
+            fila = self.sigla_to_row.get(trabajador)
+            if fila:
+                plan[fila, col] = True
+        self.plan_blpt_bant_ayer = desplazar_ayer(plan)
+        self.plan_blpt_bant_manana = desplazar_manana(plan)
+
     # --------------------------------------------------------
     # Validaciones de celda y restricciones
     # --------------------------------------------------------
     def _celda_vacia(self, fila: int, col: int) -> bool:
-        val = self.ws.cell(row=fila, column=col).value
-        return val is None or str(val).strip() == ""
-
-    def _valor_en(self, fila: int, col: int) -> Optional[str]:
-        val = self.ws.cell(row=fila, column=col).value
-        if val is None:
-            return None
-        return str(val).strip().upper()
+        return self.grilla.esta_vacia(fila, col)
 
     def _existe_turno_en_columna(self, col_dia: int, turno: str) -> bool:
         """True si en ese día (columna) ya existe el turno indicado en cualquier trabajador (filas 2-25)."""
         turno_u = turno.strip().upper()
         for fila in range(2, 26):
-            val = self.ws.cell(row=fila, column=col_dia).value
-            if val is None:
-                continue
-            if str(val).strip().upper() == turno_u:
+            if self.grilla.valor(fila, col_dia) == turno_u:
                 return True
         return False
 
@@ -301,38 +311,30 @@ class AsignadorSabadosFestivos:
         if not fila:
             return False, False, None
 
-        # Día siguiente
-        next_col = col_actual + 1
-        max_col = self.ws.max_column
-        next_val = None
-        en_plan_blpt_bant_next = False
-        if next_col <= max_col:
-            next_val = self._valor_en(fila, next_col)
-            en_plan_blpt_bant_next = (trabajador, next_col) in self.plan_blpt_bant_por_celda
-
-        # Día anterior
-        prev_col = col_actual - 1
-        prev_val = None
-        en_plan_blpt_bant_prev = False
-        if prev_col >= 2:
-            prev_val = self._valor_en(fila, prev_col)
-            en_plan_blpt_bant_prev = (trabajador, prev_col) in self.plan_blpt_bant_por_celda
+        # Día siguiente / día anterior: hoja + plan del JSON, desde máscaras de todo el mes
+        # (False si el día queda fuera del rango de columnas)
+        bloqueados = self.blocked_next_day_turns
+        bloqueado_siguiente = bool(
+            self.restricciones.manana(bloqueados)[fila, col_actual] or self.plan_blpt_bant_manana[fila, col_actual]
+        )
+        bloqueado_anterior = bool(
+            self.restricciones.ayer(bloqueados)[fila, col_actual] or self.plan_blpt_bant_ayer[fila, col_actual]
+        )
 
         # Restricciones duras
         if turno_u in self.hard_source_turns:
             # Para BLPTD/BANTD: verificar día anterior y siguiente
             if turno_u in {"BLPTD", "BANTD"}:
-                if ((prev_val in self.blocked_next_day_turns) or en_plan_blpt_bant_prev or
-                    (next_val in self.blocked_next_day_turns) or en_plan_blpt_bant_next):
+                if bloqueado_anterior or bloqueado_siguiente:
                     return True, False, f"Restricción dura: {turno_u} con BLPTD/BANTD en día anterior o siguiente"
             # Para otros turnos duros: solo verificar día siguiente
             else:
-                if (next_val in self.blocked_next_day_turns) or en_plan_blpt_bant_next:
+                if bloqueado_siguiente:
                     return True, False, f"Restricción dura: {turno_u} con BLPTD/BANTD al día siguiente"
 
         # Restricciones blandas: solo verificar día siguiente
         if turno_u in self.soft_source_turns:
-            if (next_val in self.blocked_next_day_turns) or en_plan_blpt_bant_next:
+            if bloqueado_siguiente:
                 return False, True, f"Restricción blanda: {turno_u} con BLPTD/BANTD al día siguiente"
 
         return False, False, None
@@ -465,8 +467,7 @@ class AsignadorSabadosFestivos:
                         motivo = "Asignado forzado con violación dura"
                         break
                 if col_forzada is not None and not self.modo_simulacion:
-                    celda = self.ws.cell(row=fila, column=col_forzada, value=turno)
-                    celda.fill = self.color_violacion_dura
+                    self.grilla.asignar(fila, col_forzada, turno, relleno=self.color_violacion_dura)
                     dow_mm = self.col_to_header_tuple.get(col_forzada)
                     fecha_final_str = f"{dow_mm[0]}-{dow_mm[1]}" if dow_mm else None
                     self.resultados.append(
@@ -552,12 +553,12 @@ class AsignadorSabadosFestivos:
 
             # Escribir en la hoja
             if not self.modo_simulacion:
-                celda = self.ws.cell(row=fila, column=col_final, value=turno)
                 # Colorear solo si hay violación; de lo contrario, limpiar relleno
                 if tipo_asig == "blanda":
-                    celda.fill = self.color_violacion_blanda
+                    relleno = self.color_violacion_blanda
                 else:
-                    celda.fill = PatternFill(fill_type=None)
+                    relleno = None
+                self.grilla.asignar(fila, col_final, turno, relleno=relleno)
 
             # Fecha final para reporte: reconstruida desde encabezado
             dow_mm = self.col_to_header_tuple.get(col_final)
@@ -630,11 +631,7 @@ class AsignadorSabadosFestivos:
             col_nueva = (ws_stats.max_column or 0) + 1
             ws_stats.cell(row=1, column=col_nueva, value=nombre)
             # Estilo encabezado
-            header_fill = PatternFill(start_color="E6E6E6", end_color="E6E6E6", fill_type="solid")
-            header_font = Font(bold=True)
-            cell = ws_stats.cell(row=1, column=col_nueva)
-            cell.fill = header_fill
-            cell.font = header_font
+            aplicar_estilo(ws_stats.cell(row=1, column=col_nueva), "gris_encabezado", "negrita")
             encabezados[nombre_u] = col_nueva
             return col_nueva
 
@@ -691,106 +688,30 @@ class AsignadorSabadosFestivos:
         Recalcula las dos filas estáticas en la hoja principal:
         - 'TURNOS OPERATIVOS'
         - 'Torre'
-        Usando la misma lógica de conteo que en procesador_horarios.py
+        Usando la misma lógica de conteo que en procesador_horarios.py (conteos incrementales de la grilla)
         """
-        # Definir turnos no operativos (copiado de procesador_horarios.py)
-        turnos_no_operativos = {
-            # Turnos básicos
-            "DESC", "TROP",
-            # Turnos completos
-            "VACA", "COME", "COMT", "COMS",
-            # Turnos adicionales originales
-            "SIND", "CMED", "CERT",
-            # Formación, instrucción y entrenamiento
-            "CAPA", "MCAE", "TCAE", "MCHC", "TCHC", "NCHC", "ACHC",
-            "MENT", "TENT", "NENT", "AENT",
-            "MINS", "TINS", "NINS", "AINS",
-            # Gestión, oficinas y grupos de trabajo
-            "MCOR", "TCOR", "MSMS", "TSMS", "MDBM", "TDBM",
-            "MDOC", "TDOC", "MPRO", "TPRO", "MATF", "TATF",
-            "MGST", "TGST", "MOFI", "TOFI",
-            # Operativos y asignaciones especiales
-            "CET", "ATC", "KATC", "XATC", "YATC", "ZATC", "X"
-        }
-
-        ws = self.ws
-        max_row = ws.max_row
-        max_col = ws.max_column
-
-        # Buscar/crear filas destino
-        fila_conteo = None
-        fila_torre = None
-        for r in range(1, max_row + 1):
-            v = ws.cell(row=r, column=1).value
-            if not v:
-                continue
-            val = str(v).strip().upper()
-            if val == "TURNOS OPERATIVOS":
-                fila_conteo = r
-            elif val == "TORRE":
-                fila_torre = r
         # Si no existen, crearlas al final conservando el orden (conteo antes que torre)
-        cursor = max_row + 1
-        if fila_conteo is None:
-            fila_conteo = cursor
-            ws.cell(row=fila_conteo, column=1, value="TURNOS OPERATIVOS")
+        cursor = self.grilla.max_row + 1
+        if self.grilla.fila_etiqueta("TURNOS OPERATIVOS") is None:
+            self.grilla.asignar(cursor, 1, "TURNOS OPERATIVOS")
             cursor += 1
-        if fila_torre is None:
-            fila_torre = cursor
-            ws.cell(row=fila_torre, column=1, value="Torre")
-
-        # Mapa sigla -> fila (2-25)
-        sigla_a_fila = {}
-        for r in range(2, min(26, max_row + 1)):
-            sig = ws.cell(row=r, column=1).value
-            if isinstance(sig, str):
-                s = sig.strip().upper()
-                if s:
-                    sigla_a_fila[s] = r
-
-        # Filas objetivo para Torre
-        siglas_torre = {"YIS", "MAQ", "DJO", "AFG", "JLF", "JMV"}
-        filas_objetivo = [sigla_a_fila[s] for s in siglas_torre if s in sigla_a_fila]
-
-        # Recalcular conteos por columna
-        for col in range(2, max_col + 1):
-            # Operativos
-            conteo_operativos = 0
-            for r in range(2, 26):
-                cell_value = ws.cell(row=r, column=col).value
-                if cell_value is None or str(cell_value).strip() == "":
-                    conteo_operativos += 1
-                else:
-                    valor_limpio = str(cell_value).strip().upper()
-                    if valor_limpio not in turnos_no_operativos:
-                        conteo_operativos += 1
-            ws.cell(row=fila_conteo, column=col, value=conteo_operativos)
-
-            # Torre
-            conteo_torre = 0
-            for r in filas_objetivo:
-                v = ws.cell(row=r, column=col).value
-                if v is None or str(v).strip() == "":
-                    conteo_torre += 1
-                else:
-                    if str(v).strip().upper() not in turnos_no_operativos:
-                        conteo_torre += 1
-            ws.cell(row=fila_torre, column=col, value=conteo_torre)
+        if self.grilla.fila_etiqueta("Torre") is None:
+            self.grilla.asignar(cursor, 1, "Torre")
 
-        # Asegurar etiquetas
-        ws.cell(row=fila_conteo, column=1, value="TURNOS OPERATIVOS")
-        ws.cell(row=fila_torre, column=1, value="Torre")
+        # Solo se reescriben las columnas cuyo conteo cambió respecto a la hoja
+        self.grilla.volcar_conteos()
 
     # --------------------------------------------------------
     # Orquestador
     # --------------------------------------------------------
-    def asignar(self) -> None:
+    def asignar(self, guardar: bool = True) -> None:
         """
         Ejecuta el flujo completo de asignación:
         - Carga y normaliza el JSON de pedidos.
         - Precomputa el plan de BLPTdom/BANTdom para el día siguiente.
         - Resuelve por turno el matching 1:1 con dos pasadas (evitando primero violaciones blandas).
         - Escribe en el Excel (salvo 'modo_simulacion=True') y genera el reporte en disco.
+        - Con 'guardar=False' deja los cambios solo en el libro en memoria.
         """
         pedidos_por_turno = self._cargar_json()
         # Precompute plan de BLPT/BANT en el siguiente día
@@ -808,8 +729,11 @@ class AsignadorSabadosFestivos:
         # Recalcular filas estáticas
         self._recalcular_estaticos_operativos_y_torre()
 
+        # Pasar a la hoja de openpyxl las celdas escritas en la grilla
+        self.grilla.volcar()
+
         # Guardar archivos
-        if not self.modo_simulacion:
+        if guardar and not self.modo_simulacion:
             try:
                 self.wb.save(self.excel_out)
                 print(f"Archivo guardado como: {self.excel_out}")
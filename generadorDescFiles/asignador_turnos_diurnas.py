@@ -1,9 +1,13 @@
-import openpyxl
 import random
 from collections import defaultdict
-from openpyxl.styles import PatternFill, Font
 from typing import List, Optional, Dict, Tuple, Set
-import os
+
+from exportador_excel import aplicar_estilo
+from grilla_horario import GrillaHorario, resolver_archivo_entrada
+from motor_asignacion import MAX_RONDAS_REBALANCEO
+from rebalanceo_flujo import planificar_transferencias
+from reglas_turnos import REGLAS, regla_compilada
+from restricciones_horario import MotorRestricciones
 
 
 class AsignadorTurnosDiurnas:
@@ -22,42 +26,41 @@ class AsignadorTurnosDiurnas:
     - Colores: rojo oscuro para 6S, rojo medio para 6N
     - Archivo de entrada: "horarioUnificado_con_3.xlsx"
     - Archivo de salida: "horarioUnificado_con_diurnas.xlsx"
+    - Puede recibir una `GrillaHorario` ya cargada para ejecutarse en memoria dentro de la cadena
+    - Elegibles, turnos conflictivos y umbrales de personal en `reglas_turnos.REGLAS["DIURNAS"]`
     
     IMPORTANTE: Este módulo actualiza la fila de conteo operativo estático usando la misma
     lógica que procesador_horarios.py antes de realizar las asignaciones, asegurando que
     las decisiones se basen en conteos consistentes y actualizados.
     """
 
-    TRABAJADORES_ELEGIBLES = [
-        'PHD', 'HLG', 'MEI', 'VCM', 'ROP', 'ECE', 'WEH', 'DFB', 'MLS', 'FCE',
-        'JBV', 'GMT', 'BRS', 'HZG', 'JIS', 'CDT', 'WGG', 'GCE'
-    ]
-
-    COLOR_6S = "8B0000"  # Rojo oscuro (DarkRed)
-    COLOR_6N = "DC143C"  # Rojo medio (Crimson)
-
-    def __init__(self, archivo_entrada: Optional[str] = None) -> None:
-        candidatos = [
-            archivo_entrada,
-            "horarioUnificado_con_3.xlsx",
-            "horarioUnificado_con_6r.xlsx",
-            "horarioUnificado_procesado.xlsx",
-        ]
-        candidatos = [c for c in candidatos if c]
-        elegido = None
-        for c in candidatos:
-            if os.path.exists(c):
-                elegido = c
-                break
-        if not elegido:
-            elegido = "horarioUnificado_con_3.xlsx"
-        self.archivo_entrada = elegido
-
-        self.wb = openpyxl.load_workbook(self.archivo_entrada)
-        self.ws = self._obtener_hoja_horario()
+    TRABAJADORES_ELEGIBLES = list(REGLAS["DIURNAS"].elegibles)
+
+    COLOR_6S = REGLAS["DIURNAS"].colores["6S"]  # Rojo oscuro (DarkRed)
+    COLOR_6N = REGLAS["DIURNAS"].colores["6N"]  # Rojo medio (Crimson)
+
+    def __init__(self, archivo_entrada: Optional[str] = None, grilla: Optional[GrillaHorario] = None) -> None:
+        if grilla is None:
+            self.archivo_entrada = resolver_archivo_entrada(
+                [
+                    archivo_entrada,
+                    "horarioUnificado_con_3.xlsx",
+                    "horarioUnificado_con_6r.xlsx",
+                    "horarioUnificado_procesado.xlsx",
+                ],
+                "horarioUnificado_con_3.xlsx",
+            )
+            grilla = GrillaHorario.desde_archivo(self.archivo_entrada)
+        else:
+            self.archivo_entrada = None
+        self.grilla = grilla
+        self.wb = grilla.wb
+        self.ws = grilla.ws
+        self.restricciones = MotorRestricciones(self.grilla)
+        self.compilada = regla_compilada("DIURNAS")
 
         # Snapshot del estado original
-        self.original_nonempty: Set[Tuple[int, int]] = set()
+        self.original_vacia = self.restricciones.vacias().copy()
         self.original_6s: Set[Tuple[int, int]] = set()
         self.original_6n: Set[Tuple[int, int]] = set()
         self._snapshot_estado_original()
@@ -70,109 +73,49 @@ class AsignadorTurnosDiurnas:
         random.seed()
         self._inicializar_contadores_desde_hoja()
 
-    def _obtener_hoja_horario(self):
-        for nombre in self.wb.sheetnames:
-            if nombre != "Estadísticas":
-                return self.wb[nombre]
-        return self.wb.active
-
     def _nombre_hoja_horario(self) -> str:
         return self.ws.title
 
     def _snapshot_estado_original(self) -> None:
-        max_col = self.ws.max_column
+        max_col = self.grilla.max_col
         for fila in range(2, 26):
             for col in range(2, max_col + 1):
-                valor = self.ws.cell(row=fila, column=col).value
-                if valor is None or str(valor).strip() == "":
+                val = self.grilla.valor(fila, col)
+                if val is None:
                     continue
-                val = str(valor).strip().upper()
-                self.original_nonempty.add((fila, col))
                 if val == "6S":
                     self.original_6s.add((fila, col))
                 elif val == "6N":
                     self.original_6n.add((fila, col))
 
     def _es_celda_originalmente_vacia(self, fila: int, col: int) -> bool:
-        return (fila, col) not in self.original_nonempty
+        return bool(self.original_vacia[fila, col])
 
     def _obtener_fila_trabajador(self, trabajador: str) -> Optional[int]:
-        for fila in range(2, 26):
-            valor = self.ws.cell(row=fila, column=1).value
-            if valor and str(valor).strip().upper() == trabajador.upper():
-                return fila
-        return None
+        return self.grilla.fila_de(trabajador)
 
     def _contar_personal_operativo(self, col_dia: int) -> int:
-        """Cuenta el personal operativo usando la misma lógica que procesador_horarios.py"""
-        # Definir turnos no operativos (misma lista que procesador_horarios.py)
-        turnos_no_operativos = {
-            # Turnos básicos
-            "DESC", "TROP",
-            # Turnos completos
-            "VACA", "COME", "COMT", "COMS",
-            # Turnos adicionales originales
-            "SIND", "CMED", "CERT",
-            # Formación, instrucción y entrenamiento
-            "CAPA", "MCAE", "TCAE", "MCHC", "TCHC", "NCHC", "ACHC",
-            "MENT", "TENT", "NENT", "AENT",
-            "MINS", "TINS", "NINS", "AINS",
-            # Gestión, oficinas y grupos de trabajo
-            "MCOR", "TCOR", "MSMS", "TSMS", "MDBM", "TDBM",
-            "MDOC", "TDOC", "MPRO", "TPRO", "MATF", "TATF",
-            "MGST", "TGST", "MOFI", "TOFI",
-            # Operativos y asignaciones especiales
-            "CET", "ATC", "KATC", "XATC", "YATC", "ZATC", "X"
-        }
-        
-        count = 0
-        for fila in range(2, 26):  # Filas 2-25
-            cell_value = self.ws.cell(row=fila, column=col_dia).value
-            if cell_value is None or str(cell_value).strip() == "":
-                count += 1  # Celda vacía = operativo
-            else:
-                valor_limpio = str(cell_value).strip().upper()
-                if valor_limpio not in turnos_no_operativos:
-                    count += 1  # No está en lista de no operativos = operativo
-        return count
+        """Personal operativo del día con la misma lógica que procesador_horarios.py (conteo incremental de la grilla)"""
+        return self.grilla.conteo_operativos(col_dia)
 
     def _existe_turno_conflictivo_en_dia(self, col_dia: int) -> bool:
         """Verifica si ya existe 6S, 6N, BLPTD o NANRD en el día"""
-        for fila in range(2, 26):
-            v = self.ws.cell(row=fila, column=col_dia).value
-            if v is None:
-                continue
-            val = str(v).strip().upper()
-            if val in {"6S", "6N", "BLPTD", "NANRD"}:
-                return True
-        return False
+        return bool(self.restricciones.en(self.compilada.regla.conflictos_dia)[2:26, col_dia].any())
 
     def _obtener_trabajadores_disponibles(self, col_dia: int) -> List[str]:
-        disponibles: List[str] = []
-        for trabajador in self.TRABAJADORES_ELEGIBLES:
-            fila = self._obtener_fila_trabajador(trabajador)
-            if not fila:
-                continue
-            celda = self.ws.cell(row=fila, column=col_dia)
-            if (
-                (celda.value is None or str(celda.value).strip() == "")
-                and self._es_celda_originalmente_vacia(fila, col_dia)
-            ):
-                disponibles.append(trabajador)
-        return disponibles
+        # Vacía ahora y vacía al cargar, para todo el mes; luego se toma la columna del día
+        mascara = self.restricciones.vacias() & self.original_vacia
+        return self.restricciones.disponibles(self.TRABAJADORES_ELEGIBLES, mascara, col_dia)
 
     def _inicializar_contadores_desde_hoja(self) -> None:
-        max_col = self.ws.max_column
+        max_col = self.grilla.max_col
         for fila in range(2, 26):
-            trabajador = self.ws.cell(row=fila, column=1).value
+            trabajador = self.grilla.valor_crudo(fila, 1)
             if not trabajador:
                 continue
             trabajador = str(trabajador).strip().upper()
             for col in range(2, max_col + 1):
-                valor = self.ws.cell(row=fila, column=col).value
-                if valor is None:
-                    continue
-                val = str(valor).strip().upper()
+                val = self.grilla.valor(fila, col)
                 if val == "6S":
                     self.contador_6s[trabajador] += 1
                     self.contador_diurna[trabajador] += 1
@@ -206,77 +149,15 @@ class AsignadorTurnosDiurnas:
 
     def _actualizar_fila_conteo_operativo(self) -> None:
         """Actualiza la fila de conteo operativo estático usando la misma lógica que procesador_horarios.py"""
-        # Definir turnos no operativos (misma lista que procesador_horarios.py)
-        turnos_no_operativos = {
-            # Turnos básicos
-            "DESC", "TROP",
-            # Turnos completos
-            "VACA", "COME", "COMT", "COMS",
-            # Turnos adicionales originales
-            "SIND", "CMED", "CERT",
-            # Formación, instrucción y entrenamiento
-            "CAPA", "MCAE", "TCAE", "MCHC", "TCHC", "NCHC", "ACHC",
-            "MENT", "TENT", "NENT", "AENT",
-            "MINS", "TINS", "NINS", "AINS",
-            # Gestión, oficinas y grupos de trabajo
-            "MCOR", "TCOR", "MSMS", "TSMS", "MDBM", "TDBM",
-            "MDOC", "TDOC", "MPRO", "TPRO", "MATF", "TATF",
-            "MGST", "TGST", "MOFI", "TOFI",
-            # Operativos y asignaciones especiales
-            "CET", "ATC", "KATC", "XATC", "YATC", "ZATC", "X"
-        }
-        
         # Buscar la fila de conteo operativo estático
-        fila_conteo = None
-        for fila in range(1, self.ws.max_row + 1):
-            valor = self.ws.cell(row=fila, column=1).value
-            if valor and str(valor).strip() == "TURNOS OPERATIVOS":
-                fila_conteo = fila
-                break
+        fila_conteo = self.grilla.fila_etiqueta("TURNOS OPERATIVOS")
         
         if fila_conteo is None:
             print("⚠️  No se encontró la fila 'TURNOS OPERATIVOS' para actualizar")
             return
         
-        # Actualizar conteos para cada columna
-        for col in range(2, self.ws.max_column + 1):
-            conteo_operativos = 0
-            # Contar turnos operativos según la lógica correcta
-            for row in range(2, 26):  # Filas 2-25
-                cell_value = self.ws.cell(row=row, column=col).value
-                if cell_value is None or str(cell_value).strip() == "":
-                    conteo_operativos += 1
-                else:
-                    valor_limpio = str(cell_value).strip().upper()
-                    if valor_limpio not in turnos_no_operativos:
-                        conteo_operativos += 1
-            
-            # Escribir el conteo actualizado
-            celda_conteo = self.ws.cell(row=fila_conteo, column=col)
-            celda_conteo.value = conteo_operativos
-            
-            # Aplicar colores según el conteo (misma lógica que procesador_horarios.py)
-            rojo_intenso = PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")
-            rojo_medio = PatternFill(start_color="FF6666", end_color="FF6666", fill_type="solid")
-            azul_clarito = PatternFill(start_color="99CCFF", end_color="99CCFF", fill_type="solid")
-            verde_clarito = PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid")
-            verde_intenso = PatternFill(start_color="008000", end_color="008000", fill_type="solid")
-            sin_relleno = PatternFill(fill_type=None)
-            fuente_blanca = Font(color="FFFFFF")
-            
-            if conteo_operativos <= 8:
-                celda_conteo.fill = rojo_intenso
-                celda_conteo.font = fuente_blanca
-            elif conteo_operativos == 9:
-                celda_conteo.fill = rojo_medio
-            elif conteo_operativos == 10:
-                celda_conteo.fill = azul_clarito
-            elif conteo_operativos == 11:
-                celda_conteo.fill = verde_clarito
-            elif conteo_operativos == 12:
-                celda_conteo.fill = verde_intenso
-            else:
-                celda_conteo.fill = sin_relleno
+        # Reescribir conteos y colores de todas las columnas desde los vectores de la grilla
+        self.grilla.volcar_conteos(forzar=True)
         
         print("✅ Fila de conteo operativo estático actualizada")
 
@@ -288,13 +169,12 @@ class AsignadorTurnosDiurnas:
         if not self._es_celda_originalmente_vacia(fila, col_dia):
             return False
         
-        self.ws.cell(row=fila, column=col_dia, value=tipo_turno)
-        celda = self.ws.cell(row=fila, column=col_dia)
-        
         if tipo_turno == "6S":
-            celda.fill = PatternFill(start_color=self.COLOR_6S, end_color=self.COLOR_6S, fill_type="solid")
+            self.grilla.asignar(fila, col_dia, tipo_turno, relleno=self.COLOR_6S)
         elif tipo_turno == "6N":
-            celda.fill = PatternFill(start_color=self.COLOR_6N, end_color=self.COLOR_6N, fill_type="solid")
+            self.grilla.asignar(fila, col_dia, tipo_turno, relleno=self.COLOR_6N)
+        else:
+            self.grilla.asignar(fila, col_dia, tipo_turno)
         
         self._actualizar_contadores(trabajador, tipo_turno, 1)
         return True
@@ -310,14 +190,15 @@ class AsignadorTurnosDiurnas:
         personal_operativo = self._contar_personal_operativo(col_dia)
         disponibles = self._obtener_trabajadores_disponibles(col_dia)
         disponibles_count = len(disponibles)
+        turnos = self.compilada.turnos_para(personal_operativo)
         
-        if personal_operativo < 9:
+        if turnos is None and personal_operativo < self.compilada.minimo_personal():
             return False, personal_operativo, disponibles_count, "Poco personal (<9)"
-        elif personal_operativo >= 12:
+        elif turnos is None:
             return False, personal_operativo, disponibles_count, "Mucho personal (≥12)"
-        elif personal_operativo in [9, 10] and disponibles_count < 2:
+        elif len(turnos) == 2 and disponibles_count < 2:
             return False, personal_operativo, disponibles_count, "Pocos disponibles para 6N+6S"
-        elif personal_operativo == 11 and disponibles_count < 1:
+        elif disponibles_count < len(turnos):
             return False, personal_operativo, disponibles_count, "Sin disponibles para 6S"
         else:
             return True, personal_operativo, disponibles_count, "OK"
@@ -332,92 +213,71 @@ class AsignadorTurnosDiurnas:
             return None, None
 
         disponibles = self._obtener_trabajadores_disponibles(col_dia)
-        trabajador_6s = None
-        trabajador_6n = None
-
-        if personal_operativo >= 9 and personal_operativo <= 10:
-            # Asignar 6N y 6S
-            if len(disponibles) >= 2:
-                # Seleccionar para 6N
-                elegido_6n = self._seleccionar_equitativo_6n(disponibles)
-                if elegido_6n and self._asignar_turno(elegido_6n, col_dia, "6N"):
-                    trabajador_6n = elegido_6n
-                    disponibles.remove(elegido_6n)
-
-                # Seleccionar para 6S
-                elegido_6s = self._seleccionar_equitativo_6s(disponibles)
-                if elegido_6s and self._asignar_turno(elegido_6s, col_dia, "6S"):
-                    trabajador_6s = elegido_6s
-
-        elif personal_operativo == 11:
-            # Asignar solo 6S
-            elegido_6s = self._seleccionar_equitativo_6s(disponibles)
-            if elegido_6s and self._asignar_turno(elegido_6s, col_dia, "6S"):
-                trabajador_6s = elegido_6s
-
-        return trabajador_6s, trabajador_6n
+        elegidos: Dict[str, Optional[str]] = {"6S": None, "6N": None}
+
+        # 9-10 → 6N y luego 6S a otro trabajador; 11 → solo 6S
+        for turno in self.compilada.turnos_para(personal_operativo):
+            seleccionar = self._seleccionar_equitativo_6n if turno == "6N" else self._seleccionar_equitativo_6s
+            elegido = seleccionar(disponibles)
+            if elegido and self._asignar_turno(elegido, col_dia, turno):
+                elegidos[turno] = elegido
+                disponibles.remove(elegido)
+
+        return elegidos["6S"], elegidos["6N"]
+
+    def _admite_transferencia(self, origen: str, destino: str, col: int) -> bool:
+        """True si el 6S/6N de `origen` en la columna puede pasar a `destino` con la grilla actual"""
+        fila_origen = self._obtener_fila_trabajador(origen)
+        fila_destino = self._obtener_fila_trabajador(destino)
+        if not fila_origen or not fila_destino:
+            return False
+        # Los 6S/6N del día son los que se mueven; solo bloquean los demás turnos conflictivos (BLPTD/NANRD)
+        bloqueos = self.compilada.regla.conflictos_dia - {"6S", "6N"}
+        return (
+            self.grilla.valor(fila_origen, col) in {"6S", "6N"}
+            and (fila_origen, col) not in self.original_6s
+            and (fila_origen, col) not in self.original_6n
+            and self.grilla.esta_vacia(fila_destino, col)
+            and self._es_celda_originalmente_vacia(fila_destino, col)
+            and not self.restricciones.en(bloqueos)[2:26, col].any()
+        )
 
     def _rebalancear_para_paridad(self) -> None:
-        """Rebalanceo moviendo turnos 6S y 6N para que DIURNA tenga diferencia ≤1"""
-        max_iteraciones = 50
-        iteracion = 0
-        
-        while iteracion < max_iteraciones:
-            iteracion += 1
-            
-            # Calcular conteos actuales de DIURNA para trabajadores elegibles presentes
-            conteos_actuales: Dict[str, int] = {}
-            for t in self.TRABAJADORES_ELEGIBLES:
-                if self._obtener_fila_trabajador(t):
-                    conteos_actuales[t] = self.contador_diurna[t]
-            
-            if not conteos_actuales:
-                break
+        """Rebalanceo moviendo turnos 6S y 6N para que DIURNA tenga diferencia ≤1 (transferencias por flujo de costo mínimo)"""
+        presentes = [t for t in self.TRABAJADORES_ELEGIBLES if self._obtener_fila_trabajador(t)]
+        diurnas = self.restricciones.en({"6S", "6N"})
+
+        for _ in range(MAX_RONDAS_REBALANCEO):
+            conteos = {t: self.contador_diurna[t] for t in presentes}
+            movibles = {}
+            for t in presentes:
+                fila = self._obtener_fila_trabajador(t)
+                movibles[t] = [
+                    col for col in range(2, self.grilla.max_col + 1)
+                    if diurnas[fila, col] and (fila, col) not in self.original_6s and (fila, col) not in self.original_6n
+                ]
+            transferencias = planificar_transferencias(conteos, movibles, self._admite_transferencia)
+
+            aplicadas = 0
+            for origen, destino, col in transferencias:
+                if not self._admite_transferencia(origen, destino, col):
+                    continue
+                fila_origen = self._obtener_fila_trabajador(origen)
+                tipo_turno = self.grilla.valor(fila_origen, col)
 
-            trabajador_max = max(conteos_actuales, key=conteos_actuales.get)
-            trabajador_min = min(conteos_actuales, key=conteos_actuales.get)
-            
-            if conteos_actuales[trabajador_max] - conteos_actuales[trabajador_min] <= 1:
-                break
+                # Remover del trabajador de origen
+                self.grilla.asignar(fila_origen, col, None, relleno=None)
+                self._actualizar_contadores(origen, tipo_turno, -1)
 
-            fila_max = self._obtener_fila_trabajador(trabajador_max)
-            fila_min = self._obtener_fila_trabajador(trabajador_min)
-            if not fila_max or not fila_min:
-                break
+                # Asignar al trabajador de destino
+                color = self.COLOR_6S if tipo_turno == "6S" else self.COLOR_6N
+                self.grilla.asignar(self._obtener_fila_trabajador(destino), col, tipo_turno, relleno=color)
+                self._actualizar_contadores(destino, tipo_turno, 1)
+                aplicadas += 1
 
-            # Buscar una columna donde mover un turno
-            movimiento_realizado = False
-            for col in range(2, self.ws.max_column + 1):
-                valor_max = self.ws.cell(row=fila_max, column=col).value
-                valor_min = self.ws.cell(row=fila_min, column=col).value
-                
-                if (
-                    valor_max is not None
-                    and str(valor_max).strip().upper() in {"6S", "6N"}
-                    and (valor_min is None or str(valor_min).strip() == "")
-                    and self._es_celda_originalmente_vacia(fila_min, col)
-                    and not self._existe_turno_conflictivo_en_dia(col)
-                ):
-                    tipo_turno = str(valor_max).strip().upper()
-                    
-                    # Remover del trabajador_max
-                    self.ws.cell(row=fila_max, column=col, value=None)
-                    celda_original = self.ws.cell(row=fila_max, column=col)
-                    celda_original.fill = PatternFill(fill_type=None)
-                    self._actualizar_contadores(trabajador_max, tipo_turno, -1)
-
-                    # Asignar al trabajador_min
-                    self.ws.cell(row=fila_min, column=col, value=tipo_turno)
-                    celda_nueva = self.ws.cell(row=fila_min, column=col)
-                    color = self.COLOR_6S if tipo_turno == "6S" else self.COLOR_6N
-                    celda_nueva.fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
-                    self._actualizar_contadores(trabajador_min, tipo_turno, 1)
-
-                    movimiento_realizado = True
-                    break
-
-            if not movimiento_realizado:
+            if not aplicadas:
                 break
+            diurnas = self.restricciones.en({"6S", "6N"})
 
     def _actualizar_hoja_estadisticas(self) -> None:
         nombre_stats = "Estadísticas"
@@ -438,7 +298,7 @@ class AsignadorTurnosDiurnas:
         for fila in ws_stats.iter_rows():
             for celda in fila:
                 celda.value = None
-                celda.fill = PatternFill(fill_type=None)
+                aplicar_estilo(celda)
 
         # Encabezados
         ws_stats.cell(row=1, column=1, value="SIGLA")
@@ -460,17 +320,13 @@ class AsignadorTurnosDiurnas:
             ws_stats.cell(row=1, column=8, value="DIURNA")  # 6S + 6N
             num_columnas = 8
 
-        header_fill = PatternFill(start_color="E6E6E6", end_color="E6E6E6", fill_type="solid")
-        header_font = Font(bold=True)
         for col in range(1, num_columnas + 1):
-            c = ws_stats.cell(row=1, column=col)
-            c.fill = header_fill
-            c.font = header_font
+            aplicar_estilo(ws_stats.cell(row=1, column=col), "gris_encabezado", "negrita")
 
         hoja = self._nombre_hoja_horario()
         fila_destino = 2
         for fila in range(2, 26):
-            trabajador = self.ws.cell(row=fila, column=1).value
+            trabajador = self.grilla.valor_crudo(fila, 1)
             if not trabajador:
                 continue
             ws_stats.cell(row=fila_destino, column=1, value=trabajador)
@@ -557,7 +413,7 @@ class AsignadorTurnosDiurnas:
         print("REPORTE DETALLADO DE ASIGNACIÓN DE TURNOS DIURNOS (6S y 6N)")
         print("="*80)
         
-        max_col = self.ws.max_column
+        max_col = self.grilla.max_col
         asignaciones_realizadas = []
         dias_con_9_10_personal = []
         dias_con_11_personal = []
@@ -565,7 +421,7 @@ class AsignadorTurnosDiurnas:
         dias_con_conflictos = []
         
         for col in range(2, max_col + 1):
-            header = self.ws.cell(row=1, column=col).value
+            header = self.grilla.valor_crudo(1, col)
             if not header or header == "SIGLA ATCO":
                 continue
                 
@@ -664,7 +520,7 @@ class AsignadorTurnosDiurnas:
         print("="*80)
         return len(asignaciones_realizadas)
 
-    def procesar_todos_los_dias(self) -> None:
+    def procesar_todos_los_dias(self, guardar: bool = True) -> None:
         # Actualizar la fila de conteo operativo estático antes de asignar
         print("🔄 Actualizando fila de conteo operativo estático...")
         self._actualizar_fila_conteo_operativo()
@@ -679,15 +535,9 @@ class AsignadorTurnosDiurnas:
         self._actualizar_hoja_estadisticas()
 
         # Guardar archivo
-        salida = "horarioUnificado_con_diurnas.xlsx"
-        try:
-            self.wb.save(salida)
-            print(f"\n✅ Archivo guardado como: {salida}")
-        except PermissionError:
-            base, ext = os.path.splitext(salida)
-            alternativo = f"{base}_{random.randint(1000,9999)}{ext}"
-            self.wb.save(alternativo)
-            print(f"\n✅ Archivo por defecto en uso. Guardado como: {alternativo}")
+        if guardar:
+            print()
+            self.grilla.guardar("horarioUnificado_con_diurnas.xlsx")
 
 
 if __name__ == "__main__":
@@ -1,9 +1,9 @@
-import openpyxl
 import random
 from collections import defaultdict
-from openpyxl.styles import PatternFill, Font
 from typing import List, Optional, Dict, Set
-import os
+
+from exportador_excel import aplicar_estilo
+from grilla_horario import GrillaHorario, resolver_archivo_entrada
 
 
 class AsignadorTurnosMofis:
@@ -22,6 +22,7 @@ class AsignadorTurnosMofis:
     - Verificar que no existan ya estos turnos en el día
     - Actualizar hoja "Estadísticas" con columna 6S (S+N)
     - Guardar como "horarioUnificado_con_mofis.xlsx"
+    - Puede recibir una `GrillaHorario` ya cargada para ejecutarse en memoria dentro de la cadena
     """
 
     TRABAJADORES_ELEGIBLES = ['MEI', 'VCM', 'ROP', 'WEH']
@@ -54,46 +55,34 @@ class AsignadorTurnosMofis:
         1: ["N"]
     }
 
-    def __init__(self, archivo_entrada: Optional[str] = None) -> None:
-        # Elegir el archivo de entrada más reciente disponible
-        candidatos = [
-            archivo_entrada,
-            "horarioUnificado_con_diurnas.xlsx",
-            "horarioUnificado_con_6rt.xlsx",
-            "horarioUnificado_con_1t.xlsx",
-            "horarioUnificado_procesado.xlsx",
-        ]
-        candidatos = [c for c in candidatos if c]
-        elegido = None
-        for c in candidatos:
-            if os.path.exists(c):
-                elegido = c
-                break
-        if not elegido:
-            elegido = "horarioUnificado_procesado.xlsx"
-        self.archivo_entrada = elegido
-
-        self.wb = openpyxl.load_workbook(self.archivo_entrada)
-        self.ws = self._obtener_hoja_horario()
+    def __init__(self, archivo_entrada: Optional[str] = None, grilla: Optional[GrillaHorario] = None) -> None:
+        if grilla is None:
+            # Elegir el archivo de entrada más reciente disponible
+            self.archivo_entrada = resolver_archivo_entrada(
+                [
+                    archivo_entrada,
+                    "horarioUnificado_con_diurnas.xlsx",
+                    "horarioUnificado_con_6rt.xlsx",
+                    "horarioUnificado_con_1t.xlsx",
+                    "horarioUnificado_procesado.xlsx",
+                ],
+                "horarioUnificado_procesado.xlsx",
+            )
+            grilla = GrillaHorario.desde_archivo(self.archivo_entrada)
+        else:
+            self.archivo_entrada = None
+        self.grilla = grilla
+        self.wb = grilla.wb
+        self.ws = grilla.ws
         self.contador_sn: Dict[str, int] = defaultdict(int)  # Contador de turnos S+N
         random.seed()
         self._inicializar_contadores_desde_hoja()
 
-    def _obtener_hoja_horario(self):
-        for nombre in self.wb.sheetnames:
-            if nombre != "Estadísticas":
-                return self.wb[nombre]
-        return self.wb.active
-
     def _nombre_hoja_horario(self) -> str:
         return self.ws.title
 
     def _obtener_fila_trabajador(self, trabajador: str) -> Optional[int]:
-        for fila in range(2, 26):
-            valor = self.ws.cell(row=fila, column=1).value
-            if valor and str(valor).strip().upper() == trabajador.upper():
-                return fila
-        return None
+        return self.grilla.fila_de(trabajador)
 
     def _es_turno_no_operativo(self, turno: str) -> bool:
         """Verifica si un turno está en la lista de no operativos"""
@@ -114,11 +103,10 @@ class AsignadorTurnosMofis:
             fila = self._obtener_fila_trabajador(trabajador)
             if not fila:
                 continue
-            celda = self.ws.cell(row=fila, column=col_dia)
-            valor = celda.value
+            valor = self.grilla.valor(fila, col_dia)
             
             # Si la celda está vacía o tiene un turno que NO está en la lista de no operativos, es elegible
-            if valor is None or str(valor).strip() == "" or not self._es_turno_no_operativo(valor):
+            if valor is None or not self._es_turno_no_operativo(valor):
                 disponibles.append(trabajador)
         
         return disponibles
@@ -126,10 +114,7 @@ class AsignadorTurnosMofis:
     def _existe_turno_en_dia(self, turno: str, col_dia: int) -> bool:
         """Verifica si ya existe un turno específico en el día"""
         for fila in range(2, 26):
-            val = self.ws.cell(row=fila, column=col_dia).value
-            if val is None:
-                continue
-            if str(val).strip().upper() == turno.upper():
+            if self.grilla.valor(fila, col_dia) == turno.upper():
                 return True
         return False
 
@@ -144,14 +129,11 @@ class AsignadorTurnosMofis:
     def _inicializar_contadores_desde_hoja(self) -> None:
         """Inicializa contadores de turnos S+N desde el archivo existente"""
         for fila in range(2, 26):
-            trabajador = self.ws.cell(row=fila, column=1).value
+            trabajador = self.grilla.valor_crudo(fila, 1)
             if not trabajador:
                 continue
-            for col in range(2, self.ws.max_column + 1):
-                val = self.ws.cell(row=fila, column=col).value
-                if val is None:
-                    continue
-                if self._es_turno_s_o_n(val):
+            for col in range(2, self.grilla.max_col + 1):
+                if self._es_turno_s_o_n(self.grilla.valor(fila, col)):
                     self.contador_sn[str(trabajador).strip().upper()] += 1
 
     def asignar_turnos_en_dia(self, col_dia: int) -> List[str]:
@@ -191,10 +173,8 @@ class AsignadorTurnosMofis:
             if not fila:
                 continue
             
-            celda = self.ws.cell(row=fila, column=col_dia, value=turno)
-            
-            # Colorear celda de amarillo claro
-            celda.fill = PatternFill(start_color="FFFF99", end_color="FFFF99", fill_type="solid")
+            # Asignar turno y colorear celda de amarillo claro
+            self.grilla.asignar(fila, col_dia, turno, relleno="FFFF99")
             
             # Actualizar contador si es turno S o N
             if self._es_turno_s_o_n(turno):
@@ -207,11 +187,11 @@ class AsignadorTurnosMofis:
         
         return asignaciones
 
-    def procesar_todos_los_dias(self) -> None:
+    def procesar_todos_los_dias(self, guardar: bool = True) -> None:
         """Procesa todos los días del mes asignando turnos MOFIS"""
         total_asignaciones = 0
         
-        for col in range(2, self.ws.max_column + 1):
+        for col in range(2, self.grilla.max_col + 1):
             asignaciones = self.asignar_turnos_en_dia(col)
             if asignaciones:
                 total_asignaciones += len(asignaciones)
@@ -226,15 +206,9 @@ class AsignadorTurnosMofis:
         
         self._actualizar_hoja_estadisticas()
 
-        salida = "horarioUnificado_con_mofis.xlsx"
-        try:
-            self.wb.save(salida)
-            print(f"\nArchivo guardado como: {salida}")
-        except PermissionError:
-            base, ext = os.path.splitext(salida)
-            alternativo = f"{base}_{random.randint(1000,9999)}{ext}"
-            self.wb.save(alternativo)
-            print(f"Archivo por defecto en uso. Guardado como: {alternativo}")
+        if guardar:
+            print()
+            self.grilla.guardar("horarioUnificado_con_mofis.xlsx")
 
     def _actualizar_hoja_estadisticas(self) -> None:
         """Actualiza la hoja de estadísticas conservando todas las columnas del módulo de diurnas"""
@@ -256,7 +230,7 @@ class AsignadorTurnosMofis:
         for fila in ws_stats.iter_rows():
             for celda in fila:
                 celda.value = None
-                celda.fill = PatternFill(fill_type=None)
+                aplicar_estilo(celda)
 
         # Encabezados (conservando todas las columnas del módulo de diurnas)
         ws_stats.cell(row=1, column=1, value="SIGLA")
@@ -284,17 +258,13 @@ class AsignadorTurnosMofis:
             ws_stats.cell(row=1, column=11, value="6D")     # Nueva columna 6D
             num_columnas = 11
 
-        header_fill = PatternFill(start_color="E6E6E6", end_color="E6E6E6", fill_type="solid")
-        header_font = Font(bold=True)
         for col in range(1, num_columnas + 1):
-            c = ws_stats.cell(row=1, column=col)
-            c.fill = header_fill
-            c.font = header_font
+            aplicar_estilo(ws_stats.cell(row=1, column=col), "gris_encabezado", "negrita")
 
         hoja = self._nombre_hoja_horario()
         fila_destino = 2
         for fila in range(2, 26):
-            trabajador = self.ws.cell(row=fila, column=1).value
+            trabajador = self.grilla.valor_crudo(fila, 1)
             if not trabajador:
                 continue
             ws_stats.cell(row=fila_destino, column=1, value=trabajador)
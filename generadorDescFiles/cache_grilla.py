@@ -0,0 +1,156 @@
+"""
+Caché binaria de grillas: sidecar por libro en __grilla_cache__/ junto al archivo.
+
+- Por cada hoja de horario pedida a `GrillaHorario.solo_lectura` guarda la matriz de códigos como
+  .npy (se abre con np.load(mmap_mode='c'), sin copiarla ni descomprimir nada) y el vocabulario,
+  título y hojas del libro en el JSON del sidecar
+- Las filas de otras hojas pedidas a `leer_filas` (p. ej. 'Estadísticas') se guardan en el mismo JSON
+- Clave: mtime + tamaño + SHA-256 del libro. Si el mtime y el tamaño coinciden no se relee el
+  archivo; si solo cambió el mtime (copia, touch) se compara el SHA-256 y se actualiza el mtime
+- Un libro modificado invalida todo su sidecar; en un fallo de caché el llamador lee con openpyxl y
+  guarda el resultado. Los errores de escritura del sidecar (carpeta de solo lectura) se ignoran
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+DIRECTORIO_CACHE = "__grilla_cache__"
+VERSION_CACHE = 1
+
+
+def huella_sha256(ruta: str, bloque: int = 1 << 20) -> str:
+    """SHA-256 del contenido del archivo."""
+    sha = hashlib.sha256()
+    with open(ruta, "rb") as archivo:
+        for trozo in iter(lambda: archivo.read(bloque), b""):
+            sha.update(trozo)
+    return sha.hexdigest()
+
+
+def _escribir_atomico(ruta: str, escribir) -> None:
+    """Escribe en un temporal y lo reemplaza, para que un lector nunca vea un archivo a medias."""
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    try:
+        escribir(temporal)
+        os.replace(temporal, ruta)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+
+class CacheGrilla:
+    """Sidecar de un libro: {hoja: códigos + vocabulario} y {hoja: filas de valores}."""
+
+    def __init__(self, ruta: str) -> None:
+        self.ruta = ruta
+        self.directorio = os.path.join(os.path.dirname(os.path.abspath(ruta)), DIRECTORIO_CACHE)
+        self.base = os.path.join(self.directorio, os.path.basename(ruta))
+        self.archivo_meta = f"{self.base}.json"
+        self._meta: Optional[dict] = None
+
+    # --------------------------------------------------------
+    # Clave del libro
+    # --------------------------------------------------------
+    def _meta_vigente(self) -> dict:
+        """
+        Metadatos del sidecar si corresponden al libro actual; si no, unos nuevos (vacíos) con la
+        clave calculada ANTES de que el llamador lea el libro.
+        """
+        if self._meta is not None:
+            return self._meta
+        estado = os.stat(self.ruta)
+        try:
+            with open(self.archivo_meta, "r", encoding="utf-8") as archivo:
+                meta = json.load(archivo)
+        except (OSError, ValueError):
+            meta = None
+
+        if meta is not None and meta.get("version") == VERSION_CACHE and meta.get("tamano") == estado.st_size:
+            if meta.get("mtime_ns") == estado.st_mtime_ns:
+                self._meta = meta
+                return meta
+            if meta.get("sha256") == huella_sha256(self.ruta):
+                meta["mtime_ns"] = estado.st_mtime_ns
+                self._meta = meta
+                self._guardar_meta()
+                return meta
+
+        self._meta = {
+            "version": VERSION_CACHE,
+            "mtime_ns": estado.st_mtime_ns,
+            "tamano": estado.st_size,
+            "sha256": huella_sha256(self.ruta),
+            "grillas": {},
+            "filas": {},
+        }
+        return self._meta
+
+    def _guardar_meta(self) -> None:
+        def escribir(temporal):
+            with open(temporal, "w", encoding="utf-8") as archivo:
+                json.dump(self._meta, archivo, ensure_ascii=False)
+        try:
+            os.makedirs(self.directorio, exist_ok=True)
+            _escribir_atomico(self.archivo_meta, escribir)
+        except OSError:
+            pass
+
+    # --------------------------------------------------------
+    # Grilla codificada
+    # --------------------------------------------------------
+    def _archivo_codigos(self, hoja: Optional[str]) -> str:
+        clave = hashlib.sha1((hoja or "").encode("utf-8")).hexdigest()[:12]
+        return f"{self.base}.{clave}.npy"
+
+    def cargar_grilla(self, hoja: Optional[str] = None) -> Optional[Tuple[np.ndarray, List[str], str, List[str]]]:
+        """(codigos, vocabulario, titulo, hojas) de la hoja (None = hoja de horario por defecto), o None."""
+        entrada = self._meta_vigente()["grillas"].get(hoja or "")
+        if entrada is None:
+            return None
+        try:
+            codigos = np.load(self._archivo_codigos(hoja), mmap_mode="c")
+        except (OSError, ValueError):
+            return None
+        return codigos, entrada["vocabulario"], entrada["titulo"], entrada["hojas"]
+
+    def guardar_grilla(self, hoja: Optional[str], codigos: np.ndarray, vocabulario: List[str],
+                       titulo: str, hojas: List[str]) -> None:
+        meta = self._meta_vigente()
+        try:
+            os.makedirs(self.directorio, exist_ok=True)
+            _escribir_atomico(self._archivo_codigos(hoja), lambda temporal: _guardar_npy(temporal, codigos))
+        except OSError:
+            return
+        meta["grillas"][hoja or ""] = {"vocabulario": list(vocabulario), "titulo": titulo, "hojas": list(hojas)}
+        self._guardar_meta()
+
+    # --------------------------------------------------------
+    # Filas de valores
+    # --------------------------------------------------------
+    def cargar_filas(self, hojas: List[str]) -> Optional[Dict[str, List[tuple]]]:
+        """{hoja: filas} si todas las hojas pedidas están en el sidecar (las que no existen en el libro se omiten)."""
+        meta = self._meta_vigente()
+        if not all(nombre in meta["filas"] for nombre in hojas):
+            return None
+        return {nombre: [tuple(fila) for fila in meta["filas"][nombre]]
+                for nombre in hojas if meta["filas"][nombre] is not None}
+
+    def guardar_filas(self, hojas: List[str], filas: Dict[str, List[tuple]]) -> None:
+        """Guarda las filas leídas; una hoja pedida que no existe se registra como None."""
+        meta = self._meta_vigente()
+        nuevas = {nombre: [list(fila) for fila in filas[nombre]] if nombre in filas else None for nombre in hojas}
+        try:
+            json.dumps(nuevas)
+        except (TypeError, ValueError):
+            return  # valores no representables en JSON (fechas): sin caché para estas hojas
+        meta["filas"].update(nuevas)
+        self._guardar_meta()
+
+
+def _guardar_npy(ruta: str, codigos: np.ndarray) -> None:
+    with open(ruta, "wb") as archivo:
+        np.save(archivo, np.ascontiguousarray(codigos))
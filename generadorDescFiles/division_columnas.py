@@ -0,0 +1,261 @@
+"""
+Conversión entre el horario unificado (una columna por día) y el formato con división de columna
+(dos columnas por día, excel_con_division_de_columna.xlsx), en ambos sentidos con la misma tabla.
+
+- DIVISION_TURNOS declara cada turno y sus dos mitades (6TT ↔ TLPT/NLPT, ..., 1T ↔ BLPT); los turnos
+  sin entrada pasan tal cual a la primera columna
+- TablaDivision compila esa tabla sobre el vocabulario de la hoja codificada: `primera[id]` y
+  `segunda[id]` dividen, `inversa[id1, id2]` une. Cada conversión es una indexación NumPy sobre la
+  matriz de ids, sin cadenas if/elif por celda, y el vocabulario se comparte entre hojas (un año)
+- El color del turno pasa a las columnas que ocupa según la misma tabla (a las dos si tiene segunda
+  mitad); al unir se toma el de la primera columna
+- La ida y vuelta es exacta si `inversa[primera[ids], segunda[ids]] == ids` en toda la matriz
+  (`es_reversible`); `celdas_no_reversibles` lista las que no (p. ej. un 'BANT' escrito a mano, que
+  volvería como '1')
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import openpyxl
+from openpyxl.worksheet.cell_range import CellRange
+
+from exportador_excel import escribir_hoja, libro_solo_escritura, registrar_estilo
+
+
+DIVISION_TURNOS = (
+    # (turno, primera columna, segunda columna; "" = ocupa solo la primera)
+    ("6TT", "TLPT", "NLPT"),
+    ("6RT", "MLPR", "NLPR"),
+    ("6T", "TANT", "NANT"),
+    ("6R", "MAST", "NANR"),
+    ("6N", "MANR", "TANR"),
+    ("6S", "MASR", "TASR"),
+    ("6MT", "MLPR", "TLPR"),
+    ("3", "TAST", "HXN4"),
+    ("7", "BLPT", "NLPR"),
+    ("1T", "BLPT", ""),
+    ("1", "BANT", ""),
+)
+
+ANCHO_COLUMNA = 8
+
+
+def clave(valor) -> str:
+    """Texto comparable de una celda ("" = vacía), el mismo con que se verifica la conversión."""
+    return "" if valor is None or valor == "" else str(valor).strip()
+
+
+def _matriz(filas: Sequence[Sequence], ancho: int = 0) -> np.ndarray:
+    """Filas de largo variable → matriz object rellenada con None."""
+    ancho = max([ancho] + [len(fila) for fila in filas])
+    matriz = np.full((len(filas), ancho), None, dtype=object)
+    for i, fila in enumerate(filas):
+        matriz[i, :len(fila)] = fila
+    return matriz
+
+
+class TablaDivision:
+    """DIVISION_TURNOS compilada sobre un vocabulario de claves (id 0 = vacía)."""
+
+    def __init__(self, division: Sequence[Tuple[str, str, str]] = DIVISION_TURNOS) -> None:
+        self.division = tuple(division)
+        self.vocabulario: List[str] = [""]
+        self._ids = {"": 0}
+        self._por_valor = {None: 0}
+        for textos in self.division:
+            for texto in textos:
+                self.internar(texto)
+        self._compilada = 0
+
+    def internar(self, texto: str) -> int:
+        idx = self._ids.get(texto)
+        if idx is None:
+            idx = len(self.vocabulario)
+            self.vocabulario.append(texto)
+            self._ids[texto] = idx
+        return idx
+
+    def codificar(self, valores: np.ndarray) -> np.ndarray:
+        """Matriz de valores de celda → matriz de ids del vocabulario (una consulta de diccionario por celda)."""
+        por_valor = self._por_valor
+        ids = [por_valor[valor] if valor in por_valor else self._internar_valor(valor)
+               for valor in valores.ravel().tolist()]
+        return np.array(ids, dtype=np.int32).reshape(valores.shape)
+
+    def _internar_valor(self, valor) -> int:
+        idx = self.internar(clave(valor))
+        self._por_valor[valor] = idx
+        return idx
+
+    def _compilar(self) -> None:
+        """(Re)construye las tablas de búsqueda si el vocabulario creció."""
+        n = len(self.vocabulario)
+        if self._compilada == n:
+            return
+        self.primera = np.arange(n, dtype=np.int32)
+        self.segunda = np.zeros(n, dtype=np.int32)
+        self.renombrado = np.zeros(n, dtype=bool)
+        self.inversa = np.repeat(np.arange(n, dtype=np.int32)[:, None], n, axis=1)
+        self.inversa[0, :] = 0  # primera columna vacía: día vacío
+        self.es_par = np.zeros((n, n), dtype=bool)
+        for turno, primera, segunda in self.division:
+            t, p, s = self._ids[turno], self._ids[primera], self._ids[segunda]
+            self.primera[t], self.segunda[t], self.renombrado[t] = p, s, True
+            self.inversa[p, s] = t
+            self.es_par[p, s] = True
+        self._textos = np.array([None] + self.vocabulario[1:], dtype=object)
+        self._compilada = n
+
+    def textos(self, ids: np.ndarray) -> np.ndarray:
+        """Ids → textos (None para 0)."""
+        self._compilar()
+        return self._textos[ids]
+
+    def dividir(self, ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Ids del día → (ids de la primera columna, ids de la segunda)."""
+        self._compilar()
+        return self.primera[ids], self.segunda[ids]
+
+    def unir(self, ids_primera: np.ndarray, ids_segunda: np.ndarray) -> np.ndarray:
+        """Ids de las dos columnas del día → ids del turno original (sin par conocido: la primera)."""
+        self._compilar()
+        return self.inversa[ids_primera, ids_segunda]
+
+    def es_reversible(self, ids: np.ndarray) -> bool:
+        return np.array_equal(self.unir(*self.dividir(ids)), ids)
+
+    def celdas_no_reversibles(self, ids: np.ndarray) -> np.ndarray:
+        """Posiciones (fila, columna) cuyo valor no vuelve igual tras dividir y unir."""
+        return np.argwhere(self.unir(*self.dividir(ids)) != ids)
+
+
+# --------------------------------------------------------
+# Hojas completas
+# --------------------------------------------------------
+def leer_hoja(ruta: str) -> Tuple[str, np.ndarray, np.ndarray]:
+    """
+    (título, valores, colores) de la hoja activa en modo streaming (conserva las fórmulas). Los
+    colores son el RGB de los rellenos sólidos, o None.
+    """
+    wb = openpyxl.load_workbook(ruta, read_only=True)
+    try:
+        ws = wb.active
+        titulo = ws.title
+        valores, colores = [], []
+        for fila in ws.iter_rows():
+            valores.append([celda.value for celda in fila])
+            colores.append([_color(celda) for celda in fila])
+    finally:
+        wb.close()
+    ancho = max([len(fila) for fila in valores] + [0])
+    return titulo, _matriz(valores, ancho), _matriz(colores, ancho)
+
+
+def _color(celda) -> Optional[str]:
+    relleno = celda.fill
+    if relleno is not None and relleno.fill_type == "solid" and isinstance(relleno.start_color.rgb, str):
+        return relleno.start_color.rgb
+    return None
+
+
+def dividir_hoja(tabla: TablaDivision, valores: np.ndarray, colores: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Hoja unificada → (valores, colores) con dos columnas por día (la columna A queda igual) y los ids
+    de los días, para verificar la ida y vuelta con `tabla.es_reversible`.
+    La fila 1 conserva los encabezados en la primera columna de cada día.
+    """
+    dias, colores_dias = valores[:, 1:], colores[:, 1:]
+    ids = tabla.codificar(dias)
+    ids[0] = 0
+    ids_primera, ids_segunda = tabla.dividir(ids)
+
+    filas, n_dias = dias.shape
+    divididos = np.full((filas, 1 + 2 * n_dias), None, dtype=object)
+    colores_divididos = np.full(divididos.shape, None, dtype=object)
+    divididos[:, 0] = valores[:, 0]
+    divididos[:, 1::2] = np.where(tabla.renombrado[ids], tabla.textos(ids_primera), dias)
+    divididos[:, 2::2] = tabla.textos(ids_segunda)
+    divididos[:, 1::2][ids == 0] = None
+    divididos[0, 1::2] = dias[0]
+    colores_divididos[:, 1::2] = np.where(ids != 0, colores_dias, None)
+    colores_divididos[:, 2::2] = np.where(ids_segunda != 0, colores_dias, None)
+    return divididos, colores_divididos, ids
+
+
+def unir_hoja(tabla: TablaDivision, valores: np.ndarray, colores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hoja con división de columna → (valores, colores) unificados: cada par de columnas desde la B
+    vuelve a ser un día con el turno de `tabla.unir` y el color de su primera columna.
+    """
+    if valores.shape[1] % 2 == 0:  # último día sin su segunda columna
+        valores = np.pad(valores, ((0, 0), (0, 1)), constant_values=None)
+        colores = np.pad(colores, ((0, 0), (0, 1)), constant_values=None)
+    primeras, segundas = valores[:, 1::2], valores[:, 2::2]
+    ids_primera, ids_segunda = tabla.codificar(primeras), tabla.codificar(segundas)
+    ids = tabla.unir(ids_primera, ids_segunda)
+
+    unidos = np.full((valores.shape[0], 1 + primeras.shape[1]), None, dtype=object)
+    unidos[:, 0] = valores[:, 0]
+    unidos[:, 1:] = np.where(tabla.es_par[ids_primera, ids_segunda], tabla.textos(ids), primeras)
+    unidos[:, 1:][ids == 0] = None
+    unidos[0, 1:] = primeras[0]
+    colores_unidos = np.full(unidos.shape, None, dtype=object)
+    colores_unidos[1:, 1:] = np.where(ids[1:] != 0, colores[1:, 1::2], None)
+    return unidos, colores_unidos
+
+
+def mismas_celdas(tabla: TablaDivision, valores_a: np.ndarray, valores_b: np.ndarray) -> bool:
+    """Comparación de dos hojas por clave de celda en una sola igualdad de matrices."""
+    return np.array_equal(tabla.codificar(valores_a), tabla.codificar(valores_b))
+
+
+def celdas_distintas(tabla: TablaDivision, valores_a: np.ndarray, valores_b: np.ndarray) -> np.ndarray:
+    """Posiciones (fila, columna) desde 0 donde las claves difieren (las hojas se igualan en tamaño)."""
+    forma = tuple(max(a, b) for a, b in zip(valores_a.shape, valores_b.shape))
+    ids_a = np.zeros(forma, dtype=np.int32)
+    ids_b = np.zeros(forma, dtype=np.int32)
+    ids_a[:valores_a.shape[0], :valores_a.shape[1]] = tabla.codificar(valores_a)
+    ids_b[:valores_b.shape[0], :valores_b.shape[1]] = tabla.codificar(valores_b)
+    return np.argwhere(ids_a != ids_b)
+
+
+# --------------------------------------------------------
+# Escritura
+# --------------------------------------------------------
+def _estilos(wb, colores: np.ndarray) -> List[list]:
+    nombres = {color: registrar_estilo(wb, color) for color in set(colores.ravel()) if color}
+    return [[nombres.get(color) for color in fila] for fila in colores.tolist()]
+
+
+def guardar_dividido(ruta: str, titulo: str, valores: np.ndarray, colores: np.ndarray) -> str:
+    """
+    Libro con división de columna: columna A en azul claro, encabezado de cada día combinado sobre
+    sus dos columnas (rosa claro los domingos) y celdas vacías de domingo en rosa claro.
+    """
+    colores = colores.copy()
+    encabezados = valores[0, 1::2]
+    domingos = np.array([bool(dia) and str(dia).startswith("SUN") for dia in encabezados])
+    domingo_col = np.zeros(valores.shape[1], dtype=bool)
+    domingo_col[1::2] = domingos
+    domingo_col[2::2] = domingos
+    vacias = np.vectorize(lambda valor: not valor, otypes=[bool])(valores)
+    colores[1:][vacias[1:] & domingo_col] = "rosa_claro"
+    colores[:, 0] = "azul_claro"
+
+    wb = libro_solo_escritura()
+    estilos = _estilos(wb, colores)
+    for k, domingo in enumerate(domingos):
+        estilos[0][1 + 2 * k] = registrar_estilo(wb, "rosa_claro" if domingo else "azul_claro", "centrado")
+    ws = escribir_hoja(wb, titulo, valores.tolist(), estilos, [ANCHO_COLUMNA] * valores.shape[1])
+    for k in range(len(encabezados)):
+        ws.merged_cells.add(CellRange(min_col=2 + 2 * k, min_row=1, max_col=3 + 2 * k, max_row=1))
+    wb.save(ruta)
+    return ruta
+
+
+def guardar_unido(ruta: str, titulo: str, valores: np.ndarray, colores: np.ndarray) -> str:
+    wb = libro_solo_escritura()
+    escribir_hoja(wb, titulo, valores.tolist(), _estilos(wb, colores), [ANCHO_COLUMNA] * valores.shape[1])
+    wb.save(ruta)
+    return ruta
@@ -1,7 +1,6 @@
 import openpyxl
-from openpyxl.styles import Alignment, PatternFill
-from openpyxl.utils import get_column_letter
-import copy
+
+from division_columnas import TablaDivision, dividir_hoja, guardar_dividido, leer_hoja
 
 def modificar_horario_con_division_columna():
     """
@@ -23,175 +22,28 @@ def modificar_horario_con_division_columna():
          * 1T → BLPT
          * 1 → BANT
        - Otros turnos se mantienen iguales pero ocupan solo la primera columna
+    4. Verifica que la conversión inversa (quitar_division_de_columna.py) recupere cada celda
+
+    Las reglas están en DIVISION_TURNOS (division_columnas.py), la misma tabla que usa la conversión
+    inversa; la división y el color de cada mitad salen de una búsqueda vectorizada sobre la hoja codificada.
     """
     
-    # Cargar el archivo original
-    wb = openpyxl.load_workbook('horarioUnificado_con_6t.xlsx')
-    ws = wb.active
-    
-    print(f"Procesando archivo: {wb.active.title}")
-    print(f"Dimensiones originales: {ws.max_row} filas x {ws.max_column} columnas")
-    
-    # Crear nuevo workbook
-    nuevo_wb = openpyxl.Workbook()
-    nuevo_ws = nuevo_wb.active
-    nuevo_ws.title = ws.title
+    # Cargar el archivo original (valores y colores de relleno)
+    titulo, valores, colores = leer_hoja('horarioUnificado_con_6t.xlsx')
     
-    # Definir colores
-    azul_claro = PatternFill(start_color="ADD8E6", end_color="ADD8E6", fill_type="solid")  # Light blue
-    rojo_claro = PatternFill(start_color="FFB6C1", end_color="FFB6C1", fill_type="solid")  # Light red
-    
-    def aplicar_color_seguro(celda, color):
-        """Aplica color solo si existe"""
-        if color:
-            celda.fill = color
-    
-    # Copiar la primera columna (trabajadores) sin cambios y aplicar color azul claro
-    for fila in range(1, ws.max_row + 1):
-        valor = ws.cell(row=fila, column=1).value
-        celda_nueva = nuevo_ws.cell(row=fila, column=1, value=valor)
-        celda_nueva.fill = azul_claro
-    
-    # Procesar columnas de días (desde la columna 2 en adelante)
-    nueva_col = 2
-    for col_original in range(2, ws.max_column + 1):
-        dia = ws.cell(row=1, column=col_original).value
-        
-        # Crear dos columnas para cada día
-        col_primera = nueva_col
-        col_segunda = nueva_col + 1
-        
-        # Combinar las dos columnas para el encabezado del día
-        nuevo_ws.merge_cells(start_row=1, start_column=col_primera, 
-                           end_row=1, end_column=col_segunda)
-        celda_encabezado = nuevo_ws.cell(row=1, column=col_primera, value=dia)
-        
-        # Centrar el encabezado y aplicar color
-        celda_encabezado.alignment = Alignment(horizontal='center')
-        
-        # Aplicar color según el tipo de día
-        if dia and str(dia).startswith("SUN"):
-            # Domingo: rojo claro
-            celda_encabezado.fill = rojo_claro
-        else:
-            # Otros días: azul claro
-            celda_encabezado.fill = azul_claro
-        
-        # Procesar cada fila para este día
-        for fila in range(2, ws.max_row + 1):
-            turno_original = ws.cell(row=fila, column=col_original).value
-            
-            if turno_original:
-                turno_str = str(turno_original).strip()
-                
-                # Obtener el color original del turno
-                celda_original = ws.cell(row=fila, column=col_original)
-                # Crear una copia del color original
-                if celda_original.fill.start_color.rgb:
-                    color_original = PatternFill(
-                        start_color=celda_original.fill.start_color.rgb,
-                        end_color=celda_original.fill.end_color.rgb,
-                        fill_type=celda_original.fill.fill_type
-                    )
-                else:
-                    color_original = None
-                
-                # Aplicar reglas específicas de renombrado
-                if turno_str == "6TT":
-                    # Dividir 6TT en TLPT y NLPT (ocupa ambas columnas)
-                    celda1 = nuevo_ws.cell(row=fila, column=col_primera, value="TLPT")
-                    celda2 = nuevo_ws.cell(row=fila, column=col_segunda, value="NLPT")
-                    aplicar_color_seguro(celda1, color_original)
-                    aplicar_color_seguro(celda2, color_original)
-                elif turno_str == "6RT":
-                    # Dividir 6RT en MLPR y NLPR (ocupa ambas columnas)
-                    celda1 = nuevo_ws.cell(row=fila, column=col_primera, value="MLPR")
-                    celda2 = nuevo_ws.cell(row=fila, column=col_segunda, value="NLPR")
-                    aplicar_color_seguro(celda1, color_original)
-                    aplicar_color_seguro(celda2, color_original)
-                elif turno_str == "6T":
-                    # Dividir 6T en TANT y NANT (ocupa ambas columnas)
-                    celda1 = nuevo_ws.cell(row=fila, column=col_primera, value="TANT")
-                    celda2 = nuevo_ws.cell(row=fila, column=col_segunda, value="NANT")
-                    aplicar_color_seguro(celda1, color_original)
-                    aplicar_color_seguro(celda2, color_original)
-                elif turno_str == "6R":
-                    # Dividir 6R en MAST y NANR (ocupa ambas columnas)
-                    celda1 = nuevo_ws.cell(row=fila, column=col_primera, value="MAST")
-                    celda2 = nuevo_ws.cell(row=fila, column=col_segunda, value="NANR")
-                    aplicar_color_seguro(celda1, color_original)
-                    aplicar_color_seguro(celda2, color_original)
-                elif turno_str == "6N":
-                    # Dividir 6N en MANR y TANR (ocupa ambas columnas)
-                    celda1 = nuevo_ws.cell(row=fila, column=col_primera, value="MANR")
-                    celda2 = nuevo_ws.cell(row=fila, column=col_segunda, value="TANR")
-                    aplicar_color_seguro(celda1, color_original)
-                    aplicar_color_seguro(celda2, color_original)
-                elif turno_str == "6S":
-                    # Dividir 6S en MASR y TASR (ocupa ambas columnas)
-                    celda1 = nuevo_ws.cell(row=fila, column=col_primera, value="MASR")
-                    celda2 = nuevo_ws.cell(row=fila, column=col_segunda, value="TASR")
-                    aplicar_color_seguro(celda1, color_original)
-                    aplicar_color_seguro(celda2, color_original)
-                elif turno_str == "6MT":
-                    # Dividir 6MT en MLPR y TLPR (ocupa ambas columnas)
-                    celda1 = nuevo_ws.cell(row=fila, column=col_primera, value="MLPR")
-                    celda2 = nuevo_ws.cell(row=fila, column=col_segunda, value="TLPR")
-                    aplicar_color_seguro(celda1, color_original)
-                    aplicar_color_seguro(celda2, color_original)
-                elif turno_str == "3":
-                    # Dividir 3 en TAST y HXN4 (ocupa ambas columnas)
-                    celda1 = nuevo_ws.cell(row=fila, column=col_primera, value="TAST")
-                    celda2 = nuevo_ws.cell(row=fila, column=col_segunda, value="HXN4")
-                    aplicar_color_seguro(celda1, color_original)
-                    aplicar_color_seguro(celda2, color_original)
-                elif turno_str == "7":
-                    # Dividir 7 en BLPT y NLPR (ocupa ambas columnas)
-                    celda1 = nuevo_ws.cell(row=fila, column=col_primera, value="BLPT")
-                    celda2 = nuevo_ws.cell(row=fila, column=col_segunda, value="NLPR")
-                    aplicar_color_seguro(celda1, color_original)
-                    aplicar_color_seguro(celda2, color_original)
-                elif turno_str == "1T":
-                    # Renombrar 1T a BLPT (ocupa solo la primera columna)
-                    celda1 = nuevo_ws.cell(row=fila, column=col_primera, value="BLPT")
-                    celda2 = nuevo_ws.cell(row=fila, column=col_segunda, value="")  # Segunda columna vacía
-                    aplicar_color_seguro(celda1, color_original)
-                elif turno_str == "1":
-                    # Renombrar 1 a BANT (ocupa solo la primera columna)
-                    celda1 = nuevo_ws.cell(row=fila, column=col_primera, value="BANT")
-                    celda2 = nuevo_ws.cell(row=fila, column=col_segunda, value="")  # Segunda columna vacía
-                    aplicar_color_seguro(celda1, color_original)
-                else:
-                    # Otros turnos se mantienen iguales pero ocupan solo la primera columna
-                    celda1 = nuevo_ws.cell(row=fila, column=col_primera, value=turno_original)
-                    celda2 = nuevo_ws.cell(row=fila, column=col_segunda, value="")  # Segunda columna vacía
-                    aplicar_color_seguro(celda1, color_original)
-        
-        # Aplicar color rojo claro a las dos columnas de domingos
-        if dia and str(dia).startswith("SUN"):
-            for fila in range(2, ws.max_row + 1):
-                # Aplicar color rojo claro a las celdas vacías de domingo
-                celda1 = nuevo_ws.cell(row=fila, column=col_primera)
-                celda2 = nuevo_ws.cell(row=fila, column=col_segunda)
-                
-                # Solo aplicar color si la celda no tiene contenido (está vacía)
-                if not celda1.value:
-                    celda1.fill = rojo_claro
-                if not celda2.value:
-                    celda2.fill = rojo_claro
-        
-        nueva_col += 2  # Avanzar dos columnas para el siguiente día
+    print(f"Procesando archivo: {titulo}")
+    print(f"Dimensiones originales: {valores.shape[0]} filas x {valores.shape[1]} columnas")
     
-    # Ajustar ancho de columnas
-    for col in range(1, nuevo_ws.max_column + 1):
-        nuevo_ws.column_dimensions[get_column_letter(col)].width = 8
+    # Dividir todos los días de una vez
+    tabla = TablaDivision()
+    divididos, colores_divididos, ids = dividir_hoja(tabla, valores, colores)
     
     # Guardar el archivo modificado
     nombre_archivo_salida = "excel_con_division_de_columna.xlsx"
-    nuevo_wb.save(nombre_archivo_salida)
+    guardar_dividido(nombre_archivo_salida, titulo, divididos, colores_divididos)
     
     print(f"\nArchivo modificado guardado como: {nombre_archivo_salida}")
-    print(f"Nuevas dimensiones: {nuevo_ws.max_row} filas x {nuevo_ws.max_column} columnas")
+    print(f"Nuevas dimensiones: {divididos.shape[0]} filas x {divididos.shape[1]} columnas")
     
     # Mostrar resumen de los cambios
     print("\nResumen de cambios realizados:")
@@ -211,6 +63,15 @@ def modificar_horario_con_division_columna():
     print("  * 1T → BLPT")
     print("  * 1 → BANT")
     print("- Otros turnos se mantienen iguales pero ocupan solo la primera columna")
+    
+    # Ida y vuelta: unir(dividir(ids)) == ids en toda la hoja
+    no_reversibles = tabla.celdas_no_reversibles(ids)
+    if len(no_reversibles) == 0:
+        print("- Ida y vuelta verificada: la conversión inversa recupera todas las celdas")
+    else:
+        print(f"⚠️  {len(no_reversibles)} celdas no vuelven igual con la conversión inversa:")
+        for fila, col in no_reversibles[:10]:
+            print(f"     {valores[fila, 0]} en {valores[0, col + 1]}: '{valores[fila, col + 1]}'")
 
 def mostrar_estructura_archivo():
     """
@@ -0,0 +1,168 @@
+"""
+Exportador Excel: estilos con nombre compartidos y escritura en modo solo escritura.
+
+- PALETA: colores fijos del horario (turnos no operativos, escala de turnos operativos, encabezados),
+  de cada turno (reglas_turnos.py) y de la hoja de estadísticas transformada
+- Los colores copiados de otra celda conservan su ARGB (p. ej. FFFFFF00); los de la paleta y los RGB de
+  6 dígitos usan alfa 00, igual que PatternFill(start_color="FFFF00")
+- Cada (color, variante de fuente) es un estilo con nombre que se registra una sola vez por libro;
+  asignarlo a una celda (celda.style = nombre) solo copia sus índices, sin crear ni comparar
+  objetos PatternFill/Font por celda
+- escribir_hoja: hoja nueva en un libro Workbook(write_only=True) a partir de filas de valores y
+  nombres de estilo, con anchos de columna calculados sobre la grilla codificada
+"""
+
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
+from openpyxl.utils import get_column_letter
+
+
+# Nombre → color RGB. Los colores fuera de la paleta usan el estilo "relleno_<RGB>" ("relleno_<ARGB>" si
+# traen un alfa distinto de 00).
+PALETA = {
+    # Horario (procesador_horarios.py / grilla_horario.py)
+    "amarillo": "FFFF00",        # Turnos no operativos, 5AM
+    "rojo_intenso": "FF0000",    # TURNOS OPERATIVOS ≤8 (con fuente blanca)
+    "rojo_medio": "FF6666",      # =9, Torre >4, encabezado de domingo
+    "azul_clarito": "99CCFF",    # =10
+    "verde_clarito": "90EE90",   # =11, DIURNAS
+    "verde_intenso": "008000",   # =12
+    "gris_encabezado": "E6E6E6", # Encabezados de "Estadísticas"
+    # Turnos (reglas_turnos.py y asignadores)
+    "naranja": "FFA500",         # 1, verificaciones
+    "lavanda": "E6E6FA",         # 6RT, NocFes
+    "azul_real": "4169E1",       # 6R
+    "oro_oscuro": "B8860B",      # 3
+    "cian_oscuro": "008B8B",     # 6T
+    "morado_medio": "9370DB",    # 6TT
+    "rojo_oscuro": "8B0000",     # 6S
+    "carmesi": "DC143C",         # 6N
+    "amarillo_claro": "FFFF99",  # MOFI/TOFI
+    "azul_cielo": "87CEEB",      # Violación blanda de sábados, SumaD
+    "magenta": "FF00FF",         # Violación dura de sábados
+    # Estadísticas transformadas (stat_transformada.py) y división de columnas
+    "ciruela": "DDA0DD",         # SLN
+    "rosa_claro": "FFB6C1",      # TANT/NANT, domingos divididos
+    "gris_claro": "D3D3D3",      # MAST/NANR
+    "verde_palido": "98FB98",    # SumaN
+    "dorado": "FFD700",          # SumTot, sumatorias
+    "rosa": "FFC0CB",            # DiurF
+    "marron_claro": "DEB887",    # DifHo
+    "rojo_claro": "FF6B6B",      # Totales
+    "azul_claro": "ADD8E6",      # Días divididos
+}
+
+_NOMBRE_COLOR = {}
+for _nombre, _color in PALETA.items():
+    _NOMBRE_COLOR.setdefault(_color, _nombre)
+
+# Variante → fuente y alineación del estilo ("" = solo relleno)
+VARIANTES = {
+    "": {},
+    "blanca": {"font": Font(color="FFFFFF")},
+    "negrita": {"font": Font(bold=True)},
+    "negrita_blanca": {"font": Font(bold=True, color="FFFFFF")},
+    "encabezado": {"font": Font(bold=True), "alignment": Alignment(horizontal="center", vertical="center")},
+    "centrado": {"alignment": Alignment(horizontal="center")},
+}
+
+
+def color_argb(color: str) -> str:
+    """Nombre de la paleta, RGB o ARGB → ARGB de 8 dígitos en mayúsculas (sin alfa: 00, como openpyxl)."""
+    color = PALETA.get(color, color).upper()
+    return color if len(color) == 8 else "00" + color[-6:]
+
+
+def nombre_estilo(color: Optional[str] = None, variante: str = "") -> str:
+    """Nombre del estilo para un color (nombre de la paleta o RGB) y una variante; sin nada es "Normal"."""
+    if variante not in VARIANTES:
+        raise ValueError(f"Variante de estilo desconocida: {variante!r}")
+    if color is None:
+        return variante or "Normal"
+    argb = color_argb(color)
+    if argb.startswith("00"):
+        base = _NOMBRE_COLOR.get(argb[2:], f"relleno_{argb[2:]}")
+    else:
+        base = f"relleno_{argb}"
+    return f"{base}_{variante}" if variante else base
+
+
+def registrar_estilo(wb, color: Optional[str] = None, variante: str = "") -> str:
+    """Registra en el libro (una sola vez) el estilo de (color, variante) y devuelve su nombre."""
+    nombre = nombre_estilo(color, variante)
+    if nombre == "Normal" or nombre in wb.named_styles:
+        return nombre
+    estilo = NamedStyle(name=nombre, **VARIANTES[variante])
+    if color is not None:
+        argb = color_argb(color)
+        estilo.fill = PatternFill(start_color=argb, end_color=argb, fill_type="solid")
+    wb.add_named_style(estilo)
+    return nombre
+
+
+def aplicar_estilo(celda, color: Optional[str] = None, variante: str = "") -> None:
+    """
+    Asigna a la celda el estilo de (color, variante). Reemplaza relleno, fuente, alineación y borde;
+    sin color ni variante deja la celda con el estilo "Normal" (sin relleno).
+    """
+    celda.style = registrar_estilo(celda.parent.parent, color, variante)
+
+
+def anchos_columnas(codigos: np.ndarray, longitudes: Sequence[int], encabezados: Sequence,
+                    extra: Iterable[Sequence] = (), minimo: int = 0, maximo: int = 15) -> list:
+    """
+    Anchos de columna a partir de la grilla codificada: largo del código más largo de cada columna
+    (longitudes[codigo], 0 = vacía), del encabezado y de las filas extra, más 2, acotado a [minimo, maximo].
+    """
+    largos = np.asarray(longitudes, dtype=np.int64)
+    por_columna = largos[codigos].max(axis=0) if codigos.size else np.zeros(codigos.shape[1], dtype=np.int64)
+    anchos = []
+    for j, encabezado in enumerate(encabezados):
+        largo = max(int(por_columna[j]), len(str(encabezado)))
+        for fila in extra:
+            if fila[j] is not None:
+                largo = max(largo, len(str(fila[j])))
+        anchos.append(min(max(largo + 2, minimo), maximo))
+    return anchos
+
+
+def libro_solo_escritura() -> Workbook:
+    """Libro nuevo en modo solo escritura (las hojas se crean con escribir_hoja)."""
+    return Workbook(write_only=True)
+
+
+def escribir_hoja(wb, titulo: str, filas: Iterable[Sequence], estilos: Optional[Iterable[Sequence]] = None,
+                  anchos: Optional[Sequence[float]] = None):
+    """
+    Escribe una hoja nueva en un libro de solo escritura.
+
+    Args:
+        filas: Valores fila por fila (None = celda vacía)
+        estilos: Por cada fila, el nombre de estilo de cada celda (None = sin estilo); deben estar
+            registrados con registrar_estilo. Las filas sin estilos pueden ser None
+        anchos: Ancho de cada columna desde la A
+    """
+    ws = wb.create_sheet(titulo)
+    for col, ancho in enumerate(anchos or (), start=1):
+        ws.column_dimensions[get_column_letter(col)].width = ancho
+
+    estilos = iter(estilos) if estilos is not None else None
+    for valores in filas:
+        estilos_fila = next(estilos, None) if estilos is not None else None
+        if not estilos_fila:
+            ws.append(list(valores))
+            continue
+        fila = []
+        for valor, estilo in zip(valores, estilos_fila):
+            if estilo is None:
+                fila.append(valor)
+            else:
+                celda = WriteOnlyCell(ws, value=valor)
+                celda.style = estilo
+                fila.append(celda)
+        ws.append(fila)
+    return ws
@@ -0,0 +1,251 @@
+"""
+Horario final en formato largo (una fila por turno asignado) y su lector.
+
+- Columnas: sigla, fecha, turno, mitad, etapa
+  - mitad: 0 en el horario unificado (un día = una columna); 1/2 en el formato con división de
+    columna (excel_con_division_de_columna.xlsx) para la primera/segunda columna del día
+  - etapa: etapa de la cadena (pipeline.py) que escribió el turno por última vez; "" al exportar un
+    libro suelto
+- Solo se exportan las celdas con turno de las filas de trabajador; las vacías (personal operativo)
+  se deducen de las siglas y fechas presentes
+- Los encabezados "DOW-DD" no traen mes ni año: se pasan explícitos (--mes AAAA-MM) o se deducen del
+  día de la semana de cada encabezado y del largo del mes (el mes compatible más cercano a hoy)
+- Formato por extensión: .parquet y .feather (requieren pyarrow) o .csv (sin dependencias)
+- `leer_largo` devuelve {columna: np.ndarray} (fecha como datetime64[D]) y concatena varios archivos:
+  un análisis de varios meses es una máscara NumPy sobre columnas, no un recorrido de celdas con openpyxl
+
+Uso:
+    python exportador_largo.py horarioUnificado_con_6t_stats.xlsx horario_largo.csv --mes 2026-06
+"""
+
+import argparse
+import calendar
+import csv
+import os
+import re
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from grilla_horario import GrillaHorario, PRIMERA_FILA_TRABAJADOR, ULTIMA_FILA_TRABAJADOR
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow es opcional: solo lo necesitan los formatos .parquet y .feather
+    pa = None
+
+
+COLUMNAS = ("sigla", "fecha", "turno", "mitad", "etapa")
+FORMATOS = {".parquet": "parquet", ".feather": "feather", ".csv": "csv"}
+DIAS_SEMANA = {"MON": 0, "TUE": 1, "WED": 2, "THU": 3, "FRI": 4, "SAT": 5, "SUN": 6}
+_PATRON_ENCABEZADO = re.compile(r"^([A-Z]{3})-(\d{1,2})$")
+
+
+# --------------------------------------------------------
+# Días y mes del horario
+# --------------------------------------------------------
+def columnas_de_dias(grilla: GrillaHorario) -> List[Tuple[int, str, int, int]]:
+    """
+    (columna, día de la semana, día del mes, mitad) de cada columna de día. Un encabezado seguido de
+    una columna sin encabezado es un día dividido: mitad 1 en su columna y 2 en la siguiente.
+    """
+    encabezados = [grilla.valor(1, col) for col in range(1, grilla.max_col + 1)]
+    columnas = []
+    for col, encabezado in enumerate(encabezados, start=1):
+        coincidencia = _PATRON_ENCABEZADO.match(encabezado or "")
+        if coincidencia is None or coincidencia.group(1) not in DIAS_SEMANA:
+            continue
+        dia_semana, dia = coincidencia.group(1), int(coincidencia.group(2))
+        if col < len(encabezados) and encabezados[col] is None:
+            columnas.append((col, dia_semana, dia, 1))
+            columnas.append((col + 1, dia_semana, dia, 2))
+        else:
+            columnas.append((col, dia_semana, dia, 0))
+    return columnas
+
+
+def inferir_mes(dias: Sequence[Tuple[str, int]], referencia: Optional[date] = None) -> Tuple[int, int]:
+    """
+    (año, mes) cuyo largo es el último día de `dias` y en el que cada (día de la semana, día) coincide;
+    entre los compatibles, el más cercano a `referencia` (hoy por defecto).
+    """
+    referencia = referencia or date.today()
+    ultimo = max(dia for _, dia in dias)
+    candidatos = []
+    for año in range(referencia.year - 2, referencia.year + 3):
+        for mes in range(1, 13):
+            if calendar.monthrange(año, mes)[1] != ultimo:
+                continue
+            if all(date(año, mes, dia).weekday() == DIAS_SEMANA[dia_semana] for dia_semana, dia in dias):
+                distancia = abs((año - referencia.year) * 12 + mes - referencia.month)
+                candidatos.append((distancia, año, mes))
+    if not candidatos:
+        raise ValueError("No se pudo deducir el mes de los encabezados; indíquelo con --mes AAAA-MM")
+    _, año, mes = min(candidatos)
+    return año, mes
+
+
+def leer_mes(texto: str) -> Tuple[int, int]:
+    """'AAAA-MM' → (año, mes)."""
+    fecha = datetime.strptime(texto, "%Y-%m")
+    return fecha.year, fecha.month
+
+
+# --------------------------------------------------------
+# Etapa de origen de cada celda
+# --------------------------------------------------------
+def _ampliar(matriz: np.ndarray, forma: Tuple[int, int], relleno) -> np.ndarray:
+    extra = ((0, forma[0] - matriz.shape[0]), (0, forma[1] - matriz.shape[1]))
+    return np.pad(matriz, extra, constant_values=relleno) if any(e for _, e in extra) else matriz
+
+
+class OrigenCeldas:
+    """
+    Etapa que escribió por última vez cada celda de las filas de trabajador. `registrar` se llama tras
+    cada etapa de la cadena y compara los valores con los de la etapa anterior; las celdas con valor
+    en la primera etapa registrada quedan a su nombre.
+    """
+
+    def __init__(self) -> None:
+        self.nombres: List[str] = [""]
+        self.indices: Optional[np.ndarray] = None
+        self._anterior: Optional[np.ndarray] = None
+
+    def registrar(self, nombre: str, grilla: GrillaHorario) -> None:
+        valores = grilla.vocabulario()[grilla.codigos[:ULTIMA_FILA_TRABAJADOR + 1]]
+        self.nombres.append(nombre)
+        if self._anterior is None:
+            self.indices = np.zeros(valores.shape, dtype=np.int16)
+            cambiadas = valores != ""
+        else:
+            forma = tuple(max(a, b) for a, b in zip(valores.shape, self._anterior.shape))
+            valores = _ampliar(valores, forma, "")
+            self.indices = _ampliar(self.indices, forma, 0)
+            cambiadas = valores != _ampliar(self._anterior, forma, "")
+        self.indices[cambiadas] = len(self.nombres) - 1
+        self._anterior = valores
+
+    def etapas(self, filas: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """Nombre de la etapa de cada celda (filas[k], cols[k]); "" si ninguna etapa la escribió."""
+        nombres = np.array(self.nombres, dtype=str)
+        if self.indices is None:
+            return nombres[np.zeros(len(filas), dtype=np.int16)]
+        dentro = (filas < self.indices.shape[0]) & (cols < self.indices.shape[1])
+        indices = np.zeros(len(filas), dtype=np.int16)
+        indices[dentro] = self.indices[filas[dentro], cols[dentro]]
+        return nombres[indices]
+
+
+# --------------------------------------------------------
+# Tabla larga
+# --------------------------------------------------------
+def tabla_larga(grilla: GrillaHorario, año: Optional[int] = None, mes: Optional[int] = None,
+                origen: Optional[OrigenCeldas] = None) -> Dict[str, np.ndarray]:
+    """Turnos de las filas de trabajador como columnas {sigla, fecha, turno, mitad, etapa}."""
+    dias = columnas_de_dias(grilla)
+    if not dias:
+        raise ValueError("La fila 1 no tiene encabezados de día 'DOW-DD'")
+    if año is None or mes is None:
+        año, mes = inferir_mes([(dia_semana, dia) for _, dia_semana, dia, _ in dias])
+    for _, dia_semana, dia, _ in dias:
+        if date(año, mes, dia).weekday() != DIAS_SEMANA[dia_semana]:
+            raise ValueError(f"{dia_semana}-{dia:02d} no coincide con {año}-{mes:02d}")
+
+    cols = np.array([col for col, _, _, _ in dias], dtype=np.int64)
+    fechas = np.array([date(año, mes, dia) for _, _, dia, _ in dias], dtype="datetime64[D]")
+    mitades = np.array([mitad for _, _, _, mitad in dias], dtype=np.int8)
+    filas = np.arange(PRIMERA_FILA_TRABAJADOR, min(ULTIMA_FILA_TRABAJADOR, grilla.max_row) + 1)
+
+    vocabulario = grilla.vocabulario()
+    siglas = vocabulario[grilla.codigos[filas, 1]]
+    bloque = grilla.codigos[np.ix_(filas, cols)]
+    i, j = np.nonzero((bloque != 0) & (siglas != "")[:, None])
+    if origen is not None:
+        etapas = origen.etapas(filas[i], cols[j])
+    else:
+        etapas = np.full(len(i), "", dtype=str)
+    return {
+        "sigla": siglas[i],
+        "fecha": fechas[j],
+        "turno": vocabulario[bloque[i, j]],
+        "mitad": mitades[j],
+        "etapa": etapas,
+    }
+
+
+# --------------------------------------------------------
+# Escritura y lectura
+# --------------------------------------------------------
+def _formato(ruta: str) -> str:
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension not in FORMATOS:
+        raise ValueError(f"Extensión no soportada: {extension!r} (use {', '.join(FORMATOS)})")
+    formato = FORMATOS[extension]
+    if formato != "csv" and pa is None:
+        raise ImportError(f"El formato {formato} necesita pyarrow: pip install pyarrow (o use .csv)")
+    return formato
+
+
+def exportar_largo(tabla: Dict[str, np.ndarray], ruta: str) -> str:
+    """Escribe la tabla en el formato de la extensión de `ruta` y devuelve la ruta."""
+    formato = _formato(ruta)
+    if formato == "csv":
+        with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+            escritor = csv.writer(archivo)
+            escritor.writerow(COLUMNAS)
+            escritor.writerows(zip(*(tabla[columna].astype(str).tolist() for columna in COLUMNAS)))
+        return ruta
+
+    tabla_arrow = pa.table({columna: tabla[columna] for columna in COLUMNAS})
+    if formato == "parquet":
+        pq.write_table(tabla_arrow, ruta)
+    else:
+        feather.write_feather(tabla_arrow, ruta)
+    return ruta
+
+
+def _tipar(columnas: Dict[str, Sequence]) -> Dict[str, np.ndarray]:
+    return {
+        "sigla": np.asarray(columnas["sigla"], dtype=str),
+        "fecha": np.asarray(columnas["fecha"], dtype="datetime64[D]"),
+        "turno": np.asarray(columnas["turno"], dtype=str),
+        "mitad": np.asarray(columnas["mitad"], dtype=np.int8),
+        "etapa": np.asarray(columnas["etapa"], dtype=str),
+    }
+
+
+def _leer_archivo(ruta: str) -> Dict[str, np.ndarray]:
+    formato = _formato(ruta)
+    if formato == "csv":
+        with open(ruta, "r", newline="", encoding="utf-8") as archivo:
+            lector = csv.reader(archivo)
+            encabezado = next(lector)
+            filas = list(lector)
+        columnas = {nombre: [fila[k] for fila in filas] for k, nombre in enumerate(encabezado)}
+        return _tipar(columnas)
+
+    tabla_arrow = pq.read_table(ruta) if formato == "parquet" else feather.read_table(ruta)
+    return _tipar({columna: tabla_arrow.column(columna).to_numpy(zero_copy_only=False) for columna in COLUMNAS})
+
+
+def leer_largo(rutas: Union[str, Sequence[str]]) -> Dict[str, np.ndarray]:
+    """Lee uno o varios archivos en formato largo (p. ej. varios meses) como una sola tabla de columnas."""
+    if isinstance(rutas, str):
+        rutas = [rutas]
+    partes = [_leer_archivo(ruta) for ruta in rutas]
+    return {columna: np.concatenate([parte[columna] for parte in partes]) for columna in COLUMNAS}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta un horario en formato largo (parquet/feather/csv)")
+    parser.add_argument("archivo", help="Libro de horario (unificado o con división de columna)")
+    parser.add_argument("salida", help="Archivo de salida: .parquet, .feather o .csv")
+    parser.add_argument("--mes", type=leer_mes, help="Mes del horario (AAAA-MM); por defecto se deduce")
+    args = parser.parse_args()
+
+    año, mes = args.mes or (None, None)
+    tabla = tabla_larga(GrillaHorario.solo_lectura(args.archivo), año, mes)
+    print(f"Turnos exportados: {len(tabla['sigla'])} → {exportar_largo(tabla, args.salida)}")
@@ -0,0 +1,469 @@
+"""
+Grilla compacta del horario unificado compartida por toda la cadena de asignadores.
+
+Descripción general:
+- El libro se lee UNA sola vez; la hoja de horario se codifica en una matriz NumPy (uint16)
+  de filas × columnas con los códigos de turno internados (0 = celda vacía).
+- Los asignadores leen y escriben a través de la grilla (`valor`, `asignar`, `colorear`) en lugar
+  de tocar celdas de openpyxl una a una.
+- Los cambios se acumulan como celdas "sucias" y se vuelcan al libro solo al guardar
+  (`volcar` / `guardar`), de modo que una cadena completa hace una única serialización. Los rellenos
+  se vuelcan como estilos con nombre de la paleta compartida (exportador_excel.py).
+- Las coordenadas son las mismas de la hoja (fila y columna empiezan en 1), para que las reglas
+  existentes no cambien su aritmética de columnas (día anterior = col - 1, etc.).
+- Índices perezosos sigla → fila, encabezado "DOW-DD" → columna y etiqueta → fila ("TURNOS OPERATIVOS",
+  "Torre", ...) sustituyen los recorridos lineales; se invalidan al escribir en la fila 1 o la columna A.
+- Conteos por día de personal operativo y de Torre mantenidos de forma incremental: cada `asignar`
+  compara si el valor anterior y el nuevo están en TURNOS_NO_OPERATIVOS y ajusta el vector del día.
+  Las filas estáticas 'TURNOS OPERATIVOS' y 'Torre' de la hoja solo se reescriben al volcar/guardar.
+- Para herramientas que solo leen, `GrillaHorario.solo_lectura(ruta)` abre el libro con read_only=True y
+  codifica la hoja en una sola pasada de `iter_rows(values_only=True)`, sin crear objetos Cell
+  (también con los .xlsm de varias hojas); `leer_filas` hace lo mismo para otras hojas como tuplas.
+  Ambos guardan lo leído en un sidecar binario (cache_grilla.py, clave mtime + SHA-256): si el libro no
+  cambió, la siguiente lectura no abre el zip ni parsea XML.
+"""
+
+import os
+import random
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import openpyxl
+
+from cache_grilla import CacheGrilla
+from exportador_excel import aplicar_estilo
+
+HOJA_ESTADISTICAS = "Estadísticas"
+
+# Filas de trabajadores en la hoja de horario
+PRIMERA_FILA_TRABAJADOR = 2
+ULTIMA_FILA_TRABAJADOR = 25
+
+# Turnos que NO cuentan como personal operativo (misma lista que procesador_horarios.py)
+TURNOS_NO_OPERATIVOS = frozenset({
+    # Turnos básicos
+    "DESC", "TROP",
+    # Turnos completos
+    "VACA", "COME", "COMT", "COMS",
+    # Turnos adicionales originales
+    "SIND", "CMED", "CERT",
+    # Formación, instrucción y entrenamiento
+    "CAPA", "MCAE", "TCAE", "MCHC", "TCHC", "NCHC", "ACHC",
+    "MENT", "TENT", "NENT", "AENT",
+    "MINS", "TINS", "NINS", "AINS",
+    # Gestión, oficinas y grupos de trabajo
+    "MCOR", "TCOR", "MSMS", "TSMS", "MDBM", "TDBM",
+    "MDOC", "TDOC", "MPRO", "TPRO", "MATF", "TATF",
+    "MGST", "TGST", "MOFI", "TOFI",
+    # Operativos y asignaciones especiales
+    "CET", "ATC", "KATC", "XATC", "YATC", "ZATC", "X"
+})
+
+# Siglas que suman en la fila 'Torre'
+SIGLAS_TORRE = ("YIS", "MAQ", "DJO", "AFG", "JLF", "JMV")
+
+# Marcador para distinguir "no tocar el relleno" de "limpiar el relleno" (None)
+SIN_CAMBIO = object()
+
+
+def obtener_hoja_horario(wb):
+    """Devuelve la hoja principal de horario (la primera que no sea 'Estadísticas')."""
+    for nombre in wb.sheetnames:
+        if nombre != HOJA_ESTADISTICAS:
+            return wb[nombre]
+    return wb.active
+
+
+def abrir_solo_lectura(ruta: str):
+    """Abre el libro en modo streaming (read_only, valores calculados); cerrarlo con wb.close()."""
+    return openpyxl.load_workbook(ruta, read_only=True, data_only=True)
+
+
+def leer_filas(ruta: str, hojas: List[str], cache: bool = True) -> Dict[str, List[tuple]]:
+    """
+    {hoja: [tupla de valores por fila]} de las hojas pedidas que existan, leídas en streaming.
+    Con `cache=True` se usan (y se guardan) las filas del sidecar de cache_grilla.py si el libro no cambió.
+    """
+    sidecar = CacheGrilla(ruta) if cache else None
+    if sidecar is not None:
+        filas = sidecar.cargar_filas(hojas)
+        if filas is not None:
+            return filas
+    wb = abrir_solo_lectura(ruta)
+    try:
+        filas = {nombre: list(wb[nombre].iter_rows(values_only=True)) for nombre in hojas if nombre in wb.sheetnames}
+    finally:
+        wb.close()
+    if sidecar is not None:
+        sidecar.guardar_filas(hojas, filas)
+    return filas
+
+
+def resolver_archivo_entrada(candidatos: List[Optional[str]], por_defecto: str) -> str:
+    """Devuelve el primer candidato existente en disco, o `por_defecto` si ninguno existe."""
+    for c in [c for c in candidatos if c]:
+        if os.path.exists(c):
+            return c
+    return por_defecto
+
+
+def normalizar(valor) -> str:
+    """Normaliza un valor de celda a la forma usada por las reglas ('' si está vacía)."""
+    if valor is None:
+        return ""
+    return str(valor).strip().upper()
+
+
+def relleno_conteo_operativos(conteo: int) -> Optional[str]:
+    """Color de la fila 'TURNOS OPERATIVOS' según el conteo (misma escala que procesador_horarios.py)."""
+    if conteo <= 8:
+        return "FF0000"  # Rojo intenso
+    if conteo == 9:
+        return "FF6666"  # Rojo medio
+    if conteo == 10:
+        return "99CCFF"  # Azul clarito
+    if conteo == 11:
+        return "90EE90"  # Verde clarito
+    if conteo == 12:
+        return "008000"  # Verde intenso
+    return None
+
+
+def relleno_conteo_torre(conteo: int) -> Optional[str]:
+    """Color de la fila 'Torre': rojo medio si hay más de 4 disponibles."""
+    return "FF6666" if conteo > 4 else None
+
+
+class GrillaHorario:
+    """
+    Horario unificado codificado como matriz de códigos internados.
+
+    Atributos principales:
+    - wb / ws: libro y hoja de horario de origen (se mantienen para estadísticas y volcado final).
+    - codigos: np.ndarray uint16 de forma (max_row + 1, max_col + 1); la fila/columna 0 no se usan.
+    - max_row / max_col: dimensiones de la hoja al cargarla (crecen si se escribe fuera de rango).
+
+    Los valores devueltos por `valor` están normalizados (strip + mayúsculas) y son None si la celda
+    está vacía. `valor_crudo` devuelve el valor tal como está (o quedará) en la hoja.
+
+    Una grilla de solo lectura (`solo_lectura`) no conserva el libro: wb y ws son None, `titulo` y
+    `hojas` guardan el nombre de la hoja y las hojas del libro, y `volcar`/`guardar` lanzan ValueError.
+    """
+
+    def __init__(self, wb, ws=None) -> None:
+        self.wb = wb
+        self.ws = ws if ws is not None or wb is None else obtener_hoja_horario(wb)
+        self.titulo = self.ws.title if self.ws is not None else None
+        self.hojas = list(wb.sheetnames) if wb is not None else []
+        self.max_row = self.ws.max_row if self.ws is not None else 0
+        self.max_col = self.ws.max_column if self.ws is not None else 0
+
+        self._vocabulario: List[str] = [""]
+        self._ids: Dict[str, int] = {"": 0}
+        self._es_no_operativo: List[bool] = [False]
+        self.codigos = np.zeros((self.max_row + 1, self.max_col + 1), dtype=np.uint16)
+
+        # Cambios pendientes de volcar al libro
+        self._crudos: Dict[Tuple[int, int], object] = {}
+        self._rellenos: Dict[Tuple[int, int], Optional[str]] = {}
+        self._fuentes_blancas: Set[Tuple[int, int]] = set()  # 'TURNOS OPERATIVOS' ≤8: rojo intenso con texto blanco
+
+        # Índices perezosos (None = hay que reconstruirlos)
+        self._indice_siglas: Optional[Dict[str, int]] = None
+        self._indice_encabezados: Optional[Dict[str, int]] = None
+        self._indice_etiquetas: Optional[Dict[str, int]] = None
+
+        # Conteos por columna (None = hay que reconstruirlos)
+        self._operativos: Optional[np.ndarray] = None
+        self._torre: Optional[np.ndarray] = None
+        self._filas_torre: List[int] = []
+
+        # Se incrementa en cada escritura (permite cachear cálculos derivados de `codigos`)
+        self.version = 0
+
+        if self.ws is not None:
+            self._cargar_desde_hoja()
+
+    # --------------------------------------------------------
+    # Construcción
+    # --------------------------------------------------------
+    @classmethod
+    def desde_archivo(cls, ruta: str) -> "GrillaHorario":
+        return cls(openpyxl.load_workbook(ruta))
+
+    @classmethod
+    def solo_lectura(cls, ruta: str, hoja: Optional[str] = None, cache: bool = True) -> "GrillaHorario":
+        """
+        Grilla para herramientas de análisis: lee la hoja de horario en streaming (read_only=True,
+        valores calculados) y la codifica en una sola pasada; el libro se cierra al terminar.
+
+        Con `cache=True`, si el sidecar de cache_grilla.py corresponde al libro (mtime + SHA-256) se
+        usan sus códigos (mapeados en memoria) y su vocabulario sin abrir el libro; si no, se lee con
+        openpyxl y se guarda el sidecar.
+        """
+        sidecar = CacheGrilla(ruta) if cache else None
+        guardado = sidecar.cargar_grilla(hoja) if sidecar is not None else None
+        grilla = cls(None)
+        if guardado is not None:
+            codigos, vocabulario, grilla.titulo, grilla.hojas = guardado
+            for codigo in vocabulario[1:]:
+                grilla.internar(codigo)
+            grilla.codigos = codigos
+            grilla.max_row = codigos.shape[0] - 1
+            grilla.max_col = codigos.shape[1] - 1
+            return grilla
+
+        wb = abrir_solo_lectura(ruta)
+        try:
+            ws = wb[hoja] if hoja else obtener_hoja_horario(wb)
+            grilla.titulo = ws.title
+            grilla.hojas = list(wb.sheetnames)
+            grilla._codificar_filas(ws.iter_rows(values_only=True))
+        finally:
+            wb.close()
+        if sidecar is not None:
+            sidecar.guardar_grilla(hoja, grilla.codigos, grilla._vocabulario, grilla.titulo, grilla.hojas)
+        return grilla
+
+    @property
+    def es_solo_lectura(self) -> bool:
+        return self.ws is None
+
+    def _cargar_desde_hoja(self) -> None:
+        self._codificar_filas(self.ws.iter_rows(min_row=1, max_row=self.max_row, max_col=self.max_col, values_only=True))
+
+    def _codificar_filas(self, filas) -> None:
+        """Codifica las filas (tuplas de valores) en una pasada; las dimensiones crecen con lo leído."""
+        ids_filas = [[0 if valor is None else self.internar(normalizar(valor)) for valor in valores] for valores in filas]
+        while ids_filas and not any(ids_filas[-1]):
+            ids_filas.pop()  # filas vacías al final (dimensión declarada de más en los .xlsm)
+        max_row = max(self.max_row, len(ids_filas))
+        max_col = max([self.max_col] + [len(ids) for ids in ids_filas])
+        self.codigos = np.zeros((max_row + 1, max_col + 1), dtype=np.uint16)
+        for fila, ids in enumerate(ids_filas, start=1):
+            if ids:
+                self.codigos[fila, 1:len(ids) + 1] = ids
+        self.max_row = max_row
+        self.max_col = max_col
+
+    def internar(self, codigo: str) -> int:
+        """Devuelve el id entero de un código normalizado, registrándolo si es nuevo."""
+        idx = self._ids.get(codigo)
+        if idx is None:
+            idx = len(self._vocabulario)
+            self._vocabulario.append(codigo)
+            self._ids[codigo] = idx
+            self._es_no_operativo.append(codigo in TURNOS_NO_OPERATIVOS)
+        return idx
+
+    def id_de(self, codigo: str) -> int:
+        """Id de un código ya internado, o -1 si nunca apareció en la grilla."""
+        return self._ids.get(normalizar(codigo), -1)
+
+    def tabla_de(self, codigos) -> np.ndarray:
+        """Vector booleano por id con True en los `codigos` dados; `tabla[self.codigos]` da la máscara de celdas."""
+        tabla = np.zeros(len(self._vocabulario), dtype=bool)
+        for codigo in codigos:
+            idx = self.id_de(codigo)
+            if idx > 0:
+                tabla[idx] = True
+        return tabla
+
+    def _asegurar_tamano(self, fila: int, col: int) -> None:
+        filas_extra = max(0, fila - self.max_row)
+        cols_extra = max(0, col - self.max_col)
+        if filas_extra or cols_extra:
+            self.codigos = np.pad(self.codigos, ((0, filas_extra), (0, cols_extra)))
+            self.max_row += filas_extra
+            self.max_col += cols_extra
+            self._operativos = None
+            self._torre = None
+
+    # --------------------------------------------------------
+    # Lectura
+    # --------------------------------------------------------
+    def valor(self, fila: int, col: int) -> Optional[str]:
+        """Valor normalizado de la celda, o None si está vacía o fuera de la hoja."""
+        if fila > self.max_row or col > self.max_col:
+            return None
+        codigo = self._vocabulario[self.codigos[fila, col]]
+        return codigo or None
+
+    def esta_vacia(self, fila: int, col: int) -> bool:
+        if fila > self.max_row or col > self.max_col:
+            return True
+        return self.codigos[fila, col] == 0
+
+    def vocabulario(self) -> np.ndarray:
+        """Vector de códigos normalizados por id ("" = vacía); `vocabulario()[codigos]` decodifica un bloque."""
+        return np.array(self._vocabulario, dtype=str)
+
+    # --------------------------------------------------------
+    # Índices
+    # --------------------------------------------------------
+    def _indexar_columna_a(self, desde: int, hasta: int) -> Dict[str, int]:
+        indice: Dict[str, int] = {}
+        for fila in range(desde, min(hasta, self.max_row) + 1):
+            codigo = self._vocabulario[self.codigos[fila, 1]]
+            if codigo:
+                # Ante duplicados gana la primera fila, igual que el recorrido lineal
+                indice.setdefault(codigo, fila)
+        return indice
+
+    def fila_de(self, sigla: str) -> Optional[int]:
+        """Fila (2-25) del trabajador con esa sigla, o None si no está en la hoja."""
+        if self._indice_siglas is None:
+            self._indice_siglas = self._indexar_columna_a(PRIMERA_FILA_TRABAJADOR, ULTIMA_FILA_TRABAJADOR)
+        return self._indice_siglas.get(normalizar(sigla))
+
+    def fila_etiqueta(self, etiqueta: str) -> Optional[int]:
+        """Primera fila cuya columna A coincide con la etiqueta (p. ej. "TURNOS OPERATIVOS", "Torre")."""
+        if self._indice_etiquetas is None:
+            self._indice_etiquetas = self._indexar_columna_a(1, self.max_row)
+        return self._indice_etiquetas.get(normalizar(etiqueta))
+
+    def columna_de(self, encabezado: str) -> Optional[int]:
+        """Columna cuyo encabezado de la fila 1 coincide (p. ej. "THU-07"), o None."""
+        if self._indice_encabezados is None:
+            self._indice_encabezados = {}
+            for col in range(2, self.max_col + 1):
+                codigo = self._vocabulario[self.codigos[1, col]]
+                if codigo:
+                    self._indice_encabezados.setdefault(codigo, col)
+        return self._indice_encabezados.get(normalizar(encabezado))
+
+    def _invalidar_indices(self, fila: int, col: int) -> None:
+        if col == 1:
+            self._indice_siglas = None
+            self._indice_etiquetas = None
+            # Cambiar una sigla puede cambiar las filas que suman en Torre
+            self._operativos = None
+            self._torre = None
+        if fila == 1:
+            self._indice_encabezados = None
+
+    # --------------------------------------------------------
+    # Conteos de personal operativo y Torre
+    # --------------------------------------------------------
+    def _inicializar_conteos(self) -> None:
+        no_operativo = np.array(self._es_no_operativo, dtype=bool)
+        filas_trabajador = ULTIMA_FILA_TRABAJADOR - PRIMERA_FILA_TRABAJADOR + 1
+        bloque = self.codigos[PRIMERA_FILA_TRABAJADOR:ULTIMA_FILA_TRABAJADOR + 1]
+        # Las filas 2-25 vacías o inexistentes cuentan como operativas
+        self._operativos = filas_trabajador - no_operativo[bloque].sum(axis=0).astype(np.int32)
+
+        self._filas_torre = [f for f in (self.fila_de(s) for s in SIGLAS_TORRE) if f is not None]
+        self._torre = len(self._filas_torre) - no_operativo[self.codigos[self._filas_torre]].sum(axis=0).astype(np.int32)
+
+    def conteo_operativos(self, col: int) -> int:
+        """Personal operativo del día (filas 2-25 vacías o con turno fuera de TURNOS_NO_OPERATIVOS)."""
+        if self._operativos is None:
+            self._inicializar_conteos()
+        if col > self.max_col:
+            return ULTIMA_FILA_TRABAJADOR - PRIMERA_FILA_TRABAJADOR + 1
+        return int(self._operativos[col])
+
+    def conteo_torre(self, col: int) -> int:
+        """Personal operativo del día limitado a las siglas de SIGLAS_TORRE."""
+        if self._torre is None:
+            self._inicializar_conteos()
+        if col > self.max_col:
+            return len(self._filas_torre)
+        return int(self._torre[col])
+
+    def _ajustar_conteos(self, fila: int, col: int, anterior: int, nuevo: int) -> None:
+        if self._operativos is None or not (PRIMERA_FILA_TRABAJADOR <= fila <= ULTIMA_FILA_TRABAJADOR):
+            return
+        delta = int(self._es_no_operativo[anterior]) - int(self._es_no_operativo[nuevo])
+        if delta:
+            self._operativos[col] += delta
+            if fila in self._filas_torre:
+                self._torre[col] += delta
+
+    def volcar_conteos(self, forzar: bool = False) -> None:
+        """
+        Reescribe las filas estáticas 'TURNOS OPERATIVOS' y 'Torre' donde difieran de los conteos
+        actuales (o en todas las columnas con forzar=True), con la misma escala de colores que
+        procesador_horarios.py.
+        """
+        fila_operativos = self.fila_etiqueta("TURNOS OPERATIVOS")
+        fila_torre = self.fila_etiqueta("Torre")
+        for col in range(2, self.max_col + 1):
+            if fila_operativos is not None:
+                conteo = self.conteo_operativos(col)
+                if forzar or self.valor_crudo(fila_operativos, col) != conteo:
+                    self.asignar(fila_operativos, col, conteo, relleno=relleno_conteo_operativos(conteo))
+                    if conteo <= 8:
+                        self._fuentes_blancas.add((fila_operativos, col))
+                    else:
+                        self._fuentes_blancas.discard((fila_operativos, col))
+            if fila_torre is not None:
+                conteo = self.conteo_torre(col)
+                if forzar or self.valor_crudo(fila_torre, col) != conteo:
+                    self.asignar(fila_torre, col, conteo, relleno=relleno_conteo_torre(conteo))
+
+    def valor_crudo(self, fila: int, col: int):
+        """Valor sin normalizar, tal como quedará escrito en la hoja."""
+        if (fila, col) in self._crudos:
+            return self._crudos[(fila, col)]
+        if self.ws is None:
+            return self.valor(fila, col)
+        return self.ws.cell(row=fila, column=col).value
+
+    # --------------------------------------------------------
+    # Escritura
+    # --------------------------------------------------------
+    def asignar(self, fila: int, col: int, valor, relleno=SIN_CAMBIO) -> None:
+        """
+        Escribe `valor` (None para vaciar) en la celda.
+
+        `relleno` puede ser un color RGB ("FFA500") o un nombre de exportador_excel.PALETA, None para
+        quitar el relleno (estilo "Normal"), o SIN_CAMBIO para conservar el que tenga la celda.
+        """
+        self._asegurar_tamano(fila, col)
+        anterior = int(self.codigos[fila, col])
+        nuevo = self.internar(normalizar(valor))
+        self.codigos[fila, col] = nuevo
+        self.version += 1
+        self._ajustar_conteos(fila, col, anterior, nuevo)
+        self._invalidar_indices(fila, col)
+        self._crudos[(fila, col)] = valor
+        if relleno is not SIN_CAMBIO:
+            self._rellenos[(fila, col)] = relleno
+
+    def colorear(self, fila: int, col: int, relleno: Optional[str]) -> None:
+        """Cambia solo el relleno de la celda (None lo elimina)."""
+        self._rellenos[(fila, col)] = relleno
+
+    # --------------------------------------------------------
+    # Volcado al libro
+    # --------------------------------------------------------
+    def volcar(self) -> None:
+        """Escribe en la hoja de openpyxl todas las celdas modificadas desde la carga o el último volcado."""
+        if self.es_solo_lectura:
+            raise ValueError("La grilla es de solo lectura: cárguela con GrillaHorario.desde_archivo para guardar cambios")
+        self.volcar_conteos()
+        for (fila, col), valor in self._crudos.items():
+            # ws.cell(..., value=None) no borra la celda: se asigna .value para que None la vacíe
+            self.ws.cell(row=fila, column=col).value = valor
+        # Estilos con nombre (exportador_excel): la celda solo copia los índices del estilo
+        for (fila, col), color in self._rellenos.items():
+            variante = "blanca" if (fila, col) in self._fuentes_blancas else ""
+            aplicar_estilo(self.ws.cell(row=fila, column=col), color, variante)
+        self._crudos.clear()
+        self._rellenos.clear()
+        self._fuentes_blancas.clear()
+
+    def guardar(self, salida: str) -> str:
+        """Vuelca los cambios y guarda el libro; si el archivo está en uso, guarda con sufijo aleatorio."""
+        self.volcar()
+        try:
+            self.wb.save(salida)
+            print(f"Archivo guardado como: {salida}")
+            return salida
+        except PermissionError:
+            base, ext = os.path.splitext(salida)
+            alternativo = f"{base}_{random.randint(1000,9999)}{ext}"
+            self.wb.save(alternativo)
+            print(f"Archivo por defecto en uso. Guardado como: {alternativo}")
+            return alternativo
@@ -1,8 +1,9 @@
-import openpyxl
+from grilla_horario import HOJA_ESTADISTICAS, abrir_solo_lectura
 
 def inspect_excel(filename="horarioUnificado_con_6t.xlsx"):
     try:
-        wb = openpyxl.load_workbook(filename, data_only=True)
+        # Lectura en streaming: solo se recorre la hoja de estadísticas, sin objetos Cell
+        wb = abrir_solo_lectura(filename)
         
         print(f"Archivo: {filename}")
         print("Hojas disponibles:")
@@ -10,37 +11,31 @@ def inspect_excel(filename="horarioUnificado_con_6t.xlsx"):
             print(f"  - {sheet_name}")
         
         # Revisar la hoja de estadísticas
-        if "Estadísticas" in wb.sheetnames:
-            ws = wb["Estadísticas"]
+        if HOJA_ESTADISTICAS in wb.sheetnames:
+            filas = list(wb[HOJA_ESTADISTICAS].iter_rows(values_only=True))
+            wb.close()
+            encabezados = filas[0] if filas else ()
             print(f"\nColumnas en hoja 'Estadísticas' (primeras 20 columnas):")
-            for col in range(1, min(21, ws.max_column + 1)):
-                header = ws.cell(row=1, column=col).value
+            for col, header in enumerate(encabezados[:20], start=1):
                 print(f"  Columna {col}: '{header}'")
             
             print(f"\nPrimeras 5 filas de datos:")
-            for fila in range(1, min(6, ws.max_row + 1)):
-                datos = []
-                for col in range(1, min(11, ws.max_column + 1)):
-                    valor = ws.cell(row=fila, column=col).value
-                    datos.append(str(valor)[:10] if valor is not None else "None")
+            for fila, valores in enumerate(filas[:5], start=1):
+                datos = [str(valor)[:10] if valor is not None else "None" for valor in valores[:10]]
                 print(f"  Fila {fila}: {' | '.join(datos)}")
                 
             # Revisar si hay datos reales (no None) en las columnas de turnos
             print(f"\nRevisando datos reales en columnas de turnos:")
             columnas_turnos = ['1T', '6RT', '6T', '3', '6S', '6N']
             for col_name in columnas_turnos:
-                for col in range(1, ws.max_column + 1):
-                    header = ws.cell(row=1, column=col).value
-                    if header == col_name:
-                        # Revisar valores en esta columna
-                        valores_no_nulos = 0
-                        for fila in range(2, min(10, ws.max_row + 1)):
-                            valor = ws.cell(row=fila, column=col).value
-                            if valor is not None and valor != 0:
-                                valores_no_nulos += 1
-                        print(f"  {col_name} (col {col}): {valores_no_nulos} valores no nulos")
-                        break
+                if col_name in encabezados:
+                    col = encabezados.index(col_name)
+                    # Revisar valores en esta columna
+                    valores_no_nulos = sum(1 for valores in filas[1:9]
+                                           if col < len(valores) and valores[col] is not None and valores[col] != 0)
+                    print(f"  {col_name} (col {col + 1}): {valores_no_nulos} valores no nulos")
         else:
+            wb.close()
             print("\n❌ No se encontró la hoja 'Estadísticas'")
     except Exception as e:
         print(f"❌ Error al abrir {filename}: {e}")
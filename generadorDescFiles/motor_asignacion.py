@@ -0,0 +1,308 @@
+"""
+Motor genérico de asignación de turnos a partir de una `ReglaTurno` del registro (`reglas_turnos.py`).
+
+Descripción general:
+- Flujo por día (el mismo que seguían los asignadores 1, 3, 6R, 6T y 6TT):
+  1) Umbral por personal operativo (si la regla lo define) mediante la tabla compilada.
+  2) No asignar si el día ya tiene alguno de los `conflictos_dia`.
+  3) Disponibles: elegibles con celda vacía (y vacía al cargar, si la regla lo exige); si no hay, respaldo.
+  4) Descartar por cada regla `excluyentes` (máscaras de día anterior/siguiente).
+  5) Repartir en `niveles` de prioridad + "resto" y elegir por equidad (menor contador, desempate aleatorio).
+- Rebalanceo opcional: transferencias del turno entre elegibles calculadas a la vez como flujo de costo
+  mínimo (`rebalanceo_flujo.py`) hasta diferencia ≤ 1 en el grupo de equidad, respetando el snapshot
+  original, `rebalanceo_bloqueo_dia` y `rebalanceo_excluyentes`.
+- Hoja "Estadísticas" con las columnas declaradas en la regla (fórmulas COUNTIF sobre la hoja de horario).
+- Las subclases solo fijan `REGLA` y, cuando hace falta, sobreescriben algún paso (`_conteo_operativos`,
+  `_columna_admite_rebalanceo`, ...). Las reglas con lógica propia (1T, 6RT) reutilizan los pasos sueltos.
+"""
+
+import random
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from openpyxl.utils import get_column_letter
+
+from exportador_excel import aplicar_estilo
+from grilla_horario import GrillaHorario, resolver_archivo_entrada
+from rebalanceo_flujo import planificar_transferencias
+from reglas_turnos import ReglaCompilada, ReglaTurno, regla_compilada
+from restricciones_horario import MotorRestricciones
+
+
+# Rondas de plan + aplicación; cada ronda recalcula el flujo sobre la grilla ya modificada
+MAX_RONDAS_REBALANCEO = 10
+
+
+def escribir_hoja_estadisticas(
+    wb, grilla: GrillaHorario, columnas: Tuple[Tuple[str, Tuple[str, ...]], ...]
+) -> None:
+    """
+    Reescribe la hoja "Estadísticas": SIGLA y una columna por (encabezado, turnos), cada celda con
+    =COUNTIF(hoja!B<f>:AE<f>,"T1")+COUNTIF(...) para que se recalcule al editar el horario en Excel.
+    """
+    nombre_stats = "Estadísticas"
+    if nombre_stats in wb.sheetnames:
+        ws_stats = wb[nombre_stats]
+    else:
+        ws_stats = wb.create_sheet(nombre_stats)
+
+    # Limpiar hoja
+    for fila in ws_stats.iter_rows():
+        for celda in fila:
+            celda.value = None
+            aplicar_estilo(celda)
+
+    # Encabezados
+    ws_stats.cell(row=1, column=1, value="SIGLA")
+    for col, (encabezado, _) in enumerate(columnas, start=2):
+        ws_stats.cell(row=1, column=col, value=encabezado)
+
+    for col in range(1, len(columnas) + 2):
+        aplicar_estilo(ws_stats.cell(row=1, column=col), "gris_encabezado", "negrita")
+
+    hoja = grilla.ws.title
+    fila_destino = 2
+    for fila in range(2, 26):
+        trabajador = grilla.valor_crudo(fila, 1)
+        if not trabajador:
+            continue
+        ws_stats.cell(row=fila_destino, column=1, value=trabajador)
+        for col, (_, turnos) in enumerate(columnas, start=2):
+            formula = "=" + "+".join(f'COUNTIF({hoja}!B{fila}:AE{fila},"{t}")' for t in turnos)
+            ws_stats.cell(row=fila_destino, column=col, value=formula)
+        fila_destino += 1
+
+    ws_stats.column_dimensions['A'].width = 10
+    for col in range(2, len(columnas) + 2):
+        ws_stats.column_dimensions[get_column_letter(col)].width = 8
+
+
+class AsignadorPorReglas:
+    """
+    Asignador genérico de un tipo de turno descrito por `REGLA` (nombre en `reglas_turnos.REGLAS`).
+
+    - Puede recibir una `GrillaHorario` ya cargada para ejecutarse en memoria dentro de la cadena
+    - Sin grilla, lee el primer archivo existente de `regla.entradas` y guarda en `regla.salida`
+    """
+
+    REGLA: str = ""
+
+    def __init__(self, archivo_entrada: Optional[str] = None, grilla: Optional[GrillaHorario] = None) -> None:
+        self.compilada: ReglaCompilada = regla_compilada(self.REGLA)
+        self.regla: ReglaTurno = self.compilada.regla
+        if grilla is None:
+            self.archivo_entrada = resolver_archivo_entrada(
+                [archivo_entrada, *self.regla.entradas], self.regla.entrada_por_defecto
+            )
+            grilla = GrillaHorario.desde_archivo(self.archivo_entrada)
+        else:
+            self.archivo_entrada = None
+        self.grilla = grilla
+        self.wb = grilla.wb
+        self.ws = grilla.ws
+        self.restricciones = MotorRestricciones(self.grilla)
+
+        # Snapshot del estado original para no tocar asignaciones preexistentes
+        self.original_vacia = self.restricciones.vacias().copy()
+        self.original_turno = self.restricciones.en({self.regla.turno}).copy()
+
+        # Contador de equidad (turnos del grupo de la regla)
+        self.contador: Dict[str, int] = defaultdict(int)
+        random.seed()
+        self._inicializar_contadores_desde_hoja()
+
+    # --------------------------------------------------------
+    # Consultas sobre la grilla
+    # --------------------------------------------------------
+    def _nombre_hoja_horario(self) -> str:
+        return self.ws.title
+
+    def _obtener_fila_trabajador(self, trabajador: str) -> Optional[int]:
+        return self.grilla.fila_de(trabajador)
+
+    def _es_celda_originalmente_vacia(self, fila: int, col: int) -> bool:
+        return bool(self.original_vacia[fila, col])
+
+    def _existe_en_dia(self, col_dia: int, turnos) -> bool:
+        """True si alguna fila de trabajador (2-25) tiene ese día uno de los turnos."""
+        return bool(turnos) and bool(self.restricciones.en(turnos)[2:26, col_dia].any())
+
+    def _cumple(self, nombre: str, trabajador: str, col_dia: int) -> bool:
+        """Evalúa la regla de vecino `nombre` de la regla para el trabajador y el día."""
+        fila = self._obtener_fila_trabajador(trabajador)
+        if not fila:
+            return False
+        direccion, turnos = self.regla.vecinos[nombre]
+        mascara = self.restricciones.ayer(turnos) if direccion == "ayer" else self.restricciones.manana(turnos)
+        return bool(mascara[fila, col_dia])
+
+    def _conteo_operativos(self, col_dia: int) -> Optional[int]:
+        if self.grilla.fila_etiqueta("TURNOS OPERATIVOS") is None:
+            return None
+        return self.grilla.conteo_operativos(col_dia)
+
+    def _turnos_por_personal(self, col_dia: int) -> Optional[Tuple[str, ...]]:
+        if not self.regla.por_personal:
+            return (self.regla.turno,)
+        return self.compilada.turnos_para(self._conteo_operativos(col_dia))
+
+    def _obtener_trabajadores_disponibles(self, col_dia: int, pool: Optional[List[str]] = None) -> List[str]:
+        candidatos = pool if pool is not None else list(self.regla.elegibles)
+        mascara = self.restricciones.vacias()
+        if self.regla.exigir_original_vacia:
+            # Vacía ahora y vacía al cargar, para todo el mes; luego se toma la columna del día
+            mascara = mascara & self.original_vacia
+        return self.restricciones.disponibles(candidatos, mascara, col_dia)
+
+    def _disponibles_con_respaldo(self, col_dia: int) -> List[str]:
+        disponibles = self._obtener_trabajadores_disponibles(col_dia)
+        if not disponibles and self.regla.respaldo:
+            disponibles = self._obtener_trabajadores_disponibles(col_dia, list(self.regla.respaldo))
+        return disponibles
+
+    def _clasificar_por_niveles(self, disponibles: List[str], col_dia: int) -> List[List[str]]:
+        """Reparte los disponibles en los niveles de la regla (primer nivel que cumple) más un nivel "resto"."""
+        niveles: List[List[str]] = [[] for _ in range(len(self.regla.niveles) + 1)]
+        for t in disponibles:
+            estado: Dict[str, bool] = {}
+            destino = len(self.regla.niveles)
+            for i, condiciones in enumerate(self.regla.niveles):
+                cumple = True
+                for nombre, esperado in condiciones:
+                    if nombre not in estado:
+                        estado[nombre] = self._cumple(nombre, t, col_dia)
+                    if estado[nombre] != esperado:
+                        cumple = False
+                        break
+                if cumple:
+                    destino = i
+                    break
+            niveles[destino].append(t)
+        return niveles
+
+    # --------------------------------------------------------
+    # Equidad
+    # --------------------------------------------------------
+    def _inicializar_contadores_desde_hoja(self) -> None:
+        grupo = self.restricciones.en(self.regla.grupo_equidad)
+        for trabajador in self.regla.elegibles + self.regla.respaldo:
+            fila = self._obtener_fila_trabajador(trabajador)
+            if not fila or trabajador in self.contador:
+                continue
+            self.contador[trabajador] = int(grupo[fila, 2:self.grilla.max_col + 1].sum())
+
+    def _seleccionar_equitativo(self, candidatos: List[str]) -> Optional[str]:
+        if not candidatos:
+            return None
+        min_val = min(self.contador[c] for c in candidatos)
+        empatados = [c for c in candidatos if self.contador[c] == min_val]
+        return random.choice(empatados)
+
+    def _actualizar_contadores(self, trabajador: str, delta: int = 1) -> None:
+        self.contador[trabajador] += delta
+
+    # --------------------------------------------------------
+    # Asignación
+    # --------------------------------------------------------
+    def asignar_en_dia(self, col_dia: int) -> Optional[str]:
+        """Intenta asignar el turno de la regla en el día (columna), retornando el trabajador o None."""
+        turnos = self._turnos_por_personal(col_dia)
+        if not turnos:
+            return None
+        turno = turnos[0]
+
+        if self._existe_en_dia(col_dia, self.regla.conflictos_dia):
+            return None
+
+        disponibles = self._disponibles_con_respaldo(col_dia)
+        if not disponibles:
+            return None
+
+        for nombre in self.regla.excluyentes:
+            disponibles = [t for t in disponibles if not self._cumple(nombre, t, col_dia)]
+            if not disponibles:
+                return None
+
+        for candidatos in self._clasificar_por_niveles(disponibles, col_dia):
+            elegido = self._seleccionar_equitativo(candidatos)
+            if elegido:
+                fila = self._obtener_fila_trabajador(elegido)
+                if not fila:
+                    return None
+                # Confirmar que la celda de destino fue originalmente vacía
+                if self.regla.exigir_original_vacia and not self._es_celda_originalmente_vacia(fila, col_dia):
+                    return None
+                self.grilla.asignar(fila, col_dia, turno, relleno=self.regla.color)
+                self._actualizar_contadores(elegido, 1)
+                return elegido
+
+        return None
+
+    def _columna_admite_rebalanceo(self, col: int) -> bool:
+        return True
+
+    def _bloqueos_rebalanceo(self) -> frozenset:
+        """Turnos de `rebalanceo_bloqueo_dia` que no asigna la propia regla (los suyos son los que se mueven)."""
+        propios = {self.regla.turno} | {t for _, _, turnos in self.regla.por_personal for t in turnos}
+        return self.regla.rebalanceo_bloqueo_dia - propios
+
+    def _columnas_movibles(self, trabajador: str) -> List[int]:
+        """Columnas donde el trabajador tiene el turno de la regla asignado por este asignador (no original)."""
+        fila = self._obtener_fila_trabajador(trabajador)
+        if not fila:
+            return []
+        movibles = self.restricciones.en({self.regla.turno}) & ~self.original_turno
+        return [int(c) for c in movibles[fila, 2:self.grilla.max_col + 1].nonzero()[0] + 2]
+
+    def _admite_transferencia(self, origen: str, destino: str, col: int) -> bool:
+        """True si el turno de `origen` en la columna puede pasar a `destino` con la grilla actual."""
+        fila_origen = self._obtener_fila_trabajador(origen)
+        fila_destino = self._obtener_fila_trabajador(destino)
+        if not fila_origen or not fila_destino:
+            return False
+        return (
+            self.grilla.valor(fila_origen, col) == self.regla.turno
+            and not self.original_turno[fila_origen, col]
+            and self.grilla.esta_vacia(fila_destino, col)
+            and self._es_celda_originalmente_vacia(fila_destino, col)
+            and not self._existe_en_dia(col, self._bloqueos_rebalanceo())
+            and self._columna_admite_rebalanceo(col)
+            and not any(self._cumple(n, destino, col) for n in self.regla.rebalanceo_excluyentes)
+        )
+
+    def _rebalancear_para_paridad(self) -> None:
+        """Reparte el turno de la regla entre elegibles hasta diferencia ≤ 1 (transferencias por flujo de costo mínimo)."""
+        turno = self.regla.turno
+        presentes = [t for t in self.regla.elegibles if self._obtener_fila_trabajador(t)]
+        for _ in range(MAX_RONDAS_REBALANCEO):
+            conteos = {t: self.contador[t] for t in presentes}
+            movibles = {t: self._columnas_movibles(t) for t in presentes}
+            transferencias = planificar_transferencias(conteos, movibles, self._admite_transferencia)
+
+            # Aplicar revalidando sobre la grilla: dos recepciones en días seguidos pueden chocar entre sí
+            aplicadas = 0
+            for origen, destino, col in transferencias:
+                if not self._admite_transferencia(origen, destino, col):
+                    continue
+                self.grilla.asignar(self._obtener_fila_trabajador(origen), col, None, relleno=None)
+                self.grilla.asignar(self._obtener_fila_trabajador(destino), col, turno, relleno=self.regla.color)
+                self._actualizar_contadores(origen, -1)
+                self._actualizar_contadores(destino, +1)
+                aplicadas += 1
+            if not aplicadas:
+                break
+
+    def _actualizar_hoja_estadisticas(self) -> None:
+        escribir_hoja_estadisticas(self.wb, self.grilla, self.regla.estadisticas)
+
+    def procesar_todos_los_dias(self, guardar: bool = True) -> None:
+        for col in range(2, self.grilla.max_col + 1):
+            self.asignar_en_dia(col)
+
+        if self.regla.rebalanceo:
+            self._rebalancear_para_paridad()
+
+        self._actualizar_hoja_estadisticas()
+
+        if guardar:
+            self.grilla.guardar(self.regla.salida)
@@ -0,0 +1,383 @@
+"""
+Modo optimizador de la cadena mensual: decide todos los turnos extra del mes en un único modelo CP-SAT.
+
+Descripción general:
+- La cadena normal asigna día a día y etapa por etapa (1T → 1 → 6RT → 6R → 3 → diurnas → 6T); cada etapa
+  elige con `_seleccionar_equitativo` y luego intenta corregir la equidad con `_rebalancear_para_paridad`,
+  sin poder deshacer lo que decidieron las etapas anteriores.
+- Aquí las mismas reglas del registro (`reglas_turnos.REGLAS`) se traducen a un problema entero con
+  OR-Tools CP-SAT, que corre localmente, y se resuelven todas juntas:
+  * Una variable booleana por (regla, turno, trabajador, día) candidata: celda vacía, día permitido por el
+    umbral de 'TURNOS OPERATIVOS', sin turnos conflictivos preexistentes y sin restricciones duras con los
+    turnos ya presentes en la hoja (incluida la regla Torre de `tope_torre`).
+  * Restricciones: un turno por celda; cada turno como máximo una vez por día; `conflictos_dia` entre
+    reglas (p. ej. un "7" de 1T bloquea el 6RT de ese día); restricciones duras (`excluyentes`) también
+    entre turnos nuevos de días consecutivos.
+  * Objetivo (de mayor a menor peso): cubrir el máximo de días, minimizar (máximo − mínimo) de cada grupo de
+    equidad entre elegibles, evitar respaldo y restricciones blandas, y preferir los niveles de prioridad.
+- Con `limite_segundos` el solver devuelve la mejor solución encontrada hasta ese momento (FEASIBLE) o la
+  óptima si la demuestra antes (OPTIMAL).
+- Los umbrales usan el mismo conteo de personal que en la cadena normal. Los turnos extra no cambian ese
+  conteo, pero MOFI/TOFI sí: convierte 'X' (no operativo) en MN/TN/MS/TS y sube ~4 el personal de cada día.
+  En la cadena normal 1T … DIURNAS se deciden antes de MOFI/TOFI y solo 6T después (`REGLAS_TRAS_MOFI`).
+  En la cadena con optimizador MOFI/TOFI va antes, así que pipeline.py guarda los conteos previos
+  (`conteos_por_dia`) y se pasan como `conteos_previos`; 6T usa los de la grilla actual.
+- Fuera del modelo quedan las heurísticas propias de cada asignador (alertas de 1T, desempate de "7" por
+  grupo 6RT); ortools es una dependencia opcional que solo necesita este modo.
+
+Uso:
+    python optimizador_mensual.py
+    python optimizador_mensual.py horario_procesado_con_sabados_domingos.xlsx --limite-segundos 30
+"""
+
+import argparse
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from grilla_horario import GrillaHorario, resolver_archivo_entrada
+from motor_asignacion import escribir_hoja_estadisticas
+from reglas_turnos import REGLAS, regla_compilada
+from restricciones_horario import MotorRestricciones
+
+try:
+    from ortools.sat.python import cp_model
+except ImportError:  # ortools es opcional: solo lo necesita el modo optimizador
+    cp_model = None
+
+
+# Reglas que decide el optimizador, en el orden de la cadena (el de la última define "Estadísticas")
+REGLAS_CADENA = ("1T", "1", "6RT", "6R", "3", "DIURNAS", "6T")
+
+# Reglas que en la cadena normal van después de MOFI/TOFI: sus umbrales ven el personal con MOFI/TOFI
+REGLAS_TRAS_MOFI = frozenset({"6T"})
+
+# Pesos del objetivo: la cobertura domina a la equidad y ésta a las preferencias
+PESO_COBERTURA = 1000
+PESO_EQUIDAD = 100
+PESO_RESPALDO = 50
+PESO_BLANDA = 10
+PESO_PRIORIDAD = 5
+
+
+def conteos_por_dia(grilla: GrillaHorario) -> Dict[str, np.ndarray]:
+    """Personal operativo y de Torre de cada columna de la hoja (índice = columna)."""
+    columnas = range(grilla.max_col + 1)
+    return {
+        "operativos": np.array([grilla.conteo_operativos(col) for col in columnas], dtype=np.int32),
+        "torre": np.array([grilla.conteo_torre(col) for col in columnas], dtype=np.int32),
+    }
+
+
+def conteos_umbral(grilla: GrillaHorario, nombre: str,
+                   conteos_previos: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+    """
+    Conteos con que la regla `nombre` evalúa umbrales y tope de Torre, como en la cadena normal: los
+    previos a MOFI/TOFI si se conocen, salvo las reglas de REGLAS_TRAS_MOFI, que usan los actuales.
+    """
+    if conteos_previos is None or nombre in REGLAS_TRAS_MOFI:
+        return conteos_por_dia(grilla)
+    return conteos_previos
+
+
+@dataclass
+class Candidato:
+    regla: str
+    turno: str
+    trabajador: str
+    fila: int
+    col: int
+    respaldo: bool
+    var: object = None
+
+
+@dataclass
+class ResultadoOptimizacion:
+    estado: str
+    segundos: float
+    objetivo: Optional[float] = None
+    # (regla, trabajador, columna, turno) de cada asignación de la solución
+    asignaciones: List[Tuple[str, str, int, str]] = field(default_factory=list)
+
+    @property
+    def tiene_solucion(self) -> bool:
+        return self.estado in ("OPTIMAL", "FEASIBLE")
+
+
+class OptimizadorMensual:
+    """
+    Construye y resuelve con CP-SAT el modelo de turnos extra del mes sobre una `GrillaHorario`.
+
+    - Misma interfaz que los asignadores: `procesar_todos_los_dias(guardar=...)`, constructor con `grilla=`
+    - `resolver()` solo optimiza; `aplicar(resultado)` escribe la solución en la grilla con los colores de cada regla
+    """
+
+    def __init__(
+        self,
+        archivo_entrada: Optional[str] = None,
+        grilla: Optional[GrillaHorario] = None,
+        reglas: Tuple[str, ...] = REGLAS_CADENA,
+        limite_segundos: float = 10.0,
+        hilos: int = 8,
+        semilla: int = 0,
+        conteos_previos: Optional[Dict[str, np.ndarray]] = None,
+    ) -> None:
+        if cp_model is None:
+            raise ImportError("El modo optimizador necesita OR-Tools: pip install ortools")
+        if grilla is None:
+            self.archivo_entrada = resolver_archivo_entrada(
+                [
+                    archivo_entrada,
+                    "horario_procesado_con_sabados_domingos.xlsx",
+                    "horarioUnificado_procesado.xlsx",
+                ],
+                "horario_procesado_con_sabados_domingos.xlsx",
+            )
+            grilla = GrillaHorario.desde_archivo(self.archivo_entrada)
+        else:
+            self.archivo_entrada = None
+        self.grilla = grilla
+        self.wb = grilla.wb
+        self.ws = grilla.ws
+        self.restricciones = MotorRestricciones(self.grilla)
+        self.reglas = reglas
+        self.limite_segundos = limite_segundos
+        self.hilos = hilos
+        self.semilla = semilla
+        self.conteos_previos = conteos_previos
+        self._conteos: Dict[str, Dict[str, np.ndarray]] = {}
+
+        self.modelo = None
+        self.candidatos: List[Candidato] = []
+
+    # --------------------------------------------------------
+    # Datos de la hoja
+    # --------------------------------------------------------
+    def _conteos_regla(self, nombre: str) -> Dict[str, np.ndarray]:
+        if nombre not in self._conteos:
+            self._conteos[nombre] = conteos_umbral(self.grilla, nombre, self.conteos_previos)
+        return self._conteos[nombre]
+
+    def _conteo_operativos(self, nombre: str, col_dia: int) -> Optional[int]:
+        if self.grilla.fila_etiqueta("TURNOS OPERATIVOS") is None:
+            return None
+        return int(self._conteos_regla(nombre)["operativos"][col_dia])
+
+    def _conteo_torre(self, nombre: str, col_dia: int) -> Optional[int]:
+        if self.grilla.fila_etiqueta("TORRE") is None:
+            return None
+        return int(self._conteos_regla(nombre)["torre"][col_dia])
+
+    def _turnos_del_dia(self, nombre: str, col_dia: int) -> Tuple[str, ...]:
+        compilada = regla_compilada(nombre)
+        if not compilada.regla.por_personal:
+            return (compilada.regla.turno,)
+        return compilada.turnos_para(self._conteo_operativos(nombre, col_dia)) or ()
+
+    @staticmethod
+    def _bloqueos(nombre: str, turno: str) -> frozenset:
+        """Turnos que impiden `turno` en el día: `conflictos_dia` si el turno está en él, si no solo el mismo turno."""
+        regla = REGLAS[nombre]
+        return regla.conflictos_dia if turno in regla.conflictos_dia else frozenset({turno})
+
+    def _vecino_fijo(self, nombre: str, vecino: str, fila: int, col_dia: int) -> bool:
+        direccion, turnos = REGLAS[nombre].vecinos[vecino]
+        mascara = self.restricciones.ayer(turnos) if direccion == "ayer" else self.restricciones.manana(turnos)
+        return bool(mascara[fila, col_dia])
+
+    @staticmethod
+    def _col_vecina(direccion: str, col_dia: int, max_col: int) -> Optional[int]:
+        # Mismos bordes que las máscaras: sin "ayer" el primer día ni "mañana" el último
+        col = col_dia - 1 if direccion == "ayer" else col_dia + 1
+        return col if 2 <= col <= max_col else None
+
+    # --------------------------------------------------------
+    # Modelo
+    # --------------------------------------------------------
+    def _generar_candidatos(self) -> None:
+        vacias = self.restricciones.vacias()
+        max_col = self.grilla.max_col
+        for nombre in self.reglas:
+            regla = REGLAS[nombre]
+            trabajadores = [(t, False) for t in regla.elegibles] + [(t, True) for t in regla.respaldo]
+            for col in range(2, max_col + 1):
+                for turno in self._turnos_del_dia(nombre, col):
+                    if self.restricciones.en(self._bloqueos(nombre, turno))[2:26, col].any():
+                        continue
+                    torre = self._conteo_torre(nombre, col) if turno == regla.turno else None
+                    for trabajador, es_respaldo in trabajadores:
+                        fila = self.grilla.fila_de(trabajador)
+                        if not fila or not vacias[fila, col]:
+                            continue
+                        if any(self._vecino_fijo(nombre, v, fila, col) for v in regla.excluyentes):
+                            continue
+                        if torre is not None and torre > regla.tope_torre.get(trabajador, torre):
+                            continue
+                        self.candidatos.append(Candidato(nombre, turno, trabajador, fila, col, es_respaldo))
+
+    def _grupos_equidad(self) -> List[Tuple[frozenset, Tuple[str, ...]]]:
+        """(turnos que suman, elegibles) por regla; los turnos extra de una regla (6TT de 6RT) tienen paridad propia."""
+        grupos: List[Tuple[frozenset, Tuple[str, ...]]] = []
+        for nombre in self.reglas:
+            regla = REGLAS[nombre]
+            grupos.append((regla.grupo_equidad, regla.elegibles))
+            extra = {t for _, _, turnos in regla.por_personal for t in turnos} - regla.grupo_equidad
+            for turno in sorted(extra):
+                grupos.append((frozenset({turno}), regla.elegibles))
+        return grupos
+
+    def construir_modelo(self) -> None:
+        modelo = cp_model.CpModel()
+        self.modelo = modelo
+        self.candidatos = []
+        self._conteos = {}
+        self._generar_candidatos()
+
+        por_celda: Dict[Tuple[int, int], List[Candidato]] = defaultdict(list)
+        por_turno_dia: Dict[Tuple[str, int], List[Candidato]] = defaultdict(list)
+        for i, c in enumerate(self.candidatos):
+            c.var = modelo.NewBoolVar(f"{c.regla}_{c.turno}_{c.trabajador}_{c.col}_{i}")
+            por_celda[(c.fila, c.col)].append(c)
+            por_turno_dia[(c.turno, c.col)].append(c)
+
+        objetivo = []
+
+        # Un turno por celda y cada turno como máximo una vez por día
+        for grupo in list(por_celda.values()) + list(por_turno_dia.values()):
+            if len(grupo) > 1:
+                modelo.AddAtMostOne(c.var for c in grupo)
+
+        # Turnos conflictivos entre reglas en el mismo día
+        propios: Dict[str, set] = defaultdict(set)
+        for c in self.candidatos:
+            propios[c.regla].add(c.turno)
+        for (turno, col), grupo in por_turno_dia.items():
+            for nombre in {c.regla for c in grupo}:
+                mios = [c.var for c in grupo if c.regla == nombre]
+                for otro in self._bloqueos(nombre, turno) - propios[nombre]:
+                    ajenos = [c.var for c in por_turno_dia.get((otro, col), ())]
+                    if ajenos:
+                        modelo.Add(sum(mios) + sum(ajenos) <= 1)
+
+        max_col = self.grilla.max_col
+        for c in self.candidatos:
+            regla = REGLAS[c.regla]
+            peso = PESO_COBERTURA - (PESO_RESPALDO if c.respaldo else 0)
+
+            # Restricciones duras contra turnos nuevos del día anterior/siguiente
+            for vecino in regla.excluyentes:
+                direccion, turnos = regla.vecinos[vecino]
+                col_vecina = self._col_vecina(direccion, c.col, max_col)
+                if col_vecina is None:
+                    continue
+                for otro in por_celda.get((c.fila, col_vecina), ()):
+                    if otro.turno in turnos:
+                        modelo.Add(c.var + otro.var <= 1)
+
+            # Niveles de prioridad: evitar los vecinos esperados en False, preferir los esperados en True
+            condiciones = {cond for nivel in regla.niveles for cond in nivel}
+            for vecino, esperado in condiciones:
+                if self._vecino_fijo(c.regla, vecino, c.fila, c.col):
+                    peso += PESO_PRIORIDAD if esperado else -PESO_BLANDA
+                direccion, turnos = regla.vecinos[vecino]
+                col_vecina = self._col_vecina(direccion, c.col, max_col)
+                if col_vecina is None:
+                    continue
+                for otro in por_celda.get((c.fila, col_vecina), ()):
+                    if otro.turno not in turnos:
+                        continue
+                    ambos = modelo.NewBoolVar("")
+                    if esperado:
+                        modelo.Add(ambos <= c.var)
+                        modelo.Add(ambos <= otro.var)
+                        objetivo.append(PESO_PRIORIDAD * ambos)
+                    else:
+                        modelo.Add(ambos >= c.var + otro.var - 1)
+                        objetivo.append(-PESO_BLANDA * ambos)
+
+            objetivo.append(peso * c.var)
+
+        # Equidad: (máximo − mínimo) de cada grupo entre los elegibles presentes en la hoja
+        for turnos, elegibles in self._grupos_equidad():
+            fijos = self.restricciones.en(turnos)
+            conteos = []
+            for trabajador in elegibles:
+                fila = self.grilla.fila_de(trabajador)
+                if not fila:
+                    continue
+                base = int(fijos[fila, 2:max_col + 1].sum())
+                nuevos = [c.var for c in self.candidatos if c.fila == fila and c.turno in turnos]
+                conteos.append(base + sum(nuevos))
+            if len(conteos) < 2:
+                continue
+            maximo = modelo.NewIntVar(0, max_col, "")
+            minimo = modelo.NewIntVar(0, max_col, "")
+            modelo.AddMaxEquality(maximo, conteos)
+            modelo.AddMinEquality(minimo, conteos)
+            objetivo.append(-PESO_EQUIDAD * (maximo - minimo))
+
+        modelo.Maximize(sum(objetivo))
+
+    # --------------------------------------------------------
+    # Resolución
+    # --------------------------------------------------------
+    def resolver(self) -> ResultadoOptimizacion:
+        if self.modelo is None:
+            self.construir_modelo()
+
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = self.limite_segundos
+        solver.parameters.num_search_workers = self.hilos
+        solver.parameters.random_seed = self.semilla
+
+        inicio = time.perf_counter()
+        estado = solver.Solve(self.modelo)
+        resultado = ResultadoOptimizacion(solver.StatusName(estado), time.perf_counter() - inicio)
+        if resultado.tiene_solucion:
+            resultado.objetivo = solver.ObjectiveValue()
+            resultado.asignaciones = [
+                (c.regla, c.trabajador, c.col, c.turno) for c in self.candidatos if solver.BooleanValue(c.var)
+            ]
+        return resultado
+
+    def aplicar(self, resultado: ResultadoOptimizacion) -> None:
+        for nombre, trabajador, col, turno in resultado.asignaciones:
+            regla = REGLAS[nombre]
+            color = regla.colores.get(turno, regla.color if turno == regla.turno else None)
+            fila = self.grilla.fila_de(trabajador)
+            if color is None:
+                self.grilla.asignar(fila, col, turno)
+            else:
+                self.grilla.asignar(fila, col, turno, relleno=color)
+
+    def procesar_todos_los_dias(self, guardar: bool = True) -> ResultadoOptimizacion:
+        self.construir_modelo()
+        print(f"🧮 Modelo CP-SAT: {len(self.candidatos)} candidatos, límite {self.limite_segundos:g} s")
+        resultado = self.resolver()
+        print(f"   Estado: {resultado.estado} en {resultado.segundos:.2f} s")
+        if not resultado.tiene_solucion:
+            print("⚠️  El optimizador no encontró solución; no se modifica el horario")
+            return resultado
+
+        self.aplicar(resultado)
+        print(f"✅ Turnos asignados: {len(resultado.asignaciones)} (objetivo {resultado.objetivo:g})")
+
+        escribir_hoja_estadisticas(self.wb, self.grilla, REGLAS[self.reglas[-1]].estadisticas)
+
+        if guardar:
+            self.grilla.guardar("horarioUnificado_optimizado.xlsx")
+        return resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Turnos extra del mes con un único modelo CP-SAT")
+    parser.add_argument("archivo_entrada", nargs="?", default=None, help="Horario procesado (con sábados/festivos)")
+    parser.add_argument("--limite-segundos", type=float, default=10.0, help="Tiempo máximo del solver")
+    parser.add_argument("--hilos", type=int, default=8, help="Hilos de búsqueda de CP-SAT")
+    args = parser.parse_args()
+
+    optimizador = OptimizadorMensual(args.archivo_entrada, limite_segundos=args.limite_segundos, hilos=args.hilos)
+    optimizador.procesar_todos_los_dias()
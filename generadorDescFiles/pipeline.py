@@ -0,0 +1,248 @@
+"""
+Ejecuta la cadena mensual completa en un solo proceso, sin archivos intermedios.
+
+Descripción general:
+- El orden de las etapas queda declarado en `ETAPAS` (antes solo estaba implícito en los nombres de
+  archivo que cada script buscaba con `os.path.exists`):
+  procesador_horarios → sábados y festivos → 1T → 1 → 6RT → 6R → 3 → diurnas → mofis → 6T → stats
+- 'horioUnificado.xlsx' se lee una sola vez. Las dos primeras etapas trabajan sobre el libro de openpyxl;
+  a partir de 1T todos los asignadores comparten la misma `GrillaHorario` en memoria.
+- Solo se escribe el resultado final ('horarioUnificado_con_6t_stats.xlsx'). Con `--snapshots` se
+  guardan además los archivos intermedios con los mismos nombres que produce la cadena por scripts.
+- Al terminar se imprime, por etapa, el tiempo de reloj y el pico de memoria (tracemalloc).
+- Con `--optimizador` las etapas 1T … 6T se reemplazan por un único modelo CP-SAT (`optimizador_mensual.py`,
+  requiere ortools): procesador → sábados y festivos → mofis → optimizador → stats.
+- Con `--exportar-largo RUTA` se escribe además el horario final en formato largo (exportador_largo.py:
+  sigla, fecha, turno, mitad, etapa que escribió cada turno) en .parquet, .feather o .csv.
+
+Uso:
+    python pipeline.py
+    python pipeline.py --snapshots
+    python pipeline.py --snapshots --directorio-snapshots intermedios
+    python pipeline.py --optimizador --limite-segundos 30
+    python pipeline.py --exportar-largo horario_largo.parquet --mes 2026-06
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from grilla_horario import GrillaHorario
+from procesador_horarios import procesar_horarios
+from asignador_de_sabados_y_festivos import AsignadorSabadosFestivos
+from asignador_turnos_1t import AsignadorTurnos
+from asignador_turnos_1 import AsignadorTurnos1
+from asignador_turnos_6rt import AsignadorTurnos6RT
+from asignador_turnos_6r import AsignadorTurnos6R
+from asignador_turnos_3 import AsignadorTurnos3
+from asignador_turnos_diurnas import AsignadorTurnosDiurnas
+from asignador_turnos_mofis import AsignadorTurnosMofis
+from asignador_turnos_6t import AsignadorTurnos6T
+from optimizador_mensual import OptimizadorMensual, conteos_por_dia
+from stat_transformada import StatTransformada
+from exportador_largo import OrigenCeldas, exportar_largo, leer_mes, tabla_larga
+
+
+@dataclass
+class EstadoCadena:
+    """Estado que pasa de una etapa a la siguiente."""
+    wb: object = None
+    grilla: Optional[GrillaHorario] = None
+    # Personal por día antes de MOFI/TOFI (modo optimizador: umbrales como en la cadena normal)
+    conteos_previos_mofi: Optional[Dict[str, np.ndarray]] = None
+
+    def asegurar_grilla(self) -> GrillaHorario:
+        if self.grilla is None:
+            self.grilla = GrillaHorario(self.wb)
+        return self.grilla
+
+    def volcar(self) -> None:
+        """Deja el libro de openpyxl al día con los cambios pendientes de la grilla."""
+        if self.grilla is not None:
+            self.grilla.volcar()
+
+
+@dataclass
+class Etapa:
+    nombre: str
+    archivo_snapshot: str
+    ejecutar: Callable[[EstadoCadena], None]
+
+
+@dataclass
+class MedicionEtapa:
+    nombre: str
+    segundos: float
+    pico_bytes: int
+    snapshot: Optional[str] = None
+
+
+@dataclass
+class ResultadoCadena:
+    estado: EstadoCadena
+    mediciones: List[MedicionEtapa] = field(default_factory=list)
+
+
+# --------------------------------------------------------
+# Etapas
+# --------------------------------------------------------
+def _etapa_procesador(estado: EstadoCadena) -> None:
+    estado.wb = procesar_horarios(estado.wb, guardar=False)
+    if estado.wb is None:
+        raise FileNotFoundError("No se pudo cargar 'horioUnificado.xlsx'")
+
+
+def _etapa_sabados(estado: EstadoCadena) -> None:
+    AsignadorSabadosFestivos(modo_simulacion=False, wb=estado.wb).asignar(guardar=False)
+
+
+def _etapa_asignador(clase) -> Callable[[EstadoCadena], None]:
+    def ejecutar(estado: EstadoCadena) -> None:
+        clase(grilla=estado.asegurar_grilla()).procesar_todos_los_dias(guardar=False)
+    return ejecutar
+
+
+def _etapa_mofis_previa(estado: EstadoCadena) -> None:
+    """MOFI/TOFI antes del optimizador, guardando el personal por día previo a sus asignaciones."""
+    grilla = estado.asegurar_grilla()
+    estado.conteos_previos_mofi = conteos_por_dia(grilla)
+    AsignadorTurnosMofis(grilla=grilla).procesar_todos_los_dias(guardar=False)
+
+
+def _etapa_optimizador(limite_segundos: float) -> Callable[[EstadoCadena], None]:
+    def ejecutar(estado: EstadoCadena) -> None:
+        optimizador = OptimizadorMensual(
+            grilla=estado.asegurar_grilla(),
+            limite_segundos=limite_segundos,
+            conteos_previos=estado.conteos_previos_mofi,
+        )
+        optimizador.procesar_todos_los_dias(guardar=False)
+    return ejecutar
+
+
+def _etapa_stats(estado: EstadoCadena) -> None:
+    estado.volcar()
+    StatTransformada("horarioUnificado_con_6t.xlsx", wb=estado.wb)
+
+
+ETAPAS: List[Etapa] = [
+    Etapa("procesador_horarios", "horarioUnificado_procesado.xlsx", _etapa_procesador),
+    Etapa("sabados_y_festivos", "horario_procesado_con_sabados_domingos.xlsx", _etapa_sabados),
+    Etapa("1T", "horarioUnificado_con_1t.xlsx", _etapa_asignador(AsignadorTurnos)),
+    Etapa("1", "horarioUnificado_con_1.xlsx", _etapa_asignador(AsignadorTurnos1)),
+    Etapa("6RT", "horarioUnificado_con_6rt.xlsx", _etapa_asignador(AsignadorTurnos6RT)),
+    Etapa("6R", "horarioUnificado_con_6r.xlsx", _etapa_asignador(AsignadorTurnos6R)),
+    Etapa("3", "horarioUnificado_con_3.xlsx", _etapa_asignador(AsignadorTurnos3)),
+    Etapa("diurnas", "horarioUnificado_con_diurnas.xlsx", _etapa_asignador(AsignadorTurnosDiurnas)),
+    Etapa("mofis", "horarioUnificado_con_mofis.xlsx", _etapa_asignador(AsignadorTurnosMofis)),
+    Etapa("6T", "horarioUnificado_con_6t.xlsx", _etapa_asignador(AsignadorTurnos6T)),
+    # La etapa de estadísticas guarda siempre su propio archivo final (*_stats.xlsx)
+    Etapa("stats", "", _etapa_stats),
+]
+
+
+def etapas_optimizador(limite_segundos: float = 10.0) -> List[Etapa]:
+    """
+    Etapas del modo optimizador. MOFI/TOFI va antes porque sus decisiones no dependen de los turnos extra;
+    así el optimizador no pierde asignaciones que MOFI/TOFI sobrescribiría. MOFI/TOFI sí sube el personal
+    operativo de cada día, por eso se guardan los conteos previos y el optimizador evalúa con ellos los
+    umbrales de 1T … DIURNAS (6T, que en la cadena normal va después de MOFI/TOFI, usa los actuales).
+    """
+    return [
+        Etapa("procesador_horarios", "horarioUnificado_procesado.xlsx", _etapa_procesador),
+        Etapa("sabados_y_festivos", "horario_procesado_con_sabados_domingos.xlsx", _etapa_sabados),
+        Etapa("mofis", "horarioUnificado_con_mofis.xlsx", _etapa_mofis_previa),
+        Etapa("optimizador", "horarioUnificado_optimizado.xlsx", _etapa_optimizador(limite_segundos)),
+        Etapa("stats", "", _etapa_stats),
+    ]
+
+
+# --------------------------------------------------------
+# Orquestador
+# --------------------------------------------------------
+def ejecutar_cadena(
+    wb=None,
+    snapshots: bool = False,
+    directorio_snapshots: str = ".",
+    etapas: Optional[List[Etapa]] = None,
+    origen: Optional[OrigenCeldas] = None,
+) -> ResultadoCadena:
+    """
+    Ejecuta las etapas en orden sobre un único libro/grilla en memoria.
+
+    - wb: libro inicial; si es None, procesar_horarios lee 'horioUnificado.xlsx'.
+    - snapshots: si es True, guarda tras cada etapa el archivo intermedio correspondiente.
+    - etapas: subconjunto/orden alternativo de etapas (por defecto `ETAPAS`).
+    - origen: si se indica, registra tras cada etapa qué celdas cambió (columna 'etapa' del formato largo).
+    """
+    etapas = ETAPAS if etapas is None else etapas
+    resultado = ResultadoCadena(EstadoCadena(wb=wb))
+    if snapshots:
+        os.makedirs(directorio_snapshots, exist_ok=True)
+
+    tracemalloc.start()
+    try:
+        for etapa in etapas:
+            tracemalloc.reset_peak()
+            inicio = time.perf_counter()
+            etapa.ejecutar(resultado.estado)
+            segundos = time.perf_counter() - inicio
+            _, pico = tracemalloc.get_traced_memory()
+
+            if origen is not None:
+                estado = resultado.estado
+                origen.registrar(etapa.nombre, estado.grilla if estado.grilla is not None else GrillaHorario(estado.wb))
+
+            ruta_snapshot = None
+            if snapshots and etapa.archivo_snapshot:
+                resultado.estado.volcar()
+                ruta_snapshot = os.path.join(directorio_snapshots, etapa.archivo_snapshot)
+                resultado.estado.wb.save(ruta_snapshot)
+            resultado.mediciones.append(MedicionEtapa(etapa.nombre, segundos, pico, ruta_snapshot))
+    finally:
+        tracemalloc.stop()
+    return resultado
+
+
+def imprimir_mediciones(mediciones: List[MedicionEtapa]) -> None:
+    print("\n" + "=" * 60)
+    print("TIEMPOS Y MEMORIA POR ETAPA")
+    print("=" * 60)
+    print(f"{'Etapa':<22}{'Tiempo (s)':>12}{'Pico (MB)':>12}")
+    print("-" * 60)
+    for m in mediciones:
+        print(f"{m.nombre:<22}{m.segundos:>12.3f}{m.pico_bytes / (1024 * 1024):>12.2f}")
+    print("-" * 60)
+    print(f"{'TOTAL':<22}{sum(m.segundos for m in mediciones):>12.3f}")
+    snapshots = [m.snapshot for m in mediciones if m.snapshot]
+    if snapshots:
+        print(f"Snapshots intermedios escritos: {len(snapshots)}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cadena mensual completa en un solo proceso")
+    parser.add_argument("--snapshots", action="store_true", help="Guardar los archivos intermedios de cada etapa")
+    parser.add_argument("--directorio-snapshots", default=".", help="Carpeta para los archivos intermedios")
+    parser.add_argument("--optimizador", action="store_true", help="Asignar 1T…6T con un único modelo CP-SAT")
+    parser.add_argument("--limite-segundos", type=float, default=10.0, help="Tiempo máximo del optimizador")
+    parser.add_argument("--exportar-largo", help="Escribir también el horario final en formato largo (.parquet/.feather/.csv)")
+    parser.add_argument("--mes", type=leer_mes, help="Mes del horario (AAAA-MM) para las fechas del formato largo")
+    args = parser.parse_args()
+
+    etapas = etapas_optimizador(args.limite_segundos) if args.optimizador else None
+    origen = OrigenCeldas() if args.exportar_largo else None
+    resultado = ejecutar_cadena(
+        snapshots=args.snapshots, directorio_snapshots=args.directorio_snapshots, etapas=etapas, origen=origen
+    )
+    imprimir_mediciones(resultado.mediciones)
+
+    if args.exportar_largo:
+        año, mes = args.mes or (None, None)
+        tabla = tabla_larga(resultado.estado.asegurar_grilla(), año, mes, origen)
+        print(f"Formato largo: {len(tabla['sigla'])} turnos → {exportar_largo(tabla, args.exportar_largo)}")
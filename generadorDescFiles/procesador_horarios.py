@@ -1,12 +1,17 @@
 import openpyxl
-from openpyxl.styles import PatternFill, Font
+from openpyxl.styles import PatternFill
 from openpyxl.utils import get_column_letter
 import os
 
-def procesar_horarios():
+from exportador_excel import aplicar_estilo
+
+def procesar_horarios(wb=None, guardar=True):
 	"""
 	Procesa el archivo horarioUnificado.xlsx para contar turnos operativos
 	usando valores calculados y aplicar formato de colores según especificaciones.
+	
+	Si se pasa `wb` se procesa ese libro en memoria en lugar de leer 'horioUnificado.xlsx';
+	con `guardar=False` no se escribe 'horarioUnificado_procesado.xlsx'. Devuelve el libro procesado.
 	"""
 	
 	# Definir turnos no operativos
@@ -31,7 +36,8 @@ def procesar_horarios():
 	
 	# Cargar el archivo Excel
 	try:
-		wb = openpyxl.load_workbook('horioUnificado.xlsx')
+		if wb is None:
+			wb = openpyxl.load_workbook('horioUnificado.xlsx')
 		ws = wb.active
 		print("Archivo cargado exitosamente")
 	except FileNotFoundError:
@@ -47,26 +53,22 @@ def procesar_horarios():
 	
 	print(f"Dimensiones del archivo: {max_row} filas, {max_col} columnas")
 	
-	# Definir colores según especificaciones
-	rojo_intenso = PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")		# ≤8
-	rojo_medio = PatternFill(start_color="FF6666", end_color="FF6666", fill_type="solid")		# =9 (también para 'Torre' >4)
-	azul_clarito = PatternFill(start_color="99CCFF", end_color="99CCFF", fill_type="solid")		# =10
-	verde_clarito = PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid")		# =11
-	verde_intenso = PatternFill(start_color="008000", end_color="008000", fill_type="solid")		# =12
-	sin_relleno = PatternFill(fill_type=None)														# ≥13
+	# Colores según especificaciones: estilos con nombre de la paleta compartida (exportador_excel.py)
+	# 'rojo_intenso' (≤8, texto blanco), 'rojo_medio' (=9, también 'Torre' >4), 'azul_clarito' (=10),
+	# 'verde_clarito' (=11), 'verde_intenso' (=12), sin relleno (≥13), 'amarillo' (turnos no operativos)
+	colores_conteo = {9: "rojo_medio", 10: "azul_clarito", 11: "verde_clarito", 12: "verde_intenso"}
+	# Solo se quita el relleno: fuente, bordes, alineación y formato numérico se conservan
+	sin_relleno = PatternFill(fill_type=None)
 	rojo_claro_encabezado = PatternFill(start_color="FF6666", end_color="FF6666", fill_type="solid")	# Solo encabezado domingo
-	amarillo = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")			# Turnos no operativos
-	
-	# Definir fuentes
-	fuente_blanca = Font(color="FFFFFF")  # Para rojo intenso
 	
 	# Limpiar todo el formato existente antes de aplicar nuevos colores
 	print("Limpiando formato existente...")
-	for row in range(1, max_row + 1):
+	for col in range(1, max_col + 1):
+		ws.cell(row=1, column=col).fill = sin_relleno
+	for row in range(2, max_row + 1):
 		for col in range(1, max_col + 1):
-			cell = ws.cell(row=row, column=col)
-			# Limpiar solo el relleno, preservar el valor
-			cell.fill = PatternFill(fill_type=None)
+			# Limpiar solo el relleno, preservar el valor (y fuente, bordes y formato)
+			ws.cell(row=row, column=col).fill = sin_relleno
 	
 	# Fijar filas para nuevos conteos (dinámicos y estáticos)
 	fila_dinamico_torre = max_row + 1
@@ -97,18 +99,9 @@ def procesar_horarios():
 		celda_conteo_estatico.value = conteo_operativos
 		# Color estático
 		if conteo_operativos <= 8:
-			celda_conteo_estatico.fill = rojo_intenso
-			celda_conteo_estatico.font = fuente_blanca
-		elif conteo_operativos == 9:
-			celda_conteo_estatico.fill = rojo_medio
-		elif conteo_operativos == 10:
-			celda_conteo_estatico.fill = azul_clarito
-		elif conteo_operativos == 11:
-			celda_conteo_estatico.fill = verde_clarito
-		elif conteo_operativos == 12:
-			celda_conteo_estatico.fill = verde_intenso
+			aplicar_estilo(celda_conteo_estatico, "rojo_intenso", "blanca")
 		else:
-			celda_conteo_estatico.fill = sin_relleno
+			aplicar_estilo(celda_conteo_estatico, colores_conteo.get(conteo_operativos))
 	
 	# Agregar fila 'Torre' estático (subconjunto de siglas)
 	siglas_torre = {"YIS", "MAQ", "DJO", "AFG", "JLF", "JMV"}
@@ -131,10 +124,7 @@ def procesar_horarios():
 				if str(v).strip().upper() not in turnos_no_operativos:
 					conteo_torre += 1
 		celda_torre_estatico = ws.cell(row=fila_torre, column=col, value=conteo_torre)
-		if conteo_torre > 4:
-			celda_torre_estatico.fill = rojo_medio
-		else:
-			celda_torre_estatico.fill = sin_relleno
+		aplicar_estilo(celda_torre_estatico, "rojo_medio" if conteo_torre > 4 else None)
 	
 	# Añadir fórmulas dinámicas (Solución 1)
 	turnos_list = sorted(list(turnos_no_operativos))
@@ -163,7 +153,7 @@ def procesar_horarios():
 			if cell_value is not None and str(cell_value).strip() != "":
 				valor_limpio = str(cell_value).strip().upper()
 				if valor_limpio in turnos_no_operativos:
-					cell.fill = amarillo
+					aplicar_estilo(cell, "amarillo")
 	
 	# Colorear SOLO el encabezado de domingos de rojo claro (no todas las celdas)
 	for col in range(2, max_col + 1):
@@ -182,7 +172,7 @@ def procesar_horarios():
 	for row in ws_stats.iter_rows():
 		for cell in row:
 			cell.value = None
-			cell.fill = PatternFill(fill_type=None)
+			aplicar_estilo(cell)
 	# Crear encabezados
 	ws_stats.cell(row=1, column=1, value="SIGLA")
 	ws_stats.cell(row=1, column=2, value="DESC")
@@ -198,21 +188,18 @@ def procesar_horarios():
 		formula_desc_trop = f'=COUNTIF(HorarioUnificado!B{i}:AC{i},"DESC")+COUNTIF(HorarioUnificado!B{i}:AC{i},"TROP")'
 		ws_stats.cell(row=i, column=2, value=formula_desc_trop)
 	# Formato encabezados
-	header_fill = PatternFill(start_color="E6E6E6", end_color="E6E6E6", fill_type="solid")
-	header_font = Font(bold=True)
 	for col in range(1, 3):
-		cell = ws_stats.cell(row=1, column=col)
-		cell.fill = header_fill
-		cell.font = header_font
+		aplicar_estilo(ws_stats.cell(row=1, column=col), "gris_encabezado", "negrita")
 	# Anchos
 	ws_stats.column_dimensions['A'].width = 8
 	ws_stats.column_dimensions['B'].width = 6
 	
 	# Guardar el archivo procesado
 	nombre_archivo_salida = "horarioUnificado_procesado.xlsx"
-	wb.save(nombre_archivo_salida)
+	if guardar:
+		wb.save(nombre_archivo_salida)
+		print(f"Archivo procesado guardado como: {nombre_archivo_salida}")
 	
-	print(f"Archivo procesado guardado como: {nombre_archivo_salida}")
 	print("Resumen del procesamiento:")
 	print("- Se limpió todo el formato de color existente")
 	print("- Se agregaron filas dinámicas: 'TORRE (DIN)' y 'TURNOS OPERATIVOS (DIN)'")
@@ -232,6 +219,7 @@ def procesar_horarios():
 	print("• El orden es procesar horarios, generar sábados")
 	print("•, luego 1T/7, 6RT/6tt, 6TT.")
 	print("="*60)
+	return wb
 
 if __name__ == "__main__":
 	procesar_horarios() 
\ No newline at end of file
@@ -1,7 +1,7 @@
+import numpy as np
 import openpyxl
-from openpyxl.styles import Alignment, PatternFill
-from openpyxl.utils import get_column_letter
-import copy
+
+from division_columnas import TablaDivision, celdas_distintas, clave, guardar_unido, leer_hoja, mismas_celdas, unir_hoja
 
 def quitar_division_columna():
     """
@@ -20,69 +20,27 @@ def quitar_division_columna():
        - BLPT → 1T
        - BANT → 1
     3. Conserva los colores originales
+
+    Las reglas inversas salen de DIVISION_TURNOS (division_columnas.py), la misma tabla de la división:
+    cada par de columnas se une con una búsqueda vectorizada `inversa[id1, id2]` sobre la hoja codificada.
     """
     
-    # Cargar el archivo con división de columnas
-    wb = openpyxl.load_workbook('excel_con_division_de_columna.xlsx')
-    ws = wb.active
-    
-    print(f"Procesando archivo: {wb.active.title}")
-    print(f"Dimensiones con división: {ws.max_row} filas x {ws.max_column} columnas")
-    
-    # Crear nuevo workbook
-    nuevo_wb = openpyxl.Workbook()
-    nuevo_ws = nuevo_wb.active
-    nuevo_ws.title = ws.title
-    
-    # Copiar la primera columna (trabajadores) sin cambios
-    for fila in range(1, ws.max_row + 1):
-        valor = ws.cell(row=fila, column=1).value
-        nuevo_ws.cell(row=fila, column=1, value=valor)
+    # Cargar el archivo con división de columnas (valores y colores de relleno)
+    titulo, valores, colores = leer_hoja('excel_con_division_de_columna.xlsx')
     
-    # Procesar columnas de días (desde la columna 2 en adelante, de dos en dos)
-    nueva_col = 2
-    for col_primera in range(2, ws.max_column, 2):  # Avanzar de 2 en 2
-        col_segunda = col_primera + 1
-        
-        # Obtener el día del encabezado (está en la primera columna del par)
-        dia = ws.cell(row=1, column=col_primera).value
-        
-        # Crear una sola columna para el día
-        nuevo_ws.cell(row=1, column=nueva_col, value=dia)
-        
-        # Procesar cada fila para este día
-        for fila in range(2, ws.max_row + 1):
-            valor_primera = ws.cell(row=fila, column=col_primera).value
-            valor_segunda = ws.cell(row=fila, column=col_segunda).value
-            
-            # Determinar el turno original basado en los valores de ambas columnas
-            turno_original = determinar_turno_original(valor_primera, valor_segunda)
-            
-            if turno_original:
-                # Crear la celda con el turno original
-                celda_nueva = nuevo_ws.cell(row=fila, column=nueva_col, value=turno_original)
-                
-                # Aplicar el color de la primera columna (si existe)
-                color_primera = ws.cell(row=fila, column=col_primera).fill
-                if color_primera.start_color.rgb:
-                    celda_nueva.fill = PatternFill(
-                        start_color=color_primera.start_color.rgb,
-                        end_color=color_primera.end_color.rgb,
-                        fill_type=color_primera.fill_type
-                    )
-        
-        nueva_col += 1  # Avanzar una columna para el siguiente día
+    print(f"Procesando archivo: {titulo}")
+    print(f"Dimensiones con división: {valores.shape[0]} filas x {valores.shape[1]} columnas")
     
-    # Ajustar ancho de columnas
-    for col in range(1, nuevo_ws.max_column + 1):
-        nuevo_ws.column_dimensions[get_column_letter(col)].width = 8
+    # Unir todos los pares de columnas de una vez
+    tabla = TablaDivision()
+    unidos, colores_unidos = unir_hoja(tabla, valores, colores)
     
     # Guardar el archivo convertido
     nombre_archivo_salida = "conversion_inversa_a_una_sola_columna.xlsx"
-    nuevo_wb.save(nombre_archivo_salida)
+    guardar_unido(nombre_archivo_salida, titulo, unidos, colores_unidos)
     
     print(f"\nArchivo convertido guardado como: {nombre_archivo_salida}")
-    print(f"Nuevas dimensiones: {nuevo_ws.max_row} filas x {nuevo_ws.max_column} columnas")
+    print(f"Nuevas dimensiones: {unidos.shape[0]} filas x {unidos.shape[1]} columnas")
     
     # Mostrar resumen de los cambios
     print("\nResumen de conversión inversa realizada:")
@@ -103,46 +61,16 @@ def quitar_division_columna():
     print("- Se conservaron los colores originales de los turnos")
     
     # Verificar que la conversión fue exitosa
-    verificar_conversion_exitosa()
+    verificar_conversion_exitosa(unidos, tabla)
 
 def determinar_turno_original(valor_primera, valor_segunda):
     """
     Determina el turno original basado en los valores de las dos columnas divididas
+    (para una sola celda; quitar_division_columna aplica la misma tabla a toda la hoja)
     """
-    if not valor_primera:
-        return None
-    
-    primera = str(valor_primera).strip()
-    segunda = str(valor_segunda).strip() if valor_segunda else ""
-    
-    # Reglas inversas de renombrado
-    if primera == "TLPT" and segunda == "NLPT":
-        return "6TT"
-    elif primera == "MLPR" and segunda == "NLPR":
-        return "6RT"
-    elif primera == "TANT" and segunda == "NANT":
-        return "6T"
-    elif primera == "MAST" and segunda == "NANR":
-        return "6R"
-    elif primera == "MANR" and segunda == "TANR":
-        return "6N"
-    elif primera == "MASR" and segunda == "TASR":
-        return "6S"
-    elif primera == "MLPR" and segunda == "TLPR":
-        return "6MT"
-    elif primera == "TAST" and segunda == "HXN4":
-        return "3"
-    elif primera == "BLPT" and segunda == "NLPR":
-        return "7"
-    elif primera == "BLPT" and not segunda:
-        return "1T"
-    elif primera == "BANT" and not segunda:
-        return "1"
-    elif primera == "r" and not segunda:
-        return "r"
-    else:
-        # Si no coincide con ninguna regla, devolver el valor de la primera columna
-        return valor_primera
+    valores = np.array([[None, None, None], [None, valor_primera, valor_segunda]], dtype=object)
+    unidos, _ = unir_hoja(TablaDivision(), valores, np.full(valores.shape, None, dtype=object))
+    return unidos[1, 1]
 
 def mostrar_estructura_archivo_dividido():
     """
@@ -183,43 +111,44 @@ def mostrar_estructura_archivo_dividido():
     except Exception as e:
         print(f"Error al leer el archivo: {e}")
 
-def verificar_conversion_exitosa():
+def verificar_conversion_exitosa(convertido=None, tabla=None):
     """
-    Compara el archivo original con el archivo convertido para verificar que la conversión fue exitosa
+    Compara el archivo original con el convertido para verificar que la conversión fue exitosa.
+    Las dos hojas se codifican con la misma tabla y se comparan en una sola igualdad de matrices;
+    solo si difieren se buscan las celdas distintas. Sin `convertido` se lee el archivo convertido.
     """
     print("\n" + "="*50)
     print("VERIFICANDO CONVERSIÓN")
     print("="*50)
     
     try:
-        # Cargar archivo original
-        wb_original = openpyxl.load_workbook('horarioUnificado_con_6t.xlsx')
-        ws_original = wb_original.active
+        tabla = tabla or TablaDivision()
         
-        # Cargar archivo convertido
-        wb_convertido = openpyxl.load_workbook('conversion_inversa_a_una_sola_columna.xlsx')
-        ws_convertido = wb_convertido.active
+        # Cargar archivo original (y el convertido si no viene en memoria)
+        _, original, _ = leer_hoja('horarioUnificado_con_6t.xlsx')
+        if convertido is None:
+            _, convertido, _ = leer_hoja('conversion_inversa_a_una_sola_columna.xlsx')
         
-        print(f"Archivo original: {ws_original.max_row} filas x {ws_original.max_column} columnas")
-        print(f"Archivo convertido: {ws_convertido.max_row} filas x {ws_convertido.max_column} columnas")
+        print(f"Archivo original: {original.shape[0]} filas x {original.shape[1]} columnas")
+        print(f"Archivo convertido: {convertido.shape[0]} filas x {convertido.shape[1]} columnas")
         
         # Verificar dimensiones
-        dimensiones_coinciden = (ws_original.max_row == ws_convertido.max_row and 
-                                ws_original.max_column == ws_convertido.max_column)
-        
+        dimensiones_coinciden = original.shape == convertido.shape
         print(f"✅ Dimensiones coinciden: {dimensiones_coinciden}")
         
-        # Verificar encabezados
-        encabezados_coinciden = True
-        diferencias_encabezados = []
+        # Una sola comparación de matrices; las diferencias solo se buscan si hay alguna
+        identicos = mismas_celdas(tabla, original, convertido)
+        distintas = np.empty((0, 2), dtype=np.int64) if identicos else celdas_distintas(tabla, original, convertido)
         
-        for col in range(1, ws_original.max_column + 1):
-            valor_original = ws_original.cell(row=1, column=col).value
-            valor_convertido = ws_convertido.cell(row=1, column=col).value
-            
-            if valor_original != valor_convertido:
-                encabezados_coinciden = False
-                diferencias_encabezados.append(f"Col {col}: '{valor_original}' vs '{valor_convertido}'")
+        def valor(matriz, fila, col):
+            return matriz[fila, col] if fila < matriz.shape[0] and col < matriz.shape[1] else None
+        
+        # Verificar encabezados
+        diferencias_encabezados = [
+            f"Col {col + 1}: '{valor(original, 0, col)}' vs '{valor(convertido, 0, col)}'"
+            for fila, col in distintas if fila == 0
+        ]
+        encabezados_coinciden = not diferencias_encabezados
         
         print(f"✅ Encabezados coinciden: {encabezados_coinciden}")
         if diferencias_encabezados:
@@ -228,16 +157,11 @@ def verificar_conversion_exitosa():
                 print(f"     {diff}")
         
         # Verificar trabajadores (primera columna)
-        trabajadores_coinciden = True
-        diferencias_trabajadores = []
-        
-        for fila in range(2, ws_original.max_row + 1):
-            valor_original = ws_original.cell(row=fila, column=1).value
-            valor_convertido = ws_convertido.cell(row=fila, column=1).value
-            
-            if valor_original != valor_convertido:
-                trabajadores_coinciden = False
-                diferencias_trabajadores.append(f"Fila {fila}: '{valor_original}' vs '{valor_convertido}'")
+        diferencias_trabajadores = [
+            f"Fila {fila + 1}: '{valor(original, fila, 0)}' vs '{valor(convertido, fila, 0)}'"
+            for fila, col in distintas if fila > 0 and col == 0
+        ]
+        trabajadores_coinciden = not diferencias_trabajadores
         
         print(f"✅ Trabajadores coinciden: {trabajadores_coinciden}")
         if diferencias_trabajadores:
@@ -246,26 +170,13 @@ def verificar_conversion_exitosa():
                 print(f"     {diff}")
         
         # Verificar turnos
-        turnos_coinciden = True
-        diferencias_turnos = []
-        total_celdas_comparadas = 0
-        
-        for fila in range(2, ws_original.max_row + 1):
-            for col in range(2, ws_original.max_column + 1):
-                valor_original = ws_original.cell(row=fila, column=col).value
-                valor_convertido = ws_convertido.cell(row=fila, column=col).value
-                
-                total_celdas_comparadas += 1
-                
-                # Normalizar valores para comparación
-                val_orig = str(valor_original).strip() if valor_original else ""
-                val_conv = str(valor_convertido).strip() if valor_convertido else ""
-                
-                if val_orig != val_conv:
-                    turnos_coinciden = False
-                    trabajador = ws_original.cell(row=fila, column=1).value
-                    dia = ws_original.cell(row=1, column=col).value
-                    diferencias_turnos.append(f"{trabajador} en {dia}: '{val_orig}' vs '{val_conv}'")
+        diferencias_turnos = [
+            f"{valor(original, fila, 0)} en {valor(original, 0, col)}: "
+            f"'{clave(valor(original, fila, col))}' vs '{clave(valor(convertido, fila, col))}'"
+            for fila, col in distintas if fila > 0 and col > 0
+        ]
+        turnos_coinciden = not diferencias_turnos
+        total_celdas_comparadas = max(original.shape[0] - 1, 0) * max(original.shape[1] - 1, 0)
         
         print(f"✅ Turnos coinciden: {turnos_coinciden}")
         print(f"   Total de celdas comparadas: {total_celdas_comparadas}")
@@ -278,7 +189,7 @@ def verificar_conversion_exitosa():
         
         # Resumen final
         print("\n" + "-"*50)
-        if dimensiones_coinciden and encabezados_coinciden and trabajadores_coinciden and turnos_coinciden:
+        if dimensiones_coinciden and identicos:
             print("🎉 CONVERSIÓN EXITOSA: Los archivos son idénticos!")
         else:
             print("⚠️  CONVERSIÓN PARCIAL: Se encontraron algunas diferencias")
@@ -286,18 +197,8 @@ def verificar_conversion_exitosa():
         
         # Estadísticas de turnos
         print("\nEstadísticas de turnos encontrados:")
-        turnos_originales = set()
-        turnos_convertidos = set()
-        
-        for fila in range(2, ws_original.max_row + 1):
-            for col in range(2, ws_original.max_column + 1):
-                valor_orig = ws_original.cell(row=fila, column=col).value
-                valor_conv = ws_convertido.cell(row=fila, column=col).value
-                
-                if valor_orig:
-                    turnos_originales.add(str(valor_orig).strip())
-                if valor_conv:
-                    turnos_convertidos.add(str(valor_conv).strip())
+        turnos_originales = {clave(v) for v in original[1:, 1:].ravel()} - {""}
+        turnos_convertidos = {clave(v) for v in convertido[1:, 1:].ravel()} - {""}
         
         print(f"Turnos en archivo original: {sorted(turnos_originales)}")
         print(f"Turnos en archivo convertido: {sorted(turnos_convertidos)}")
@@ -0,0 +1,159 @@
+"""
+Rebalanceo de equidad como problema de flujo de costo mínimo.
+
+Descripción general:
+- Los asignadores movían un turno a la vez: buscar el trabajador con más y con menos turnos, recorrer todas
+  las columnas hasta encontrar una transferencia legal y volver a empezar; se detenían en cuanto la pareja
+  (máximo, mínimo) no tenía movimiento aunque otras parejas sí lo tuvieran.
+- Aquí todas las transferencias se calculan a la vez sobre una red:
+  fuente → trabajador con exceso → celda movible (trabajador, día) → celda destino (otro trabajador, mismo
+  día) → trabajador con déficit → sumidero.
+  * Con T turnos entre k trabajadores el objetivo es que todos queden en [L, L+1], L = T // k.
+  * Los excesos sobre L+1 y los déficits bajo L se envían con costo muy negativo (obligatorios); bajar de
+    L+1 a L o subir de L a L+1 cuesta 0 (opcionales, solo para cuadrar la suma); cada movimiento cuesta 1.
+  * Se aumenta por caminos mínimos (Bellman-Ford) mientras el costo del camino sea negativo: se obtiene el
+    mínimo de movimientos que deja la diferencia máx − mín ≤ 1 siempre que la red lo permita.
+- Quién puede recibir cada celda lo decide el asignador con `admite(origen, destino, col)` (snapshot original,
+  restricciones de vecinos, turnos que bloquean el día); la red no conoce las reglas de turnos.
+- La red es pequeña (unas decenas de trabajadores y días), así que se resuelve en Python puro.
+"""
+
+from collections import deque
+from typing import Callable, Dict, List, Tuple
+
+
+# Costo de las unidades obligatorias: mayor que cualquier camino de movimientos de costo 1
+COSTO_OBLIGATORIO = 10 ** 6
+
+
+class RedFlujo:
+    """Red dirigida con capacidades y costos; aristas en listas paralelas (la reversa de la arista i es i ^ 1)."""
+
+    def __init__(self) -> None:
+        self.adyacencia: List[List[int]] = []
+        self.hacia: List[int] = []
+        self.capacidad: List[int] = []
+        self.costo: List[int] = []
+
+    def nodo(self) -> int:
+        self.adyacencia.append([])
+        return len(self.adyacencia) - 1
+
+    def arista(self, desde: int, hasta: int, capacidad: int, costo: int) -> int:
+        indice = len(self.hacia)
+        for a, b, cap, c in ((desde, hasta, capacidad, costo), (hasta, desde, 0, -costo)):
+            self.adyacencia[a].append(len(self.hacia))
+            self.hacia.append(b)
+            self.capacidad.append(cap)
+            self.costo.append(c)
+        return indice
+
+    def flujo_en(self, arista: int) -> int:
+        return self.capacidad[arista ^ 1]
+
+    def _camino_minimo(self, fuente: int, sumidero: int) -> Tuple[float, List[int]]:
+        """Bellman-Ford con cola (admite costos negativos); devuelve (costo, aristas del camino)."""
+        infinito = float("inf")
+        distancia = [infinito] * len(self.adyacencia)
+        previa = [-1] * len(self.adyacencia)
+        en_cola = [False] * len(self.adyacencia)
+        distancia[fuente] = 0
+        cola = deque([fuente])
+        while cola:
+            u = cola.popleft()
+            en_cola[u] = False
+            for e in self.adyacencia[u]:
+                if self.capacidad[e] <= 0:
+                    continue
+                v = self.hacia[e]
+                nueva = distancia[u] + self.costo[e]
+                if nueva < distancia[v]:
+                    distancia[v] = nueva
+                    previa[v] = e
+                    if not en_cola[v]:
+                        en_cola[v] = True
+                        cola.append(v)
+        if distancia[sumidero] == infinito:
+            return infinito, []
+        camino: List[int] = []
+        v = sumidero
+        while v != fuente:
+            e = previa[v]
+            camino.append(e)
+            v = self.hacia[e ^ 1]
+        return distancia[sumidero], camino
+
+    def flujo_costo_minimo(self, fuente: int, sumidero: int) -> int:
+        """Aumenta por caminos mínimos mientras reduzcan el costo total; devuelve las unidades enviadas."""
+        enviado = 0
+        while True:
+            costo, camino = self._camino_minimo(fuente, sumidero)
+            if not camino or costo >= 0:
+                return enviado
+            unidades = min(self.capacidad[e] for e in camino)
+            for e in camino:
+                self.capacidad[e] -= unidades
+                self.capacidad[e ^ 1] += unidades
+            enviado += unidades
+
+
+def planificar_transferencias(
+    conteos: Dict[str, int],
+    movibles: Dict[str, List[int]],
+    admite: Callable[[str, str, int], bool],
+) -> List[Tuple[str, str, int]]:
+    """
+    Calcula las transferencias (origen, destino, columna) que dejan los conteos con diferencia ≤ 1.
+
+    - conteos: turnos actuales del grupo de equidad por trabajador (solo quienes participan)
+    - movibles: por trabajador, columnas donde tiene un turno que se puede mover
+    - admite(origen, destino, col): True si la celda de `destino` en `col` puede recibir el turno de `origen`
+    """
+    if len(conteos) < 2 or max(conteos.values()) - min(conteos.values()) <= 1:
+        return []
+    base = sum(conteos.values()) // len(conteos)
+
+    red = RedFlujo()
+    fuente, sumidero = red.nodo(), red.nodo()
+    nodo_de = {t: red.nodo() for t in conteos}
+    for t, n in conteos.items():
+        if n > base + 1:
+            red.arista(fuente, nodo_de[t], n - base - 1, -COSTO_OBLIGATORIO)
+        if n > base:
+            red.arista(fuente, nodo_de[t], 1, 0)
+        if n < base:
+            red.arista(nodo_de[t], sumidero, base - n, -COSTO_OBLIGATORIO)
+        if n <= base:
+            red.arista(nodo_de[t], sumidero, 1, 0)
+
+    # origen → celda movible → celda destino (una recepción por celda) → destino
+    celdas_destino: Dict[Tuple[str, int], int] = {}
+    salidas: List[Tuple[str, int, int, List[Tuple[str, int]]]] = []
+    for origen, columnas in movibles.items():
+        if origen not in nodo_de:
+            continue
+        for col in columnas:
+            celda = red.nodo()
+            arista_salida = red.arista(nodo_de[origen], celda, 1, 0)
+            llegadas: List[Tuple[str, int]] = []
+            for destino in conteos:
+                if destino == origen or not admite(origen, destino, col):
+                    continue
+                clave = (destino, col)
+                if clave not in celdas_destino:
+                    celdas_destino[clave] = red.nodo()
+                    red.arista(celdas_destino[clave], nodo_de[destino], 1, 0)
+                llegadas.append((destino, red.arista(celda, celdas_destino[clave], 1, 1)))
+            salidas.append((origen, col, arista_salida, llegadas))
+
+    red.flujo_costo_minimo(fuente, sumidero)
+
+    transferencias: List[Tuple[str, str, int]] = []
+    for origen, col, arista_salida, llegadas in salidas:
+        if not red.flujo_en(arista_salida):
+            continue
+        for destino, arista in llegadas:
+            if red.flujo_en(arista):
+                transferencias.append((origen, destino, col))
+                break
+    return transferencias
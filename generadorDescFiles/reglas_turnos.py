@@ -0,0 +1,342 @@
+"""
+Registro declarativo de las reglas de cada tipo de turno de la cadena mensual.
+
+Descripción general:
+- Cada asignador (1T, 1, 6RT, 6R, 3, diurnas, 6T, 6TT) declara aquí su `ReglaTurno`: trabajadores elegibles
+  y de respaldo, turnos que bloquean el día, umbrales por personal operativo, reglas de día anterior/siguiente,
+  niveles de prioridad, grupo de equidad, rebalanceo, columnas de "Estadísticas" y archivos de entrada/salida.
+- `regla_compilada(nombre)` convierte una regla una sola vez en tablas de consulta: los umbrales pasan a una
+  lista indexada por el conteo de personal operativo (0-24) y los conjuntos de turnos quedan normalizados.
+- El motor genérico (`motor_asignacion.AsignadorPorReglas`) ejecuta cualquier regla de este registro; los
+  asignadores con lógica propia (1T, 6RT, diurnas) leen de aquí sus listas, conjuntos y umbrales.
+
+Vecinos (`vecinos`): nombre → ("ayer" | "manana", turnos). Los nombres se usan en:
+- `excluyentes`: si el vecino tiene alguno de esos turnos el trabajador queda descartado ese día.
+- `niveles`: cada nivel es una tupla de (nombre, valor esperado); el trabajador cae en el primer nivel que
+  cumpla y, si no cumple ninguno, en un último nivel "resto".
+- `rebalanceo_excluyentes`: condiciones que impiden mover un turno al trabajador con menos turnos.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from grilla_horario import PRIMERA_FILA_TRABAJADOR, ULTIMA_FILA_TRABAJADOR
+
+
+Vecino = Tuple[str, FrozenSet[str]]
+Nivel = Tuple[Tuple[str, bool], ...]
+
+
+def ayer(*turnos: str) -> Vecino:
+    return ("ayer", frozenset(turnos))
+
+
+def manana(*turnos: str) -> Vecino:
+    return ("manana", frozenset(turnos))
+
+
+@dataclass(frozen=True)
+class ReglaTurno:
+    turno: str
+    elegibles: Tuple[str, ...]
+    respaldo: Tuple[str, ...] = ()
+    color: Optional[str] = None
+    # Color por turno cuando la regla asigna más de un turno (p. ej. 6S/6N)
+    colores: Dict[str, str] = field(default_factory=dict)
+    # No asignar si el día ya tiene alguno de estos turnos (filas 2-25)
+    conflictos_dia: FrozenSet[str] = frozenset()
+    # Turnos que suman en el contador de equidad
+    grupo_equidad: FrozenSet[str] = frozenset()
+    # (mínimo, máximo o None, turnos a asignar) según el conteo de 'TURNOS OPERATIVOS'; vacío = siempre asignar
+    por_personal: Tuple[Tuple[int, Optional[int], Tuple[str, ...]], ...] = ()
+    vecinos: Dict[str, Vecino] = field(default_factory=dict)
+    excluyentes: Tuple[str, ...] = ()
+    niveles: Tuple[Nivel, ...] = ()
+    # sigla → máximo de la fila 'Torre' con el que puede recibir `turno` (p. ej. GCE solo con Torre ≤3)
+    tope_torre: Dict[str, int] = field(default_factory=dict)
+    # Solo usar celdas que ya estaban vacías al cargar la hoja
+    exigir_original_vacia: bool = True
+    rebalanceo: bool = False
+    rebalanceo_bloqueo_dia: FrozenSet[str] = frozenset()
+    rebalanceo_excluyentes: Tuple[str, ...] = ()
+    # Columnas de la hoja "Estadísticas" después de SIGLA: (encabezado, turnos que suma)
+    estadisticas: Tuple[Tuple[str, Tuple[str, ...]], ...] = ()
+    entradas: Tuple[str, ...] = ()
+    entrada_por_defecto: str = "horarioUnificado_procesado.xlsx"
+    salida: str = ""
+
+
+@dataclass
+class ReglaCompilada:
+    regla: ReglaTurno
+    # turnos_por_personal[conteo] → turnos a asignar (None = no asignar)
+    turnos_por_personal: List[Optional[Tuple[str, ...]]]
+
+    def turnos_para(self, conteo: Optional[int]) -> Optional[Tuple[str, ...]]:
+        if conteo is None:
+            return None
+        conteo = min(max(conteo, 0), len(self.turnos_por_personal) - 1)
+        return self.turnos_por_personal[conteo]
+
+    def minimo_personal(self) -> int:
+        """Menor conteo de personal con el que la regla asigna algo."""
+        return min((minimo for minimo, _, _ in self.regla.por_personal), default=0)
+
+
+# --------------------------------------------------------
+# Listas de trabajadores y columnas de estadísticas compartidas
+# --------------------------------------------------------
+TORRE_CON_GCE = ('GCE', 'YIS', 'MAQ', 'DJO', 'AFG', 'JLF', 'JMV')
+TORRE = ('YIS', 'MAQ', 'DJO', 'AFG', 'JLF', 'JMV')
+RESPALDO_TORRE = ('FCE', 'JBV', 'HZG')
+GENERALES = (
+    'PHD', 'HLG', 'MEI', 'VCM', 'ROP', 'ECE', 'WEH', 'DFB', 'MLS', 'FCE',
+    'JBV', 'GMT', 'BRS', 'HZG', 'JIS', 'CDT', 'WGG', 'GCE',
+)
+
+PRIORIDAD = ("DESC", "TROP", "SIND")
+
+COLUMNA_DESC = ("DESC", ("DESC", "TROP"))
+COLUMNA_1T = ("1T", ("1T", "7", "1"))
+COLUMNA_6RT = ("6RT", ("6RT", "7", "6R"))
+COLUMNA_6T = ("6T", ("6TT", "6T"))
+
+
+REGLAS: Dict[str, ReglaTurno] = {
+    "1T": ReglaTurno(
+        turno="1T",
+        elegibles=TORRE_CON_GCE,
+        conflictos_dia=frozenset({"1T", "7", "BLPTD", "BANTD"}),
+        grupo_equidad=frozenset({"1T", "7"}),
+        # ≤8 no asignar; =9 → "7"; ≥10 → "1T"
+        por_personal=((9, 9, ("7",)), (10, None, ("1T",))),
+        vecinos={
+            "prioridad_ayer": ayer(*PRIORIDAD),
+            "extra_ayer": ayer("1T", "7"),
+            "dura_ayer": ayer("BANTD", "BLPTD", "NLPRD", "NANRD", "1T", "7"),
+            "dura_manana": manana("BANTD", "BLPTD", "1T", "7"),
+            "blanda_ayer": ayer("NANTD", "NLPTD"),
+        },
+        excluyentes=("dura_ayer", "dura_manana"),
+        tope_torre={"GCE": 3},
+        niveles=(
+            (("prioridad_ayer", True), ("extra_ayer", False), ("blanda_ayer", False)),
+            (("extra_ayer", False), ("blanda_ayer", False)),
+            (("prioridad_ayer", True), ("blanda_ayer", True)),
+            (("blanda_ayer", True),),
+        ),
+        exigir_original_vacia=False,
+        estadisticas=(
+            COLUMNA_DESC,
+            ("1T", ("1T", "7")),
+            ("6RT", ("7",)),
+            ("1D", ("BANTD", "BLPTD")),
+            ("3D", ("3", "3D")),
+            ("6D", ("NLPTD", "NLPRD", "NANTD", "NANRD")),
+        ),
+        entradas=(
+            "horario_procesado_con_sabados_domingos.xlsx",
+            "horarioUnificado_procesado.xlsx",
+        ),
+        entrada_por_defecto="horario_procesado_con_sabados_domingos.xlsx",
+        salida="horarioUnificado_con_1t.xlsx",
+    ),
+    "1": ReglaTurno(
+        turno="1",
+        elegibles=GENERALES,
+        color="FFA500",  # Naranja
+        conflictos_dia=frozenset({"1", "BLPTD"}),
+        grupo_equidad=frozenset({"1T", "7", "1"}),
+        vecinos={
+            "prioridad_ayer": ayer(*PRIORIDAD),
+            "dura_ayer": ayer("BANTD", "BLPTD", "NLPRD", "NANRD", "6RT", "1T", "7", "1"),
+            "dura_manana": manana("BANTD", "BLPTD", "1T", "7", "1"),
+            "blanda_ayer": ayer("NANTD", "NLPTD", "6TT"),
+        },
+        excluyentes=("dura_ayer", "dura_manana"),
+        niveles=(
+            (("prioridad_ayer", True), ("blanda_ayer", False)),
+            (("blanda_ayer", False),),
+            (("prioridad_ayer", True), ("blanda_ayer", True)),
+            (("blanda_ayer", True),),
+        ),
+        rebalanceo=True,
+        rebalanceo_bloqueo_dia=frozenset({"1", "BLPTD"}),
+        rebalanceo_excluyentes=("dura_ayer", "dura_manana"),
+        estadisticas=(COLUMNA_DESC, COLUMNA_1T, ("6RT", ("6RT", "7")), ("6T", ("6TT",))),
+        entradas=(
+            "horarioUnificado_con_6tt.xlsx",
+            "horarioUnificado_con_6rt.xlsx",
+            "horarioUnificado_con_1t.xlsx",
+            "horarioUnificado_procesado.xlsx",
+        ),
+        entrada_por_defecto="horarioUnificado_con_6tt.xlsx",
+        salida="horarioUnificado_con_1.xlsx",
+    ),
+    "6RT": ReglaTurno(
+        turno="6RT",
+        elegibles=TORRE,
+        respaldo=RESPALDO_TORRE,
+        color="E6E6FA",  # Morado claro
+        conflictos_dia=frozenset({"6RT", "7"}),
+        grupo_equidad=frozenset({"6RT", "7"}),
+        # ≤9 → "6TT" (paridad propia); 10-15 → "6RT"; ≥16 no asignar
+        por_personal=((0, 9, ("6TT",)), (10, 15, ("6RT",))),
+        vecinos={
+            "prioridad_manana": manana(*PRIORIDAD),
+            "extra_manana": manana("1T", "T1", "1", "7"),
+        },
+        niveles=(
+            (("prioridad_manana", True), ("extra_manana", False)),
+            (("extra_manana", False),),
+        ),
+        rebalanceo=True,
+        rebalanceo_bloqueo_dia=frozenset({"7"}),
+        rebalanceo_excluyentes=("extra_manana",),
+        estadisticas=(COLUMNA_DESC, ("1T", ("1T", "7")), ("6RT", ("6RT", "7"))),
+        entradas=(
+            "horarioUnificado_con_1t.xlsx",
+            "horarioUnificado_procesado.xlsx",
+        ),
+        salida="horarioUnificado_con_6rt.xlsx",
+    ),
+    "6R": ReglaTurno(
+        turno="6R",
+        elegibles=GENERALES,
+        color="4169E1",  # Azul medio oscuro (RoyalBlue)
+        conflictos_dia=frozenset({"6R", "NANRD"}),
+        grupo_equidad=frozenset({"6RT", "7", "6R"}),
+        vecinos={
+            "prioridad_manana": manana(*PRIORIDAD),
+            "extra_manana": manana("1T", "T1", "1", "7"),
+            "dura_manana": manana("1T", "1", "7", "BLPTD", "BANTD"),
+        },
+        excluyentes=("dura_manana",),
+        niveles=(
+            (("prioridad_manana", True), ("dura_manana", False), ("extra_manana", False)),
+            (("extra_manana", False),),
+        ),
+        rebalanceo=True,
+        rebalanceo_bloqueo_dia=frozenset({"NANRD"}),
+        rebalanceo_excluyentes=("dura_manana",),
+        estadisticas=(COLUMNA_DESC, COLUMNA_1T, COLUMNA_6RT, ("6T", ("6TT",))),
+        entradas=(
+            "horarioUnificado_con_1.xlsx",
+            "horarioUnificado_con_6tt.xlsx",
+            "horarioUnificado_con_1t.xlsx",
+            "horarioUnificado_procesado.xlsx",
+        ),
+        entrada_por_defecto="horarioUnificado_con_1.xlsx",
+        salida="horarioUnificado_con_6r.xlsx",
+    ),
+    "3": ReglaTurno(
+        turno="3",
+        elegibles=GENERALES,
+        color="B8860B",  # Oro oscuro (DarkGoldenrod)
+        conflictos_dia=frozenset({"3", "BLPTD", "3D"}),
+        grupo_equidad=frozenset({"3"}),
+        vecinos={
+            "blanda_manana": manana("BANTD", "BLPTD", "1T", "7", "1"),
+        },
+        niveles=((("blanda_manana", False),),),
+        rebalanceo=True,
+        rebalanceo_bloqueo_dia=frozenset({"3", "BLPTD", "3D"}),
+        estadisticas=(COLUMNA_DESC, COLUMNA_1T, COLUMNA_6RT, COLUMNA_6T, ("3", ("3",))),
+        entradas=(
+            "horarioUnificado_con_6t.xlsx",
+            "horarioUnificado_con_6tt.xlsx",
+            "horarioUnificado_con_6rt.xlsx",
+            "horarioUnificado_con_6r.xlsx",
+            "horarioUnificado_con_1t.xlsx",
+            "horarioUnificado_con_1.xlsx",
+            "horarioUnificado_procesado.xlsx",
+        ),
+        entrada_por_defecto="horarioUnificado_con_6t.xlsx",
+        salida="horarioUnificado_con_3.xlsx",
+    ),
+    "DIURNAS": ReglaTurno(
+        turno="6S",
+        elegibles=GENERALES,
+        colores={
+            "6S": "8B0000",  # Rojo oscuro (DarkRed)
+            "6N": "DC143C",  # Rojo medio (Crimson)
+        },
+        conflictos_dia=frozenset({"6S", "6N", "BLPTD", "NANRD"}),
+        grupo_equidad=frozenset({"6S", "6N"}),
+        # 9-10 → "6N" y "6S" a dos trabajadores; 11 → solo "6S"; 12+ no asignar
+        por_personal=((9, 10, ("6N", "6S")), (11, 11, ("6S",))),
+        rebalanceo=True,
+        rebalanceo_bloqueo_dia=frozenset({"6S", "6N", "BLPTD", "NANRD"}),
+        entradas=(
+            "horarioUnificado_con_3.xlsx",
+            "horarioUnificado_con_6r.xlsx",
+            "horarioUnificado_procesado.xlsx",
+        ),
+        entrada_por_defecto="horarioUnificado_con_3.xlsx",
+        salida="horarioUnificado_con_diurnas.xlsx",
+    ),
+    "6T": ReglaTurno(
+        turno="6T",
+        elegibles=GENERALES,
+        color="008B8B",  # DarkCyan (aguamarina oscura)
+        conflictos_dia=frozenset({"6T", "NANRD"}),
+        grupo_equidad=frozenset({"6RT", "7", "6R", "6TT", "6T"}),
+        vecinos={
+            "dura_manana": manana("1T", "1", "7", "BLPTD", "BANTD"),
+        },
+        # Prioridad BLANDA: la restricción de mañana solo ordena, no descarta
+        niveles=((("dura_manana", False),),),
+        rebalanceo=True,
+        rebalanceo_bloqueo_dia=frozenset({"NANRD"}),
+        estadisticas=(COLUMNA_DESC, COLUMNA_1T, COLUMNA_6RT, COLUMNA_6T),
+        entradas=(
+            "horarioUnificado_con_6r.xlsx",
+            "horarioUnificado_con_1.xlsx",
+            "horarioUnificado_con_6tt.xlsx",
+            "horarioUnificado_con_1t.xlsx",
+            "horarioUnificado_procesado.xlsx",
+        ),
+        entrada_por_defecto="horarioUnificado_con_6r.xlsx",
+        salida="horarioUnificado_con_6t.xlsx",
+    ),
+    "6TT": ReglaTurno(
+        turno="6TT",
+        elegibles=TORRE,
+        respaldo=RESPALDO_TORRE,
+        color="9370DB",  # Morado medio
+        conflictos_dia=frozenset({"6TT"}),
+        grupo_equidad=frozenset({"6TT"}),
+        # ≤13 → asignar; ≥14 no asignar
+        por_personal=((0, 13, ("6TT",)),),
+        vecinos={
+            "extra_manana": manana("1T", "1", "7"),
+        },
+        niveles=((("extra_manana", False),),),
+        exigir_original_vacia=False,
+        estadisticas=(COLUMNA_DESC, ("1T", ("1T", "7")), ("6RT", ("6RT", "7")), ("6T", ("6TT",))),
+        entradas=(
+            "horarioUnificado_con_6rt.xlsx",
+            "horarioUnificado_con_1t.xlsx",
+            "horarioUnificado_procesado.xlsx",
+        ),
+        salida="horarioUnificado_con_6tt.xlsx",
+    ),
+}
+
+
+_COMPILADAS: Dict[str, ReglaCompilada] = {}
+
+
+def regla_compilada(nombre: str) -> ReglaCompilada:
+    """Compila (una sola vez por proceso) la regla `nombre` del registro en tablas de consulta."""
+    compilada = _COMPILADAS.get(nombre)
+    if compilada is None:
+        regla = REGLAS[nombre]
+        maximo = ULTIMA_FILA_TRABAJADOR - PRIMERA_FILA_TRABAJADOR + 1
+        tabla: List[Optional[Tuple[str, ...]]] = [None] * (maximo + 1)
+        for minimo, tope, turnos in regla.por_personal:
+            for conteo in range(minimo, (maximo if tope is None else tope) + 1):
+                tabla[conteo] = turnos
+        compilada = ReglaCompilada(regla, tabla)
+        _COMPILADAS[nombre] = compilada
+    return compilada
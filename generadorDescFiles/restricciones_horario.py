@@ -0,0 +1,101 @@
+"""
+Máscaras de restricciones trabajador×día sobre la `GrillaHorario`.
+
+Descripción general:
+- Las reglas de día anterior/siguiente ("ayer tuvo BANTD/BLPTD/...", "mañana tiene 1T/7/...") se calculan
+  para todo el mes de una vez: se marca con una tabla de búsqueda qué códigos de la grilla pertenecen al
+  conjunto de turnos y se desplaza la matriz una columna con NumPy.
+- Las máscaras tienen la misma forma que `grilla.codigos` (fila/columna de la hoja), por lo que se indexan
+  igual que las celdas: `motor.ayer({"1T", "7"})[fila, col_dia]`.
+- Se guardan en caché hasta la siguiente escritura en la grilla (`grilla.version`), así que varias reglas y
+  trabajadores del mismo día comparten el cálculo.
+- Bordes (mismo criterio que las reglas originales):
+  * `ayer` es False en el primer día (columna 2): la columna A son siglas, no turnos.
+  * `manana` es False en el último día (`max_col`).
+"""
+
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+import numpy as np
+
+from grilla_horario import GrillaHorario, normalizar
+
+
+def desplazar_ayer(mascara: np.ndarray) -> np.ndarray:
+    """resultado[f, c] = mascara[f, c - 1] para los días desde la columna 3; False en el resto."""
+    resultado = np.zeros_like(mascara)
+    resultado[:, 3:] = mascara[:, 2:-1]
+    return resultado
+
+
+def desplazar_manana(mascara: np.ndarray) -> np.ndarray:
+    """resultado[f, c] = mascara[f, c + 1] para los días hasta max_col - 1; False en el resto."""
+    resultado = np.zeros_like(mascara)
+    resultado[:, 2:-1] = mascara[:, 3:]
+    return resultado
+
+
+class MotorRestricciones:
+    """
+    Construye y cachea máscaras booleanas trabajador×día a partir de los códigos de la grilla.
+
+    - en(turnos): la celda contiene alguno de los turnos.
+    - ayer(turnos) / manana(turnos): el día anterior / siguiente del mismo trabajador contiene alguno.
+    - vacias(): la celda está vacía.
+    - disponibles(siglas, mascara, col_dia): siglas cuya máscara es True ese día, conservando el orden dado.
+    """
+
+    def __init__(self, grilla: GrillaHorario) -> None:
+        self.grilla = grilla
+        self._version = -1
+        self._cache: Dict[Tuple[str, FrozenSet[str]], np.ndarray] = {}
+
+    def _cacheado(self, clave: Tuple[str, FrozenSet[str]]):
+        if self._version != self.grilla.version:
+            self._cache.clear()
+            self._version = self.grilla.version
+        return self._cache.get(clave)
+
+    def en(self, turnos: Iterable[str]) -> np.ndarray:
+        conjunto = frozenset(normalizar(t) for t in turnos)
+        clave = ("en", conjunto)
+        mascara = self._cacheado(clave)
+        if mascara is None:
+            mascara = self.grilla.tabla_de(conjunto)[self.grilla.codigos]
+            self._cache[clave] = mascara
+        return mascara
+
+    def ayer(self, turnos: Iterable[str]) -> np.ndarray:
+        conjunto = frozenset(turnos)
+        clave = ("ayer", conjunto)
+        mascara = self._cacheado(clave)
+        if mascara is None:
+            mascara = desplazar_ayer(self.en(conjunto))
+            self._cache[clave] = mascara
+        return mascara
+
+    def manana(self, turnos: Iterable[str]) -> np.ndarray:
+        conjunto = frozenset(turnos)
+        clave = ("manana", conjunto)
+        mascara = self._cacheado(clave)
+        if mascara is None:
+            mascara = desplazar_manana(self.en(conjunto))
+            self._cache[clave] = mascara
+        return mascara
+
+    def vacias(self) -> np.ndarray:
+        clave = ("vacias", frozenset())
+        mascara = self._cacheado(clave)
+        if mascara is None:
+            mascara = self.grilla.codigos == 0
+            self._cache[clave] = mascara
+        return mascara
+
+    def disponibles(self, siglas: List[str], mascara: np.ndarray, col_dia: int) -> List[str]:
+        """Siglas (en el orden dado) con fila en la hoja y máscara True en la columna del día."""
+        resultado: List[str] = []
+        for sigla in siglas:
+            fila = self.grilla.fila_de(sigla)
+            if fila and mascara[fila, col_dia]:
+                resultado.append(sigla)
+        return resultado
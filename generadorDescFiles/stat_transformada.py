@@ -1,8 +1,10 @@
 import openpyxl
 import os
-from openpyxl.styles import PatternFill, Font
 from typing import Optional, List, Dict
 
+from exportador_excel import aplicar_estilo
+from grilla_horario import HOJA_ESTADISTICAS, leer_filas
+
 
 class StatTransformada:
     """
@@ -18,11 +20,23 @@ class StatTransformada:
     
     Archivo de entrada: horarioUnificado_con_mofis → horarioUnificado_con_diurnas → horarioUnificado_con_6t
     Archivo de salida: mismo nombre + "_stats"
+    
+    Si se pasa `wb` (libro ya cargado en memoria, p. ej. desde pipeline.py), no se lee ningún archivo:
+    las fórmulas de "Estadísticas" se evalúan directamente y `archivo_entrada` solo se usa para nombrar la salida.
     """
 
     COLOR_AMARILLO = "FFFF00"  # Amarillo por defecto de Excel
 
-    def __init__(self, archivo_entrada: Optional[str] = None) -> None:
+    def __init__(self, archivo_entrada: Optional[str] = None, wb=None, guardar: bool = True) -> None:
+        self.guardar = guardar
+        if wb is not None:
+            self.archivo_entrada = archivo_entrada or "horarioUnificado_con_6t.xlsx"
+            # Un libro en memoria nunca tiene valores calculados de fórmulas
+            self.wb = wb
+            self._procesar_formulas_dinamicas()
+            self._procesar_transformacion()
+            return
+
         # Elegir el archivo de entrada según el orden de prioridad
         candidatos = [
             archivo_entrada,
@@ -43,36 +57,41 @@ class StatTransformada:
         self.archivo_entrada = elegido
         print(f"📁 Archivo de entrada seleccionado: {self.archivo_entrada}")
         
-        # Intentar cargar primero con data_only=True para obtener valores calculados
+        # Revisar primero (en streaming, solo la hoja de estadísticas) si hay valores calculados
         print("🔄 Intentando cargar valores calculados de fórmulas dinámicas...")
-        self.wb = openpyxl.load_workbook(self.archivo_entrada, data_only=True)
+        filas_stats = leer_filas(self.archivo_entrada, [HOJA_ESTADISTICAS]).get(HOJA_ESTADISTICAS)
         
         # Verificar si los valores se cargaron correctamente
-        valores_validos = self._verificar_carga_valores()
+        valores_validos = self._verificar_carga_valores(filas_stats)
         
+        # Una sola carga completa: con valores calculados si existen, si no con las fórmulas
+        self.wb = openpyxl.load_workbook(self.archivo_entrada, data_only=valores_validos)
         if not valores_validos:
             print("⚠️  Los valores calculados no están disponibles. Intentando estrategia alternativa...")
-            # Cargar sin data_only para trabajar con las fórmulas directamente
-            self.wb = openpyxl.load_workbook(self.archivo_entrada, data_only=False)
             self._procesar_formulas_dinamicas()
         
         self._procesar_transformacion()
 
-    def _verificar_carga_valores(self) -> bool:
-        """Verifica que los valores se cargaron correctamente desde las fórmulas dinámicas"""
-        if "Estadísticas" not in self.wb.sheetnames:
+    def _verificar_carga_valores(self, filas_stats: Optional[List[tuple]]) -> bool:
+        """
+        Verifica que los valores calculados de las fórmulas dinámicas están guardados en el archivo.
+        `filas_stats` son las filas de 'Estadísticas' leídas en streaming (leer_filas), o None si no existe.
+        """
+        if filas_stats is None:
             print("⚠️  No se encontró la hoja 'Estadísticas'")
             return False
         
-        ws_stats = self.wb["Estadísticas"]
         print("🔍 Verificando carga de valores desde fórmulas dinámicas...")
         
+        def celda(fila: int, col: int):
+            valores = filas_stats[fila - 1]
+            return valores[col - 1] if col <= len(valores) else None
+        
         # Buscar las columnas clave
         columnas_clave = ['1T', '6N', '6S', '3', '6T', '6RT']
         posiciones_columnas = {}
         
-        for col in range(1, ws_stats.max_column + 1):
-            header = ws_stats.cell(row=1, column=col).value
+        for col, header in enumerate(filas_stats[0] if filas_stats else (), start=1):
             if header in columnas_clave:
                 posiciones_columnas[header] = col
         
@@ -81,9 +100,9 @@ class StatTransformada:
         valores_faltantes = 0
         
         for columna, pos in posiciones_columnas.items():
-            for fila in range(2, min(ws_stats.max_row + 1, 7)):  # Verificar primeras 5 filas
-                valor = ws_stats.cell(row=fila, column=pos).value
-                sigla = ws_stats.cell(row=fila, column=1).value
+            for fila in range(2, min(len(filas_stats) + 1, 7)):  # Verificar primeras 5 filas
+                valor = celda(fila, pos)
+                sigla = celda(fila, 1)
                 if sigla:
                     if valor is not None and isinstance(valor, (int, float)) and valor != 0:
                         valores_cargados += 1
@@ -105,11 +124,11 @@ class StatTransformada:
             for columna, pos in list(posiciones_columnas.items())[:3]:  # Solo las primeras 3 columnas
                 print(f"\n  📋 Ejemplos en columna {columna}:")
                 ejemplos_mostrados = 0
-                for fila in range(2, min(ws_stats.max_row + 1, 7)):
+                for fila in range(2, min(len(filas_stats) + 1, 7)):
                     if ejemplos_mostrados >= 3:
                         break
-                    valor = ws_stats.cell(row=fila, column=pos).value
-                    sigla = ws_stats.cell(row=fila, column=1).value
+                    valor = celda(fila, pos)
+                    sigla = celda(fila, 1)
                     if sigla and valor is not None:
                         print(f"    {sigla}: {valor}")
                         ejemplos_mostrados += 1
@@ -443,111 +462,59 @@ class StatTransformada:
         col_difho = num_columnas_5am + num_columnas_diurnas + num_columnas_sln + num_columnas_tant_nant + num_columnas_mast_nanr + 7
         ws_stats_nueva.cell(row=1, column=col_difho, value="DifHo")
         
-        # Aplicar formato a encabezados
-        from openpyxl.styles import Alignment
-        
-        header_fill = PatternFill(start_color="E6E6E6", end_color="E6E6E6", fill_type="solid")
-        header_font = Font(bold=True)
-        header_alignment = Alignment(horizontal="center", vertical="center")
-        
+        # Aplicar formato a encabezados (estilos con nombre de exportador_excel: relleno, negrita y centrado)
         # Formato para SIGLA
         celda_sigla = ws_stats_nueva.cell(row=1, column=1)
-        celda_sigla.fill = header_fill
-        celda_sigla.font = header_font
-        celda_sigla.alignment = header_alignment
+        aplicar_estilo(celda_sigla, "gris_encabezado", "encabezado")
         
         # Formato para 5AM (celda combinada) - con color amarillo
         if num_columnas_5am > 0:
             celda_5am = ws_stats_nueva.cell(row=1, column=2)
-            celda_5am.fill = PatternFill(start_color=self.COLOR_AMARILLO, 
-                                       end_color=self.COLOR_AMARILLO, 
-                                       fill_type="solid")
-            celda_5am.font = header_font
-            celda_5am.alignment = header_alignment
+            aplicar_estilo(celda_5am, self.COLOR_AMARILLO, "encabezado")
         
         # Formato para DIURNAS (celda combinada) - con color verde claro
         if num_columnas_diurnas > 0:
             celda_diurnas = ws_stats_nueva.cell(row=1, column=num_columnas_5am + 2)
-            celda_diurnas.fill = PatternFill(start_color="90EE90", 
-                                           end_color="90EE90", 
-                                           fill_type="solid")  # Verde claro
-            celda_diurnas.font = header_font
-            celda_diurnas.alignment = header_alignment
+            aplicar_estilo(celda_diurnas, "verde_clarito", "encabezado")
         
         # Formato para SLN (celda combinada) - con color morado claro
         if num_columnas_sln > 0:
             celda_sln = ws_stats_nueva.cell(row=1, column=num_columnas_5am + num_columnas_diurnas + 5)
-            celda_sln.fill = PatternFill(start_color="DDA0DD", 
-                                       end_color="DDA0DD", 
-                                       fill_type="solid")  # Morado claro
-            celda_sln.font = header_font
-            celda_sln.alignment = header_alignment
+            aplicar_estilo(celda_sln, "ciruela", "encabezado")
         
         # Formato para TANT/NANT (celda combinada) - con color naranja claro
         if num_columnas_tant_nant > 0:
             celda_tant_nant = ws_stats_nueva.cell(row=1, column=num_columnas_5am + num_columnas_diurnas + num_columnas_sln + 5)
-            celda_tant_nant.fill = PatternFill(start_color="FFB6C1", 
-                                             end_color="FFB6C1", 
-                                             fill_type="solid")  # Naranja claro
-            celda_tant_nant.font = header_font
-            celda_tant_nant.alignment = header_alignment
+            aplicar_estilo(celda_tant_nant, "rosa_claro", "encabezado")
         
         # Formato para MAST/NANR (celda combinada) - con color gris claro
         if num_columnas_mast_nanr > 0:
             celda_mast_nanr = ws_stats_nueva.cell(row=1, column=num_columnas_5am + num_columnas_diurnas + num_columnas_sln + num_columnas_tant_nant + 5)
-            celda_mast_nanr.fill = PatternFill(start_color="D3D3D3", 
-                                             end_color="D3D3D3", 
-                                             fill_type="solid")  # Gris claro
-            celda_mast_nanr.font = header_font
-            celda_mast_nanr.alignment = header_alignment
+            aplicar_estilo(celda_mast_nanr, "gris_claro", "encabezado")
         
         # Formato para SumaD - con color azul claro
         celda_suma_d = ws_stats_nueva.cell(row=1, column=col_suma_d)
-        celda_suma_d.fill = PatternFill(start_color="87CEEB", 
-                                       end_color="87CEEB", 
-                                       fill_type="solid")  # Azul claro
-        celda_suma_d.font = header_font
-        celda_suma_d.alignment = header_alignment
+        aplicar_estilo(celda_suma_d, "azul_cielo", "encabezado")
         
         # Formato para SumaN - con color verde claro
         celda_suma_n = ws_stats_nueva.cell(row=1, column=col_suma_n)
-        celda_suma_n.fill = PatternFill(start_color="98FB98", 
-                                       end_color="98FB98", 
-                                       fill_type="solid")  # Verde claro
-        celda_suma_n.font = header_font
-        celda_suma_n.alignment = header_alignment
+        aplicar_estilo(celda_suma_n, "verde_palido", "encabezado")
         
         # Formato para SumTot - con color dorado
         celda_sumtot = ws_stats_nueva.cell(row=1, column=col_sumtot)
-        celda_sumtot.fill = PatternFill(start_color="FFD700", 
-                                       end_color="FFD700", 
-                                       fill_type="solid")  # Dorado
-        celda_sumtot.font = header_font
-        celda_sumtot.alignment = header_alignment
+        aplicar_estilo(celda_sumtot, "dorado", "encabezado")
         
         # Formato para DiurF - con color rosa claro
         celda_diurf = ws_stats_nueva.cell(row=1, column=col_diurf)
-        celda_diurf.fill = PatternFill(start_color="FFC0CB", 
-                                      end_color="FFC0CB", 
-                                      fill_type="solid")  # Rosa claro
-        celda_diurf.font = header_font
-        celda_diurf.alignment = header_alignment
+        aplicar_estilo(celda_diurf, "rosa", "encabezado")
         
         # Formato para NocFes - con color violeta claro
         celda_nocfes = ws_stats_nueva.cell(row=1, column=col_nocfes)
-        celda_nocfes.fill = PatternFill(start_color="E6E6FA", 
-                                       end_color="E6E6FA", 
-                                       fill_type="solid")  # Violeta claro
-        celda_nocfes.font = header_font
-        celda_nocfes.alignment = header_alignment
+        aplicar_estilo(celda_nocfes, "lavanda", "encabezado")
         
         # Formato para DifHo - con color marrón claro
         celda_difho = ws_stats_nueva.cell(row=1, column=col_difho)
-        celda_difho.fill = PatternFill(start_color="DEB887", 
-                                      end_color="DEB887", 
-                                      fill_type="solid")  # Marrón claro
-        celda_difho.font = header_font
-        celda_difho.alignment = header_alignment
+        aplicar_estilo(celda_difho, "marron_claro", "encabezado")
         
         # Buscar la columna 1T en la hoja de estadísticas original
         col_1t = None
@@ -635,9 +602,7 @@ class StatTransformada:
                         # Rellenar celdas de 5AM con color amarillo
                         for col in range(2, num_columnas_5am + 2):
                             celda = ws_stats_nueva.cell(row=fila_destino, column=col)
-                            celda.fill = PatternFill(start_color=self.COLOR_AMARILLO, 
-                                                   end_color=self.COLOR_AMARILLO, 
-                                                   fill_type="solid")
+                            aplicar_estilo(celda, self.COLOR_AMARILLO)
                             # Solo poner "1" en las primeras celdas según el valor de 1T
                             if col < valor_int + 2:
                                 celda.value = 1
@@ -665,9 +630,7 @@ class StatTransformada:
                 # Rellenar celdas de DIURNAS con color verde claro
                 for col in range(num_columnas_5am + 2, num_columnas_5am + num_columnas_diurnas + 2):
                     celda = ws_stats_nueva.cell(row=fila_destino, column=col)
-                    celda.fill = PatternFill(start_color="90EE90", 
-                                           end_color="90EE90", 
-                                           fill_type="solid")  # Verde claro
+                    aplicar_estilo(celda, "verde_clarito")
                     # Solo poner "6" en las primeras celdas según el valor total de DIURNAS
                     if col < num_columnas_5am + 2 + valor_total_diurnas:
                         celda.value = 6
@@ -680,9 +643,7 @@ class StatTransformada:
                         # Rellenar celdas de SLN con color morado claro
                         for col in range(num_columnas_5am + num_columnas_diurnas + 5, num_columnas_5am + num_columnas_diurnas + num_columnas_sln + 5):
                             celda = ws_stats_nueva.cell(row=fila_destino, column=col)
-                            celda.fill = PatternFill(start_color="DDA0DD", 
-                                                   end_color="DDA0DD", 
-                                                   fill_type="solid")  # Morado claro
+                            aplicar_estilo(celda, "ciruela")
                             # Solo poner "3" en las primeras celdas según el valor de 3
                             if col < num_columnas_5am + num_columnas_diurnas + 5 + valor_int_3:
                                 celda.value = 3
@@ -697,9 +658,7 @@ class StatTransformada:
                         # Rellenar celdas de TANT/NANT con color naranja claro
                         for col in range(num_columnas_5am + num_columnas_diurnas + num_columnas_sln + 5, num_columnas_5am + num_columnas_diurnas + num_columnas_sln + num_columnas_tant_nant + 5):
                             celda = ws_stats_nueva.cell(row=fila_destino, column=col)
-                            celda.fill = PatternFill(start_color="FFB6C1", 
-                                                   end_color="FFB6C1", 
-                                                   fill_type="solid")  # Naranja claro
+                            aplicar_estilo(celda, "rosa_claro")
                             # Solo poner "6" en las primeras celdas según el valor de 6T
                             if col < num_columnas_5am + num_columnas_diurnas + num_columnas_sln + 5 + valor_int_6t:
                                 celda.value = 6
@@ -714,9 +673,7 @@ class StatTransformada:
                         # Rellenar celdas de MAST/NANR con color gris claro
                         for col in range(num_columnas_5am + num_columnas_diurnas + num_columnas_sln + num_columnas_tant_nant + 5, num_columnas_5am + num_columnas_diurnas + num_columnas_sln + num_columnas_tant_nant + num_columnas_mast_nanr + 5):
                             celda = ws_stats_nueva.cell(row=fila_destino, column=col)
-                            celda.fill = PatternFill(start_color="D3D3D3", 
-                                                   end_color="D3D3D3", 
-                                                   fill_type="solid")  # Gris claro
+                            aplicar_estilo(celda, "gris_claro")
                             # Solo poner "6" en las primeras celdas según el valor de 6RT
                             if col < num_columnas_5am + num_columnas_diurnas + num_columnas_sln + num_columnas_tant_nant + 5 + valor_int_6rt:
                                 celda.value = 6
@@ -729,27 +686,21 @@ class StatTransformada:
                 ws_stats_nueva.cell(row=fila_destino, column=col_diurf, value=valor_1d)
                 # Aplicar color de fondo rosa claro
                 celda_diurf = ws_stats_nueva.cell(row=fila_destino, column=col_diurf)
-                celda_diurf.fill = PatternFill(start_color="FFC0CB", 
-                                              end_color="FFC0CB", 
-                                              fill_type="solid")  # Rosa claro
+                aplicar_estilo(celda_diurf, "rosa")
             
             # NocFes (columna 3D)
             if col_3d is not None:
                 ws_stats_nueva.cell(row=fila_destino, column=col_nocfes, value=valor_3d)
                 # Aplicar color de fondo violeta claro
                 celda_nocfes = ws_stats_nueva.cell(row=fila_destino, column=col_nocfes)
-                celda_nocfes.fill = PatternFill(start_color="E6E6FA", 
-                                               end_color="E6E6FA", 
-                                               fill_type="solid")  # Violeta claro
+                aplicar_estilo(celda_nocfes, "lavanda")
             
             # DifHo (columna 6D)
             if col_6d is not None:
                 ws_stats_nueva.cell(row=fila_destino, column=col_difho, value=valor_6d)
                 # Aplicar color de fondo marrón claro
                 celda_difho = ws_stats_nueva.cell(row=fila_destino, column=col_difho)
-                celda_difho.fill = PatternFill(start_color="DEB887", 
-                                              end_color="DEB887", 
-                                              fill_type="solid")  # Marrón claro
+                aplicar_estilo(celda_difho, "marron_claro")
             
             # Crear fórmula dinámica para SumaD: sumar columnas 5AM + columnas DIURNAS
             # La fórmula será: =SUM(B{fila_destino}:H{fila_destino}) + SUM(I{fila_destino}:R{fila_destino})
@@ -763,10 +714,7 @@ class StatTransformada:
             # Escribir la fórmula en la columna SumaD
             celda_suma_d = ws_stats_nueva.cell(row=fila_destino, column=col_suma_d)
             celda_suma_d.value = formula_suma_d
-            celda_suma_d.fill = PatternFill(start_color="87CEEB", 
-                                           end_color="87CEEB", 
-                                           fill_type="solid")  # Azul claro
-            celda_suma_d.font = Font(bold=True)
+            aplicar_estilo(celda_suma_d, "azul_cielo", "negrita")
             
             # Crear fórmula dinámica para SumaN: sumar columnas SLN + TANT/NANT + MAST/NANR
             # La fórmula será: =SUM(U{fila_destino}:Y{fila_destino}) + SUM(Z{fila_destino}:AF{fila_destino}) + SUM(AG{fila_destino}:AM{fila_destino})
@@ -782,10 +730,7 @@ class StatTransformada:
             # Escribir la fórmula en la columna SumaN
             celda_suma_n = ws_stats_nueva.cell(row=fila_destino, column=col_suma_n)
             celda_suma_n.value = formula_suma_n
-            celda_suma_n.fill = PatternFill(start_color="98FB98", 
-                                           end_color="98FB98", 
-                                           fill_type="solid")  # Verde claro
-            celda_suma_n.font = Font(bold=True)
+            aplicar_estilo(celda_suma_n, "verde_palido", "negrita")
             
             # Crear fórmula dinámica para SumTot: sumar SumaD + SumaN + DiurF + NocFes
             col_suma_d_letter = openpyxl.utils.get_column_letter(col_suma_d)
@@ -798,10 +743,7 @@ class StatTransformada:
             # Escribir la fórmula en la columna SumTot
             celda_sum_tot = ws_stats_nueva.cell(row=fila_destino, column=col_sumtot)
             celda_sum_tot.value = formula_sum_tot
-            celda_sum_tot.fill = PatternFill(start_color="FFD700", 
-                                           end_color="FFD700", 
-                                           fill_type="solid")  # Dorado
-            celda_sum_tot.font = Font(bold=True)
+            aplicar_estilo(celda_sum_tot, "dorado", "negrita")
             
             # Contar trabajadores procesados (si tiene al menos un turno en 1T, 6N, 6S, 3, 6T o 6RT)
             tiene_turnos = False
@@ -825,8 +767,7 @@ class StatTransformada:
             # Añadir nombre "PARCI" en la primera columna de la fila de sumatoria parcial (GCE)
             celda_parci_gce = ws_stats_nueva.cell(row=fila_gce + 1, column=1)
             celda_parci_gce.value = "PARCI"
-            celda_parci_gce.fill = PatternFill(start_color="FFD700", end_color="FFD700", fill_type="solid")  # Dorado
-            celda_parci_gce.font = Font(bold=True)
+            aplicar_estilo(celda_parci_gce, "dorado", "negrita")
             
             # Aplicar fórmulas de sumatoria para todas las columnas bajo 5AM
             for col in range(2, num_columnas_5am + 2):
@@ -840,8 +781,7 @@ class StatTransformada:
                 celda_sumatoria.value = formula_sumatoria
                 
                 # Aplicar formato especial a la celda de sumatoria
-                celda_sumatoria.fill = PatternFill(start_color="FFD700", end_color="FFD700", fill_type="solid")  # Dorado
-                celda_sumatoria.font = Font(bold=True)
+                aplicar_estilo(celda_sumatoria, "dorado", "negrita")
             
             # Aplicar fórmulas de sumatoria para todas las columnas bajo DIURNAS
             for col in range(num_columnas_5am + 2, num_columnas_5am + num_columnas_diurnas + 2):
@@ -855,8 +795,7 @@ class StatTransformada:
                 celda_sumatoria.value = formula_sumatoria
                 
                 # Aplicar formato especial a la celda de sumatoria
-                celda_sumatoria.fill = PatternFill(start_color="FFD700", end_color="FFD700", fill_type="solid")  # Dorado
-                celda_sumatoria.font = Font(bold=True)
+                aplicar_estilo(celda_sumatoria, "dorado", "negrita")
             
             # Aplicar fórmulas de sumatoria para todas las columnas bajo SLN
             for col in range(num_columnas_5am + num_columnas_diurnas + 5, num_columnas_5am + num_columnas_diurnas + num_columnas_sln + 5):
@@ -870,8 +809,7 @@ class StatTransformada:
                 celda_sumatoria.value = formula_sumatoria
                 
                 # Aplicar formato especial a la celda de sumatoria
-                celda_sumatoria.fill = PatternFill(start_color="FFD700", end_color="FFD700", fill_type="solid")  # Dorado
-                celda_sumatoria.font = Font(bold=True)
+                aplicar_estilo(celda_sumatoria, "dorado", "negrita")
             
             # Aplicar fórmulas de sumatoria para todas las columnas bajo TANT/NANT
             for col in range(num_columnas_5am + num_columnas_diurnas + num_columnas_sln + 5, num_columnas_5am + num_columnas_diurnas + num_columnas_sln + num_columnas_tant_nant + 5):
@@ -885,8 +823,7 @@ class StatTransformada:
                 celda_sumatoria.value = formula_sumatoria
                 
                 # Aplicar formato especial a la celda de sumatoria
-                celda_sumatoria.fill = PatternFill(start_color="FFD700", end_color="FFD700", fill_type="solid")  # Dorado
-                celda_sumatoria.font = Font(bold=True)
+                aplicar_estilo(celda_sumatoria, "dorado", "negrita")
             
             # Aplicar fórmulas de sumatoria para todas las columnas bajo MAST/NANR
             for col in range(num_columnas_5am + num_columnas_diurnas + num_columnas_sln + num_columnas_tant_nant + 5, num_columnas_5am + num_columnas_diurnas + num_columnas_sln + num_columnas_tant_nant + num_columnas_mast_nanr + 5):
@@ -900,8 +837,7 @@ class StatTransformada:
                 celda_sumatoria.value = formula_sumatoria
                 
                 # Aplicar formato especial a la celda de sumatoria
-                celda_sumatoria.fill = PatternFill(start_color="FFD700", end_color="FFD700", fill_type="solid")  # Dorado
-                celda_sumatoria.font = Font(bold=True)
+                aplicar_estilo(celda_sumatoria, "dorado", "negrita")
             
             # Aplicar fórmula de sumatoria para la columna SumaD
             col_suma_d_letter = openpyxl.utils.get_column_letter(col_suma_d)
@@ -912,8 +848,7 @@ class StatTransformada:
             celda_sumatoria_suma_d.value = formula_sumatoria_suma_d
             
             # Aplicar formato especial a la celda de sumatoria SumaD
-            celda_sumatoria_suma_d.fill = PatternFill(start_color="FFD700", end_color="FFD700", fill_type="solid")  # Dorado
-            celda_sumatoria_suma_d.font = Font(bold=True)
+            aplicar_estilo(celda_sumatoria_suma_d, "dorado", "negrita")
             
             # Aplicar fórmula de sumatoria para la columna SumaN
             col_suma_n_letter = openpyxl.utils.get_column_letter(col_suma_n)
@@ -924,8 +859,7 @@ class StatTransformada:
             celda_sumatoria_suma_n.value = formula_sumatoria_suma_n
             
             # Aplicar formato especial a la celda de sumatoria SumaN
-            celda_sumatoria_suma_n.fill = PatternFill(start_color="FFD700", end_color="FFD700", fill_type="solid")  # Dorado
-            celda_sumatoria_suma_n.font = Font(bold=True)
+            aplicar_estilo(celda_sumatoria_suma_n, "dorado", "negrita")
             
             # Añadir segunda fila con sumatoria total de todas las columnas
             ws_stats_nueva.insert_rows(fila_gce + 2)
@@ -933,8 +867,7 @@ class StatTransformada:
             # Añadir nombre "TOTAL" en la primera columna de la fila de sumatoria total (GCE)
             celda_total_gce = ws_stats_nueva.cell(row=fila_gce + 2, column=1)
             celda_total_gce.value = "TOTAL"
-            celda_total_gce.fill = PatternFill(start_color="FF6B6B", end_color="FF6B6B", fill_type="solid")  # Rojo claro
-            celda_total_gce.font = Font(bold=True, color="FFFFFF")  # Texto blanco
+            aplicar_estilo(celda_total_gce, "rojo_claro", "negrita_blanca")
             
             # Crear fórmula para sumar solo las columnas de 5AM (fila_gce + 1)
             # La fórmula será: =SUM(B{fila_gce+1}:{última_col_5am}{fila_gce+1})
@@ -947,8 +880,7 @@ class StatTransformada:
             celda_sumatoria_total_5am.value = formula_sumatoria_total_5am
             
             # Aplicar formato especial a la celda de sumatoria total 5AM
-            celda_sumatoria_total_5am.fill = PatternFill(start_color="FF6B6B", end_color="FF6B6B", fill_type="solid")  # Rojo claro
-            celda_sumatoria_total_5am.font = Font(bold=True, color="FFFFFF")  # Texto blanco
+            aplicar_estilo(celda_sumatoria_total_5am, "rojo_claro", "negrita_blanca")
             
             # Crear fórmula para sumar solo las columnas de DIURNAS (fila_gce + 1)
             # La fórmula será: =SUM({primera_col_diurnas}{fila_gce+1}:{última_col_diurnas}{fila_gce+1})
@@ -961,8 +893,7 @@ class StatTransformada:
             celda_sumatoria_total_diurnas.value = formula_sumatoria_total_diurnas
             
             # Aplicar formato especial a la celda de sumatoria total DIURNAS
-            celda_sumatoria_total_diurnas.fill = PatternFill(start_color="FF6B6B", end_color="FF6B6B", fill_type="solid")  # Rojo claro
-            celda_sumatoria_total_diurnas.font = Font(bold=True, color="FFFFFF")  # Texto blanco
+            aplicar_estilo(celda_sumatoria_total_diurnas, "rojo_claro", "negrita_blanca")
             
             # Crear fórmula para sumar solo las columnas de SLN (fila_gce + 1)
             # La fórmula será: =SUM({primera_col_sln}{fila_gce+1}:{última_col_sln}{fila_gce+1})
@@ -975,8 +906,7 @@ class StatTransformada:
             celda_sumatoria_total_sln.value = formula_sumatoria_total_sln
             
             # Aplicar formato especial a la celda de sumatoria total SLN
-            celda_sumatoria_total_sln.fill = PatternFill(start_color="FF6B6B", end_color="FF6B6B", fill_type="solid")  # Rojo claro
-            celda_sumatoria_total_sln.font = Font(bold=True, color="FFFFFF")  # Texto blanco
+            aplicar_estilo(celda_sumatoria_total_sln, "rojo_claro", "negrita_blanca")
             
             # Crear fórmula para sumar solo las columnas de TANT/NANT (fila_gce + 1)
             # La fórmula será: =SUM({primera_col_tant_nant}{fila_gce+1}:{última_col_tant_nant}{fila_gce+1})
@@ -989,8 +919,7 @@ class StatTransformada:
             celda_sumatoria_total_tant_nant.value = formula_sumatoria_total_tant_nant
             
             # Aplicar formato especial a la celda de sumatoria total TANT/NANT
-            celda_sumatoria_total_tant_nant.fill = PatternFill(start_color="FF6B6B", end_color="FF6B6B", fill_type="solid")  # Rojo claro
-            celda_sumatoria_total_tant_nant.font = Font(bold=True, color="FFFFFF")  # Texto blanco
+            aplicar_estilo(celda_sumatoria_total_tant_nant, "rojo_claro", "negrita_blanca")
             
             # Crear fórmula para sumar solo las columnas de MAST/NANR (fila_gce + 1)
             # La fórmula será: =SUM({primera_col_mast_nanr}{fila_gce+1}:{última_col_mast_nanr}{fila_gce+1})
@@ -1003,8 +932,7 @@ class StatTransformada:
             celda_sumatoria_total_mast_nanr.value = formula_sumatoria_total_mast_nanr
             
             # Aplicar formato especial a la celda de sumatoria total MAST/NANR
-            celda_sumatoria_total_mast_nanr.fill = PatternFill(start_color="FF6B6B", end_color="FF6B6B", fill_type="solid")  # Rojo claro
-            celda_sumatoria_total_mast_nanr.font = Font(bold=True, color="FFFFFF")  # Texto blanco
+            aplicar_estilo(celda_sumatoria_total_mast_nanr, "rojo_claro", "negrita_blanca")
             
             # Aplicar fórmula de sumatoria total para la columna SumaD
             formula_sumatoria_total_suma_d = f"=SUM({col_suma_d_letter}{fila_gce+1})"
@@ -1014,8 +942,7 @@ class StatTransformada:
             celda_sumatoria_total_suma_d.value = formula_sumatoria_total_suma_d
             
             # Aplicar formato especial a la celda de sumatoria total SumaD
-            celda_sumatoria_total_suma_d.fill = PatternFill(start_color="FF6B6B", end_color="FF6B6B", fill_type="solid")  # Rojo claro
-            celda_sumatoria_total_suma_d.font = Font(bold=True, color="FFFFFF")  # Texto blanco
+            aplicar_estilo(celda_sumatoria_total_suma_d, "rojo_claro", "negrita_blanca")
             
             # Aplicar fórmula de sumatoria total para la columna SumaN
             formula_sumatoria_total_suma_n = f"=SUM({col_suma_n_letter}{fila_gce+1})"
@@ -1025,8 +952,7 @@ class StatTransformada:
             celda_sumatoria_total_suma_n.value = formula_sumatoria_total_suma_n
             
             # Aplicar formato especial a la celda de sumatoria total SumaN
-            celda_sumatoria_total_suma_n.fill = PatternFill(start_color="FF6B6B", end_color="FF6B6B", fill_type="solid")  # Rojo claro
-            celda_sumatoria_total_suma_n.font = Font(bold=True, color="FFFFFF")  # Texto blanco
+            aplicar_estilo(celda_sumatoria_total_suma_n, "rojo_claro", "negrita_blanca")
             
             # Calcular valor inicial de la primera columna para mostrar en el mensaje
             sumatoria_inicial_5am = 0
@@ -1091,8 +1017,7 @@ class StatTransformada:
             # Añadir nombre "PARCI" en la primera columna de la fila de sumatoria parcial
             celda_parci = ws_stats_nueva.cell(row=fila_jmv + 1, column=1)
             celda_parci.value = "PARCI"
-            celda_parci.fill = PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid")  # Verde claro
-            celda_parci.font = Font(bold=True)
+            aplicar_estilo(celda_parci, "verde_clarito", "negrita")
             
             # Aplicar fórmulas de sumatoria para todas las columnas bajo 5AM
             # Sumatoria desde YIS hasta JMV
@@ -1107,8 +1032,7 @@ class StatTransformada:
                 celda_sumatoria_final.value = formula_sumatoria_final
                 
                 # Aplicar formato especial a la celda de sumatoria (verde)
-                celda_sumatoria_final.fill = PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid")  # Verde claro
-                celda_sumatoria_final.font = Font(bold=True)
+                aplicar_estilo(celda_sumatoria_final, "verde_clarito", "negrita")
             
             # Aplicar fórmulas de sumatoria para todas las columnas bajo DIURNAS
             # Sumatoria desde YIS hasta JMV
@@ -1123,8 +1047,7 @@ class StatTransformada:
                 celda_sumatoria_final.value = formula_sumatoria_final
                 
                 # Aplicar formato especial a la celda de sumatoria (verde)
-                celda_sumatoria_final.fill = PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid")  # Verde claro
-                celda_sumatoria_final.font = Font(bold=True)
+                aplicar_estilo(celda_sumatoria_final, "verde_clarito", "negrita")
             
             # Aplicar fórmulas de sumatoria para todas las columnas bajo SLN
             # Sumatoria desde YIS hasta JMV
@@ -1139,8 +1062,7 @@ class StatTransformada:
                 celda_sumatoria_final.value = formula_sumatoria_final
                 
                 # Aplicar formato especial a la celda de sumatoria (verde)
-                celda_sumatoria_final.fill = PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid")  # Verde claro
-                celda_sumatoria_final.font = Font(bold=True)
+                aplicar_estilo(celda_sumatoria_final, "verde_clarito", "negrita")
             
             # Aplicar fórmulas de sumatoria para todas las columnas bajo TANT/NANT
             # Sumatoria desde YIS hasta JMV
@@ -1155,8 +1077,7 @@ class StatTransformada:
                 celda_sumatoria_final.value = formula_sumatoria_final
                 
                 # Aplicar formato especial a la celda de sumatoria (verde)
-                celda_sumatoria_final.fill = PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid")  # Verde claro
-                celda_sumatoria_final.font = Font(bold=True)
+                aplicar_estilo(celda_sumatoria_final, "verde_clarito", "negrita")
             
             # Aplicar fórmulas de sumatoria para todas las columnas bajo MAST/NANR
             # Sumatoria desde YIS hasta JMV
@@ -1171,8 +1092,7 @@ class StatTransformada:
                 celda_sumatoria_final.value = formula_sumatoria_final
                 
                 # Aplicar formato especial a la celda de sumatoria (verde)
-                celda_sumatoria_final.fill = PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid")  # Verde claro
-                celda_sumatoria_final.font = Font(bold=True)
+                aplicar_estilo(celda_sumatoria_final, "verde_clarito", "negrita")
             
             # Aplicar fórmula de sumatoria para la columna SumaD (desde YIS hasta JMV)
             formula_sumatoria_final_suma_d = f"=SUM({col_suma_d_letter}{fila_yis}:{col_suma_d_letter}{fila_jmv})"
@@ -1182,8 +1102,7 @@ class StatTransformada:
             celda_sumatoria_final_suma_d.value = formula_sumatoria_final_suma_d
             
             # Aplicar formato especial a la celda de sumatoria SumaD (verde)
-            celda_sumatoria_final_suma_d.fill = PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid")  # Verde claro
-            celda_sumatoria_final_suma_d.font = Font(bold=True)
+            aplicar_estilo(celda_sumatoria_final_suma_d, "verde_clarito", "negrita")
             
             # Aplicar fórmula de sumatoria para la columna SumaN (desde YIS hasta JMV)
             formula_sumatoria_final_suma_n = f"=SUM({col_suma_n_letter}{fila_yis}:{col_suma_n_letter}{fila_jmv})"
@@ -1193,8 +1112,7 @@ class StatTransformada:
             celda_sumatoria_final_suma_n.value = formula_sumatoria_final_suma_n
             
             # Aplicar formato especial a la celda de sumatoria SumaN (verde)
-            celda_sumatoria_final_suma_n.fill = PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid")  # Verde claro
-            celda_sumatoria_final_suma_n.font = Font(bold=True)
+            aplicar_estilo(celda_sumatoria_final_suma_n, "verde_clarito", "negrita")
             
             # Insertar segunda fila con sumatoria total justo después de PARCI
             ws_stats_nueva.insert_rows(fila_jmv + 2)
@@ -1202,8 +1120,7 @@ class StatTransformada:
             # Añadir nombre "TOTAL" en la primera columna de la fila de sumatoria total
             celda_total = ws_stats_nueva.cell(row=fila_jmv + 2, column=1)
             celda_total.value = "TOTAL"
-            celda_total.fill = PatternFill(start_color="87CEEB", end_color="87CEEB", fill_type="solid")  # Azul claro
-            celda_total.font = Font(bold=True, color="000000")  # Texto negro
+            aplicar_estilo(celda_total, "azul_cielo", "negrita")
             
             # Crear fórmula para sumar solo las columnas de 5AM (fila_jmv + 1)
             # La fórmula será: =SUM(B{fila_jmv+1}:{última_col_5am}{fila_jmv+1})
@@ -1216,8 +1133,7 @@ class StatTransformada:
             celda_sumatoria_total_final_5am.value = formula_sumatoria_total_final_5am
             
             # Aplicar formato especial a la celda de sumatoria total 5AM final (azul)
-            celda_sumatoria_total_final_5am.fill = PatternFill(start_color="87CEEB", end_color="87CEEB", fill_type="solid")  # Azul claro
-            celda_sumatoria_total_final_5am.font = Font(bold=True, color="000000")  # Texto negro
+            aplicar_estilo(celda_sumatoria_total_final_5am, "azul_cielo", "negrita")
             
             # Crear fórmula para sumar solo las columnas de DIURNAS (fila_jmv + 1)
             # La fórmula será: =SUM({primera_col_diurnas}{fila_jmv+1}:{última_col_diurnas}{fila_jmv+1})
@@ -1230,8 +1146,7 @@ class StatTransformada:
             celda_sumatoria_total_final_diurnas.value = formula_sumatoria_total_final_diurnas
             
             # Aplicar formato especial a la celda de sumatoria total DIURNAS final (azul)
-            celda_sumatoria_total_final_diurnas.fill = PatternFill(start_color="87CEEB", end_color="87CEEB", fill_type="solid")  # Azul claro
-            celda_sumatoria_total_final_diurnas.font = Font(bold=True, color="000000")  # Texto negro
+            aplicar_estilo(celda_sumatoria_total_final_diurnas, "azul_cielo", "negrita")
             
             # Crear fórmula para sumar solo las columnas de SLN (fila_jmv + 1)
             # La fórmula será: =SUM({primera_col_sln}{fila_jmv+1}:{última_col_sln}{fila_jmv+1})
@@ -1244,8 +1159,7 @@ class StatTransformada:
             celda_sumatoria_total_final_sln.value = formula_sumatoria_total_final_sln
             
             # Aplicar formato especial a la celda de sumatoria total SLN final (azul)
-            celda_sumatoria_total_final_sln.fill = PatternFill(start_color="87CEEB", end_color="87CEEB", fill_type="solid")  # Azul claro
-            celda_sumatoria_total_final_sln.font = Font(bold=True, color="000000")  # Texto negro
+            aplicar_estilo(celda_sumatoria_total_final_sln, "azul_cielo", "negrita")
             
             # Crear fórmula para sumar solo las columnas de TANT/NANT (fila_jmv + 1)
             # La fórmula será: =SUM({primera_col_tant_nant}{fila_jmv+1}:{última_col_tant_nant}{fila_jmv+1})
@@ -1258,8 +1172,7 @@ class StatTransformada:
             celda_sumatoria_total_final_tant_nant.value = formula_sumatoria_total_final_tant_nant
             
             # Aplicar formato especial a la celda de sumatoria total TANT/NANT final (azul)
-            celda_sumatoria_total_final_tant_nant.fill = PatternFill(start_color="87CEEB", end_color="87CEEB", fill_type="solid")  # Azul claro
-            celda_sumatoria_total_final_tant_nant.font = Font(bold=True, color="000000")  # Texto negro
+            aplicar_estilo(celda_sumatoria_total_final_tant_nant, "azul_cielo", "negrita")
             
             # Crear fórmula para sumar solo las columnas de MAST/NANR (fila_jmv + 1)
             # La fórmula será: =SUM({primera_col_mast_nanr}{fila_jmv+1}:{última_col_mast_nanr}{fila_jmv+1})
@@ -1272,8 +1185,7 @@ class StatTransformada:
             celda_sumatoria_total_final_mast_nanr.value = formula_sumatoria_total_final_mast_nanr
             
             # Aplicar formato especial a la celda de sumatoria total MAST/NANR final (azul)
-            celda_sumatoria_total_final_mast_nanr.fill = PatternFill(start_color="87CEEB", end_color="87CEEB", fill_type="solid")  # Azul claro
-            celda_sumatoria_total_final_mast_nanr.font = Font(bold=True, color="000000")  # Texto negro
+            aplicar_estilo(celda_sumatoria_total_final_mast_nanr, "azul_cielo", "negrita")
             
             # Aplicar fórmula de sumatoria total para la columna SumaD final
             formula_sumatoria_total_final_suma_d = f"=SUM({col_suma_d_letter}{fila_jmv+1})"
@@ -1283,8 +1195,7 @@ class StatTransformada:
             celda_sumatoria_total_final_suma_d.value = formula_sumatoria_total_final_suma_d
             
             # Aplicar formato especial a la celda de sumatoria total SumaD final (azul)
-            celda_sumatoria_total_final_suma_d.fill = PatternFill(start_color="87CEEB", end_color="87CEEB", fill_type="solid")  # Azul claro
-            celda_sumatoria_total_final_suma_d.font = Font(bold=True, color="000000")  # Texto negro
+            aplicar_estilo(celda_sumatoria_total_final_suma_d, "azul_cielo", "negrita")
             
             # Aplicar fórmula de sumatoria total para la columna SumaN final
             formula_sumatoria_total_final_suma_n = f"=SUM({col_suma_n_letter}{fila_jmv+1})"
@@ -1294,8 +1205,7 @@ class StatTransformada:
             celda_sumatoria_total_final_suma_n.value = formula_sumatoria_total_final_suma_n
             
             # Aplicar formato especial a la celda de sumatoria total SumaN final (azul)
-            celda_sumatoria_total_final_suma_n.fill = PatternFill(start_color="87CEEB", end_color="87CEEB", fill_type="solid")  # Azul claro
-            celda_sumatoria_total_final_suma_n.font = Font(bold=True, color="000000")  # Texto negro
+            aplicar_estilo(celda_sumatoria_total_final_suma_n, "azul_cielo", "negrita")
             
             print(f"  📊 Sumatorias añadidas justo después de JMV para todos los grupos")
             print(f"     Rango: desde YIS (fila {fila_yis}) hasta JMV (fila {fila_jmv})")
@@ -1320,21 +1230,18 @@ class StatTransformada:
         # Añadir nombre "VERIFICACIÓN" en la primera celda (A)
         celda_verificacion_nombre = ws_stats_nueva.cell(row=ultima_fila_final, column=1)
         celda_verificacion_nombre.value = "VERIFICACIÓN"
-        celda_verificacion_nombre.fill = PatternFill(start_color="FFA500", end_color="FFA500", fill_type="solid")  # Naranja
-        celda_verificacion_nombre.font = Font(bold=True, color="000000")  # Texto negro
+        aplicar_estilo(celda_verificacion_nombre, "naranja", "negrita")
         
         # Añadir las constantes en celdas separadas para poder modificarlas
         # Constante 1 en columna C
         celda_constante1 = ws_stats_nueva.cell(row=ultima_fila_final, column=3)
         celda_constante1.value = 1
-        celda_constante1.fill = PatternFill(start_color="FFA500", end_color="FFA500", fill_type="solid")  # Naranja
-        celda_constante1.font = Font(bold=True)
+        aplicar_estilo(celda_constante1, "naranja", "negrita")
         
         # Constante 52 en columna D
         celda_constante52 = ws_stats_nueva.cell(row=ultima_fila_final, column=4)
         celda_constante52.value = 52
-        celda_constante52.fill = PatternFill(start_color="FFA500", end_color="FFA500", fill_type="solid")  # Naranja
-        celda_constante52.font = Font(bold=True)
+        aplicar_estilo(celda_constante52, "naranja", "negrita")
         
         # Crear fórmula de verificación: (Total1 + Total2) / constante1 - constante52
         # Total1 = sumatoria total debajo de GCE (fila_gce + 2, columna B)
@@ -1345,8 +1252,7 @@ class StatTransformada:
             # Escribir la fórmula en la segunda celda (B)
             celda_verificacion_formula = ws_stats_nueva.cell(row=ultima_fila_final, column=2)
             celda_verificacion_formula.value = formula_verificacion
-            celda_verificacion_formula.fill = PatternFill(start_color="FFA500", end_color="FFA500", fill_type="solid")  # Naranja
-            celda_verificacion_formula.font = Font(bold=True, color="000000")  # Texto negro
+            aplicar_estilo(celda_verificacion_formula, "naranja", "negrita")
             
             print(f"  🔍 Fila de verificación añadida al final")
             print(f"     Fórmula: {formula_verificacion}")
@@ -1365,8 +1271,7 @@ class StatTransformada:
             # Escribir la fórmula en la primera columna de DIURNAS (columna I)
             celda_verificacion_diurnas_formula = ws_stats_nueva.cell(row=ultima_fila_final, column=num_columnas_5am + 2)
             celda_verificacion_diurnas_formula.value = formula_verificacion_diurnas
-            celda_verificacion_diurnas_formula.fill = PatternFill(start_color="FFA500", end_color="FFA500", fill_type="solid")  # Naranja
-            celda_verificacion_diurnas_formula.font = Font(bold=True, color="000000")  # Texto negro
+            aplicar_estilo(celda_verificacion_diurnas_formula, "naranja", "negrita")
             
             print(f"  🔍 Fórmula de verificación DIURNAS añadida en la fila VERIFICACIÓN existente")
             print(f"     Fórmula: {formula_verificacion_diurnas}")
@@ -1500,6 +1405,9 @@ class StatTransformada:
         # Crear nueva hoja stats
         self._crear_hoja_stats(ws_stats, max_1t, max_diurnas, max_3, max_6t, max_6rt, col_1d, col_3d, col_6d)
         
+        if not self.guardar:
+            return
+
         # Generar nombre del archivo de salida
         base_name = os.path.splitext(self.archivo_entrada)[0]
         archivo_salida = f"{base_name}_stats.xlsx"
@@ -0,0 +1,83 @@
+"""
+Verificaciones de regresión de GrillaHorario sobre el libro de ejemplo (horarioUnificado_con_6t.xlsx).
+
+Uso:
+    python verificar_grilla.py
+"""
+
+import os
+import tempfile
+
+import openpyxl
+
+from grilla_horario import GrillaHorario, PRIMERA_FILA_TRABAJADOR, ULTIMA_FILA_TRABAJADOR
+
+ARCHIVO_EJEMPLO = "horarioUnificado_con_6t.xlsx"
+
+
+def _origen_y_destino(grilla: GrillaHorario):
+    """(fila, columna con turno, columna vacía) de la primera fila de trabajador que tenga ambas."""
+    for fila in range(PRIMERA_FILA_TRABAJADOR, ULTIMA_FILA_TRABAJADOR + 1):
+        columnas = range(2, grilla.max_col)  # sin la columna final 'SIGLA ATCO'
+        origen = next((c for c in columnas if grilla.valor(fila, c)), None)
+        destino = next((c for c in columnas if grilla.esta_vacia(fila, c)), None)
+        if origen is not None and destino is not None:
+            return fila, origen, destino
+    return None
+
+
+def verificar_vaciado_al_volcar() -> bool:
+    """asignar(f, c, None) + volcar() debe dejar vacía una celda que ya tenía valor en la hoja."""
+    grilla = GrillaHorario.desde_archivo(ARCHIVO_EJEMPLO)
+    celdas = _origen_y_destino(grilla)
+    if celdas is None:
+        print("⚠️  El libro de ejemplo no tiene una fila de trabajador con turno y celda vacía")
+        return False
+    fila, col, _ = celdas
+    anterior = grilla.valor_crudo(fila, col)
+
+    grilla.asignar(fila, col, None)
+    grilla.volcar()
+    en_hoja = grilla.ws.cell(row=fila, column=col).value
+
+    # También tras guardar y releer (lo que ven los rebalanceos al mover turnos ya volcados)
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "vaciado.xlsx")
+        grilla.wb.save(ruta)
+        releida = openpyxl.load_workbook(ruta)[grilla.titulo].cell(row=fila, column=col).value
+
+    correcto = en_hoja is None and releida is None
+    estado = "✅" if correcto else "❌"
+    print(f"{estado} Vaciado al volcar ({fila}, {col}): '{anterior}' → hoja {en_hoja!r}, releída {releida!r}")
+    return correcto
+
+
+def verificar_movimiento_sin_duplicado() -> bool:
+    """Mover un turno ya volcado (origen → destino vacío) no debe dejarlo duplicado en la hoja."""
+    grilla = GrillaHorario.desde_archivo(ARCHIVO_EJEMPLO)
+    celdas = _origen_y_destino(grilla)
+    if celdas is None:
+        print("⚠️  El libro de ejemplo no tiene una fila de trabajador con turno y celda vacía")
+        return False
+    fila, origen, destino = celdas
+    turno = grilla.valor_crudo(fila, origen)
+    grilla.volcar()
+
+    grilla.asignar(fila, destino, turno)
+    grilla.asignar(fila, origen, None)
+    grilla.volcar()
+    valores = [grilla.ws.cell(row=fila, column=c).value for c in (origen, destino)]
+
+    correcto = valores == [None, turno]
+    estado = "✅" if correcto else "❌"
+    print(f"{estado} Movimiento de '{turno}' col {origen} → {destino}: hoja {valores}")
+    return correcto
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("VERIFICACIONES DE GrillaHorario")
+    print("=" * 50)
+    resultados = [verificar_vaciado_al_volcar(), verificar_movimiento_sin_duplicado()]
+    print("-" * 50)
+    print("🎉 Todas las verificaciones pasaron" if all(resultados) else "⚠️  Hay verificaciones fallidas")
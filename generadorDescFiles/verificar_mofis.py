@@ -1,6 +1,9 @@
-import openpyxl
 from typing import Dict, List
 
+from grilla_horario import HOJA_ESTADISTICAS, GrillaHorario, leer_filas
+
+ARCHIVO_MOFIS = "horarioUnificado_con_mofis.xlsx"
+
 def verificar_asignaciones_mofis():
     """Verifica que las asignaciones MOFIS se realizaron correctamente"""
     
@@ -10,21 +13,14 @@ def verificar_asignaciones_mofis():
     # Turnos MOFIS
     TURNOS_MOFIS = ["MS", "TS", "MN", "TN", "S", "N"]
     
-    # Cargar archivo
-    wb = openpyxl.load_workbook("horarioUnificado_con_mofis.xlsx")
-    
-    # Obtener hoja principal
-    ws = None
-    for nombre in wb.sheetnames:
-        if nombre != "Estadísticas":
-            ws = wb[nombre]
-            break
+    # Cargar archivo (solo lectura, en streaming) en la grilla compartida
+    grilla = GrillaHorario.solo_lectura(ARCHIVO_MOFIS)
     
-    if not ws:
+    if grilla.titulo == HOJA_ESTADISTICAS:
         print("No se encontró la hoja principal")
         return
     
-    print(f"Verificando asignaciones MOFIS en: {ws.title}")
+    print(f"Verificando asignaciones MOFIS en: {grilla.titulo}")
     print("=" * 50)
     
     # Contadores por trabajador
@@ -37,21 +33,16 @@ def verificar_asignaciones_mofis():
     dias_con_asignaciones = 0
     total_asignaciones = 0
     
-    for col in range(2, ws.max_column + 1):
+    filas_trabajadores = {trabajador: grilla.fila_de(trabajador) for trabajador in TRABAJADORES_ELEGIBLES}
+    for col in range(2, grilla.max_col + 1):
         asignaciones_dia = []
         
         for trabajador in TRABAJADORES_ELEGIBLES:
-            fila = None
-            for r in range(2, 26):
-                valor = ws.cell(row=r, column=1).value
-                if valor and str(valor).strip().upper() == trabajador.upper():
-                    fila = r
-                    break
+            fila = filas_trabajadores[trabajador]
             
             if fila:
-                valor = ws.cell(row=fila, column=col).value
-                if valor and str(valor).strip().upper() in [t.upper() for t in TURNOS_MOFIS]:
-                    turno = str(valor).strip().upper()
+                turno = grilla.valor(fila, col)
+                if turno in TURNOS_MOFIS:
                     contadores[trabajador][turno] += 1
                     if turno in ['S', 'N']:
                         contadores[trabajador]['total_sn'] += 1
@@ -94,15 +85,16 @@ def verificar_asignaciones_mofis():
         print("  ⚠️  Equidad no óptima (diferencia > 1)")
     
     # Verificar hoja de estadísticas
-    if "Estadísticas" in wb.sheetnames:
-        ws_stats = wb["Estadísticas"]
+    if HOJA_ESTADISTICAS in grilla.hojas:
+        filas_stats = leer_filas(ARCHIVO_MOFIS, [HOJA_ESTADISTICAS])[HOJA_ESTADISTICAS]
+        columnas_stats = max((len(valores) for valores in filas_stats), default=0)
         print(f"\nHoja de Estadísticas:")
-        print(f"  Columnas: {ws_stats.max_column}")
-        print(f"  Filas: {ws_stats.max_row}")
+        print(f"  Columnas: {columnas_stats}")
+        print(f"  Filas: {len(filas_stats)}")
         
         # Verificar columna 6S
-        if ws_stats.max_column >= 6:
-            header_6s = ws_stats.cell(row=1, column=6).value
+        if columnas_stats >= 6:
+            header_6s = filas_stats[0][5]
             print(f"  Columna 6S: {header_6s}")
         else:
             print("  ⚠️  No se encontró la columna 6S")
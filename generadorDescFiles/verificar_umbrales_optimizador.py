@@ -0,0 +1,66 @@
+"""
+Verifica que el optimizador evalúe los umbrales de cada regla con el mismo personal por día que la cadena
+normal (1T … DIURNAS antes de MOFI/TOFI, 6T después), sobre el libro de ejemplo tras sábados y festivos.
+No necesita ortools: compara los conteos de `conteos_umbral` con los que ve cada asignador en la cadena.
+
+Uso:
+    python verificar_umbrales_optimizador.py
+"""
+
+import openpyxl
+
+from asignador_turnos_mofis import AsignadorTurnosMofis
+from optimizador_mensual import REGLAS_CADENA, conteos_por_dia, conteos_umbral
+from pipeline import ETAPAS, EstadoCadena
+from reglas_turnos import regla_compilada
+
+ARCHIVO_EJEMPLO = "horario_procesado_con_sabados_domingos.xlsx"
+REGLA_DE_ETAPA = {"1T": "1T", "1": "1", "6RT": "6RT", "6R": "6R", "3": "3", "diurnas": "DIURNAS", "6T": "6T"}
+
+
+def conteos_cadena_normal():
+    """Conteos por día que ve cada asignador de turnos extra al ejecutar la cadena normal."""
+    estado = EstadoCadena(wb=openpyxl.load_workbook(ARCHIVO_EJEMPLO))
+    conteos = {}
+    for etapa in ETAPAS:
+        if etapa.nombre in REGLA_DE_ETAPA:
+            conteos[REGLA_DE_ETAPA[etapa.nombre]] = conteos_por_dia(estado.asegurar_grilla())
+        if etapa.nombre in REGLA_DE_ETAPA or etapa.nombre == "mofis":
+            etapa.ejecutar(estado)
+    return conteos
+
+
+def conteos_modo_optimizador():
+    """Conteos con que el optimizador evalúa cada regla (MOFI/TOFI ya asignado, como en --optimizador)."""
+    grilla = EstadoCadena(wb=openpyxl.load_workbook(ARCHIVO_EJEMPLO)).asegurar_grilla()
+    previos = conteos_por_dia(grilla)
+    AsignadorTurnosMofis(grilla=grilla).procesar_todos_los_dias(guardar=False)
+    return {regla: conteos_umbral(grilla, regla, previos) for regla in REGLAS_CADENA}
+
+
+def verificar_umbrales() -> bool:
+    cadena = conteos_cadena_normal()
+    optimizador = conteos_modo_optimizador()
+    todo_ok = True
+    for regla in REGLAS_CADENA:
+        compilada = regla_compilada(regla)
+        esperados, obtenidos = cadena[regla]["operativos"], optimizador[regla]["operativos"]
+        columnas = range(2, len(esperados))
+        dias_con_turnos = sum(1 for col in columnas if compilada.turnos_para(int(esperados[col])))
+        distintos = [col for col in columnas
+                     if compilada.turnos_para(int(esperados[col])) != compilada.turnos_para(int(obtenidos[col]))]
+        ok = (esperados == obtenidos).all() and not distintos
+        if regla == "1T":
+            ok = ok and (cadena[regla]["torre"] == optimizador[regla]["torre"]).all()
+        todo_ok &= ok
+        icono = "✅" if ok else "❌"
+        print(f"{icono} {regla}: {dias_con_turnos} días con turnos en la cadena, {len(distintos)} días distintos")
+    return todo_ok
+
+
+if __name__ == "__main__":
+    print(f"=== UMBRALES DEL OPTIMIZADOR FRENTE A LA CADENA NORMAL ({ARCHIVO_EJEMPLO}) ===")
+    if verificar_umbrales():
+        print("\n🎉 El optimizador evalúa cada regla con el mismo personal por día que la cadena normal")
+    else:
+        print("\n⚠️  Hay reglas cuyos umbrales no coinciden con la cadena normal")
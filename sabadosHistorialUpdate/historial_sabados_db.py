@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Historial de Sábados - Sistema de Turnos
+========================================
+Registro semana a semana de los TROP en sábado, en SQLite (historial_sabados.db).
+
+- Tabla sabados: una fila por (año, semana, empleado), con el origen (generador, monitor, csv)
+- Tabla ultimo_sabado: última semana de cada empleado, mantenida en la misma transacción (consulta O(1))
+- Registrar una semana reemplaza lo que hubiera de esa semana (volver a generarla no duplica filas)
+- Escrituras con BEGIN IMMEDIATE y diario WAL: el monitor y el generador pueden correr a la vez
+  sin pisarse, y las lecturas no esperan a las escrituras
+- Las consultas devuelven (año, semana): las semanas transcurridas se calculan con
+  calendario_semanas.indice_semana, también entre años distintos
+- La primera vez importa historial_sabados.csv (formato anterior: solo la última semana, sin año). El año de
+  cada fila se indica con año_csv o se deduce de la fecha de modificación del CSV: una semana posterior a la
+  de esa fecha es del año anterior
+- Solo usa la biblioteca estándar: sabadosHistorialUpdate/historial_sabados_db.py es una copia idéntica
+  (la usa trop_monitor.py), así el esquema y la transacción de escritura son los mismos en las dos carpetas
+"""
+
+import csv
+import os
+import sqlite3
+from datetime import date, datetime, timedelta
+
+ARCHIVO_CSV_ANTERIOR = 'historial_sabados.csv'
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS sabados (
+    año INTEGER NOT NULL,
+    semana INTEGER NOT NULL,
+    empleado TEXT NOT NULL,
+    origen TEXT NOT NULL,
+    registrado TEXT NOT NULL,
+    PRIMARY KEY (año, semana, empleado)
+);
+CREATE INDEX IF NOT EXISTS sabados_empleado ON sabados (empleado, año, semana);
+CREATE TABLE IF NOT EXISTS ultimo_sabado (
+    empleado TEXT PRIMARY KEY,
+    año INTEGER NOT NULL,
+    semana INTEGER NOT NULL
+);
+"""
+
+
+def _semana_de(fecha):
+    """Número de semana de la fecha con la numeración de calendario_semanas (semana 1 = primer lunes de
+    enero; si el 1 de enero es lunes, el siguiente)"""
+    primer_dia_enero = date(fecha.year, 1, 1)
+    primer_lunes_enero = primer_dia_enero + timedelta(days=(7 - primer_dia_enero.weekday()) % 7 or 7)
+    return (fecha - primer_lunes_enero).days // 7 + 1
+
+
+class HistorialSabados:
+    """Historial de TROP en sábado guardado en SQLite (una conexión por instancia)"""
+
+    def __init__(self, archivo='historial_sabados.db', archivo_csv=ARCHIVO_CSV_ANTERIOR, año_csv=None, espera=30):
+        """
+        Args:
+            archivo: Base de datos SQLite (se crea si no existe)
+            archivo_csv: CSV del formato anterior que se importa si la base está vacía (None = no importar)
+            año_csv: Año de las semanas del CSV (None = deducido de su fecha de modificación)
+            espera: Segundos que una escritura espera a que otro proceso libere la base
+        """
+        self.archivo = archivo
+        self.conexion = sqlite3.connect(archivo, timeout=espera, isolation_level=None)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.executescript(ESQUEMA)
+
+        if archivo_csv and os.path.exists(archivo_csv) and self._vacio():
+            self.importar_csv(archivo_csv, año_csv)
+
+    def cerrar(self):
+        self.conexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def _vacio(self):
+        return self.conexion.execute("SELECT 1 FROM sabados LIMIT 1").fetchone() is None
+
+    def _escribir(self, semanas, origen):
+        """Reemplaza las semanas {(año, semana): [empleados]} en una sola transacción"""
+        registrado = datetime.now().isoformat(timespec='seconds')
+        cursor = self.conexion.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            afectados = set()
+            for (año, semana), empleados in semanas.items():
+                anteriores = cursor.execute(
+                    "SELECT empleado FROM sabados WHERE año = ? AND semana = ?", (año, semana)
+                ).fetchall()
+                afectados.update(empleado for (empleado,) in anteriores)
+                cursor.execute("DELETE FROM sabados WHERE año = ? AND semana = ?", (año, semana))
+                cursor.executemany(
+                    "INSERT INTO sabados (año, semana, empleado, origen, registrado) VALUES (?, ?, ?, ?, ?)",
+                    [(año, semana, empleado, origen, registrado) for empleado in dict.fromkeys(empleados)]
+                )
+                afectados.update(empleados)
+
+            # Última semana solo de los empleados que cambiaron (índice por empleado)
+            for empleado in afectados:
+                ultima = cursor.execute(
+                    "SELECT año, semana FROM sabados WHERE empleado = ? ORDER BY año DESC, semana DESC LIMIT 1",
+                    (empleado,)
+                ).fetchone()
+                if ultima is None:
+                    cursor.execute("DELETE FROM ultimo_sabado WHERE empleado = ?", (empleado,))
+                else:
+                    cursor.execute("INSERT OR REPLACE INTO ultimo_sabado (empleado, año, semana) VALUES (?, ?, ?)",
+                                   (empleado, *ultima))
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+
+    def registrar_semana(self, año, semana, empleados, origen='generador'):
+        """Registra los empleados con TROP en el sábado de esa semana (reemplaza el registro anterior)"""
+        self._escribir({(año, semana): list(empleados)}, origen)
+
+    def registrar_semanas(self, año, semanas, origen='generador'):
+        """Registra varias semanas {semana: [empleados]} de un año en una sola transacción"""
+        self._escribir({(año, semana): list(empleados) for semana, empleados in semanas.items()}, origen)
+
+    def ultima_semana(self, empleado):
+        """(año, semana) del último TROP en sábado del empleado, o None si nunca"""
+        fila = self.conexion.execute("SELECT año, semana FROM ultimo_sabado WHERE empleado = ?", (empleado,)).fetchone()
+        return tuple(fila) if fila else None
+
+    def ultimas_semanas(self, empleados=None):
+        """{empleado: (año, semana) del último TROP en sábado, o None si nunca}"""
+        ultimas = {empleado: (año, semana) for empleado, año, semana in
+                   self.conexion.execute("SELECT empleado, año, semana FROM ultimo_sabado")}
+        if empleados is None:
+            return ultimas
+        return {empleado: ultimas.get(empleado) for empleado in empleados}
+
+    def sabados_empleado(self, empleado, año=None):
+        """[(año, semana)] de todos los sábados del empleado, en orden"""
+        if año is None:
+            filas = self.conexion.execute(
+                "SELECT año, semana FROM sabados WHERE empleado = ? ORDER BY año, semana", (empleado,))
+        else:
+            filas = self.conexion.execute(
+                "SELECT año, semana FROM sabados WHERE empleado = ? AND año = ? ORDER BY semana", (empleado, año))
+        return filas.fetchall()
+
+    def empleados_semana(self, año, semana):
+        """Empleados con TROP en el sábado de esa semana"""
+        return [empleado for (empleado,) in self.conexion.execute(
+            "SELECT empleado FROM sabados WHERE año = ? AND semana = ? ORDER BY empleado", (año, semana))]
+
+    def importar_csv(self, archivo_csv, año=None):
+        """
+        Importa el CSV anterior (empleado, ultima_semana_trop_sabado) como registros de origen 'csv'.
+        Con año=None el año de cada semana se deduce de la fecha de modificación del CSV.
+        """
+        if año is None:
+            modificado = date.fromtimestamp(os.path.getmtime(archivo_csv))
+            semana_modificado = _semana_de(modificado)
+        semanas = {}
+        with open(archivo_csv, 'r', newline='', encoding='utf-8') as archivo:
+            for fila in csv.DictReader(archivo):
+                ultima_semana = (fila.get('ultima_semana_trop_sabado') or '').strip()
+                if ultima_semana:
+                    semana = int(float(ultima_semana))
+                    if año is not None:
+                        año_fila = año
+                    else:
+                        año_fila = modificado.year if semana <= semana_modificado else modificado.year - 1
+                    semanas.setdefault((año_fila, semana), []).append(fila['empleado'].strip())
+        self._escribir(semanas, 'csv')
+        return sum(len(empleados) for empleados in semanas.values())
+
+    def exportar_csv(self, archivo_csv, empleados=None):
+        """Escribe el CSV con el formato anterior, solo la semana sin año (archivo temporal + reemplazo atómico)"""
+        ultimas = self.ultimas_semanas(empleados)
+        temporal = f"{archivo_csv}.tmp"
+        with open(temporal, 'w', newline='', encoding='utf-8') as archivo:
+            writer = csv.writer(archivo)
+            writer.writerow(['empleado', 'ultima_semana_trop_sabado'])
+            for empleado, ultima_semana in ultimas.items():
+                writer.writerow([empleado, '' if ultima_semana is None else ultima_semana[1]])
+        os.replace(temporal, archivo_csv)
+        return archivo_csv
@@ -1,4 +1,3 @@
-import pandas as pd
 import openpyxl
 import re
 import os
@@ -8,6 +7,9 @@ from datetime import datetime
 from pathlib import Path
 import logging
 
+# Copia de excel_extract/excel_extraction_forschedule/historial_sabados_db.py (mismo esquema y escritura)
+from historial_sabados_db import HistorialSabados
+
 # Configurar logging
 logging.basicConfig(
     level=logging.INFO,
@@ -19,11 +21,17 @@ logging.basicConfig(
 )
 
 class TropMonitor:
-    def __init__(self):
+    def __init__(self, archivo_historial=None):
+        """
+        Args:
+            archivo_historial: historial_sabados.db del generador (None = el de la carpeta de destino).
+                Si no existe se crea, importando historial_sabados.csv de la misma carpeta si lo hay.
+        """
         # Rutas de las carpetas
         self.carpeta_monitoreo = r"C:\Users\Usuario1\Desktop\cursor\sabadosHistorialUpdate"
         self.carpeta_destino = r"C:\Users\Usuario1\Desktop\cursor\excel_extract\excel_extraction_forschedule"
-        self.archivo_csv = os.path.join(self.carpeta_destino, "historial_sabados.csv")
+        self.archivo_historial = archivo_historial or os.path.join(self.carpeta_destino, "historial_sabados.db")
+        self.archivo_csv = os.path.join(os.path.dirname(self.archivo_historial), "historial_sabados.csv")
         
         # Crear carpetas si no existen
         os.makedirs(self.carpeta_monitoreo, exist_ok=True)
@@ -34,7 +42,7 @@ class TropMonitor:
         
         logging.info(f"Carpeta de monitoreo: {self.carpeta_monitoreo}")
         logging.info(f"Carpeta de destino: {self.carpeta_destino}")
-        logging.info(f"Archivo CSV: {self.archivo_csv}")
+        logging.info(f"Historial: {self.archivo_historial}")
 
     def extraer_numero_semana(self, nombre_archivo):
         """Extrae el número de semana del nombre del archivo Excel."""
@@ -43,6 +51,13 @@ class TropMonitor:
             return int(match.group(1))
         return None
 
+    def extraer_año(self, nombre_archivo):
+        """Extrae el año del nombre del archivo Excel (..._2025.xlsx); si no lo tiene, el año actual."""
+        match = re.search(r'_(\d{4})\.xlsx?$', nombre_archivo)
+        if match:
+            return int(match.group(1))
+        return datetime.now().year
+
     def extraer_iniciales_con_trop(self, archivo_excel):
         """Extrae las iniciales de empleados que tienen 'TROP' en columnas SAT."""
         try:
@@ -52,48 +67,61 @@ class TropMonitor:
             numero_semana = self.extraer_numero_semana(archivo_excel)
             logging.info(f"Número de semana detectado: {numero_semana}")
             
-            # Leer el archivo Excel
-            excel_file = pd.ExcelFile(archivo_excel)
-            hojas = excel_file.sheet_names
+            # Leer el archivo Excel en streaming (solo lectura, una pasada por hoja, sin objetos Cell)
+            wb = openpyxl.load_workbook(archivo_excel, read_only=True, data_only=True)
+            hojas = wb.sheetnames
             logging.info(f"Hojas encontradas: {hojas}")
             
             iniciales_con_trop = []
             
-            for hoja in hojas:
-                logging.info(f"Procesando hoja: {hoja}")
-                
-                df = pd.read_excel(archivo_excel, sheet_name=hoja)
-                
-                # Buscar columnas que empiecen con 'SAT'
-                columnas_sat = [col for col in df.columns if str(col).startswith('SAT')]
-                logging.info(f"Columnas SAT encontradas: {columnas_sat}")
-                
-                if columnas_sat:
-                    for col_sat in columnas_sat:
-                        # Buscar filas con 'TROP'
-                        trop_filas = df[df[col_sat].astype(str).str.contains('TROP', case=False, na=False)]
-                        
-                        if not trop_filas.empty:
-                            logging.info(f"Encontradas {len(trop_filas)} filas con TROP en {col_sat}")
+            try:
+                for hoja in hojas:
+                    logging.info(f"Procesando hoja: {hoja}")
+                    
+                    filas = wb[hoja].iter_rows(values_only=True)
+                    encabezados = [str(col) for col in next(filas, ())]
+                    
+                    # Buscar columnas que empiecen con 'SAT'
+                    columnas_sat = [(i, col) for i, col in enumerate(encabezados) if col.startswith('SAT')]
+                    logging.info(f"Columnas SAT encontradas: {[col for _, col in columnas_sat]}")
+                    
+                    if not columnas_sat:
+                        continue
+                    
+                    # Encontrados por columna SAT (se reportan columna por columna, como antes)
+                    por_columna = {i: [] for i, _ in columnas_sat}
+                    for idx, fila in enumerate(filas):
+                        for i, col_sat in columnas_sat:
+                            # Buscar filas con 'TROP'
+                            valor_sat = fila[i] if i < len(fila) else None
+                            if valor_sat is None or 'TROP' not in str(valor_sat).upper():
+                                continue
                             
-                            for idx, fila in trop_filas.iterrows():
-                                inicial = None
-                                
-                                # Buscar iniciales en las primeras columnas
-                                for col in df.columns[:5]:
-                                    valor = str(fila[col]).strip()
-                                    if len(valor) <= 4 and valor.isalpha():
-                                        inicial = valor
-                                        break
-                                
-                                if inicial:
-                                    iniciales_con_trop.append({
-                                        'inicial': inicial,
-                                        'columna_sat': col_sat,
-                                        'fila': idx + 1,
-                                        'valor_completo': str(fila[col_sat])
-                                    })
-                                    logging.info(f"Encontrado TROP: {inicial} en {col_sat}")
+                            inicial = None
+                            
+                            # Buscar iniciales en las primeras columnas
+                            for valor in fila[:5]:
+                                valor = str(valor).strip() if valor is not None else ''
+                                if valor and len(valor) <= 4 and valor.isalpha():
+                                    inicial = valor
+                                    break
+                            
+                            por_columna[i].append({
+                                'inicial': inicial,
+                                'columna_sat': col_sat,
+                                'fila': idx + 1,
+                                'valor_completo': str(valor_sat)
+                            })
+                    
+                    for i, col_sat in columnas_sat:
+                        if por_columna[i]:
+                            logging.info(f"Encontradas {len(por_columna[i])} filas con TROP en {col_sat}")
+                        for item in por_columna[i]:
+                            if item['inicial']:
+                                iniciales_con_trop.append(item)
+                                logging.info(f"Encontrado TROP: {item['inicial']} en {col_sat}")
+            finally:
+                wb.close()
             
             return iniciales_con_trop, numero_semana
             
@@ -101,60 +129,30 @@ class TropMonitor:
             logging.error(f"Error al procesar {archivo_excel}: {e}")
             return [], None
 
-    def actualizar_historial_csv(self, iniciales_con_trop, numero_semana):
-        """Actualiza el archivo CSV con la semana para las personas que tuvieron TROP."""
+    def actualizar_historial(self, iniciales_con_trop, numero_semana, año):
+        """Registra la semana en el historial de sábados para las personas que tuvieron TROP.
+
+        Reemplaza el registro de esa semana (la del Excel publicado manda sobre la generada) en una
+        sola transacción: el generador puede estar usando el historial al mismo tiempo.
+        """
         try:
-            # Crear archivo CSV si no existe
-            if not os.path.exists(self.archivo_csv):
-                df_historial = pd.DataFrame({'empleado': [], 'ultima_semana_trop_sabado': []})
-                df_historial.to_csv(self.archivo_csv, index=False)
-                logging.info(f"Archivo CSV creado: {self.archivo_csv}")
-            
-            # Leer el archivo CSV actual
-            df_historial = pd.read_csv(self.archivo_csv)
-            logging.info(f"Archivo CSV actual cargado con {len(df_historial)} registros")
-            
-            # Obtener iniciales encontradas
-            iniciales_encontradas = [item['inicial'] for item in iniciales_con_trop]
+            # Obtener iniciales encontradas (una vez aunque aparezcan en varias hojas)
+            iniciales_encontradas = list(dict.fromkeys(item['inicial'] for item in iniciales_con_trop))
             logging.info(f"Iniciales con TROP: {iniciales_encontradas}")
             
-            # Actualizar registros existentes y agregar nuevos
-            actualizaciones = 0
-            nuevas_entradas = 0
-            
-            for inicial in iniciales_encontradas:
-                # Buscar si ya existe el empleado
-                empleado_existente = df_historial[df_historial['empleado'] == inicial]
-                
-                if not empleado_existente.index.empty:
-                    # Actualizar semana existente
-                    idx = empleado_existente.index[0]
-                    df_historial.at[idx, 'ultima_semana_trop_sabado'] = numero_semana
-                    actualizaciones += 1
-                    logging.info(f"Actualizado: {inicial} -> Semana {numero_semana}")
-                else:
-                    # Agregar nuevo empleado
-                    nueva_fila = {'empleado': inicial, 'ultima_semana_trop_sabado': numero_semana}
-                    df_historial = pd.concat([df_historial, pd.DataFrame([nueva_fila])], ignore_index=True)
-                    nuevas_entradas += 1
-                    logging.info(f"Nuevo empleado agregado: {inicial} -> Semana {numero_semana}")
-            
-            # Convertir la columna a enteros (manteniendo NaN para valores vacíos)
-            df_historial['ultima_semana_trop_sabado'] = pd.to_numeric(df_historial['ultima_semana_trop_sabado'], errors='coerce')
-            
-            # Guardar archivo actualizado con números enteros
-            df_historial.to_csv(self.archivo_csv, index=False, float_format='%.0f')
+            with HistorialSabados(self.archivo_historial, archivo_csv=self.archivo_csv) as historial:
+                historial.registrar_semana(año, numero_semana, iniciales_encontradas, origen='monitor')
             
-            logging.info(f"Archivo CSV actualizado: {actualizaciones} actualizaciones, {nuevas_entradas} nuevas entradas")
+            logging.info(f"Historial actualizado: semana {numero_semana}/{año} con {len(iniciales_encontradas)} empleados")
             
-            return df_historial
+            return iniciales_encontradas
             
         except Exception as e:
-            logging.error(f"Error al actualizar CSV: {e}")
+            logging.error(f"Error al actualizar historial: {e}")
             return None
 
     def procesar_archivo_excel(self, archivo_excel):
-        """Procesa un archivo Excel y actualiza el CSV."""
+        """Procesa un archivo Excel y actualiza el historial de sábados."""
         try:
             logging.info(f"Iniciando procesamiento de: {archivo_excel}")
             
@@ -162,10 +160,11 @@ class TropMonitor:
             iniciales_con_trop, numero_semana = self.extraer_iniciales_con_trop(archivo_excel)
             
             if iniciales_con_trop and numero_semana:
-                # Actualizar CSV
-                df_actualizado = self.actualizar_historial_csv(iniciales_con_trop, numero_semana)
+                # Actualizar historial
+                año = self.extraer_año(archivo_excel)
+                registrados = self.actualizar_historial(iniciales_con_trop, numero_semana, año)
                 
-                if df_actualizado is not None:
+                if registrados is not None:
                     logging.info("✅ Procesamiento completado exitosamente")
                     logging.info(f" Semana {numero_semana} asignada a {len(iniciales_con_trop)} empleados")
                     
@@ -177,7 +176,7 @@ class TropMonitor:
                     print(f"📅 Semana: {numero_semana}")
                     print(f" Empleados con TROP: {len(iniciales_con_trop)}")
                     print(f"📝 Iniciales: {', '.join([item['inicial'] for item in iniciales_con_trop])}")
-                    print(f" CSV actualizado: {self.archivo_csv}")
+                    print(f" Historial actualizado: {self.archivo_historial}")
                     print(f"{'='*60}\n")
                     
                     return True
@@ -194,7 +193,7 @@ class TropMonitor:
         logging.info(" Iniciando monitoreo de carpeta...")
         print(" MONITOR DE TROP EN SÁBADOS INICIADO")
         print(f"📁 Monitoreando: {self.carpeta_monitoreo}")
-        print(f"💾 Actualizando: {self.archivo_csv}")
+        print(f"💾 Actualizando: {self.archivo_historial}")
         print("⏳ Esperando archivos Excel... (Ctrl+C para salir)")
         print("="*60)
         